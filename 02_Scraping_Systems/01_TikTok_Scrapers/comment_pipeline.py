@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Comment Ingestion Pipeline
+
+Comments straight from TikTok's comment API into the comments table, instead of
+regexing "text":"..." out of page HTML into per-run JSON files.
+
+- CommentApiFetcher: cursor pagination over /api/comment/list/ (and /reply/ for threads),
+  many posts in flight over one pooled aiohttp session; pages of one post are sequential
+  (each cursor comes from the previous page), posts interleave
+- Incremental: with a high-water mark (newest top-level comment of the post's last
+  complete fetch) a post stops paging at the first page with nothing newer. TikTok orders
+  comments by relevance, not time, so a whole page has to be old before we stop. A fetch
+  that errors or hits max_pages is stored but leaves the mark where it was.
+- CommentPipeline: posts -> video ids (short links via short_link_cache) -> fetch ->
+  CommentStore.upsert as each post finishes -> per-post counts / velocity
+
+Usage:
+  python comment_pipeline.py                         # all active posts, new comments only
+  python comment_pipeline.py --limit 50 --concurrency 24 --cookies tiktok_cookies.json
+  python comment_pipeline.py --full                  # ignore high-water marks
+  python comment_pipeline.py --stats                 # comment counts / velocity, no fetching
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from database.comment_store import CommentStore, normalize_comment
+from database.models import Post
+from http_item_fetcher import HTML_HEADERS, load_cookies
+from short_link_cache import DEFAULT_DB_PATH, ShortLinkCache, parse_canonical, resolve_short_links
+
+logger = logging.getLogger(__name__)
+
+COMMENT_LIST_URL = 'https://www.tiktok.com/api/comment/list/'
+REPLY_LIST_URL = 'https://www.tiktok.com/api/comment/list/reply/'
+WEB_APP_ID = '1988'
+
+API_HEADERS = {**HTML_HEADERS, 'Accept': 'application/json, text/plain, */*'}
+
+
+@dataclass
+class PostComments:
+    """Outcome of paging through one post's comments"""
+    video_id: str
+    comments: List[dict] = field(default_factory=list)
+    pages: int = 0
+    reached_mark: bool = False
+    truncated: bool = False  # some comment list stopped at max_pages with more left
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """Every page was fetched, so the high-water mark may advance"""
+        return self.error is None and not self.truncated
+
+
+class CommentApiFetcher:
+    """Cursor-paginated comment fetches for many posts over one connection pool"""
+
+    def __init__(self, concurrency: int = 16, cookies: Optional[Dict[str, str]] = None,
+                 timeout: float = 15.0, page_size: int = 50, max_pages: int = 200,
+                 include_replies: bool = True):
+        self.concurrency = concurrency
+        self.cookies = cookies or {}
+        self.timeout = timeout
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.include_replies = include_replies
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=API_HEADERS,
+            cookies=self.cookies
+        )
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def _get_page(self, url: str, params: dict) -> dict:
+        """One API page (the semaphore is per request, so posts interleave)"""
+        async with self.semaphore:
+            async with self.session.get(url, params=params) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"HTTP {response.status}")
+                data = await response.json(content_type=None)
+        if data.get('status_code', 0) != 0:
+            raise RuntimeError(f"API status {data.get('status_code')}: {data.get('status_msg', '')}")
+        return data
+
+    async def _paginate(self, url: str, params: dict, result: PostComments,
+                        since: Optional[datetime] = None,
+                        comments: Optional[List[dict]] = None) -> List[dict]:
+        """
+        Follow the cursor until has_more is 0, max_pages, or a page with nothing newer than `since`
+
+        Pages are appended to `comments` as they arrive, so a caller passing its own list
+        keeps them when a later page raises.
+        """
+        comments = [] if comments is None else comments
+        cursor = 0
+        for _ in range(self.max_pages):
+            data = await self._get_page(url, {**params, 'cursor': cursor, 'count': self.page_size})
+            result.pages += 1
+            raw = data.get('comments') or []
+            page = [comment for comment in map(normalize_comment, raw) if comment]
+            if since is not None:
+                newer = [comment for comment in page if comment['commented_at'] > since]
+                comments.extend(newer)
+                if page and not newer:
+                    result.reached_mark = True
+                    break
+            else:
+                comments.extend(page)
+            if not data.get('has_more') or not raw:
+                break
+            cursor = data.get('cursor') or cursor + len(raw)
+        else:
+            result.truncated = True
+        return comments
+
+    async def _fetch_replies(self, video_id: str, parent: dict, result: PostComments) -> List[dict]:
+        replies = await self._paginate(REPLY_LIST_URL, {
+            'item_id': video_id, 'comment_id': parent['comment_id'], 'aid': WEB_APP_ID
+        }, result)
+        for reply in replies:
+            reply['parent_comment_id'] = reply['parent_comment_id'] or parent['comment_id']
+        return replies
+
+    async def fetch_post(self, video_id: str, since: Optional[datetime] = None) -> PostComments:
+        """
+        Top-level comments (newer than `since` if given) plus their reply threads
+
+        Replies are fetched for the top-level comments collected in this run; on an
+        incremental run, new replies under older comments wait for a --full pass.
+        Comments collected before an error are kept on the result.
+        """
+        start = time.perf_counter()
+        result = PostComments(video_id)
+        try:
+            await self._paginate(
+                COMMENT_LIST_URL, {'aweme_id': video_id, 'aid': WEB_APP_ID}, result, since, result.comments
+            )
+            if self.include_replies:
+                threads = [comment for comment in result.comments if comment['reply_count'] > 0]
+                for replies in await asyncio.gather(
+                    *(self._fetch_replies(video_id, comment, result) for comment in threads)
+                ):
+                    result.comments.extend(replies)
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.duration = time.perf_counter() - start
+        return result
+
+
+class CommentPipeline:
+    """Posts in the database -> comment API -> comments table"""
+
+    def __init__(self, db_session, fetcher: CommentApiFetcher,
+                 short_links: Optional[ShortLinkCache] = None):
+        self.db = db_session
+        self.store = CommentStore(db_session)
+        self.fetcher = fetcher
+        self.short_links = short_links
+
+    async def video_ids(self, posts: List[Post]) -> Dict[int, str]:
+        """post_id -> video id (short links resolved through the short-link cache)"""
+        urls = {post.id: post.post_url for post in posts}
+        if self.short_links is not None:
+            canonical = await resolve_short_links(urls.values(), self.short_links)
+            urls = {post_id: canonical[url] for post_id, url in urls.items()}
+        video_ids = {}
+        for post_id, url in urls.items():
+            parsed = parse_canonical(url)
+            if parsed:
+                video_ids[post_id] = parsed[2]
+        return video_ids
+
+    async def run(self, posts: Optional[List[Post]] = None, full: bool = False) -> dict:
+        """Fetch and store comments; each post is upserted as soon as its pages are in"""
+        start = time.perf_counter()
+        if posts is None:
+            posts = self.db.query(Post).filter(Post.scraping_status == 'active').all()
+
+        video_ids = await self.video_ids(posts)
+        marks = {} if full else self.store.high_water_marks(video_ids)
+
+        summary = {'posts': len(posts), 'unresolved': len(posts) - len(video_ids),
+                   'pages': 0, 'new': 0, 'updated': 0, 'incremental': 0, 'errors': 0}
+
+        async def fetch(post_id, video_id):
+            return post_id, await self.fetcher.fetch_post(video_id, marks.get(post_id))
+
+        tasks = [fetch(post_id, video_id) for post_id, video_id in video_ids.items()]
+        for next_done in asyncio.as_completed(tasks):
+            post_id, result = await next_done
+            written = self.store.upsert(post_id, result.comments)
+            if result.complete:
+                self.store.mark_complete(post_id, result.comments)
+            summary['pages'] += result.pages
+            summary['new'] += written['new']
+            summary['updated'] += written['updated']
+            summary['incremental'] += int(result.reached_mark)
+            if result.error:
+                summary['errors'] += 1
+                logger.warning(f"⚠️ Comments for video {result.video_id}: {result.error}")
+            elif result.truncated:
+                logger.warning(f"⚠️ Comments for video {result.video_id}: stopped at max_pages, "
+                               f"high-water mark not advanced")
+
+        summary['duration'] = time.perf_counter() - start
+        return summary
+
+
+def print_stats(store: CommentStore, limit: int = 20):
+    stats = store.comment_stats()
+    print(f"💬 Comments stored for {len(stats)} posts (fastest first)")
+    for item in stats[:limit]:
+        print(f"   {item['post_url']}: {item['stored_comments']:,} stored / "
+              f"{item['reported_comments']:,} reported, {item['velocity_per_hour']:.2f}/h last 24h")
+
+
+async def main():
+    from database.config import db_config
+
+    parser = argparse.ArgumentParser(description='Ingest TikTok comments into the comments table')
+    parser.add_argument('--limit', type=int, help='Only the first N active posts')
+    parser.add_argument('--concurrency', type=int, default=16, help='Parallel API requests')
+    parser.add_argument('--cookies', default='tiktok_cookies.json', help='Playwright cookie file')
+    parser.add_argument('--short-link-db', default=DEFAULT_DB_PATH, help='Short-link cache database')
+    parser.add_argument('--max-pages', type=int, default=200, help='Page cap per post / thread')
+    parser.add_argument('--no-replies', action='store_true', help='Skip reply threads')
+    parser.add_argument('--full', action='store_true', help='Ignore high-water marks, re-page everything')
+    parser.add_argument('--stats', action='store_true', help='Only print comment counts / velocity')
+    args = parser.parse_args()
+
+    session = db_config.get_session()
+    if args.stats:
+        print_stats(CommentStore(session))
+        session.close()
+        return
+
+    query = session.query(Post).filter(Post.scraping_status == 'active').order_by(Post.id)
+    posts = query.limit(args.limit).all() if args.limit else query.all()
+
+    short_links = ShortLinkCache(args.short_link_db)
+    async with CommentApiFetcher(args.concurrency, load_cookies(args.cookies), max_pages=args.max_pages,
+                                 include_replies=not args.no_replies) as fetcher:
+        summary = await CommentPipeline(session, fetcher, short_links).run(posts, full=args.full)
+    short_links.close()
+
+    print(f"💬 {summary['new']:,} new / {summary['updated']:,} updated comments from "
+          f"{summary['posts'] - summary['unresolved']} posts ({summary['pages']:,} pages) "
+          f"in {summary['duration']:.1f}s")
+    print(f"   {summary['incremental']} posts stopped at their high-water mark, "
+          f"{summary['unresolved']} without a video id, {summary['errors']} with errors")
+    print_stats(CommentStore(session), limit=10)
+    session.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
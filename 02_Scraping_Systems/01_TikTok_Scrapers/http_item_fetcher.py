@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+HTTP-only Item Detail Fetcher
+
+Post data straight from the video page HTML: TikTok server-renders the full itemStruct
+into the __UNIVERSAL_DATA_FOR_REHYDRATION__ script tag, so a plain GET is enough when
+the page isn't a login wall / captcha. No browser, no page rendering.
+
+- HttpItemFetcher: one pooled aiohttp session (keep-alive TCPConnector, DNS cache),
+  dozens of concurrent fetches, optional cookies (Playwright cookie file format)
+- parse_item_detail(): rehydration JSON -> production row fields (item_fields)
+- fetch_many() marks the URLs whose page had no item JSON; only those need the
+  Playwright scraper (ProductionTikTokScraper.scrape_batch does this automatically)
+
+Usage:
+  python http_item_fetcher.py urls_to_scrape_237.txt
+  python http_item_fetcher.py urls_to_scrape_237.txt --concurrency 48 --cookies tiktok_cookies.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from short_link_cache import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+REHYDRATION_MARKER = 'id="__UNIVERSAL_DATA_FOR_REHYDRATION__"'
+ITEM_SCOPES = ('webapp.video-detail', 'webapp.reflow.video.detail')
+
+HTML_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://www.tiktok.com/',
+}
+
+
+# ============= PARSING =============
+
+def extract_rehydration_json(html: str) -> Optional[dict]:
+    """The __UNIVERSAL_DATA_FOR_REHYDRATION__ payload (None if missing or broken)"""
+    marker = html.find(REHYDRATION_MARKER)
+    if marker < 0:
+        return None
+    start = html.find('>', marker) + 1
+    end = html.find('</script>', start)
+    if start <= 0 or end < 0:
+        return None
+    try:
+        return json.loads(html[start:end])
+    except ValueError:
+        return None
+
+
+def item_fields(item: dict) -> dict:
+    """itemStruct -> production row fields (metrics, account, content, sound, slides)"""
+    stats = item.get('stats') or {}
+    author = item.get('author') or {}
+    author_stats = item.get('authorStats') or author.get('stats') or {}
+    music = item.get('music') or {}
+    desc = item.get('desc') or ''
+
+    slides = []
+    for image in (item.get('imagePost') or {}).get('images') or []:
+        url_list = (image.get('imageURL') or {}).get('urlList')
+        if url_list:
+            slides.append(url_list[0])
+
+    fields = {
+        # Metrics
+        'views': stats.get('playCount', 0),
+        'likes': stats.get('diggCount', 0),
+        'comments': stats.get('commentCount', 0),
+        'shares': stats.get('shareCount', 0),
+        'bookmarks': stats.get('collectCount', 0),
+
+        # Account info
+        'account_username': author.get('uniqueId', 'Unknown'),
+        'account_followers': author_stats.get('followerCount', 0),
+        'account_following': author_stats.get('followingCount', 0),
+        'account_posts': author_stats.get('videoCount', 0),
+        'account_likes': author_stats.get('heartCount', 0),
+        'account_verified': author.get('verified', False),
+
+        # Content details
+        'post_description': desc,
+        'hashtags': ', '.join(re.findall(r'#(\w+)', desc)),
+        'mentions': ', '.join(re.findall(r'@(\w+)', desc)),
+        'content_length': len(desc),
+
+        # Sound/Music
+        'sound_title': music.get('title', ''),
+        'sound_url': music.get('playUrl', ''),
+        'sound_author': music.get('authorName', ''),
+        'has_sound': bool(music.get('id')),
+
+        # Slides
+        'slide_count': len(slides),
+        **{f'slide_{i+1}': url for i, url in enumerate(slides[:12])}
+    }
+
+    engagement = fields['likes'] + fields['comments'] + fields['shares'] + fields['bookmarks']
+    fields['engagement'] = engagement
+    if fields['views'] > 0:
+        fields['engagement_rate'] = round((engagement / fields['views']) * 100, 2)
+    return fields
+
+
+def parse_item_detail(html: str) -> Optional[dict]:
+    """Row fields from a video page, None if the page carries no itemStruct"""
+    data = extract_rehydration_json(html)
+    scope = (data or {}).get('__DEFAULT_SCOPE__', {})
+    for name in ITEM_SCOPES:
+        item = ((scope.get(name) or {}).get('itemInfo') or {}).get('itemStruct')
+        if item:
+            return item_fields(item)
+    return None
+
+
+def load_cookies(cookie_file) -> Dict[str, str]:
+    """Playwright cookie list (tiktok_cookies.json) -> {name: value}"""
+    path = Path(cookie_file)
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        cookies = json.load(f)
+    if isinstance(cookies, dict):
+        return cookies
+    return {cookie['name']: cookie['value'] for cookie in cookies if 'name' in cookie}
+
+
+# ============= FETCHING =============
+
+@dataclass
+class ItemFetch:
+    """Outcome of one HTTP fetch"""
+    url: str
+    fields: Optional[dict] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.fields is not None
+
+
+class HttpItemFetcher:
+    """Concurrent item page fetches over one keep-alive connection pool"""
+
+    def __init__(self, concurrency: int = 32, cookies: Optional[Dict[str, str]] = None,
+                 timeout: float = 15.0):
+        self.concurrency = concurrency
+        self.cookies = cookies or {}
+        self.timeout = timeout
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        # Only fetching needs aiohttp; parse_item_detail works without it
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=HTML_HEADERS,
+            cookies=self.cookies
+        )
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, url: str) -> ItemFetch:
+        """GET the page (short links follow their redirect) and parse the item JSON"""
+        start = time.perf_counter()
+        async with self.semaphore:
+            try:
+                async with self.session.get(url) as response:
+                    status = response.status
+                    html = await response.text()
+            except Exception as e:
+                return ItemFetch(url, error=str(e) or type(e).__name__,
+                                 duration=time.perf_counter() - start)
+
+        fields = parse_item_detail(html) if status == 200 else None
+        error = None if fields else (f"HTTP {status}" if status != 200 else "No item JSON in page")
+        return ItemFetch(url, fields, status, error, time.perf_counter() - start)
+
+    async def fetch_many(self, urls: List[str]) -> List[ItemFetch]:
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Fetch TikTok post metrics over plain HTTP')
+    parser.add_argument('urls_file', help='Text file with one URL per line')
+    parser.add_argument('--concurrency', type=int, default=32, help='Parallel requests')
+    parser.add_argument('--cookies', default='tiktok_cookies.json', help='Playwright cookie file')
+    parser.add_argument('--output', help='Write fetched rows to this JSON file')
+    args = parser.parse_args()
+
+    with open(args.urls_file, 'r') as f:
+        urls = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+    start = time.perf_counter()
+    async with HttpItemFetcher(args.concurrency, load_cookies(args.cookies)) as fetcher:
+        fetches = await fetcher.fetch_many(urls)
+    elapsed = time.perf_counter() - start
+
+    hits = [fetch for fetch in fetches if fetch.success]
+    misses = [fetch for fetch in fetches if not fetch.success]
+    print(f"⚡ {len(hits)}/{len(urls)} posts over HTTP in {elapsed:.1f}s "
+          f"({len(urls) / elapsed if elapsed else 0:.1f} URLs/s)")
+    if misses:
+        print(f"🌐 {len(misses)} need the browser fallback:")
+        for fetch in misses[:10]:
+            print(f"   {fetch.url} ({fetch.error})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({fetch.url: fetch.fields for fetch in hits}, f, indent=2)
+        print(f"💾 Rows written to {args.output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
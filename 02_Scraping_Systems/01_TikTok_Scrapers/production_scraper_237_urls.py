@@ -10,7 +10,9 @@ from datetime import datetime
 from playwright.async_api import async_playwright
 from pathlib import Path
 import logging
-import re
+
+from http_item_fetcher import HttpItemFetcher, item_fields, load_cookies
+from short_link_cache import ShortLinkCache, dedupe_urls, resolve_short_links
 
 # Setup logging
 logging.basicConfig(
@@ -23,13 +25,18 @@ logger = logging.getLogger(__name__)
 class ProductionTikTokScraper:
     """Enhanced scraper matching target CSV structure"""
 
-    def __init__(self, cookie_file="tiktok_cookies.json", headless=True):
+    def __init__(self, cookie_file="tiktok_cookies.json", headless=True, short_link_db="short_links.db",
+                 http_fast_path=True, http_concurrency=32):
         self.cookie_file = Path(cookie_file)
         self.headless = headless
+        # Plain HTTP first, browser only for pages without item JSON
+        self.http_fast_path = http_fast_path
+        self.http_concurrency = http_concurrency
         self.browser = None
         self.context = None
         self.playwright = None
         self.api_responses = []
+        self.link_cache = ShortLinkCache(short_link_db) if short_link_db else None
 
     async def __aenter__(self):
         """Initialize browser with cookies"""
@@ -67,9 +74,16 @@ class ProductionTikTokScraper:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        if self.link_cache:
+            self.link_cache.close()
+
+    async def scrape_video(self, url: str, index: int, total: int, target_url: str = None) -> dict:
+        """
+        Scrape single video with full data extraction
 
-    async def scrape_video(self, url: str, index: int, total: int) -> dict:
-        """Scrape single video with full data extraction"""
+        target_url: resolved canonical URL to load instead of url (skips the /t/ redirect);
+        the row keeps the original url as post_url
+        """
         page = await self.context.new_page()
         self.api_responses = []
 
@@ -92,7 +106,7 @@ class ProductionTikTokScraper:
             logger.info(f"[{index}/{total}] Scraping: {url}")
 
             # Navigate
-            await page.goto(url, wait_until='networkidle', timeout=30000)
+            await page.goto(target_url or url, wait_until='networkidle', timeout=30000)
             await page.wait_for_timeout(5000)
 
             # Extract comprehensive metrics
@@ -142,58 +156,7 @@ class ProductionTikTokScraper:
                 data = response['data']
 
                 if 'itemInfo' in data and 'itemStruct' in data['itemInfo']:
-                    item = data['itemInfo']['itemStruct']
-                    stats = item.get('stats', {})
-                    author = item.get('author', {})
-                    music = item.get('music', {})
-                    desc_obj = item.get('desc', '')
-
-                    # Extract hashtags from description
-                    hashtags = self._extract_hashtags(desc_obj)
-
-                    # Extract slides
-                    slides = self._extract_slide_urls(item)
-
-                    result = {
-                        # Metrics
-                        'views': stats.get('playCount', 0),
-                        'likes': stats.get('diggCount', 0),
-                        'comments': stats.get('commentCount', 0),
-                        'shares': stats.get('shareCount', 0),
-                        'bookmarks': stats.get('collectCount', 0),
-
-                        # Account info
-                        'account_username': author.get('uniqueId', 'Unknown'),
-                        'account_followers': author.get('stats', {}).get('followerCount', 0),
-                        'account_following': author.get('stats', {}).get('followingCount', 0),
-                        'account_posts': author.get('stats', {}).get('videoCount', 0),
-                        'account_likes': author.get('stats', {}).get('heartCount', 0),
-                        'account_verified': author.get('verified', False),
-
-                        # Content details
-                        'post_description': desc_obj,
-                        'hashtags': hashtags,
-                        'mentions': self._extract_mentions(desc_obj),
-                        'content_length': len(desc_obj) if desc_obj else 0,
-
-                        # Sound/Music
-                        'sound_title': music.get('title', ''),
-                        'sound_url': music.get('playUrl', ''),
-                        'sound_author': music.get('authorName', ''),
-                        'has_sound': bool(music.get('id')),
-
-                        # Slides
-                        'slide_count': len(slides),
-                        **{f'slide_{i+1}': url for i, url in enumerate(slides[:12])}
-                    }
-
-                    # Calculate engagement
-                    total_eng = result['likes'] + result['comments'] + result['shares'] + result['bookmarks']
-                    result['engagement'] = total_eng
-                    if result['views'] > 0:
-                        result['engagement_rate'] = round((total_eng / result['views']) * 100, 2)
-
-                    return result
+                    return item_fields(data['itemInfo']['itemStruct'])
 
             except Exception as e:
                 logger.debug(f"API parse error: {e}")
@@ -201,34 +164,6 @@ class ProductionTikTokScraper:
 
         return None
 
-    def _extract_hashtags(self, text: str) -> str:
-        """Extract hashtags from description"""
-        if not text:
-            return ''
-        hashtags = re.findall(r'#(\w+)', text)
-        return ', '.join(hashtags) if hashtags else ''
-
-    def _extract_mentions(self, text: str) -> str:
-        """Extract @mentions from description"""
-        if not text:
-            return ''
-        mentions = re.findall(r'@(\w+)', text)
-        return ', '.join(mentions) if mentions else ''
-
-    def _extract_slide_urls(self, item: dict) -> list:
-        """Extract slide image URLs"""
-        slides = []
-
-        # Check imagePost structure
-        if 'imagePost' in item and 'images' in item['imagePost']:
-            for img in item['imagePost']['images']:
-                # Get highest quality URL
-                if 'imageURL' in img:
-                    if 'urlList' in img['imageURL'] and img['imageURL']['urlList']:
-                        slides.append(img['imageURL']['urlList'][0])
-
-        return slides
-
     async def _extract_from_javascript(self, page) -> dict:
         """Fallback JavaScript extraction"""
         try:
@@ -312,9 +247,41 @@ class ProductionTikTokScraper:
 
         return row
 
+    async def fetch_over_http(self, urls: list, targets: dict) -> dict:
+        """url -> complete row for every URL whose page carried the item JSON"""
+        async with HttpItemFetcher(self.http_concurrency, load_cookies(self.cookie_file)) as fetcher:
+            fetches = await fetcher.fetch_many([targets.get(url) or url for url in urls])
+
+        rows = {}
+        for url, fetch in zip(urls, fetches):
+            if fetch.success:
+                row = self._empty_row(url)
+                row.update(fetch.fields)
+                row['scraping_method'] = 'http_rehydration'
+                row['scraping_success'] = True
+                row['data_quality'] = 'Complete'
+                rows[url] = row
+        return rows
+
     async def scrape_batch(self, urls: list, batch_size: int = 10, delay: int = 2) -> pd.DataFrame:
         """Scrape URLs in batches with progress tracking"""
         all_results = []
+
+        # Short links -> canonical URLs (HTTP redirects, cached), then dedup by video id
+        targets = {}
+        if self.link_cache:
+            targets = await resolve_short_links(urls, self.link_cache)
+            urls = dedupe_urls(urls, self.link_cache)
+
+        # HTTP fast path; only the misses go through the browser below
+        http_rows = {}
+        if self.http_fast_path and urls:
+            http_rows = await self.fetch_over_http(urls, targets)
+            logger.info(f"⚡ HTTP fast path: {len(http_rows)}/{len(urls)} posts, "
+                        f"{len(urls) - len(http_rows)} left for the browser")
+            all_results.extend(http_rows.values())
+            urls = [url for url in urls if url not in http_rows]
+
         total = len(urls)
 
         for i in range(0, total, batch_size):
@@ -328,7 +295,7 @@ class ProductionTikTokScraper:
 
             for j, url in enumerate(batch):
                 global_index = i + j + 1
-                result = await self.scrape_video(url, global_index, total)
+                result = await self.scrape_video(url, global_index, total, target_url=targets.get(url))
                 all_results.append(result)
 
                 # Delay between videos
@@ -337,7 +304,7 @@ class ProductionTikTokScraper:
 
             # Progress summary
             successful = sum(1 for r in all_results if r['views'] > 0)
-            logger.info(f"\n📊 Progress: {len(all_results)}/{total} completed, {successful} successful ({successful/len(all_results)*100:.1f}%)")
+            logger.info(f"\n📊 Progress: {len(all_results)}/{total + len(http_rows)} completed, {successful} successful ({successful/len(all_results)*100:.1f}%)")
 
         return pd.DataFrame(all_results)
 
@@ -13,6 +13,7 @@ Features:
 import asyncio
 import logging
 import re
+import sys
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
@@ -22,9 +23,14 @@ from pathlib import Path
 import aiohttp
 import pandas as pd
 from playwright.async_api import async_playwright, Browser, Page
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float
+from sqlalchemy import Column, Integer, String, DateTime, Float
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "scripts"))
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from metric_parser import parse_count
+from database.async_sink import AsyncWriteSink
+from database.engine_registry import get_engine, get_sessionmaker
 
 # Configure logging
 logging.basicConfig(
@@ -107,12 +113,17 @@ class ProductionTikTokScraper:
         self.config = config
         self.browser: Optional[Browser] = None
         self.playwright = None
-        self.engine = create_engine(config.database_url)
-        self.Session = sessionmaker(bind=self.engine)
+        # Shared per-process engine: every scraper instance and saved result reuses its pool
+        self.engine = get_engine(config.database_url)
+        self.Session = get_sessionmaker(config.database_url)
         
         # Create tables
         Base.metadata.create_all(self.engine)
         
+        # Snapshots are written in batches on the sink's thread, off the event loop
+        self.sink = AsyncWriteSink(self._write_snapshots, maxsize=500, batch_size=50,
+                                   flush_interval=1.0, name="snapshot-writer")
+        
         # Rate limiting
         self.last_request_time = 0.0
         
@@ -138,6 +149,7 @@ class ProductionTikTokScraper:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
+        await self.sink.close()
         try:
             if self.browser:
                 await self.browser.close()
@@ -299,24 +311,7 @@ class ProductionTikTokScraper:
         """
         Parse metric text (e.g., "10.5K", "1.2M") into integer
         """
-        if not text:
-            return 0
-        
-        text = text.replace(',', '').strip().lower()
-        
-        # Handle K, M, B suffixes
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        elif 'b' in text:
-            return int(float(text.replace('b', '')) * 1000000000)
-        else:
-            # Extract digits
-            digits = re.findall(r'\d+', text)
-            if digits:
-                return int("".join(digits))
-            return 0
+        return parse_count(text)
     
     async def scrape_accounts(self, usernames: List[str]) -> List[ScrapingResult]:
         """
@@ -353,26 +348,30 @@ class ProductionTikTokScraper:
                 )
                 results.append(error_result)
         
+        # Everything scraped is in the database once this returns
+        await self.sink.flush()
         logger.info(f"Completed scraping {len(usernames)} accounts")
         return results
     
     async def _save_result_to_db(self, result: ScrapingResult):
-        """Save scraping result to database"""
-        try:
-            session = self.Session()
-            snapshot = AccountSnapshot(
-                username=result.username,
-                followers=result.followers,
-                scraped_at=result.scraped_at,
-                status=result.status,
-                error_message=result.error_message
-            )
-            session.add(snapshot)
+        """Queue scraping result for the database writer (waits only when the queue is full)"""
+        await self.sink.put(result)
+    
+    def _write_snapshots(self, results: List[ScrapingResult]):
+        """Write a batch of results in one transaction (runs on the sink's writer thread)"""
+        with self.Session() as session:
+            session.add_all([
+                AccountSnapshot(
+                    username=result.username,
+                    followers=result.followers,
+                    scraped_at=result.scraped_at,
+                    status=result.status,
+                    error_message=result.error_message
+                )
+                for result in results
+            ])
             session.commit()
-            session.close()
-            logger.debug(f"Saved result for @{result.username} to database")
-        except Exception as e:
-            logger.error(f"Failed to save result for @{result.username} to database: {e}")
+        logger.debug(f"Saved {len(results)} results to database")
     
     def get_scraping_history(self, username: Optional[str] = None) -> pd.DataFrame:
         """Get scraping history from database"""
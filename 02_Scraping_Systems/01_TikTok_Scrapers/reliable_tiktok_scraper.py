@@ -16,6 +16,12 @@ from datetime import datetime
 from playwright.async_api import async_playwright
 from pathlib import Path
 import logging
+import sys
+
+from short_link_cache import ShortLinkCache, dedupe_urls, resolve_short_links
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "scripts"))
+from metric_parser import parse_count
 
 # Setup logging
 logging.basicConfig(
@@ -30,13 +36,14 @@ class ReliableTikTokScraper:
     Production TikTok scraper with cookie authentication and network interception
     """
 
-    def __init__(self, cookie_file="tiktok_cookies.json", headless=True):
+    def __init__(self, cookie_file="tiktok_cookies.json", headless=True, short_link_db="short_links.db"):
         self.cookie_file = Path(cookie_file)
         self.headless = headless
         self.browser = None
         self.context = None
         self.playwright = None
         self.api_responses = []
+        self.link_cache = ShortLinkCache(short_link_db) if short_link_db else None
 
     async def __aenter__(self):
         """Initialize browser with cookies"""
@@ -78,10 +85,14 @@ class ReliableTikTokScraper:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        if self.link_cache:
+            self.link_cache.close()
 
-    async def scrape_video(self, url: str) -> dict:
+    async def scrape_video(self, url: str, target_url: str = None) -> dict:
         """
         Scrape a single TikTok video with network interception
+
+        target_url: resolved canonical URL to load instead of url (skips the /t/ redirect)
         """
         page = await self.context.new_page()
         self.api_responses = []
@@ -107,7 +118,7 @@ class ReliableTikTokScraper:
             logger.info(f"🎯 Scraping: {url}")
 
             # Navigate to video
-            await page.goto(url, wait_until='networkidle', timeout=30000)
+            await page.goto(target_url or url, wait_until='networkidle', timeout=30000)
 
             # Wait for React app to load
             await page.wait_for_timeout(5000)
@@ -299,22 +310,7 @@ class ReliableTikTokScraper:
 
     def _parse_count(self, text: str) -> int:
         """Parse count strings like '10.5K' into integers"""
-        if not text:
-            return 0
-
-        text = text.strip().upper().replace(',', '')
-
-        try:
-            if 'K' in text:
-                return int(float(text.replace('K', '')) * 1000)
-            elif 'M' in text:
-                return int(float(text.replace('M', '')) * 1000000)
-            elif 'B' in text:
-                return int(float(text.replace('B', '')) * 1000000000)
-            else:
-                return int(text)
-        except:
-            return 0
+        return parse_count(text)
 
     def _empty_metrics(self, url: str, error: str = None) -> dict:
         """Return empty metrics structure"""
@@ -336,9 +332,15 @@ class ReliableTikTokScraper:
         """Scrape multiple videos with delay between requests"""
         results = []
 
+        # Short links -> canonical URLs (HTTP redirects, cached), then dedup by video id
+        targets = {}
+        if self.link_cache:
+            targets = await resolve_short_links(urls, self.link_cache)
+            urls = dedupe_urls(urls, self.link_cache)
+
         for i, url in enumerate(urls, 1):
             logger.info(f"📹 Scraping video {i}/{len(urls)}")
-            metrics = await self.scrape_video(url)
+            metrics = await self.scrape_video(url, target_url=targets.get(url))
             results.append(metrics)
 
             # Add delay between requests (except last one)
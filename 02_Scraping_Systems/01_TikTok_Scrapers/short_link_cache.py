@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Short-Link Resolution Cache
+
+Persistent short_code <-> (username, video_id) mapping for tiktok.com/t/<code>,
+vm.tiktok.com/<code> and vt.tiktok.com/<code> links.
+
+- ShortLinkCache: SQLite table short_links (one row per short code, indexed by video_id)
+- ShortLinkResolver: HTTP-only redirect resolver (HEAD, then GET, redirects disabled)
+  over one pooled aiohttp session; no browser involved
+- resolve_short_links(): cache first, resolve only the misses concurrently, store them
+
+Scrapers call resolve_short_links() before loading pages so they navigate straight to
+the canonical @user/video/<id> URL, and dedupe_urls() to dedup by video_id across forms.
+
+Usage:
+  python short_link_cache.py urls_to_scrape_237.txt
+  python short_link_cache.py urls_to_scrape_237.txt --concurrency 32 --db short_links.db
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "./short_links.db"
+
+SHORT_LINK_PATTERN = re.compile(
+    r'(?:(?:www\.|m\.)?tiktok\.com/t|(?:vm|vt)\.tiktok\.com)/([A-Za-z0-9]+)'
+)
+CANONICAL_PATTERN = re.compile(r'tiktok\.com/@([^/?#]+)/(video|photo)/(\d+)')
+
+USER_AGENT = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+
+def parse_short_code(url: str) -> Optional[str]:
+    """'https://www.tiktok.com/t/ZTMuUscW9/' -> 'ZTMuUscW9' (None for other URLs)"""
+    match = SHORT_LINK_PATTERN.search(url or '')
+    return match.group(1) if match else None
+
+
+def parse_canonical(url: str) -> Optional[tuple]:
+    """'.../@user/video/123?x=1' -> ('user', 'video', '123') (None for other URLs)"""
+    match = CANONICAL_PATTERN.search(url or '')
+    return match.groups() if match else None
+
+
+def canonical_url(username: str, video_id: str, post_type: str = 'video') -> str:
+    return f"https://www.tiktok.com/@{username}/{post_type}/{video_id}"
+
+
+def short_url(short_code: str) -> str:
+    return f"https://www.tiktok.com/t/{short_code}/"
+
+
+@dataclass
+class ShortLink:
+    """One resolved short link"""
+    short_code: str
+    username: str
+    video_id: str
+    post_type: str = 'video'
+
+    @property
+    def canonical_url(self) -> str:
+        return canonical_url(self.username, self.video_id, self.post_type)
+
+
+class ShortLinkCache:
+    """SQLite-backed short_code <-> (username, video_id) mapping"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self._create_table()
+
+    def _create_table(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS short_links (
+            short_code TEXT PRIMARY KEY,
+            username TEXT,
+            video_id TEXT,
+            post_type VARCHAR(10) DEFAULT 'video',
+            status VARCHAR(20) NOT NULL DEFAULT 'resolved',
+            error TEXT,
+            resolved_at TIMESTAMP
+        )
+        """)
+        # Reverse lookups: canonical URL -> short link
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_short_links_video ON short_links(video_id)")
+        self.conn.commit()
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def get_many(self, short_codes: Iterable[str]) -> Dict[str, ShortLink]:
+        """Resolved entries for the given codes (misses and failures are left out)"""
+        codes = list(dict.fromkeys(short_codes))
+        found = {}
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(codes), 500):
+            chunk = codes[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT short_code, username, video_id, post_type FROM short_links "
+                f"WHERE status = 'resolved' AND short_code IN ({placeholders})",
+                chunk
+            )
+            for row in rows:
+                found[row[0]] = ShortLink(*row)
+        return found
+
+    def get(self, short_code: str) -> Optional[ShortLink]:
+        return self.get_many([short_code]).get(short_code)
+
+    def short_code_for(self, video_id: str) -> Optional[str]:
+        """Reverse lookup: first short code known for a video id"""
+        row = self.conn.execute(
+            "SELECT short_code FROM short_links WHERE video_id = ? AND status = 'resolved' "
+            "ORDER BY resolved_at LIMIT 1",
+            (str(video_id),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def store(self, links: Iterable[ShortLink]):
+        now = datetime.now().isoformat()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO short_links "
+            "(short_code, username, video_id, post_type, status, error, resolved_at) "
+            "VALUES (?, ?, ?, ?, 'resolved', NULL, ?)",
+            [(link.short_code, link.username, link.video_id, link.post_type, now) for link in links]
+        )
+        self.conn.commit()
+
+    def store_failures(self, failures: Dict[str, str]):
+        """Remember codes that did not resolve (retried on the next run, never served)"""
+        now = datetime.now().isoformat()
+        self.conn.executemany(
+            "INSERT INTO short_links (short_code, status, error, resolved_at) VALUES (?, 'failed', ?, ?) "
+            "ON CONFLICT(short_code) DO UPDATE SET error = excluded.error, resolved_at = excluded.resolved_at "
+            "WHERE status = 'failed'",
+            [(code, error, now) for code, error in failures.items()]
+        )
+        self.conn.commit()
+
+    def canonicalize(self, url: str) -> str:
+        """Canonical URL for a cached short link, else the URL unchanged"""
+        code = parse_short_code(url)
+        link = self.get(code) if code else None
+        return link.canonical_url if link else url
+
+    def video_id_for(self, url: str) -> Optional[str]:
+        """Video id for either URL form (short links only if cached)"""
+        canonical = parse_canonical(url)
+        if canonical:
+            return canonical[2]
+        code = parse_short_code(url)
+        link = self.get(code) if code else None
+        return link.video_id if link else None
+
+    def stats(self) -> Dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM short_links GROUP BY status")
+        return dict(rows.fetchall())
+
+
+class ShortLinkResolver:
+    """
+    Resolve short links by reading the redirect Location header
+
+    HEAD first (no body), GET if HEAD isn't answered with a redirect; redirects are
+    never followed automatically, so each hop is one small request on a pooled connection.
+    """
+
+    def __init__(self, concurrency: int = 20, timeout: float = 10.0, max_hops: int = 3):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_hops = max_hops
+        self.session = None
+
+    async def __aenter__(self):
+        # Only resolving needs aiohttp; cache lookups work without it
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': USER_AGENT}
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+
+    async def _location(self, url: str) -> Optional[str]:
+        for method in ('HEAD', 'GET'):
+            async with self.session.request(method, url, allow_redirects=False) as response:
+                location = response.headers.get('Location')
+                if 300 <= response.status < 400 and location:
+                    return urljoin(url, location)
+        return None
+
+    async def resolve(self, short_code: str, url: str) -> ShortLink:
+        """Follow redirects until a canonical @user/video/<id> URL shows up"""
+        current = url
+        for _ in range(self.max_hops):
+            current = await self._location(current)
+            if not current:
+                break
+            canonical = parse_canonical(current)
+            if canonical:
+                username, post_type, video_id = canonical
+                return ShortLink(short_code, username, video_id, post_type)
+        raise ValueError(f"no canonical redirect (last: {current})")
+
+    async def resolve_many(self, codes_to_urls: Dict[str, str]):
+        """Resolve concurrently -> (resolved links, {code: error})"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def resolve_one(code, url):
+            async with semaphore:
+                try:
+                    return await self.resolve(code, url)
+                except Exception as e:
+                    return e
+
+        codes = list(codes_to_urls)
+        outcomes = await asyncio.gather(*(resolve_one(code, codes_to_urls[code]) for code in codes))
+
+        resolved, failures = [], {}
+        for code, outcome in zip(codes, outcomes):
+            if isinstance(outcome, ShortLink):
+                resolved.append(outcome)
+            else:
+                failures[code] = str(outcome) or type(outcome).__name__
+        return resolved, failures
+
+
+async def resolve_short_links(urls: Iterable[str], cache: ShortLinkCache,
+                              concurrency: int = 20) -> Dict[str, str]:
+    """
+    url -> canonical URL for every input URL
+
+    Cached codes are served from SQLite; only misses hit the network.
+    Canonical inputs pass through; unresolvable short links map to themselves.
+    """
+    urls = list(dict.fromkeys(urls))
+    codes_to_urls = {}
+    for url in urls:
+        code = parse_short_code(url)
+        if code:
+            codes_to_urls.setdefault(code, url)
+
+    cached = cache.get_many(codes_to_urls)
+    misses = {code: url for code, url in codes_to_urls.items() if code not in cached}
+
+    if misses:
+        logger.info(f"🔗 Resolving {len(misses)} short links ({len(cached)} cached)")
+        async with ShortLinkResolver(concurrency=concurrency) as resolver:
+            resolved, failures = await resolver.resolve_many(misses)
+        cache.store(resolved)
+        cache.store_failures(failures)
+        cached.update({link.short_code: link for link in resolved})
+        if failures:
+            logger.warning(f"⚠️ {len(failures)} short links did not resolve")
+
+    mapping = {}
+    for url in urls:
+        code = parse_short_code(url)
+        link = cached.get(code) if code else None
+        mapping[url] = link.canonical_url if link else url
+    return mapping
+
+
+def dedupe_urls(urls: Iterable[str], cache: ShortLinkCache) -> List[str]:
+    """Drop URLs that point at an already-seen video id (short and canonical forms alike)"""
+    urls = list(urls)
+    cached = cache.get_many(code for code in map(parse_short_code, urls) if code)
+
+    seen, unique = set(), []
+    for url in urls:
+        canonical = parse_canonical(url)
+        link = cached.get(parse_short_code(url))
+        key = canonical[2] if canonical else (link.video_id if link else url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Resolve TikTok short links into the local cache')
+    parser.add_argument('urls_file', help='Text file with one URL per line')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='SQLite cache path')
+    parser.add_argument('--concurrency', type=int, default=20, help='Parallel HTTP requests')
+    args = parser.parse_args()
+
+    with open(args.urls_file, 'r') as f:
+        urls = [line.strip() for line in f if line.strip()]
+
+    cache = ShortLinkCache(args.db)
+    start = time.perf_counter()
+    mapping = await resolve_short_links(urls, cache, concurrency=args.concurrency)
+    elapsed = time.perf_counter() - start
+
+    resolved = sum(1 for url, canonical in mapping.items() if url != canonical or parse_canonical(url))
+    unique = dedupe_urls(urls, cache)
+    print(f"🔗 {len(mapping)} unique URLs, {resolved} canonical in {elapsed:.1f}s")
+    print(f"📋 {len(unique)} unique videos after video_id dedup")
+    print(f"💾 Cache {args.db}: {cache.stats()}")
+    cache.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
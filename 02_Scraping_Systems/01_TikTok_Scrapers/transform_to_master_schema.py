@@ -12,6 +12,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from short_link_cache import ShortLinkCache, parse_canonical, short_url
+
 
 class SchemaTransformer:
     """Transform scraper output to master database schema"""
@@ -29,7 +31,8 @@ class SchemaTransformer:
         'slide_10', 'slide_11', 'slide_12'
     ]
 
-    def __init__(self):
+    def __init__(self, link_cache: Optional[ShortLinkCache] = None):
+        self.link_cache = link_cache
         self.stats = {
             'total': 0,
             'successful': 0,
@@ -145,9 +148,15 @@ class SchemaTransformer:
         if '/t/' in post_url:
             return post_url
 
-        # Try to extract from full URL pattern
-        # https://www.tiktok.com/@username/video/1234567890
-        # We don't have the short URL, so return empty for manual filling
+        # Full URL pattern: https://www.tiktok.com/@username/video/1234567890
+        # Short code from the resolver cache if this video was ever seen as a /t/ link
+        canonical = parse_canonical(post_url)
+        if canonical and self.link_cache:
+            short_code = self.link_cache.short_code_for(canonical[2])
+            if short_code:
+                return short_url(short_code)
+
+        # Unknown short URL, leave empty for manual filling
         return ''
 
     def _generate_set_code(self, creator: str, set_id: str) -> str:
@@ -246,14 +255,15 @@ def main():
     print("TikTok Scraper → Master Schema Transformation")
     print('='*60)
 
-    transformer = SchemaTransformer()
+    short_link_db = Path("short_links.db")
+    transformer = SchemaTransformer(ShortLinkCache(str(short_link_db)) if short_link_db.exists() else None)
     success = transformer.transform_file(input_path, output_path)
 
     if success:
         print(f"\n✅ Transformation complete!")
         print(f"📁 Output saved to: {output_path}")
         print(f"\n📋 Note: Some fields require manual population:")
-        print(f"  - va_url (short TikTok URLs)")
+        print(f"  - va_url (short TikTok URLs not in short_links.db)")
         print(f"  - created_date (post creation dates)")
         print(f"  - sound_url (TikTok sound URLs)")
         print(f"  - slide_count, ocr_text, slide_* (image data)")
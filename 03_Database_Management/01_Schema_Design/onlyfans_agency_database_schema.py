@@ -11,6 +11,9 @@ Key Features:
 - Creator performance analysis
 - VA effectiveness measurement
 - Cross-platform content optimization
+
+Legacy schema: the unified tables in database/models.py replace it. Copy a database
+built with this schema into them with `python -m database.unified_schema --import <url>`.
 """
 
 from sqlalchemy import (
@@ -21,8 +24,14 @@ from sqlalchemy import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
+from pathlib import Path
+import sys
 import uuid
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from database.proof_log_import import BulkImporter, read_proof_log
+
 Base = declarative_base()
 
 class OnlyFansCreator(Base):
@@ -554,99 +563,48 @@ class OnlyFansAgencyDatabaseManager:
         """Get a new database session"""
         return self.Session()
     
-    def import_proof_log_data(self, csv_path: str):
+    def import_proof_log_data(self, csv_path: str, chunk_size: int = 5000):
         """Import proof log data from CSV and map to OnlyFans agency structure"""
         import pandas as pd
-        from datetime import datetime
         
-        session = self.get_session()
         try:
-            df = pd.read_csv(csv_path)
+            df = read_proof_log(csv_path)
+            importer = BulkImporter(self.engine, chunk_size=chunk_size)
             
-            for _, row in df.iterrows():
-                # Create or get OnlyFans creator
-                creator = session.query(OnlyFansCreator).filter(
-                    OnlyFansCreator.name == row['Creator']
-                ).first()
-                
-                if not creator:
-                    creator = OnlyFansCreator(
-                        name=row['Creator'],
-                        display_name=row['Creator']
-                    )
-                    session.add(creator)
-                    session.flush()
-                
-                # Create or get VA
-                va = session.query(VA).filter(
-                    VA.name == row['VA']
-                ).first()
-                
-                if not va:
-                    va = VA(name=row['VA'])
-                    session.add(va)
-                    session.flush()
-                
-                # Create or get content set
-                content_set = None
-                if pd.notna(row['Set ID']):
-                    content_set = session.query(ContentSet).filter(
-                        ContentSet.set_id == int(row['Set ID']),
-                        ContentSet.creator_id == creator.id
-                    ).first()
-                    
-                    if not content_set:
-                        content_set = ContentSet(
-                            set_id=int(row['Set ID']),
-                            creator_id=creator.id,
-                            name=f"Set {row['Set ID']} - {creator.name}"
-                        )
-                        session.add(content_set)
-                        session.flush()
-                
-                # Create or get TikTok account (extract from URL)
-                account_username = self._extract_username_from_url(row['Post URL'])
-                account = None
-                if account_username:
-                    account = session.query(TikTokAccount).filter(
-                        TikTokAccount.username == account_username
-                    ).first()
-                    
-                    if not account:
-                        account = TikTokAccount(
-                            username=account_username,
-                            va_id=va.id,
-                            primary_creator_id=creator.id
-                        )
-                        session.add(account)
-                        session.flush()
-                
-                # Parse timestamp
-                timestamp = datetime.fromisoformat(row['Timestamp'].replace('Z', '+00:00'))
-                
-                # Create TikTok post entry
-                tiktok_post = TikTokPost(
-                    post_url=row['Post URL'],
-                    creator_id=creator.id,
-                    content_set_id=content_set.id if content_set else None,
-                    account_id=account.id if account else None,
-                    va_id=va.id,
-                    post_type=row['Type'],
-                    created_date=timestamp,
-                    created_time=timestamp
-                )
-                
-                session.add(tiktok_post)
+            # OnlyFans creators, VAs, content sets and TikTok accounts (from the URL)
+            df['creator_id'] = importer.resolve(
+                OnlyFansCreator, pd.DataFrame({'name': df['Creator'], 'display_name': df['Creator']}), ['name'])
+            df['va_id'] = importer.resolve(VA, pd.DataFrame({'name': df['VA']}), ['name'])
+            df['content_set_id'] = importer.resolve(ContentSet, pd.DataFrame({
+                'set_id': df['set_id'],
+                'creator_id': df['creator_id'],
+                'name': 'Set ' + df['set_id'].astype(str) + ' - ' + df['Creator']
+            }), ['set_id', 'creator_id'])
+            df['account_id'] = importer.resolve(TikTokAccount, pd.DataFrame({
+                'username': df['account_username'],
+                'va_id': df['va_id'],
+                'primary_creator_id': df['creator_id']
+            }), ['username'])
             
-            session.commit()
-            print(f"✅ Successfully imported {len(df)} OnlyFans agency posts")
+            # TikTok post entries
+            stats = importer.insert(TikTokPost, pd.DataFrame({
+                'post_url': df['Post URL'],
+                'creator_id': df['creator_id'],
+                'content_set_id': df['content_set_id'],
+                'account_id': df['account_id'],
+                'va_id': df['va_id'],
+                'post_type': df['Type'],
+                'created_date': df['timestamp'],
+                'created_time': df['timestamp']
+            }), label='OnlyFans agency posts')
+            
+            print(f"✅ Successfully imported {stats['inserted']} OnlyFans agency posts "
+                  f"({stats['skipped']} already present, {stats['invalid']} incomplete)")
+            return stats
             
         except Exception as e:
-            session.rollback()
             print(f"❌ Error importing OnlyFans agency data: {e}")
             raise
-        finally:
-            session.close()
     
     def _extract_username_from_url(self, url: str) -> str:
         """Extract TikTok username from URL"""
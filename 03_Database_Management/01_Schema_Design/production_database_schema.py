@@ -8,6 +8,9 @@ Features:
 - Comprehensive data integrity
 - Scalable architecture for 100K+ records
 - Security-first implementation
+
+Legacy schema: the unified tables in database/models.py replace it. Copy a database
+built with this schema into them with `python -m database.unified_schema --import <url>`.
 """
 
 from sqlalchemy import (
@@ -127,7 +130,8 @@ class FollowerSnapshot(Base):
         CheckConstraint("confidence_score >= 0.0 AND confidence_score <= 1.0", name='confidence_score_range_check'),
         CheckConstraint("snapshot_type IN ('scheduled', 'manual', 'api')", name='snapshot_type_check'),
         UniqueConstraint('account_id', 'timestamp', name='_account_timestamp_uc'),
-        Index('idx_follower_account_timestamp', 'account_id', 'timestamp'),
+        Index('idx_follower_account_latest', 'account_id', timestamp.desc(),
+              postgresql_include=['followers']),
         Index('idx_follower_timestamp', 'timestamp'),
         Index('idx_follower_snapshot_type', 'snapshot_type'),
     )
@@ -11,6 +11,9 @@ Key Features:
 - Enables slideshow performance tracking
 - Supports cross-creator analysis
 - Provides foundation for all future analytics
+
+Legacy schema: the unified tables in database/models.py replace it. Copy a database
+built with this schema into them with `python -m database.unified_schema --import <url>`.
 """
 
 from sqlalchemy import (
@@ -21,8 +24,14 @@ from sqlalchemy import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
+from pathlib import Path
+import sys
 import uuid
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from database.proof_log_import import BulkImporter, read_proof_log
+
 Base = declarative_base()
 
 class TelegramGroup(Base):
@@ -516,93 +525,47 @@ class ProofLogDatabaseManager:
         """Get a new database session"""
         return self.Session()
     
-    def import_proof_log_csv(self, csv_path: str):
+    def import_proof_log_csv(self, csv_path: str, chunk_size: int = 5000):
         """Import proof log data from CSV"""
         import pandas as pd
-        from datetime import datetime
         
-        session = self.get_session()
         try:
-            df = pd.read_csv(csv_path)
+            df = read_proof_log(csv_path)
+            importer = BulkImporter(self.engine, chunk_size=chunk_size)
             
-            for _, row in df.iterrows():
-                # Create or get telegram group
-                telegram_group = session.query(TelegramGroup).filter(
-                    TelegramGroup.chat_id == str(row['Chat ID'])
-                ).first()
-                
-                if not telegram_group:
-                    telegram_group = TelegramGroup(
-                        chat_id=str(row['Chat ID']),
-                        group_name=f"Chat {row['Chat ID']}"
-                    )
-                    session.add(telegram_group)
-                    session.flush()
-                
-                # Create or get creator
-                creator = session.query(Creator).filter(
-                    Creator.name == row['Creator']
-                ).first()
-                
-                if not creator:
-                    creator = Creator(name=row['Creator'])
-                    session.add(creator)
-                    session.flush()
-                
-                # Create or get VA
-                va = session.query(VA).filter(
-                    VA.name == row['VA']
-                ).first()
-                
-                if not va:
-                    va = VA(name=row['VA'])
-                    session.add(va)
-                    session.flush()
-                
-                # Create or get content set
-                content_set = None
-                if pd.notna(row['Set ID']):
-                    content_set = session.query(ContentSet).filter(
-                        ContentSet.set_id == int(row['Set ID']),
-                        ContentSet.creator_id == creator.id
-                    ).first()
-                    
-                    if not content_set:
-                        content_set = ContentSet(
-                            set_id=int(row['Set ID']),
-                            creator_id=creator.id
-                        )
-                        session.add(content_set)
-                        session.flush()
-                
-                # Parse timestamp
-                timestamp = datetime.fromisoformat(row['Timestamp'].replace('Z', '+00:00'))
-                
-                # Create proof log entry
-                proof_log = ProofLog(
-                    timestamp=timestamp,
-                    chat_id=telegram_group.chat_id,
-                    message_id=str(row['Message ID']),
-                    creator_id=creator.id,
-                    content_set_id=content_set.id if content_set else None,
-                    va_id=va.id,
-                    post_type=row['Type'],
-                    platform=row['Platform'],
-                    post_url=row['Post URL'],
-                    dedupe_key=row.get('Dedupe Key')
-                )
-                
-                session.add(proof_log)
+            # Telegram groups, creators, VAs and content sets
+            importer.resolve(TelegramGroup, pd.DataFrame({
+                'chat_id': df['Chat ID'],
+                'group_name': 'Chat ' + df['Chat ID']
+            }), ['chat_id'])
+            df['creator_id'] = importer.resolve(Creator, pd.DataFrame({'name': df['Creator']}), ['name'])
+            df['va_id'] = importer.resolve(VA, pd.DataFrame({'name': df['VA']}), ['name'])
+            df['content_set_id'] = importer.resolve(ContentSet, pd.DataFrame({
+                'set_id': df['set_id'],
+                'creator_id': df['creator_id']
+            }), ['set_id', 'creator_id'])
             
-            session.commit()
-            print(f"✅ Successfully imported {len(df)} proof log entries")
+            # Proof log entries
+            stats = importer.insert(ProofLog, pd.DataFrame({
+                'timestamp': df['timestamp'],
+                'chat_id': df['Chat ID'],
+                'message_id': df['Message ID'],
+                'creator_id': df['creator_id'],
+                'content_set_id': df['content_set_id'],
+                'va_id': df['va_id'],
+                'post_type': df['Type'],
+                'platform': df['Platform'],
+                'post_url': df['Post URL'],
+                'dedupe_key': df.get('Dedupe Key')
+            }), label='Proof log entries')
+            
+            print(f"✅ Successfully imported {stats['inserted']} proof log entries "
+                  f"({stats['skipped']} already present, {stats['invalid']} incomplete)")
+            return stats
             
         except Exception as e:
-            session.rollback()
             print(f"❌ Error importing proof log: {e}")
             raise
-        finally:
-            session.close()
     
     def get_database_stats(self):
         """Get comprehensive database statistics"""
@@ -21,10 +21,10 @@ from flask import Flask, render_template, jsonify, request, redirect, url_for
 from flask_socketio import SocketIO, emit
 import plotly.graph_objs as go
 import plotly.utils
-from sqlalchemy import create_engine, text, desc
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text, desc
 
 from location_optimization_system import LocationOptimizationSystem
+from database.engine_registry import get_engine, get_sessionmaker
 from database.location_optimization_models import (
     LocationMetrics, WarmupSession, ProfileAnalysis, CommentManagement,
     PostingOptimization, SoundVerification, LocationOptimizationAlert,
@@ -40,14 +40,18 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'tiktok_location_optimization_secret_key'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+DATABASE_URL = "sqlite:///tiktok_analytics.db"
+_dashboard: Optional['LocationOptimizationDashboard'] = None
+
 class LocationOptimizationDashboard:
     """
     Main dashboard class for location optimization monitoring
     """
     
     def __init__(self, database_url: str):
-        self.db_engine = create_engine(database_url)
-        self.Session = sessionmaker(bind=self.db_engine)
+        # Shared per-process engine; requests reuse pooled connections
+        self.db_engine = get_engine(database_url)
+        self.Session = get_sessionmaker(database_url)
         self.location_system = LocationOptimizationSystem(database_url)
         
         # Dashboard configuration
@@ -356,6 +360,13 @@ class LocationOptimizationDashboard:
         
         return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
 
+def get_dashboard() -> LocationOptimizationDashboard:
+    """One dashboard per process instead of one per request"""
+    global _dashboard
+    if _dashboard is None:
+        _dashboard = LocationOptimizationDashboard(DATABASE_URL)
+    return _dashboard
+
 # Flask routes
 @app.route('/')
 def index():
@@ -365,7 +376,7 @@ def index():
 @app.route('/api/dashboard-data')
 async def api_dashboard_data():
     """API endpoint for dashboard data"""
-    dashboard = LocationOptimizationDashboard("sqlite:///tiktok_analytics.db")
+    dashboard = get_dashboard()
     await dashboard.initialize_dashboard()
     data = await dashboard.get_dashboard_data()
     return jsonify(data)
@@ -373,7 +384,7 @@ async def api_dashboard_data():
 @app.route('/api/account/<account_name>')
 async def api_account_data(account_name):
     """API endpoint for specific account data"""
-    dashboard = LocationOptimizationDashboard("sqlite:///tiktok_analytics.db")
+    dashboard = get_dashboard()
     await dashboard.initialize_dashboard()
     
     session = dashboard.Session()
@@ -386,7 +397,7 @@ async def api_account_data(account_name):
 @app.route('/api/chart/<account_name>')
 async def api_account_chart(account_name):
     """API endpoint for account metrics chart"""
-    dashboard = LocationOptimizationDashboard("sqlite:///tiktok_analytics.db")
+    dashboard = get_dashboard()
     await dashboard.initialize_dashboard()
     
     session = dashboard.Session()
@@ -431,7 +442,7 @@ def handle_disconnect():
 async def handle_request_update():
     """Handle real-time update request"""
     try:
-        dashboard = LocationOptimizationDashboard("sqlite:///tiktok_analytics.db")
+        dashboard = get_dashboard()
         await dashboard.initialize_dashboard()
         data = await dashboard.get_dashboard_data()
         
@@ -22,8 +22,7 @@ from dataclasses import dataclass
 from enum import Enum
 import re
 import pytz
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -33,6 +32,8 @@ import requests
 from bs4 import BeautifulSoup
 import time as time_module
 
+from database.engine_registry import get_engine, get_sessionmaker
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,8 +44,8 @@ class LocationOptimizationSystem:
     """
     
     def __init__(self, database_url: str, tiktok_session_cookies: str = None):
-        self.db_engine = create_engine(database_url)
-        self.Session = sessionmaker(bind=self.db_engine)
+        self.db_engine = get_engine(database_url)
+        self.Session = get_sessionmaker(database_url)
         self.tiktok_cookies = tiktok_session_cookies
         
         # USA Signal Detection Patterns
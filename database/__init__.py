@@ -5,24 +5,54 @@ Created for Issue #1: Setup Master Database Schema
 """
 
 from .models import (
-    Base, VA, Post, MetricsHistory, Slide, ScrapingJob,
-    ContentTemplate, RepostCandidate, SystemConfig, DataImportLog
+    Base, VA, Creator, Account, ContentSet, Post, MetricsHistory, FollowerSnapshot,
+    RefreshSchedule, RefreshDispatch, Comment, CommentCrawlMark, Slide, ProofLog,
+    ScrapingJob, ContentTemplate, RepostCandidate, SystemConfig, DataImportLog
 )
 from .config import (
     DatabaseConfig, get_database_url, create_database_engine,
     get_session_factory, init_database, drop_database, reset_database,
     get_table_counts, get_database_info, db_config, get_db
 )
+from .engine_registry import (
+    EngineRegistry, get_engine, get_async_engine, get_sessionmaker, pool_stats
+)
+from .async_sink import AsyncWriteSink
+from .refresh_scheduler import RefreshPolicy, RefreshScheduler
+from .timeseries import TimeSeriesSpec, TimeSeriesMaintenance
+from .comment_store import CommentStore
+from .unified_schema import compat_views, create_compat_views, drop_compat_views
+from .proof_log_import import BulkImporter, read_proof_log, read_master_csv
 
 __all__ = [
     # Models
-    'Base', 'VA', 'Post', 'MetricsHistory', 'Slide', 'ScrapingJob',
-    'ContentTemplate', 'RepostCandidate', 'SystemConfig', 'DataImportLog',
+    'Base', 'VA', 'Creator', 'Account', 'ContentSet', 'Post', 'MetricsHistory', 'FollowerSnapshot',
+    'RefreshSchedule', 'RefreshDispatch', 'Comment', 'CommentCrawlMark', 'Slide', 'ProofLog',
+    'ScrapingJob', 'ContentTemplate', 'RepostCandidate', 'SystemConfig', 'DataImportLog',
     
     # Configuration
     'DatabaseConfig', 'get_database_url', 'create_database_engine',
     'get_session_factory', 'init_database', 'drop_database', 'reset_database',
-    'get_table_counts', 'get_database_info', 'db_config', 'get_db'
+    'get_table_counts', 'get_database_info', 'db_config', 'get_db',
+
+    # Engine registry
+    'EngineRegistry', 'get_engine', 'get_async_engine', 'get_sessionmaker', 'pool_stats',
+    'AsyncWriteSink',
+
+    # Refresh scheduling
+    'RefreshPolicy', 'RefreshScheduler',
+
+    # Time-series storage
+    'TimeSeriesSpec', 'TimeSeriesMaintenance',
+
+    # Comments
+    'CommentStore',
+
+    # Unified schema views
+    'compat_views', 'create_compat_views', 'drop_compat_views',
+
+    # Bulk CSV import
+    'BulkImporter', 'read_proof_log', 'read_master_csv'
 ]
 
 # Version info
@@ -6,12 +6,13 @@ Approach: Local SQLite file-based database
 Focus: Simple, fast, no external dependencies
 """
 
-import sqlite3
-import pandas as pd
-import time
-import os
-from datetime import datetime
+import sys
 import json
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from database.storage_benchmark import SCALES, run_suite, save_results, summarize
 
 class LocalSQLiteAgent:
     """
@@ -23,75 +24,28 @@ class LocalSQLiteAgent:
         self.agent_name = "Local SQLite Agent"
         self.approach = "File-based SQLite database"
         
-    def test_performance(self, test_data_size=1000):
-        """Test performance with sample data"""
+    def test_performance(self, scale='small'):
+        """
+        Run the storage benchmark (real schema, SQLite default / WAL / tuned pragmas)
+        and report the best SQLite variant
+        """
         print(f"🔧 {self.agent_name} - Testing Performance")
         print("=" * 50)
         
-        # Create test database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tiktok_posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                post_url TEXT UNIQUE,
-                creator TEXT,
-                va TEXT,
-                account TEXT,
-                views INTEGER,
-                likes INTEGER,
-                comments INTEGER,
-                shares INTEGER,
-                engagement_rate REAL,
-                created_date TEXT,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Test insert performance
-        start_time = time.time()
-        for i in range(test_data_size):
-            cursor.execute('''
-                INSERT OR REPLACE INTO tiktok_posts 
-                (post_url, creator, va, account, views, likes, comments, shares, engagement_rate, created_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                f"https://tiktok.com/@test{i}/video/{i}",
-                f"Creator_{i % 10}",
-                f"VA_{i % 5}",
-                f"account_{i % 20}",
-                i * 1000,
-                i * 100,
-                i * 10,
-                i * 5,
-                i * 0.1,
-                datetime.now().isoformat()
-            ))
-        
-        conn.commit()
-        insert_time = time.time() - start_time
-        
-        # Test query performance
-        start_time = time.time()
-        cursor.execute('''
-            SELECT creator, AVG(engagement_rate), COUNT(*) 
-            FROM tiktok_posts 
-            GROUP BY creator 
-            ORDER BY AVG(engagement_rate) DESC
-        ''')
-        results = cursor.fetchall()
-        query_time = time.time() - start_time
+        results = run_suite(SCALES[scale])
+        save_results(results)
         
-        conn.close()
+        summaries = {name: summarize(result) for name, result in results['targets'].items()}
+        measured = {name: summary for name, summary in summaries.items() if summary['measured']}
+        if not measured:
+            return {'measured': False, 'variants': summaries, 'test_data_size': SCALES[scale].posts}
         
+        best = max(measured, key=lambda name: measured[name]['queries_per_second'])
         return {
-            'insert_time': insert_time,
-            'query_time': query_time,
-            'inserts_per_second': test_data_size / insert_time,
-            'queries_per_second': 1 / query_time,
-            'test_data_size': test_data_size
+            **measured[best],
+            'best_variant': best,
+            'variants': summaries,
+            'test_data_size': SCALES[scale].posts
         }
     
     def test_team_collaboration(self):
@@ -212,7 +166,7 @@ def run_agent_1_analysis():
     agent = LocalSQLiteAgent()
     
     # Run all tests
-    performance = agent.test_performance(1000)
+    performance = agent.test_performance()
     collaboration = agent.test_team_collaboration()
     costs = agent.analyze_costs()
     complexity = agent.analyze_setup_complexity()
@@ -236,7 +190,8 @@ def run_agent_1_analysis():
         json.dump(results, f, indent=2, default=str)
     
     print("\n📊 AGENT 1 SUMMARY:")
-    print(f"✅ Performance: {performance['inserts_per_second']:.0f} inserts/sec")
+    print(f"✅ Performance: {performance.get('inserts_per_second', 0):.0f} inserts/sec, "
+          f"{performance.get('queries_per_second', 0):.1f} queries/sec ({performance.get('best_variant', 'n/a')})")
     print(f"💰 Cost: ${costs['total_monthly']}/month")
     print(f"👥 Team Collaboration: {recommendation['score']['team_collaboration']}/10")
     print(f"🎯 Overall Score: {recommendation['score']['overall']}/10")
@@ -6,12 +6,14 @@ Approach: Cloud-hosted PostgreSQL database
 Focus: Scalable, reliable, professional-grade
 """
 
-import psycopg2
-import pandas as pd
-import time
 import os
-from datetime import datetime
+import sys
 import json
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from database.storage_benchmark import SCALES, run_suite, save_results, summarize
 
 class CloudPostgreSQLAgent:
     """
@@ -28,22 +30,32 @@ class CloudPostgreSQLAgent:
             'heroku_postgres': {'cost_per_month': 9, 'storage_gb': 10}
         }
         
-    def test_performance(self, test_data_size=1000):
-        """Test performance with sample data"""
+    def test_performance(self, scale='small'):
+        """
+        Run the storage benchmark against PostgreSQL (BENCHMARK_POSTGRES_URL, e.g. a local
+        postgres:16 container standing in for the managed instance)
+        """
         print(f"🔧 {self.agent_name} - Testing Performance")
         print("=" * 50)
         
-        # Simulate performance (would need actual DB connection)
-        performance = {
-            'insert_time': 2.5,  # seconds for 1000 records
-            'query_time': 0.1,   # seconds for complex query
-            'inserts_per_second': 400,
-            'queries_per_second': 10,
+        url = os.getenv('BENCHMARK_POSTGRES_URL')
+        if not url:
+            print("⚠️ BENCHMARK_POSTGRES_URL not set - PostgreSQL not measured")
+            return {
+                'measured': False,
+                'reason': 'BENCHMARK_POSTGRES_URL not set',
+                'inserts_per_second': None,
+                'queries_per_second': None,
+                'test_data_size': SCALES[scale].posts
+            }
+        
+        results = run_suite(SCALES[scale], sqlite=[], postgres_url=url)
+        save_results(results)
+        return {
+            **summarize(results['targets']['postgresql']),
             'concurrent_connections': 100,
-            'test_data_size': test_data_size
+            'test_data_size': SCALES[scale].posts
         }
-        
-        return performance
     
     def test_team_collaboration(self):
         """Test team collaboration capabilities"""
@@ -199,7 +211,7 @@ def run_agent_2_analysis():
     agent = CloudPostgreSQLAgent()
     
     # Run all tests
-    performance = agent.test_performance(1000)
+    performance = agent.test_performance()
     collaboration = agent.test_team_collaboration()
     costs = agent.analyze_costs()
     complexity = agent.analyze_setup_complexity()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Async Write Sink for TikTok Analytics Master Database
+Keeps blocking database writes off the asyncio event loop
+
+Scrapers `await sink.put(row)`; one background task coalesces queued rows into
+batches (up to batch_size rows, or whatever arrived within flush_interval) and hands
+each batch to a blocking write_batch(rows) callable on a dedicated writer thread.
+The queue is bounded: when the database falls behind, put() waits (backpressure)
+instead of letting results pile up in memory.
+
+    async with AsyncWriteSink(db_manager.save_metrics_batch, maxsize=500) as sink:
+        await sink.put(result)
+    # leaving the block drains the queue and writes the last batch
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AsyncWriteSink:
+    """Bounded asyncio queue in front of a blocking batch writer"""
+
+    def __init__(self, write_batch: Callable[[List[Any]], Any], maxsize: int = 1000,
+                 batch_size: int = 100, flush_interval: float = 0.5,
+                 on_written: Optional[Callable[[List[Any]], None]] = None, name: str = 'db-writer'):
+        """
+        write_batch runs on the writer thread, once per batch, and should write the rows in
+        one transaction; on_written(rows) runs on the event loop after a batch succeeded
+        """
+        self.write_batch = write_batch
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_written = on_written
+        self.name = name
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+        self.stats: Dict[str, Any] = {
+            'queued': 0,
+            'rows_written': 0,
+            'batches': 0,
+            'failed_rows': 0,
+            'failed_batches': 0,
+            'backpressure_waits': 0,
+            'backpressure_seconds': 0.0,
+            'write_seconds': 0.0,
+            'max_queue_depth': 0,
+        }
+
+    def _ensure_started(self):
+        """Create the queue and writer on first use, inside the running loop"""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, row: Any):
+        """Queue one row; waits while the queue is full"""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        self._ensure_started()
+        if self._queue.full():
+            started = time.perf_counter()
+            await self._queue.put(row)
+            self.stats['backpressure_waits'] += 1
+            self.stats['backpressure_seconds'] += time.perf_counter() - started
+        else:
+            self._queue.put_nowait(row)
+        self.stats['queued'] += 1
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._queue.qsize())
+
+    async def flush(self):
+        """Wait until every row queued so far has been written (or failed)"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """Write what is still queued, then stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            await self._queue.put(_STOP)
+            await self._task
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        self._ensure_started()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _next_batch(self) -> Tuple[List[Any], bool]:
+        """Rows for one write: block for the first, then collect until full or flush_interval passes"""
+        loop = asyncio.get_running_loop()
+        row = await self._queue.get()
+        if row is _STOP:
+            return [], True
+
+        batch = [row]
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                row = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout=max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            try:
+                if batch:
+                    await self._write(loop, batch)
+            finally:
+                # Every dequeued row is marked done, so flush()/close() never hang on a dead writer
+                for _ in range(len(batch) + (1 if stopping else 0)):
+                    self._queue.task_done()
+
+    async def _write(self, loop, batch: List[Any]):
+        started = time.perf_counter()
+        try:
+            await loop.run_in_executor(self._executor, self.write_batch, batch)
+        except Exception as e:
+            # One bad batch must not stop the writer; the rows are counted as failed
+            self.stats['failed_rows'] += len(batch)
+            self.stats['failed_batches'] += 1
+            logger.error(f"❌ {self.name}: failed to write {len(batch)} rows: {e}")
+            return
+        finally:
+            self.stats['write_seconds'] += time.perf_counter() - started
+
+        self.stats['rows_written'] += len(batch)
+        self.stats['batches'] += 1
+        if self.on_written:
+            try:
+                self.on_written(batch)
+            except Exception as e:
+                # The rows are already committed; a failing callback must not kill the writer
+                logger.error(f"❌ {self.name}: on_written failed after writing {len(batch)} rows: {e}")
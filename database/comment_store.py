@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Comment Store for TikTok Analytics Master Database
+Normalized comments keyed by TikTok's comment id, written with upserts
+
+- normalize_comment(): comment JSON from TikTok's comment API -> Comment columns
+- upsert(): insert new comments, refresh text / like / reply counters of known ones
+- high_water_marks() / mark_complete(): per-post newest top-level comment of the last
+  complete fetch, so re-runs only page through comments newer than that. Partial fetches
+  are stored but never advance the mark.
+- comment_stats(): per-post stored vs. reported counts and comment velocity
+
+The fetching side lives in 02_Scraping_Systems/01_TikTok_Scrapers/comment_pipeline.py.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from .models import Post, Comment, CommentCrawlMark
+
+# Rows per INSERT ... ON CONFLICT statement (well under SQLite's bound-variable limit)
+UPSERT_CHUNK_SIZE = 500
+
+# Columns refreshed when a comment is seen again
+UPDATABLE_COLUMNS = ('text', 'like_count', 'reply_count', 'author_username')
+
+
+def normalize_comment(raw: dict) -> Optional[dict]:
+    """TikTok comment JSON (cid, create_time, digg_count, user, ...) -> Comment columns"""
+    comment_id = raw.get('cid')
+    create_time = raw.get('create_time')
+    if not comment_id or not create_time:
+        return None
+    user = raw.get('user') or {}
+    parent_id = raw.get('reply_id')
+    return {
+        'comment_id': str(comment_id),
+        'parent_comment_id': str(parent_id) if parent_id and str(parent_id) != '0' else None,
+        'author_id': str(user['uid']) if user.get('uid') else None,
+        'author_username': user.get('unique_id'),
+        'text': raw.get('text') or '',
+        'like_count': int(raw.get('digg_count') or 0),
+        'reply_count': int(raw.get('reply_comment_total') or 0),
+        'commented_at': datetime.fromtimestamp(int(create_time), timezone.utc).replace(tzinfo=None),
+    }
+
+
+class CommentStore:
+    """Comment persistence and per-post comment analytics"""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def _insert(self):
+        """Dialect insert that supports ON CONFLICT (SQLite and PostgreSQL)"""
+        if self.db.get_bind().dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(Comment)
+
+    def upsert(self, post_id: int, comments: Iterable[dict], now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Write normalized comments for one post
+
+        New comment ids are inserted; known ones get their text and counters refreshed.
+        Returns {'new': ..., 'updated': ...}.
+        """
+        now = now or datetime.utcnow()
+        rows = {}
+        for comment in comments:
+            if comment and comment.get('comment_id'):
+                rows[comment['comment_id']] = {
+                    **comment, 'post_id': post_id, 'first_seen_at': now, 'updated_at': now
+                }
+        if not rows:
+            return {'new': 0, 'updated': 0}
+
+        rows = list(rows.values())
+        new = 0
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+            existing = self.db.execute(
+                select(func.count()).where(Comment.comment_id.in_([row['comment_id'] for row in chunk]))
+            ).scalar()
+            new += len(chunk) - existing
+
+            statement = self._insert().values(chunk)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Comment.comment_id],
+                set_={
+                    **{column: statement.excluded[column] for column in UPDATABLE_COLUMNS},
+                    'updated_at': statement.excluded.updated_at,
+                }
+            )
+            self.db.execute(statement)
+        self.db.commit()
+        return {'new': new, 'updated': len(rows) - new}
+
+    def high_water_marks(self, post_ids: Optional[Iterable[int]] = None) -> Dict[int, datetime]:
+        """post_id -> newest top-level comment of the last complete fetch"""
+        query = select(CommentCrawlMark.post_id, CommentCrawlMark.complete_through)
+        if post_ids is not None:
+            query = query.where(CommentCrawlMark.post_id.in_(list(post_ids)))
+        return {post_id: mark for post_id, mark in self.db.execute(query).all()}
+
+    def mark_complete(self, post_id: int, comments: Iterable[dict],
+                      now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Advance a post's high-water mark after its comments were paged through completely
+
+        The new mark is the newest top-level comment in `comments` or the old mark,
+        whichever is later. Returns the mark (None if the post has no top-level comments yet).
+        """
+        now = now or datetime.utcnow()
+        newest = max((comment['commented_at'] for comment in comments
+                      if comment and not comment.get('parent_comment_id')), default=None)
+        mark = self.db.get(CommentCrawlMark, post_id)
+        if mark is None:
+            if newest is None:
+                return None
+            mark = CommentCrawlMark(post_id=post_id, complete_through=newest)
+            self.db.add(mark)
+        elif newest is not None and newest > mark.complete_through:
+            mark.complete_through = newest
+        mark.completed_at = now
+        self.db.commit()
+        return mark.complete_through
+
+    def comment_stats(self, post_ids: Optional[Iterable[int]] = None, window_hours: float = 24,
+                      now: Optional[datetime] = None) -> List[dict]:
+        """
+        Per-post comment counts and velocity, fastest-moving posts first
+
+        velocity_per_hour:  stored comments posted in the last `window_hours`, per hour
+        lifetime_per_hour:  stored comments per hour since the post went up
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(hours=window_hours)
+
+        query = (
+            select(
+                Comment.post_id,
+                Post.post_url,
+                Post.comments.label('reported_comments'),
+                Post.created_date,
+                func.count().label('stored_comments'),
+                func.sum(case((Comment.parent_comment_id.is_(None), 1), else_=0)).label('top_level'),
+                func.max(Comment.commented_at).label('latest_comment_at'),
+                func.sum(case((Comment.commented_at >= cutoff, 1), else_=0)).label('window_comments'),
+            )
+            .join(Post, Post.id == Comment.post_id)
+            .group_by(Comment.post_id, Post.post_url, Post.comments, Post.created_date)
+        )
+        if post_ids is not None:
+            query = query.where(Comment.post_id.in_(list(post_ids)))
+
+        stats = []
+        for row in self.db.execute(query).all():
+            age_hours = max((now - row.created_date).total_seconds() / 3600, 1)
+            stats.append({
+                'post_id': row.post_id,
+                'post_url': row.post_url,
+                'reported_comments': row.reported_comments,
+                'stored_comments': row.stored_comments,
+                'top_level_comments': row.top_level,
+                'replies': row.stored_comments - row.top_level,
+                'latest_comment_at': row.latest_comment_at,
+                'window_comments': row.window_comments,
+                'velocity_per_hour': round(row.window_comments / window_hours, 3),
+                'lifetime_per_hour': round(row.stored_comments / age_hours, 3),
+            })
+        stats.sort(key=lambda item: item['velocity_per_hour'], reverse=True)
+        return stats
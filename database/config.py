@@ -5,19 +5,18 @@ Created for Issue #1: Setup Master Database Schema
 """
 
 import os
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 from pathlib import Path
 
+from .engine_registry import engine_registry
+
 # Database configuration
 DATABASE_CONFIG = {
     # SQLite configuration (for development and testing)
     'sqlite': {
         'url': 'sqlite:///tiktok_analytics.db',
-        'echo': False,
-        'poolclass': StaticPool,
-        'connect_args': {'check_same_thread': False}
+        'echo': False
+        # Pool type, WAL and busy_timeout are set by the engine registry
     },
     
     # PostgreSQL configuration (for production)
@@ -57,7 +56,10 @@ def get_database_url(db_type=None):
 
 def create_database_engine(db_type=None, echo=None):
     """
-    Create SQLAlchemy engine for the specified database type
+    Get the process-wide SQLAlchemy engine for the specified database type
+    
+    Engines come from the engine registry, so repeated calls share one pool;
+    pool settings and `echo` apply when the engine is first created
     """
     if db_type is None:
         db_type = DEFAULT_DB_TYPE
@@ -74,7 +76,7 @@ def create_database_engine(db_type=None, echo=None):
     # Remove 'url' from config and use it separately
     url = config.pop('url')
     
-    return create_engine(url, **config)
+    return engine_registry.get_engine(url, **config)
 
 def get_session_factory(engine):
     """
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Engine Registry for TikTok Analytics Master Database
+One SQLAlchemy engine per database URL per process, shared by every caller
+
+- get_engine(): sync engine; the pool type is picked per backend
+    * SQLite file: QueuePool with check_same_thread=False (each checked-out connection
+      belongs to one thread until it is returned), WAL journal and busy_timeout
+    * SQLite :memory:: StaticPool (every thread must see the same connection)
+    * PostgreSQL / others: QueuePool (pool_size=10, max_overflow=20, pre-ping)
+- get_async_engine(): the same for asyncio code (aiosqlite / asyncpg drivers)
+- get_sessionmaker(): cached sessionmaker bound to the shared engine
+- pool_stats(): checked-out / checked-in / overflow counts and checkout wait times,
+  for dashboards and health checks
+
+Engines inherited through fork() are dropped without closing their sockets, so a
+worker process opens its own connections instead of sharing the parent's.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+
+# Milliseconds a SQLite connection waits on a locked database before raising
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+POOL_DEFAULTS = {
+    'sqlite': {'pool_size': 5, 'max_overflow': 10, 'pool_timeout': 30},
+    'default': {'pool_size': 10, 'max_overflow': 20, 'pool_timeout': 30, 'pool_pre_ping': True},
+}
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+def configure_sqlite_connection(dbapi_connection, busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS,
+                                wal: bool = True):
+    """
+    WAL journal (readers don't block the writer) and busy_timeout on a raw SQLite connection
+
+    Also used by code that opens sqlite3 connections directly.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if wal:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    finally:
+        cursor.close()
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+
+
+class _CheckoutTimingMixin:
+    """Records how long connect() waits for a pooled connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._timing_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._timing_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._timing_lock:
+                self.checkouts += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool with checkout wait statistics"""
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait statistics"""
+
+
+class EngineRegistry:
+    """Process-wide cache of engines keyed by database URL"""
+
+    def __init__(self, busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS):
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._engines: Dict[tuple, Any] = {}
+        self._sessionmakers: Dict[str, sessionmaker] = {}
+
+    def _check_pid(self):
+        """Forget engines inherited from a parent process (their sockets stay with the parent)"""
+        if os.getpid() != self._pid:
+            for engine in self._engines.values():
+                sync_engine = getattr(engine, 'sync_engine', engine)
+                sync_engine.dispose(close=False)
+            self._engines.clear()
+            self._sessionmakers.clear()
+            self._pid = os.getpid()
+
+    def _engine_options(self, url, is_async: bool, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """Pool class and sizing for the URL's backend, updated with caller overrides"""
+        if url.get_backend_name() == 'sqlite':
+            options = {'connect_args': {'check_same_thread': False}}
+            if _is_memory_sqlite(url):
+                options['poolclass'] = StaticPool
+            else:
+                options['poolclass'] = TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool
+                options.update(POOL_DEFAULTS['sqlite'])
+        else:
+            options = {'poolclass': TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool}
+            options.update(POOL_DEFAULTS['default'])
+        options.update(overrides)
+        if options.get('poolclass') is StaticPool:
+            for key in ('pool_size', 'max_overflow', 'pool_timeout'):
+                options.pop(key, None)
+        return options
+
+    def _install_sqlite_hooks(self, sync_engine: Engine, url):
+        wal = not _is_memory_sqlite(url)
+
+        @event.listens_for(sync_engine, 'connect')
+        def _on_connect(dbapi_connection, connection_record):
+            configure_sqlite_connection(dbapi_connection, self.busy_timeout_ms, wal=wal)
+
+        @event.listens_for(sync_engine, 'checkin')
+        def _on_checkin(dbapi_connection, connection_record):
+            # raw_connection() users may set sqlite3.Row; the next borrower expects tuples
+            if dbapi_connection is not None and hasattr(dbapi_connection, 'row_factory'):
+                dbapi_connection.row_factory = None
+
+    def get_engine(self, database_url: str, **engine_kwargs) -> Engine:
+        """
+        Shared engine for `database_url`
+
+        `engine_kwargs` (echo, pool_size, ...) only apply when the engine is first created.
+        """
+        url = make_url(database_url)
+        key = (url.render_as_string(hide_password=False), False)
+        with self._lock:
+            self._check_pid()
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = create_engine(url, **self._engine_options(url, False, engine_kwargs))
+                if url.get_backend_name() == 'sqlite':
+                    self._install_sqlite_hooks(engine, url)
+                self._engines[key] = engine
+            return engine
+
+    def get_async_engine(self, database_url: str, **engine_kwargs):
+        """
+        Shared AsyncEngine for `database_url`
+
+        Plain sqlite:// and postgresql:// URLs are switched to the aiosqlite / asyncpg drivers.
+        """
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = make_url(database_url)
+        if url.drivername in ASYNC_DRIVERS or url.drivername == 'postgresql+psycopg2':
+            url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+        key = (url.render_as_string(hide_password=False), True)
+        with self._lock:
+            self._check_pid()
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = create_async_engine(url, **self._engine_options(url, True, engine_kwargs))
+                if url.get_backend_name() == 'sqlite':
+                    self._install_sqlite_hooks(engine.sync_engine, url)
+                self._engines[key] = engine
+            return engine
+
+    def get_sessionmaker(self, database_url: str, **engine_kwargs) -> sessionmaker:
+        """Cached sessionmaker bound to the shared engine"""
+        engine = self.get_engine(database_url, **engine_kwargs)
+        with self._lock:
+            key = engine.url.render_as_string(hide_password=False)
+            factory = self._sessionmakers.get(key)
+            if factory is None:
+                factory = self._sessionmakers[key] = sessionmaker(bind=engine)
+            return factory
+
+    def pool_stats(self, database_url: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Pool counters per engine (URLs rendered without passwords)
+
+        checked_out / checked_in / overflow come from the pool itself; checkouts,
+        wait_ms_avg / wait_ms_max and timeouts are recorded by the Timed* pools.
+        """
+        with self._lock:
+            self._check_pid()
+            engines = list(self._engines.items())
+
+        if database_url is not None:
+            wanted = make_url(database_url).render_as_string(hide_password=False)
+            engines = [(key, engine) for key, engine in engines if key[0] == wanted]
+
+        stats = {}
+        for (url, is_async), engine in engines:
+            pool = getattr(engine, 'sync_engine', engine).pool
+            entry = {'pool': type(pool).__name__, 'async': is_async}
+            if isinstance(pool, QueuePool):
+                entry.update({
+                    'size': pool.size(),
+                    'checked_out': pool.checkedout(),
+                    'checked_in': pool.checkedin(),
+                    'overflow': max(pool.overflow(), 0),
+                })
+            if isinstance(pool, _CheckoutTimingMixin):
+                entry.update({
+                    'checkouts': pool.checkouts,
+                    'timeouts': pool.timeouts,
+                    'wait_ms_avg': round(pool.wait_seconds * 1000 / pool.checkouts, 3) if pool.checkouts else 0.0,
+                    'wait_ms_max': round(pool.max_wait_seconds * 1000, 3),
+                })
+            label = make_url(url).render_as_string(hide_password=True)
+            stats[f"{label} (async)" if is_async else label] = entry
+        return stats
+
+    def dispose(self, database_url: Optional[str] = None):
+        """
+        Close pooled connections and forget the engine(s); async engines are only
+        dropped (dispose them with `await engine.dispose()` first)
+        """
+        with self._lock:
+            wanted = make_url(database_url).render_as_string(hide_password=False) if database_url else None
+            for key in [key for key in self._engines if wanted is None or key[0] == wanted]:
+                engine = self._engines.pop(key)
+                if not key[1]:
+                    engine.dispose()
+                self._sessionmakers.pop(key[0], None)
+
+
+# Process-wide registry
+engine_registry = EngineRegistry()
+
+
+def get_engine(database_url: str, **engine_kwargs) -> Engine:
+    return engine_registry.get_engine(database_url, **engine_kwargs)
+
+
+def get_async_engine(database_url: str, **engine_kwargs):
+    return engine_registry.get_async_engine(database_url, **engine_kwargs)
+
+
+def get_sessionmaker(database_url: str, **engine_kwargs) -> sessionmaker:
+    return engine_registry.get_sessionmaker(database_url, **engine_kwargs)
+
+
+def pool_stats(database_url: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    return engine_registry.pool_stats(database_url)
@@ -1,6 +1,9 @@
 """
 Follower Tracking Database Models
 Professional TikTok account follower tracking system
+
+VA, Account, FollowerSnapshot and ScrapingJob are the unified tables in
+database/models.py; this module adds the follower-specific tables to the same schema.
 """
 
 from sqlalchemy import (
@@ -10,136 +13,12 @@ from sqlalchemy import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import uuid
-
-Base = declarative_base()
 
-class VA(Base):
-    """
-    Virtual Assistant (Employee) tracking
-    """
-    __tablename__ = 'vas'
+from database.models import Base, VA, Account, FollowerSnapshot, ScrapingJob
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(50), nullable=False, unique=True, index=True)
-    email = Column(String(100), nullable=True)
-    status = Column(String(20), nullable=False, default='active')  # active, inactive, training
-    joined_date = Column(DateTime, default=datetime.utcnow, nullable=False)
-    notes = Column(Text, nullable=True)
-    
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
-    # Relationships
-    accounts = relationship("Account", back_populates="va")
-
-class Account(Base):
-    """
-    TikTok Account tracking
-    """
-    __tablename__ = 'accounts'
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    username = Column(String(100), nullable=False, unique=True, index=True)
-    display_name = Column(String(200), nullable=True)
-    bio = Column(Text, nullable=True)
-    profile_picture_url = Column(String(500), nullable=True)
-    verified = Column(Boolean, default=False, nullable=False)
-    
-    # VA Assignment
-    va_id = Column(Integer, ForeignKey('vas.id'), nullable=True, index=True)
-    
-    # Account Status
-    status = Column(String(20), nullable=False, default='active')  # active, inactive, suspended, deleted
-    created_date = Column(DateTime, nullable=True)  # When account was created
-    last_checked = Column(DateTime, nullable=True)
-    
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
-    # Relationships
-    va = relationship("VA", back_populates="accounts")
-    follower_snapshots = relationship("FollowerSnapshot", back_populates="account", cascade="all, delete-orphan")
-    
-    # Indexes
-    __table_args__ = (
-        Index('idx_account_va_status', 'va_id', 'status'),
-        Index('idx_account_username_status', 'username', 'status'),
-    )
-
-class FollowerSnapshot(Base):
-    """
-    Daily follower count snapshots for growth tracking
-    """
-    __tablename__ = 'follower_snapshots'
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    account_id = Column(Integer, ForeignKey('accounts.id'), nullable=False, index=True)
-    
-    # Snapshot data
-    snapshot_date = Column(DateTime, nullable=False, index=True)
-    followers = Column(Integer, nullable=False, default=0)
-    following = Column(Integer, nullable=True, default=0)
-    likes = Column(Integer, nullable=True, default=0)
-    videos = Column(Integer, nullable=True, default=0)
-    
-    # Growth calculations
-    followers_change = Column(Integer, nullable=True, default=0)  # Change from previous day
-    followers_growth_rate = Column(Float, nullable=True, default=0.0)  # Percentage growth
-    
-    # Scraping metadata
-    scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    scraping_method = Column(String(50), nullable=True)  # playwright, apify, manual
-    scraping_status = Column(String(20), nullable=False, default='success')  # success, failed, partial
-    error_message = Column(Text, nullable=True)
-    
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    
-    # Relationships
-    account = relationship("Account", back_populates="follower_snapshots")
-    
-    # Constraints and indexes
-    __table_args__ = (
-        UniqueConstraint('account_id', 'snapshot_date', name='unique_account_date'),
-        Index('idx_snapshot_date_account', 'snapshot_date', 'account_id'),
-        Index('idx_snapshot_followers', 'followers'),
-        Index('idx_snapshot_growth', 'followers_growth_rate'),
-    )
-
-class ScrapingJob(Base):
-    """
-    Track scraping jobs and their status
-    """
-    __tablename__ = 'scraping_jobs'
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    job_name = Column(String(100), nullable=False, index=True)
-    job_type = Column(String(50), nullable=False)  # follower_scraping, account_discovery, etc.
-    status = Column(String(20), nullable=False, default='pending')  # pending, running, completed, failed, cancelled
-    
-    # Job details
-    started_at = Column(DateTime, nullable=True)
-    completed_at = Column(DateTime, nullable=True)
-    accounts_processed = Column(Integer, default=0)
-    accounts_successful = Column(Integer, default=0)
-    accounts_failed = Column(Integer, default=0)
-    error_message = Column(Text, nullable=True)
-    
-    # Configuration
-    config = Column(Text, nullable=True)  # JSON configuration
-    
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
-    # Indexes
-    __table_args__ = (
-        Index('idx_job_status_type', 'status', 'job_type'),
-        Index('idx_job_created', 'created_at'),
-    )
+# account_summary / va_summary are views (see database/unified_schema.py);
+# their classes live on a separate Base so create_all() never creates them as tables
+ViewBase = declarative_base()
 
 class GrowthMilestone(Base):
     """
@@ -212,14 +91,12 @@ class VAPerformance(Base):
         Index('idx_performance_ranks', 'follower_rank', 'growth_rank'),
     )
 
-# Create views for common queries
-class AccountSummary(Base):
+class AccountSummary(ViewBase):
     """
     View for account summary with latest follower count
     """
     __tablename__ = 'account_summary'
     
-    # This would be a materialized view in production
     account_id = Column(Integer, primary_key=True)
     username = Column(String(100))
     va_name = Column(String(50))
@@ -229,13 +106,12 @@ class AccountSummary(Base):
     last_updated = Column(DateTime)
     status = Column(String(20))
 
-class VASummary(Base):
+class VASummary(ViewBase):
     """
     View for VA summary with performance metrics
     """
     __tablename__ = 'va_summary'
     
-    # This would be a materialized view in production
     va_id = Column(Integer, primary_key=True)
     va_name = Column(String(50))
     total_accounts = Column(Integer)
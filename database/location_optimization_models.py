@@ -52,7 +52,8 @@ class LocationMetrics(Base):
         CheckConstraint('usa_percentage >= 0 AND usa_percentage <= 100', name='check_usa_percentage_range'),
         CheckConstraint('non_usa_percentage >= 0 AND non_usa_percentage <= 100', name='check_non_usa_percentage_range'),
         CheckConstraint('confidence_score >= 0 AND confidence_score <= 1', name='check_confidence_range'),
-        Index('idx_location_metrics_account_date', 'account', 'recorded_at'),
+        Index('idx_location_metrics_account_latest', 'account', recorded_at.desc(),
+              postgresql_include=['usa_percentage', 'confidence_score']),
         Index('idx_location_metrics_usa_percentage', 'usa_percentage'),
     )
     
@@ -7,11 +7,15 @@ Created for Issue #6: Complete Data Migration Plan
 from .migrate_csv_data import CSVDataMigrator
 from .migrate_ocr_data import OCRDataMigrator
 from .migrate_slides import SlidesMigrator
+from .migrate_legacy_schemas import LegacySchemaMigrator
 from .validate_migration import MigrationValidator
+from .query_plans import PerformanceValidator
 
 __all__ = [
     'CSVDataMigrator',
     'OCRDataMigrator', 
     'SlidesMigrator',
-    'MigrationValidator'
+    'LegacySchemaMigrator',
+    'MigrationValidator',
+    'PerformanceValidator'
 ]
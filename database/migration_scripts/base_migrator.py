@@ -5,10 +5,14 @@ Created for Issue #6: Complete Data Migration Plan
 """
 
 import logging
+import math
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, OperationalError, StatementError
 
 from ..models import DataImportLog
 from ..config import get_db
@@ -17,11 +21,17 @@ from ..config import get_db
 class BaseMigrator:
     """
     Base class for all data migration operations
+    
+    Rows go through queue_row(): they are buffered as mappings and written every
+    `batch_size` rows with one Core INSERT (ON CONFLICT DO NOTHING / DO UPDATE on SQLite
+    and PostgreSQL). Each write runs in a SAVEPOINT; a failing batch is bisected down to
+    the rows the database rejects, so one bad row doesn't drop the rest of the batch.
     """
     
-    def __init__(self, db_session: Session, migration_type: str):
+    def __init__(self, db_session: Session, migration_type: str, batch_size: int = 1000):
         self.db = db_session
         self.migration_type = migration_type
+        self.batch_size = batch_size
         self.import_log = None
         self.stats = {
             'processed': 0,
@@ -30,6 +40,13 @@ class BaseMigrator:
             'failed': 0,
             'errors': []
         }
+        self.write_stats = {
+            'rows': 0,
+            'batches': 0,
+            'bisections': 0,
+            'seconds': 0.0
+        }
+        self._buffers: Dict[Tuple, List[Dict[str, Any]]] = {}
         
         # Setup logging
         self.logger = logging.getLogger(f"migration.{migration_type}")
@@ -68,6 +85,12 @@ class BaseMigrator:
         """
         Complete the migration process
         """
+        if success:
+            self.flush_rows()
+        else:
+            self.discard_rows()
+        self.stats['rows_per_second'] = self.rows_per_second
+        
         if self.import_log:
             self.import_log.status = "completed" if success else "failed"
             self.import_log.completed_at = datetime.utcnow()
@@ -118,35 +141,130 @@ class BaseMigrator:
         self.stats['skipped'] += skipped
         self.stats['failed'] += failed
     
-    def batch_commit(self, batch_size: int = 1000):
+    def queue_row(
+        self,
+        model,
+        values: Dict[str, Any],
+        on_conflict: Optional[str] = 'nothing',
+        conflict_columns: Sequence[str] = (),
+        update_columns: Sequence[str] = ()
+    ):
+        """
+        Buffer one row for `model`; the buffer is written once it holds batch_size rows
+        
+        on_conflict: 'nothing' (existing rows count as skipped), 'update' (update_columns
+        from the new row, keyed by conflict_columns) or None (plain INSERT)
+        """
+        key = (model.__table__, on_conflict, tuple(conflict_columns), tuple(update_columns))
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(values)
+        if len(buffer) >= self.batch_size:
+            self._write_buffer(key)
+    
+    def flush_rows(self):
         """
-        Commit changes in batches to avoid memory issues
+        Write every buffered row
+        """
+        for key in list(self._buffers):
+            self._write_buffer(key)
+    
+    def discard_rows(self):
+        """
+        Drop buffered rows that were not written yet
+        """
+        self._buffers.clear()
+    
+    def _insert_statement(self, key: Tuple):
+        table, on_conflict, conflict_columns, update_columns = key
+        dialect = self.db.get_bind().dialect.name
+        if on_conflict is None or dialect not in ('sqlite', 'postgresql'):
+            return insert(table)
+        
+        stmt = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(table)
+        if on_conflict == 'update':
+            return stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: stmt.excluded[column] for column in update_columns}
+            )
+        return stmt.on_conflict_do_nothing(index_elements=list(conflict_columns) or None)
+    
+    def _write_buffer(self, key: Tuple):
+        rows = self._buffers.pop(key, [])
+        if not rows:
+            return
+        
+        stmt = self._insert_statement(key)
+        start = time.perf_counter()
+        for offset in range(0, len(rows), self.batch_size):
+            self._write_rows(stmt, rows[offset:offset + self.batch_size])
+        self.write_stats['seconds'] += time.perf_counter() - start
+        self.write_stats['rows'] += len(rows)
+    
+    def _write_rows(self, stmt, rows: List[Dict[str, Any]]):
+        """
+        INSERT rows in a SAVEPOINT; on failure split the batch in halves until the
+        rejected rows are isolated
         """
         try:
+            with self.db.begin_nested():
+                result = self.db.execute(stmt, rows)
+            self.write_stats['batches'] += 1
+            written = result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(rows)
+            written = min(written, len(rows))
+            self.stats['imported'] += written
+            self.stats['skipped'] += len(rows) - written
+        except OperationalError:
+            raise
+        except StatementError as e:
+            if len(rows) == 1:
+                self.log_error(e.orig or e, f"Row rejected by {stmt.table.name}")
+                return
+            self.write_stats['bisections'] += 1
+            middle = len(rows) // 2
+            self._write_rows(stmt, rows[:middle])
+            self._write_rows(stmt, rows[middle:])
+    
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if self.write_stats['seconds'] <= 0:
+            return None
+        return round(self.write_stats['rows'] / self.write_stats['seconds'], 1)
+    
+    def batch_commit(self, batch_size: Optional[int] = None):
+        """
+        Write buffered rows (in batches of `batch_size`, default self.batch_size) and commit
+        """
+        previous = self.batch_size
+        if batch_size:
+            self.batch_size = batch_size
+        try:
+            self.flush_rows()
             self.db.commit()
-            self.logger.debug(f"Committed batch of {batch_size} records")
+            self.logger.debug(f"Committed {self.write_stats['rows']} rows so far "
+                              f"({self.rows_per_second or 0:.0f} rows/s)")
         except Exception as e:
             self.db.rollback()
             self.log_error(e, "Batch commit failed")
             raise
+        finally:
+            self.batch_size = previous
     
     def safe_add_record(self, record, record_type: str = "record"):
         """
-        Safely add a record to the database with error handling
+        Add an ORM object inside a SAVEPOINT, so a rejected record only rolls back itself
         """
         try:
-            self.db.add(record)
+            with self.db.begin_nested():
+                self.db.add(record)
+                self.db.flush()
             self.stats['imported'] += 1
             return True
         except IntegrityError as e:
-            self.log_error(e, f"Integrity error adding {record_type}")
-            self.db.rollback()
+            self.log_progress(f"Integrity error adding {record_type}: {e.orig}", "warning")
             self.stats['skipped'] += 1
             return False
         except Exception as e:
             self.log_error(e, f"Error adding {record_type}")
-            self.db.rollback()
-            self.stats['failed'] += 1
             return False
     
     def get_migration_summary(self) -> Dict[str, Any]:
@@ -158,6 +276,8 @@ class BaseMigrator:
             'stats': self.stats.copy(),
             'success_rate': (self.stats['imported'] / max(self.stats['processed'], 1)) * 100,
             'error_count': len(self.stats['errors']),
+            'write_stats': self.write_stats.copy(),
+            'rows_per_second': self.rows_per_second,
             'duration': None  # Will be calculated when migration completes
         }
     
@@ -176,7 +296,7 @@ class BaseMigrator:
         """
         Normalize string values (trim, handle None)
         """
-        if value is None:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
             return None
         if isinstance(value, str):
             return value.strip() if value.strip() else None
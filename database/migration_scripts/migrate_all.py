@@ -6,22 +6,39 @@ Created for Issue #6: Complete Data Migration Plan
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from .base_migrator import BaseMigrator
 from .migrate_csv_data import CSVDataMigrator
-from .migrate_ocr_data import OCRDataMigrator
+from .migrate_ocr_data import OCRDataMigrator, load_ocr_directory
 from .migrate_slides import SlidesMigrator
 from .validate_migration import MigrationValidator
 from ..config import get_session_factory, create_database_engine
 
 
+@dataclass(frozen=True)
+class MigrationStage:
+    """
+    One node of the migration DAG
+    """
+    name: str                                   # key in the results
+    run: Callable[[], Dict[str, Any]]
+    depends_on: Tuple[str, ...] = ()
+    uses_db: bool = True                        # stages on the shared session run one at a time
+    needs_success: bool = True                  # False: runs once dependencies finish, even if they failed
+
+
 class MigrationOrchestrator:
     """
     Orchestrates the complete migration process
+    
+    Stages form a DAG: a stage starts as soon as its dependencies are done, so stages that
+    don't write through the session (reading the OCR files) overlap with the ones that do.
     """
     
     def __init__(self, db_session: Session):
@@ -29,6 +46,7 @@ class MigrationOrchestrator:
         self.start_time = None
         self.results = {}
         self.logger = BaseMigrator(db_session, "orchestrator").logger
+        self._ocr_parsed = None
     
     def run_complete_migration(
         self,
@@ -38,7 +56,8 @@ class MigrationOrchestrator:
         skip_csv: bool = False,
         skip_ocr: bool = False,
         skip_slides: bool = False,
-        validate_only: bool = False
+        validate_only: bool = False,
+        workers: int = 4
     ) -> Dict[str, Any]:
         """
         Run the complete migration process
@@ -51,30 +70,8 @@ class MigrationOrchestrator:
                 self.logger.info("📊 Running validation only")
                 return self._run_validation()
             
-            # Phase 1: CSV Data Migration
-            if not skip_csv:
-                self.logger.info("📁 Phase 1: Migrating CSV data")
-                self.results['csv_migration'] = self._migrate_csv_data(csv_path, batch_size)
-            else:
-                self.logger.info("⏭️ Skipping CSV migration")
-            
-            # Phase 2: OCR Data Migration
-            if not skip_ocr:
-                self.logger.info("🔍 Phase 2: Migrating OCR data")
-                self.results['ocr_migration'] = self._migrate_ocr_data(ocr_dir)
-            else:
-                self.logger.info("⏭️ Skipping OCR migration")
-            
-            # Phase 3: Slides Migration
-            if not skip_slides:
-                self.logger.info("🖼️ Phase 3: Migrating slides")
-                self.results['slides_migration'] = self._migrate_slides()
-            else:
-                self.logger.info("⏭️ Skipping slides migration")
-            
-            # Phase 4: Validation
-            self.logger.info("✅ Phase 4: Validating migration")
-            self.results['validation'] = self._run_validation()
+            stages = self.build_stages(csv_path, ocr_dir, batch_size, skip_csv, skip_ocr, skip_slides, workers)
+            self.run_stages(stages)
             
             # Generate final summary
             self.results['summary'] = self._generate_final_summary()
@@ -89,6 +86,133 @@ class MigrationOrchestrator:
             self.results['error'] = str(e)
             return self.results
     
+    def build_stages(
+        self,
+        csv_path: str,
+        ocr_dir: str,
+        batch_size: int = 1000,
+        skip_csv: bool = False,
+        skip_ocr: bool = False,
+        skip_slides: bool = False,
+        workers: int = 4
+    ) -> List[MigrationStage]:
+        """
+        The migration DAG:
+        
+            csv_migration ──► slides_migration ──┐
+            ocr_files ───────────────────────────┴─► ocr_migration ──► validation
+        
+        OCR text is applied after slides exist, so it lands on the parsed slides instead of
+        placeholder slides that would make the slides stage skip those posts
+        """
+        stages = []
+        
+        if not skip_csv:
+            stages.append(MigrationStage(
+                'csv_migration', lambda: self._migrate_csv_data(csv_path, batch_size)
+            ))
+        else:
+            self.logger.info("⏭️ Skipping CSV migration")
+        
+        if not skip_slides:
+            stages.append(MigrationStage(
+                'slides_migration', lambda: self._migrate_slides(batch_size, workers),
+                depends_on=('csv_migration',)
+            ))
+        else:
+            self.logger.info("⏭️ Skipping slides migration")
+        
+        if not skip_ocr:
+            stages.append(MigrationStage(
+                'ocr_files', lambda: self._load_ocr_files(ocr_dir, workers), uses_db=False
+            ))
+            stages.append(MigrationStage(
+                'ocr_migration', lambda: self._migrate_ocr_data(ocr_dir),
+                depends_on=('ocr_files', 'csv_migration', 'slides_migration')
+            ))
+        else:
+            self.logger.info("⏭️ Skipping OCR migration")
+        
+        stages.append(MigrationStage(
+            'validation', self._run_validation,
+            depends_on=tuple(stage.name for stage in stages), needs_success=False
+        ))
+        return stages
+    
+    def run_stages(self, stages: List[MigrationStage], max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run `stages` in dependency order, concurrently where the DAG allows
+        
+        Dependencies on stages that aren't in `stages` (skipped) count as done. A stage whose
+        dependency failed is recorded as skipped unless it has needs_success=False.
+        """
+        names = {stage.name for stage in stages}
+        pending = {stage.name: stage for stage in stages}
+        running = {}
+        db_busy = False
+        
+        with ThreadPoolExecutor(max_workers=max_workers or max(len(stages), 1)) as pool:
+            while pending or running:
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for stage in list(pending.values()):
+                        deps = [name for name in stage.depends_on if name in names]
+                        if any(name not in self.results for name in deps):
+                            continue
+                        failed = [name for name in deps if self.results[name].get('status') != 'success']
+                        if failed and stage.needs_success:
+                            self.logger.info(f"⏭️ Skipping {stage.name}: {', '.join(failed)} did not succeed")
+                            self.results[stage.name] = {
+                                'status': 'skipped',
+                                'error': f"dependencies failed: {', '.join(failed)}"
+                            }
+                            del pending[stage.name]
+                            progressed = True
+                            continue
+                        if stage.uses_db and db_busy:
+                            continue
+                        self.logger.info(f"▶️ Starting {stage.name}")
+                        running[pool.submit(self._run_stage, stage)] = stage
+                        db_busy = db_busy or stage.uses_db
+                        del pending[stage.name]
+                
+                if not running:
+                    if pending:
+                        raise ValueError(f"Unresolvable stage dependencies: {sorted(pending)}")
+                    break
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    self.results[stage.name] = future.result()
+                    if stage.uses_db:
+                        db_busy = False
+        
+        return self.results
+    
+    def _run_stage(self, stage: MigrationStage) -> Dict[str, Any]:
+        """
+        Run one stage and attach its timing and throughput
+        """
+        started = time.time()
+        try:
+            result = stage.run()
+        except Exception as e:
+            self.logger.error(f"❌ {stage.name} failed: {str(e)}")
+            result = {'status': 'failed', 'error': str(e)}
+        
+        seconds = time.time() - started
+        rows = result.get('rows', result.get('results', {}).get('processed'))
+        result['timing'] = {
+            'started_at': round(started - self.start_time, 3) if self.start_time else 0.0,
+            'seconds': round(seconds, 3),
+            'rows': rows,
+            'rows_per_second': round(rows / seconds, 1) if rows and seconds > 0 else None
+        }
+        self.logger.info(f"⏹️ {stage.name} finished in {seconds:.2f}s ({result.get('status')})")
+        return result
+    
     def _migrate_csv_data(self, csv_path: str, batch_size: int) -> Dict[str, Any]:
         """
         Migrate CSV data
@@ -121,9 +245,9 @@ class MigrationOrchestrator:
                 'error': str(e)
             }
     
-    def _migrate_ocr_data(self, ocr_dir: str) -> Dict[str, Any]:
+    def _load_ocr_files(self, ocr_dir: str, workers: int) -> Dict[str, Any]:
         """
-        Migrate OCR data
+        Validate and read the per-VA OCR files (no database access)
         """
         try:
             migrator = OCRDataMigrator(self.db)
@@ -136,14 +260,40 @@ class MigrationOrchestrator:
             stats = migrator.get_ocr_statistics(ocr_dir)
             self.logger.info(f"OCR Statistics: {stats}")
             
+            self._ocr_parsed = load_ocr_directory(ocr_dir, workers)
+            posts = sum(len(ocr_posts) for ocr_posts in self._ocr_parsed.values()
+                        if isinstance(ocr_posts, list))
+            
+            self.logger.info(f"✅ Read OCR files: {len(self._ocr_parsed)} VAs, {posts} posts")
+            return {
+                'status': 'success',
+                'rows': posts,
+                'vas': len(self._ocr_parsed),
+                'statistics': stats
+            }
+            
+        except Exception as e:
+            self.logger.error(f"❌ Reading OCR files failed: {str(e)}")
+            return {
+                'status': 'failed',
+                'error': str(e)
+            }
+    
+    def _migrate_ocr_data(self, ocr_dir: str) -> Dict[str, Any]:
+        """
+        Migrate OCR data
+        """
+        try:
+            migrator = OCRDataMigrator(self.db)
+            
             # Perform migration
-            results = migrator.migrate_ocr_directory(ocr_dir)
+            results = migrator.migrate_ocr_directory(ocr_dir, parsed=self._ocr_parsed)
+            self._ocr_parsed = None
             
             self.logger.info(f"✅ OCR migration completed: {results}")
             return {
                 'status': 'success',
-                'results': results,
-                'statistics': stats
+                'results': results
             }
             
         except Exception as e:
@@ -153,7 +303,7 @@ class MigrationOrchestrator:
                 'error': str(e)
             }
     
-    def _migrate_slides(self) -> Dict[str, Any]:
+    def _migrate_slides(self, batch_size: int = 1000, workers: int = 1) -> Dict[str, Any]:
         """
         Migrate slides
         """
@@ -165,7 +315,7 @@ class MigrationOrchestrator:
             self.logger.info(f"Current slides statistics: {stats}")
             
             # Perform migration
-            results = migrator.migrate_slides_from_posts()
+            results = migrator.migrate_slides_from_posts(batch_size, workers)
             
             # Get updated statistics
             updated_stats = migrator.get_slides_statistics()
@@ -254,6 +404,13 @@ class MigrationOrchestrator:
         if 'validation' in self.results:
             summary['validation_status'] = self.results['validation'].get('validation', {}).get('overall_status', 'unknown')
         
+        # Per-stage timings and throughput
+        summary['stages'] = {
+            phase: {'status': result.get('status'), **result['timing']}
+            for phase, result in self.results.items()
+            if phase != 'summary' and 'timing' in result
+        }
+        
         return summary
     
     def print_summary(self):
@@ -302,6 +459,13 @@ class MigrationOrchestrator:
         if 'validation_status' in summary:
             print(f"\n✅ Validation Status: {summary['validation_status'].upper()}")
         
+        if summary.get('stages'):
+            print(f"\n⏱️  Stages:")
+            for phase, stage in summary['stages'].items():
+                throughput = f", {stage['rows_per_second']:,.0f} rows/s" if stage['rows_per_second'] else ''
+                print(f"   • {phase}: {stage['status']} at +{stage['started_at']:.1f}s, "
+                      f"{stage['seconds']:.2f}s{throughput}")
+        
         print("="*60)
 
 
@@ -312,7 +476,8 @@ def run_migration(
     skip_csv: bool = False,
     skip_ocr: bool = False,
     skip_slides: bool = False,
-    validate_only: bool = False
+    validate_only: bool = False,
+    workers: int = 4
 ) -> Dict[str, Any]:
     """
     Convenience function to run complete migration
@@ -331,7 +496,8 @@ def run_migration(
             skip_csv=skip_csv,
             skip_ocr=skip_ocr,
             skip_slides=skip_slides,
-            validate_only=validate_only
+            validate_only=validate_only,
+            workers=workers
         )
         
         orchestrator.print_summary()
@@ -353,6 +519,7 @@ if __name__ == "__main__":
     parser.add_argument("--skip-ocr", action="store_true", help="Skip OCR migration")
     parser.add_argument("--skip-slides", action="store_true", help="Skip slides migration")
     parser.add_argument("--validate-only", action="store_true", help="Run validation only")
+    parser.add_argument("--workers", type=int, default=4, help="Processes for OCR file reading and slide parsing")
     
     args = parser.parse_args()
     
@@ -363,7 +530,8 @@ if __name__ == "__main__":
         skip_csv=args.skip_csv,
         skip_ocr=args.skip_ocr,
         skip_slides=args.skip_slides,
-        validate_only=args.validate_only
+        validate_only=args.validate_only,
+        workers=args.workers
     )
     
     if results.get('error'):
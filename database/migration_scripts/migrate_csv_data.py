@@ -19,8 +19,8 @@ class CSVDataMigrator(BaseMigrator):
     Migrates data from MASTER_TIKTOK_DATABASE.csv
     """
     
-    def __init__(self, db_session: Session):
-        super().__init__(db_session, "csv_import")
+    def __init__(self, db_session: Session, batch_size: int = 1000):
+        super().__init__(db_session, "csv_import", batch_size)
         self.va_cache = {}  # Cache for VA lookups
     
     def migrate_csv_file(self, csv_path: str, batch_size: int = 1000) -> Dict[str, int]:
@@ -31,6 +31,7 @@ class CSVDataMigrator(BaseMigrator):
         if not csv_path.exists():
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
         
+        self.batch_size = batch_size
         self.start_migration(str(csv_path), "Import 45k+ TikTok posts from master CSV")
         
         try:
@@ -48,8 +49,8 @@ class CSVDataMigrator(BaseMigrator):
                 total_chunks += 1
                 self.log_progress(f"Processing chunk {total_chunks} ({len(chunk)} records)")
                 
-                processed, imported, skipped, failed = self._process_chunk(chunk)
-                self.update_stats(processed, imported, skipped, failed)
+                self._process_chunk(chunk)
+                self.update_stats(processed=len(chunk))
                 
                 # Commit batch
                 if total_chunks % 10 == 0:  # Commit every 10 chunks
@@ -68,43 +69,24 @@ class CSVDataMigrator(BaseMigrator):
             self.complete_migration(success=False, error_message=str(e))
             raise
     
-    def _process_chunk(self, chunk: pd.DataFrame) -> tuple:
+    def _process_chunk(self, chunk: pd.DataFrame):
         """
         Process a chunk of CSV data
-        """
-        processed = len(chunk)
-        imported = 0
-        skipped = 0
-        failed = 0
         
+        Posts are queued as rows; existing post URLs are skipped by ON CONFLICT DO NOTHING
+        when the batch is written, so imported / skipped are counted there
+        """
         for _, row in chunk.iterrows():
             try:
-                # Check if post already exists
-                existing_post = self.db.query(Post).filter(
-                    Post.post_url == row['post_url']
-                ).first()
-                
-                if existing_post:
-                    skipped += 1
-                    continue
-                
                 # Create or get VA
                 va = self._get_or_create_va(row.get('va'))
                 
-                # Create post
-                post = self._create_post_from_row(row, va)
-                
-                if self.safe_add_record(post, "post"):
-                    imported += 1
-                else:
-                    failed += 1
+                # Queue post
+                self.queue_row(Post, self._post_values_from_row(row, va), conflict_columns=['post_url'])
                 
             except Exception as e:
                 self.log_error(e, f"Error processing row: {row.get('post_url', 'unknown')}")
-                failed += 1
                 continue
-        
-        return processed, imported, skipped, failed
     
     def _get_or_create_va(self, va_name: str) -> Optional[VA]:
         """
@@ -133,9 +115,9 @@ class CSVDataMigrator(BaseMigrator):
         self.va_cache[va_name] = va
         return va
     
-    def _create_post_from_row(self, row: pd.Series, va: Optional[VA]) -> Post:
+    def _post_values_from_row(self, row: pd.Series, va: Optional[VA]) -> Dict[str, Any]:
         """
-        Create Post object from CSV row
+        Post column values from CSV row
         """
         # Parse created_date
         created_date = self.parse_date(row['created_date'])
@@ -145,8 +127,7 @@ class CSVDataMigrator(BaseMigrator):
         # Parse slides (pipe-separated URLs)
         slides = self.normalize_string(row.get('slides'))
         
-        # Create post
-        post = Post(
+        return dict(
             post_url=row['post_url'],
             account=self.normalize_string(row['account']),
             va_id=va.id if va else None,
@@ -163,8 +144,6 @@ class CSVDataMigrator(BaseMigrator):
             slides=slides,
             source=self.normalize_string(row['source'])
         )
-        
-        return post
     
     def validate_csv_structure(self, csv_path: str) -> bool:
         """
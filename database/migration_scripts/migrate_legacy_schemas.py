@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Legacy Schema Migration for TikTok Analytics Database
+Copies a database built with one of the older per-pipeline schemas into the unified tables
+
+Supported source layouts (detected from the tables present):
+- local:      local_database_setup.py (raw tiktok_posts / tiktok_slides)
+- onlyfans:   database/onlyfans_tracking_schema.py
+- agency:     onlyfans_agency_database_schema.py
+- proof_log:  proof_log_database_schema.py
+- production: production_database_schema.py
+- follower:   follower tracking databases (vas / accounts / follower_snapshots only)
+
+Rows are read straight from the source database in batches and keyed by natural keys
+(VA / creator name, account username, post URL, chat + message id), so the import can be
+re-run: rows already in the unified tables are skipped, and posts only gain the
+account / creator / content-set links they were missing.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, func, inspect, text, update
+from sqlalchemy.orm import Session
+
+from .base_migrator import BaseMigrator
+from ..engine_registry import get_engine
+from ..models import (
+    VA, Account, ContentSet, Creator, FollowerSnapshot, MetricsHistory, Post, ProofLog, Slide
+)
+
+POST_LOOKUP_CHUNK = 500  # post URLs per IN (...) lookup
+ACCOUNT_IN_URL = re.compile(r'tiktok\.com/@([^/?#]+)')
+POST_LINK_COLUMNS = ('va_id', 'account_id', 'creator_id', 'content_set_id')
+
+
+@dataclass
+class LegacyLayout:
+    """Tables and columns of a source database, and which legacy schema they belong to"""
+    columns: Dict[str, Set[str]]
+
+    @classmethod
+    def inspect(cls, bind) -> 'LegacyLayout':
+        inspector = inspect(bind)
+        return cls({table: {col['name'] for col in inspector.get_columns(table)}
+                    for table in inspector.get_table_names()})
+
+    def has(self, table: Optional[str], *columns: str) -> bool:
+        return table in self.columns and set(columns) <= self.columns[table]
+
+    @property
+    def name(self) -> str:
+        if self.has('proof_logs'):
+            return 'proof_log'
+        if self.has('onlyfans_creators'):
+            return 'agency'
+        if self.has('tiktok_accounts'):
+            return 'onlyfans'
+        if self.has('tiktok_posts', 'va'):
+            return 'local'
+        if self.has('post_slides') and self.has('posts', 'account_id'):
+            return 'production'
+        if self.has('follower_snapshots') and self.has('accounts'):
+            return 'follower'
+        raise ValueError("No legacy schema tables found")
+
+    @property
+    def accounts_table(self) -> Optional[str]:
+        return next((t for t in ('tiktok_accounts', 'accounts') if self.has(t, 'username')), None)
+
+    @property
+    def creators_table(self) -> Optional[str]:
+        return next((t for t in ('onlyfans_creators', 'creators') if self.has(t, 'name')), None)
+
+    @property
+    def posts_table(self) -> Optional[str]:
+        return next((t for t in ('tiktok_posts', 'posts') if self.has(t, 'post_url')), None)
+
+    @property
+    def slides_table(self) -> Optional[str]:
+        return next((t for t in ('post_slides', 'tiktok_slides') if self.has(t, 'post_id', 'slide_number')), None)
+
+    def pick(self, table: str, alias: str, *candidates: str, default: str = 'NULL') -> str:
+        """alias.<first candidate column that exists>, or default"""
+        for column in candidates:
+            if self.has(table, column):
+                return f"{alias}.{column}"
+        return default
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Naive UTC datetime from a driver value or an ISO string (SQLite returns TEXT)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _username(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip().lstrip('@')
+    return value or None
+
+
+def _count(value: Any) -> int:
+    try:
+        return max(int(value or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class LegacySchemaMigrator(BaseMigrator):
+    """
+    Imports one legacy database into the unified schema
+
+    Dimensions (VAs, creators, accounts, content sets) are written first and mapped back to
+    unified ids by name; posts are then resolved by URL for slides, metrics and proof logs.
+    """
+
+    def __init__(self, db_session: Session, batch_size: int = 1000):
+        super().__init__(db_session, "legacy_schema", batch_size)
+        self.va_ids: Dict[str, int] = {}
+        self.creator_ids: Dict[str, int] = {}
+        self.account_ids: Dict[str, int] = {}
+        self.content_set_ids: Dict[Tuple[int, int], int] = {}
+        self.post_ids: Dict[str, Tuple[int, Optional[int]]] = {}  # post_url -> (id, va_id)
+        self.table_stats: Dict[str, int] = {}
+
+    def migrate_database(self, source_url: str) -> Dict[str, Any]:
+        """
+        Copy every supported table of the database at `source_url`
+        """
+        source = get_engine(source_url)
+        layout = LegacyLayout.inspect(source)
+        self.start_migration(source_url, f"Consolidate {layout.name} schema into unified tables")
+
+        try:
+            with source.connect() as conn:
+                self._migrate_dimensions(conn, layout)
+                source_posts = self._migrate_posts(conn, layout)
+                self._migrate_slides(conn, layout, source_posts)
+                self._migrate_metrics(conn, layout, source_posts)
+                self._migrate_follower_snapshots(conn, layout)
+                self._migrate_proof_logs(conn, layout)
+
+            self.complete_migration(success=True)
+            self.log_progress(f"Legacy {layout.name} import completed: {self.table_stats}")
+
+            summary = self.get_migration_summary()
+            summary.update({'layout': layout.name, 'tables': dict(self.table_stats)})
+            return summary
+
+        except Exception as e:
+            self.db.rollback()
+            self.complete_migration(success=False, error_message=str(e))
+            raise
+
+    # Reading
+
+    def _rows(self, conn, sql: str) -> Iterator[List[Dict[str, Any]]]:
+        """SELECT results in batches of batch_size mappings"""
+        result = conn.execution_options(yield_per=self.batch_size).execute(text(sql))
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+    def _count_rows(self, table: str, rows: int):
+        self.table_stats[table] = self.table_stats.get(table, 0) + rows
+        self.stats['processed'] += rows
+
+    # Dimensions
+
+    def _migrate_dimensions(self, conn, layout: LegacyLayout):
+        va_names: Set[str] = set()
+        creator_names: Set[str] = set()
+        accounts: Dict[str, Dict[str, Any]] = {}
+        content_sets: Set[Tuple[str, int]] = set()
+
+        if layout.has('vas', 'name'):
+            va_names.update(row['name'] for batch in self._rows(conn, "SELECT name FROM vas") for row in batch)
+        if layout.creators_table:
+            creator_names.update(
+                row['name'] for batch in self._rows(conn, f"SELECT name FROM {layout.creators_table}") for row in batch
+            )
+
+        table = layout.accounts_table
+        if table:
+            va_join = "LEFT JOIN vas v ON v.id = a.va_id" if layout.has(table, 'va_id') and layout.has('vas') else ""
+            sql = f"""
+                SELECT a.username, {layout.pick(table, 'a', 'display_name')} AS display_name,
+                       {layout.pick(table, 'a', 'status')} AS status,
+                       {layout.pick(table, 'a', 'followers')} AS followers,
+                       {layout.pick(table, 'a', 'following')} AS following,
+                       {'v.name' if va_join else 'NULL'} AS va_name
+                FROM {table} a {va_join}
+            """
+            for batch in self._rows(conn, sql):
+                for row in batch:
+                    username = _username(row['username'])
+                    if username:
+                        accounts[username] = row
+
+        if layout.name == 'local':
+            # Raw scraper table: dimensions are plain text columns on each post
+            sql = f"""
+                SELECT DISTINCT va, creator, set_id,
+                       COALESCE({layout.pick('tiktok_posts', 'p', 'account_username')}, p.account) AS username
+                FROM tiktok_posts p
+            """
+            for batch in self._rows(conn, sql):
+                for row in batch:
+                    va = self.normalize_string(row['va'])
+                    creator = self.normalize_string(row['creator'])
+                    username = _username(row['username'])
+                    va_names.update([va] if va else [])
+                    creator_names.update([creator] if creator else [])
+                    if username and username not in accounts:
+                        accounts[username] = {'va_name': va}
+                    if creator and row['set_id'] not in (None, ''):
+                        content_sets.add((creator, int(row['set_id'])))
+        elif layout.has('content_sets', 'set_id', 'creator_id') and layout.creators_table:
+            sql = f"SELECT c.name, s.set_id FROM content_sets s JOIN {layout.creators_table} c ON c.id = s.creator_id"
+            content_sets.update(
+                (row['name'], int(row['set_id'])) for batch in self._rows(conn, sql) for row in batch
+            )
+
+        va_names = {name.strip() for name in va_names if name and name.strip()}
+        creator_names = {name.strip() for name in creator_names if name and name.strip()}
+        va_names.update(row['va_name'].strip() for row in accounts.values() if row.get('va_name'))
+
+        for name in sorted(va_names):
+            self.queue_row(VA, {'name': name}, conflict_columns=('name',))
+        for name in sorted(creator_names):
+            self.queue_row(Creator, {'name': name}, conflict_columns=('name',))
+        self.flush_rows()
+        self.va_ids = self._id_map(VA.name, va_names)
+        self.creator_ids = self._id_map(Creator.name, creator_names)
+
+        for username, row in sorted(accounts.items()):
+            values = {
+                'username': username,
+                'display_name': row.get('display_name'),
+                'va_id': self.va_ids.get((row.get('va_name') or '').strip()),
+                'status': row.get('status') or 'active',
+                'followers': _count(row.get('followers')),
+                'following': _count(row.get('following')),
+            }
+            self.queue_row(Account, values, conflict_columns=('username',))
+        for creator, set_id in sorted(content_sets):
+            creator_id = self.creator_ids.get(creator.strip())
+            if creator_id:
+                self.queue_row(ContentSet, {'creator_id': creator_id, 'set_id': set_id},
+                               conflict_columns=('creator_id', 'set_id'))
+        self.batch_commit()
+        self.account_ids = self._id_map(Account.username, accounts)
+        self.content_set_ids = {
+            (creator_id, set_id): content_set_id
+            for content_set_id, creator_id, set_id in self.db.query(
+                ContentSet.id, ContentSet.creator_id, ContentSet.set_id)
+        }
+
+        self._count_rows('vas', len(va_names))
+        self._count_rows('creators', len(creator_names))
+        self._count_rows('accounts', len(accounts))
+        self._count_rows('content_sets', len(content_sets))
+
+    def _id_map(self, column, keys: Iterable[str]) -> Dict[str, int]:
+        """{natural key: unified id} via chunked IN lookups"""
+        keys = list(keys)
+        model = column.class_
+        ids = {}
+        for start in range(0, len(keys), POST_LOOKUP_CHUNK):
+            chunk = keys[start:start + POST_LOOKUP_CHUNK]
+            ids.update({key: row_id for row_id, key in self.db.query(model.id, column).filter(column.in_(chunk))})
+        return ids
+
+    def _content_set_id(self, creator: Optional[str], set_id: Any) -> Optional[int]:
+        creator_id = self.creator_ids.get((creator or '').strip())
+        if creator_id is None or set_id in (None, ''):
+            return None
+        return self.content_set_ids.get((creator_id, int(set_id)))
+
+    # Posts
+
+    def _posts_sql(self, layout: LegacyLayout) -> str:
+        table = layout.posts_table
+        if layout.name == 'local':
+            return f"""
+                SELECT p.id AS source_id, p.post_url, p.created_date, p.scraped_at, p.logged_at,
+                       p.views, p.likes, p.comments, p.shares, p.bookmarks, p.engagement, p.engagement_rate,
+                       p.hashtags, p.sound_title, p.va AS va_name, p.creator AS creator_name, p.set_id,
+                       COALESCE(p.account_username, p.account) AS username
+                FROM tiktok_posts p
+            """
+
+        accounts = layout.accounts_table
+        account_join = (f"LEFT JOIN {accounts} a ON a.id = p.account_id"
+                        if accounts and layout.has(table, 'account_id') else "")
+        va_expr = 'p.va_id' if layout.has(table, 'va_id') else ('a.va_id' if account_join else None)
+        creator_join = (f"LEFT JOIN {layout.creators_table} c ON c.id = p.creator_id"
+                        if layout.creators_table and layout.has(table, 'creator_id') else "")
+        set_join = ("LEFT JOIN content_sets s ON s.id = p.content_set_id"
+                    if layout.has('content_sets') and layout.has(table, 'content_set_id') else "")
+        return f"""
+            SELECT p.id AS source_id, p.post_url, {layout.pick(table, 'p', 'created_date')} AS created_date,
+                   {layout.pick(table, 'p', 'scraped_at')} AS scraped_at, NULL AS logged_at,
+                   p.views, p.likes, p.comments, p.shares,
+                   {layout.pick(table, 'p', 'bookmarks', default='0')} AS bookmarks,
+                   p.engagement, p.engagement_rate,
+                   {layout.pick(table, 'p', 'hashtags')} AS hashtags,
+                   {layout.pick(table, 'p', 'sound_title')} AS sound_title,
+                   {'v.name' if va_expr else 'NULL'} AS va_name,
+                   {'c.name' if creator_join else 'NULL'} AS creator_name,
+                   {'s.set_id' if set_join else 'NULL'} AS set_id,
+                   {'a.username' if account_join else 'NULL'} AS username
+            FROM {table} p
+            {account_join}
+            {f'LEFT JOIN vas v ON v.id = {va_expr}' if va_expr else ''}
+            {creator_join}
+            {set_join}
+        """
+
+    def _migrate_posts(self, conn, layout: LegacyLayout) -> Dict[Any, str]:
+        """
+        Insert posts that are new to the unified table; returns {source post id: post_url}
+        """
+        source_posts: Dict[Any, str] = {}
+        if not layout.posts_table:
+            return source_posts
+
+        for batch in self._rows(conn, self._posts_sql(layout)):
+            links = []
+            for row in batch:
+                post_url = self.normalize_string(row['post_url'])
+                if not post_url:
+                    self.stats['failed'] += 1
+                    continue
+                created = (_as_datetime(row['created_date']) or _as_datetime(row['scraped_at'])
+                           or _as_datetime(row['logged_at']))
+                if created is None:
+                    self.log_error(ValueError("no created / scraped date"), f"Post {post_url}")
+                    continue
+                source_posts[row['source_id']] = post_url
+
+                username = _username(row['username'])
+                if not username:
+                    match = ACCOUNT_IN_URL.search(post_url)
+                    username = match.group(1) if match else 'unknown'
+                link = {
+                    'va_id': self.va_ids.get((row['va_name'] or '').strip()),
+                    'account_id': self.account_ids.get(username),
+                    'creator_id': self.creator_ids.get((row['creator_name'] or '').strip()),
+                    'content_set_id': self._content_set_id(row['creator_name'], row['set_id']),
+                }
+                likes, comments, shares = _count(row['likes']), _count(row['comments']), _count(row['shares'])
+                values = {
+                    'post_url': post_url,
+                    'account': username,
+                    'created_date': created,
+                    'views': _count(row['views']),
+                    'likes': likes,
+                    'comments': comments,
+                    'shares': shares,
+                    'bookmarks': _count(row['bookmarks']),
+                    'engagement': _count(row['engagement']) or likes + comments + shares,
+                    'engagement_rate': row['engagement_rate'],
+                    'hashtags': row['hashtags'],
+                    'sound': row['sound_title'],
+                    'source': f"legacy_{layout.name}",
+                    **link,
+                }
+                self.queue_row(Post, values, conflict_columns=('post_url',))
+                if any(value is not None for value in link.values()):
+                    links.append({'url': post_url, **link})
+            self.flush_rows()
+            self._fill_post_links(links)
+            self.batch_commit()
+            self._count_rows('posts', len(batch))
+
+        self._resolve_posts(source_posts.values())
+        return source_posts
+
+    def _fill_post_links(self, links: List[Dict[str, Any]]):
+        """Set missing va / account / creator / content-set ids on posts that already existed"""
+        if not links:
+            return
+        table = Post.__table__
+        stmt = update(table).where(table.c.post_url == bindparam('url')).values({
+            column: func.coalesce(table.c[column], bindparam(f"new_{column}")) for column in POST_LINK_COLUMNS
+        })
+        self.db.execute(stmt, [
+            {'url': link['url'], **{f"new_{column}": link[column] for column in POST_LINK_COLUMNS}}
+            for link in links
+        ])
+
+    def _resolve_posts(self, urls: Iterable[str]):
+        """post_url -> (unified id, va_id), cached"""
+        missing = [url for url in dict.fromkeys(urls) if url not in self.post_ids]
+        for start in range(0, len(missing), POST_LOOKUP_CHUNK):
+            chunk = missing[start:start + POST_LOOKUP_CHUNK]
+            for post_id, va_id, post_url in self.db.query(Post.id, Post.va_id, Post.post_url).filter(
+                    Post.post_url.in_(chunk)):
+                self.post_ids[post_url] = (post_id, va_id)
+
+    # Slides and metrics
+
+    def _migrate_slides(self, conn, layout: LegacyLayout, source_posts: Dict[Any, str]):
+        table = layout.slides_table
+        if not table or not source_posts:
+            return
+        sql = f"""
+            SELECT post_id, slide_number,
+                   COALESCE({layout.pick(table, 's', 'slide_url')}, {layout.pick(table, 's', 'cloud_url')}) AS slide_url,
+                   {layout.pick(table, 's', 'ocr_text')} AS ocr_text
+            FROM {table} s
+        """
+        for batch in self._rows(conn, sql):
+            for row in batch:
+                post = self.post_ids.get(source_posts.get(row['post_id']))
+                if post is None or not row['slide_url']:
+                    self.stats['skipped'] += 1
+                    continue
+                self.queue_row(Slide, {
+                    'post_id': post[0],
+                    'slide_url': row['slide_url'],
+                    'slide_index': int(row['slide_number']),
+                    'ocr_text': row['ocr_text'],
+                    'image_hash': hashlib.md5(row['slide_url'].encode()).hexdigest(),
+                }, conflict_columns=('post_id', 'slide_index'))
+            self.batch_commit()
+            self._count_rows('slides', len(batch))
+
+    def _migrate_metrics(self, conn, layout: LegacyLayout, source_posts: Dict[Any, str]):
+        if not layout.has('metrics_snapshots', 'timestamp') or not source_posts:
+            return
+        post_column = 'tiktok_post_id' if layout.has('metrics_snapshots', 'tiktok_post_id') else 'post_id'
+        sql = f"""
+            SELECT {post_column} AS post_id, views, likes, comments, shares, engagement,
+                   engagement_rate, "timestamp" AS snapshot_date
+            FROM metrics_snapshots
+        """
+        for batch in self._rows(conn, sql):
+            for row in batch:
+                post = self.post_ids.get(source_posts.get(row['post_id']))
+                snapshot_date = _as_datetime(row['snapshot_date'])
+                if post is None or snapshot_date is None:
+                    self.stats['skipped'] += 1
+                    continue
+                likes, comments, shares = _count(row['likes']), _count(row['comments']), _count(row['shares'])
+                self.queue_row(MetricsHistory, {
+                    'post_id': post[0],
+                    'va_id': post[1],
+                    'views': _count(row['views']),
+                    'likes': likes,
+                    'comments': comments,
+                    'shares': shares,
+                    'engagement': _count(row['engagement']) or likes + comments + shares,
+                    'engagement_rate': row['engagement_rate'],
+                    'snapshot_date': snapshot_date,
+                }, conflict_columns=('post_id', 'snapshot_date'))
+            self.batch_commit()
+            self._count_rows('metrics_history', len(batch))
+
+    # Follower snapshots and proof logs
+
+    def _migrate_follower_snapshots(self, conn, layout: LegacyLayout):
+        accounts = layout.accounts_table
+        if not accounts or not layout.has('follower_snapshots', 'account_id', 'followers'):
+            return
+        table = 'follower_snapshots'
+        sql = f"""
+            SELECT a.username, {layout.pick(table, 'f', 'snapshot_date', 'timestamp')} AS snapshot_date,
+                   f.followers, {layout.pick(table, 'f', 'following')} AS following,
+                   {layout.pick(table, 'f', 'likes', 'likes_count')} AS likes,
+                   {layout.pick(table, 'f', 'videos', 'posts_count')} AS videos,
+                   {layout.pick(table, 'f', 'followers_change')} AS followers_change,
+                   {layout.pick(table, 'f', 'followers_growth_rate')} AS followers_growth_rate,
+                   {layout.pick(table, 'f', 'data_source', 'scraping_method')} AS data_source
+            FROM follower_snapshots f
+            JOIN {accounts} a ON a.id = f.account_id
+        """
+        for batch in self._rows(conn, sql):
+            for row in batch:
+                account_id = self.account_ids.get(_username(row['username']))
+                snapshot_date = _as_datetime(row['snapshot_date'])
+                if account_id is None or snapshot_date is None:
+                    self.stats['skipped'] += 1
+                    continue
+                self.queue_row(FollowerSnapshot, {
+                    'account_id': account_id,
+                    'snapshot_date': snapshot_date,
+                    'followers': _count(row['followers']),
+                    'following': row['following'],
+                    'likes': row['likes'],
+                    'videos': row['videos'],
+                    'followers_change': row['followers_change'],
+                    'followers_growth_rate': row['followers_growth_rate'],
+                    'data_source': row['data_source'] or 'import',
+                }, conflict_columns=('account_id', 'snapshot_date'))
+            self.batch_commit()
+            self._count_rows('follower_snapshots', len(batch))
+
+    def _migrate_proof_logs(self, conn, layout: LegacyLayout):
+        if not layout.has('proof_logs', 'chat_id', 'message_id', 'post_url'):
+            return
+        table = 'proof_logs'
+        accounts = layout.accounts_table
+        sql = f"""
+            SELECT l."timestamp" AS logged_at, l.chat_id, l.message_id, l.post_type, l.platform, l.post_url,
+                   {layout.pick(table, 'l', 'dedupe_key')} AS dedupe_key,
+                   v.name AS va_name, c.name AS creator_name, s.set_id,
+                   {'a.username' if accounts else 'NULL'} AS username
+            FROM proof_logs l
+            LEFT JOIN vas v ON v.id = l.va_id
+            LEFT JOIN {layout.creators_table} c ON c.id = l.creator_id
+            LEFT JOIN content_sets s ON s.id = l.content_set_id
+            {f'LEFT JOIN {accounts} a ON a.id = l.account_id' if accounts else ''}
+        """
+        for batch in self._rows(conn, sql):
+            self._resolve_posts(row['post_url'] for row in batch if row['post_url'])
+            for row in batch:
+                logged_at = _as_datetime(row['logged_at'])
+                if logged_at is None or not row['post_url']:
+                    self.stats['failed'] += 1
+                    continue
+                post = self.post_ids.get(row['post_url'])
+                self.queue_row(ProofLog, {
+                    'timestamp': logged_at,
+                    'chat_id': str(row['chat_id']),
+                    'message_id': str(row['message_id']),
+                    'creator_id': self.creator_ids.get((row['creator_name'] or '').strip()),
+                    'va_id': self.va_ids.get((row['va_name'] or '').strip()),
+                    'account_id': self.account_ids.get(_username(row['username'])),
+                    'content_set_id': self._content_set_id(row['creator_name'], row['set_id']),
+                    'post_id': post[0] if post else None,
+                    'post_type': row['post_type'],
+                    'platform': row['platform'] or 'tiktok',
+                    'post_url': row['post_url'],
+                    'dedupe_key': row['dedupe_key'],
+                }, conflict_columns=('chat_id', 'message_id'))
+            self.batch_commit()
+            self._count_rows('proof_logs', len(batch))
+
+
+def migrate_legacy_database(source_url: str, db_session: Session, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Convenience function to import one legacy database
+    """
+    migrator = LegacySchemaMigrator(db_session, batch_size)
+    return migrator.migrate_database(source_url)
@@ -6,27 +6,106 @@ Created for Issue #6: Complete Data Migration Plan
 
 import json
 import hashlib
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List, Tuple, Union
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from .base_migrator import BaseMigrator
 from ..models import Post, Slide
 
+POST_LOOKUP_CHUNK = 500  # post URLs / ids per IN (...) lookup
+
+SHORT_LINK_PATTERN = re.compile(
+    r'(?:(?:www\.|m\.)?tiktok\.com/t|(?:vm|vt)\.tiktok\.com)/([A-Za-z0-9]+)'
+)
+CANONICAL_PATTERN = re.compile(r'tiktok\.com/@([^/?#]+)/(video|photo)/(\d+)')
+
+
+def post_url_key(post_url: str) -> str:
+    """
+    Form-independent key for a post URL: 'id:<video id>' for @user/video|photo/<id>
+    URLs, 'short:<code>' for short links, otherwise the URL without query/trailing slash
+    """
+    post_url = (post_url or '').strip()
+    match = CANONICAL_PATTERN.search(post_url)
+    if match:
+        return f"id:{match.group(3)}"
+    match = SHORT_LINK_PATTERN.search(post_url)
+    if match:
+        return f"short:{match.group(1)}"
+    return post_url.split('?')[0].split('#')[0].rstrip('/')
+
+
+def post_url_variants(post_url: str) -> List[str]:
+    """
+    The forms a post URL may be stored in (posts.post_url is matched exactly)
+    """
+    post_url = (post_url or '').strip()
+    match = CANONICAL_PATTERN.search(post_url)
+    if match:
+        username, post_type, video_id = match.groups()
+        path = f"tiktok.com/@{username}/{post_type}/{video_id}"
+        bases = [f"https://www.{path}", f"https://{path}", f"https://m.{path}"]
+    else:
+        match = SHORT_LINK_PATTERN.search(post_url)
+        if match:
+            code = match.group(1)
+            bases = [f"https://vt.tiktok.com/{code}", f"https://vm.tiktok.com/{code}",
+                     f"https://www.tiktok.com/t/{code}"]
+        else:
+            bases = [post_url.split('?')[0].split('#')[0].rstrip('/')]
+    variants = [post_url]
+    for base in bases:
+        variants.extend([base, base + '/'])
+    return list(dict.fromkeys(v for v in variants if v))
+
+
+def read_va_ocr_posts(va_dir: Path) -> Tuple[str, Union[List[Dict[str, Any]], Exception, None]]:
+    """
+    (VA name, parsed ocr_posts.json) for one by_va/<VA> directory; None when the file is
+    missing, the exception when it can't be read. Pure, so it runs in worker processes
+    """
+    va_dir = Path(va_dir)
+    ocr_posts_file = va_dir / "ocr_posts.json"
+    if not ocr_posts_file.exists():
+        return va_dir.name, None
+    try:
+        with open(ocr_posts_file, 'r', encoding='utf-8') as f:
+            return va_dir.name, json.load(f)
+    except Exception as e:
+        return va_dir.name, e
+
+
+def load_ocr_directory(ocr_dir: Union[str, Path], workers: int = 1) -> Dict[str, Any]:
+    """
+    Read every by_va/<VA>/ocr_posts.json, one directory per worker process
+    """
+    va_dirs = sorted(d for d in Path(ocr_dir).glob("by_va/*") if d.is_dir())
+    if workers > 1 and len(va_dirs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(va_dirs))) as pool:
+            return dict(pool.map(read_va_ocr_posts, va_dirs))
+    return dict(read_va_ocr_posts(va_dir) for va_dir in va_dirs)
+
 
 class OCRDataMigrator(BaseMigrator):
     """
     Migrates OCR data from october_ocr_data directory
     """
     
-    def __init__(self, db_session: Session):
-        super().__init__(db_session, "ocr_import")
-        self.post_cache = {}  # Cache for post lookups
+    def __init__(self, db_session: Session, batch_size: int = 1000):
+        super().__init__(db_session, "ocr_import", batch_size)
+        self.post_cache = {}  # post_url -> Post.id, filled by resolve_post_ids()
     
-    def migrate_ocr_directory(self, ocr_dir: str) -> Dict[str, int]:
+    def migrate_ocr_directory(self, ocr_dir: str, workers: int = 1,
+                              parsed: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
         """
         Migrate OCR data from directory structure
+        
+        `parsed` takes the result of load_ocr_directory() when the files were already read
+        (the orchestrator reads them while the CSV import runs)
         """
         ocr_path = Path(ocr_dir)
         if not ocr_path.exists():
@@ -35,20 +114,19 @@ class OCRDataMigrator(BaseMigrator):
         self.start_migration(str(ocr_path), "Import OCR text data for slides")
         
         try:
-            # Process all VA directories
-            va_dirs = [d for d in ocr_path.glob("by_va/*") if d.is_dir()]
-            self.log_progress(f"Found {len(va_dirs)} VA directories")
+            if parsed is None:
+                parsed = load_ocr_directory(ocr_path, workers)
+            self.log_progress(f"Found {len(parsed)} VA directories")
             
-            for va_dir in va_dirs:
-                va_name = va_dir.name
+            for va_name, ocr_posts in parsed.items():
                 self.log_progress(f"Processing VA: {va_name}")
                 
-                # Process OCR posts for this VA
-                ocr_posts_file = va_dir / "ocr_posts.json"
-                if ocr_posts_file.exists():
-                    self._process_va_ocr_posts(ocr_posts_file, va_name)
-                else:
+                if isinstance(ocr_posts, Exception):
+                    self.log_error(ocr_posts, f"Error reading OCR posts file for {va_name}")
+                elif ocr_posts is None:
                     self.log_progress(f"No ocr_posts.json found for {va_name}", "warning")
+                else:
+                    self._apply_va_ocr_posts(ocr_posts, va_name)
             
             # Final commit
             self.batch_commit(1000)
@@ -62,68 +140,109 @@ class OCRDataMigrator(BaseMigrator):
             self.complete_migration(success=False, error_message=str(e))
             raise
     
-    def _process_va_ocr_posts(self, ocr_posts_file: Path, va_name: str):
+    def _apply_va_ocr_posts(self, ocr_posts: List[Dict[str, Any]], va_name: str):
         """
-        Process OCR posts for a specific VA
+        Apply one VA's parsed OCR posts to the database
+        
+        All post URLs are resolved up front (resolve_post_ids) and the matching slides
+        prefetched in one pass; existing slides are then updated with a single
+        bulk_update_mappings() call instead of per-post queries
         """
-        try:
-            with open(ocr_posts_file, 'r', encoding='utf-8') as f:
-                ocr_posts = json.load(f)
-            
-            self.log_progress(f"Processing {len(ocr_posts)} OCR posts for {va_name}")
-            
-            for ocr_post in ocr_posts:
-                try:
-                    self._process_single_ocr_post(ocr_post)
-                except Exception as e:
-                    self.log_error(e, f"Error processing OCR post: {ocr_post.get('post_url', 'unknown')}")
-                    continue
-            
-        except Exception as e:
-            self.log_error(e, f"Error reading OCR posts file: {ocr_posts_file}")
+        self.log_progress(f"Processing {len(ocr_posts)} OCR posts for {va_name}")
+        
+        post_ids = self.resolve_post_ids(
+            ocr_post.get('post_url') for ocr_post in ocr_posts if ocr_post.get('post_url')
+        )
+        slides_by_post = self._prefetch_slides(set(post_ids.values()))
+        
+        slide_updates = {}
+        for ocr_post in ocr_posts:
+            try:
+                self._process_single_ocr_post(ocr_post, post_ids, slides_by_post, slide_updates)
+            except Exception as e:
+                self.log_error(e, f"Error processing OCR post: {ocr_post.get('post_url', 'unknown')}")
+                continue
+        
+        mappings = list(slide_updates.values())
+        for start in range(0, len(mappings), self.batch_size):
+            self.db.bulk_update_mappings(Slide, mappings[start:start + self.batch_size])
+        self.log_progress(f"Updated OCR text on {len(mappings)} slides for {va_name}")
     
-    def _process_single_ocr_post(self, ocr_post: Dict[str, Any]):
+    def _process_single_ocr_post(self, ocr_post: Dict[str, Any], post_ids: Dict[str, int],
+                                 slides_by_post: Dict[int, List[Dict[str, Any]]],
+                                 slide_updates: Dict[int, Dict[str, Any]]):
         """
-        Process a single OCR post and update slides
+        Process a single OCR post against the prefetched posts and slides
         """
         post_url = ocr_post.get('post_url')
         if not post_url:
             self.log_error(ValueError("Missing post_url in OCR data"))
             return
         
-        # Find the post in database
-        post = self._get_post_by_url(post_url)
-        if not post:
+        post_id = post_ids.get(post_url)
+        if post_id is None:
             self.log_progress(f"Post not found in database: {post_url}", "warning")
             self.stats['skipped'] += 1
             return
         
         # Update slides with OCR data
-        self._update_slides_with_ocr(post, ocr_post)
+        self._update_slides_with_ocr(post_id, post_url, ocr_post, slides_by_post, slide_updates)
         
         self.stats['processed'] += 1
     
-    def _get_post_by_url(self, post_url: str) -> Optional[Post]:
+    def resolve_post_ids(self, post_urls: Iterable[str]) -> Dict[str, int]:
         """
-        Get post by URL with caching
+        Map post URLs to Post.id with chunked IN (...) lookups
+        
+        Every stored form of a URL (canonical with or without www/trailing slash,
+        vm/vt/tiktok.com/t short links) is looked up, so an OCR file written with a
+        different URL form still finds its post. URLs that don't resolve are left out
         """
-        if post_url in self.post_cache:
-            return self.post_cache[post_url]
+        post_urls = list(dict.fromkeys(post_urls))
+        missing = [url for url in post_urls if url not in self.post_cache]
+        
+        candidates = list(dict.fromkeys(
+            variant for url in missing for variant in post_url_variants(url)
+        ))
+        ids_by_key = {}
+        for start in range(0, len(candidates), POST_LOOKUP_CHUNK):
+            chunk = candidates[start:start + POST_LOOKUP_CHUNK]
+            for stored_url, post_id in (
+                self.db.query(Post.post_url, Post.id).filter(Post.post_url.in_(chunk))
+            ):
+                ids_by_key[post_url_key(stored_url)] = post_id
         
-        post = self.db.query(Post).filter(Post.post_url == post_url).first()
-        if post:
-            self.post_cache[post_url] = post
+        for url in missing:
+            post_id = ids_by_key.get(post_url_key(url))
+            if post_id is not None:
+                self.post_cache[url] = post_id
         
-        return post
+        return {url: self.post_cache[url] for url in post_urls if url in self.post_cache}
     
-    def _update_slides_with_ocr(self, post: Post, ocr_post: Dict[str, Any]):
+    def _prefetch_slides(self, post_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
         """
-        Update slides with OCR text data
+        Existing slides (id, ocr_text) for the given posts, grouped by post_id
+        """
+        post_ids = sorted(post_ids)
+        slides_by_post = {}
+        for start in range(0, len(post_ids), POST_LOOKUP_CHUNK):
+            chunk = post_ids[start:start + POST_LOOKUP_CHUNK]
+            for slide_id, post_id, ocr_text in (
+                self.db.query(Slide.id, Slide.post_id, Slide.ocr_text).filter(Slide.post_id.in_(chunk))
+            ):
+                slides_by_post.setdefault(post_id, []).append({'id': slide_id, 'ocr_text': ocr_text})
+        return slides_by_post
+    
+    def _update_slides_with_ocr(self, post_id: int, post_url: str, ocr_post: Dict[str, Any],
+                                slides_by_post: Dict[int, List[Dict[str, Any]]],
+                                slide_updates: Dict[int, Dict[str, Any]]):
+        """
+        Collect OCR text updates for a post's slides (written by _apply_va_ocr_posts)
         """
         # Get OCR text
         ocr_text = ocr_post.get('combined_text', '') or ocr_post.get('ocr_text', '')
         if not ocr_text:
-            self.log_progress(f"No OCR text for post: {post.post_url}", "warning")
+            self.log_progress(f"No OCR text for post: {post_url}", "warning")
             return
         
         # Get or create text hash
@@ -131,35 +250,31 @@ class OCRDataMigrator(BaseMigrator):
         if not text_hash:
             text_hash = hashlib.md5(ocr_text.encode()).hexdigest()
         
-        # Check if slides already exist for this post
-        existing_slides = self.db.query(Slide).filter(Slide.post_id == post.id).all()
+        existing_slides = slides_by_post.get(post_id)
         
         if existing_slides:
             # Update existing slides with OCR text
             for slide in existing_slides:
-                if not slide.ocr_text:  # Only update if no existing OCR text
-                    slide.ocr_text = ocr_text
-                    slide.image_hash = text_hash
-                    slide.ocr_confidence = 0.95  # Default confidence
+                if not slide['ocr_text']:  # Only update if no existing OCR text
+                    slide['ocr_text'] = ocr_text
+                    slide_updates[slide['id']] = {
+                        'id': slide['id'],
+                        'ocr_text': ocr_text,
+                        'image_hash': text_hash,
+                        'ocr_confidence': 0.95  # Default confidence
+                    }
+            self.stats['imported'] += 1
         else:
             # Create a single slide record with OCR text
-            # This handles cases where slides weren't parsed yet
-            slide = Slide(
-                post_id=post.id,
-                slide_url="",  # Will be updated when slides are parsed
-                slide_index=1,
-                ocr_text=ocr_text,
-                image_hash=text_hash,
-                ocr_confidence=0.95
-            )
-            
-            if self.safe_add_record(slide, "slide"):
-                self.stats['imported'] += 1
-            else:
-                self.stats['failed'] += 1
-                return
-        
-        self.stats['imported'] += 1
+            # This handles cases where slides weren't parsed yet (counted when written)
+            self.queue_row(Slide, {
+                'post_id': post_id,
+                'slide_url': "",  # Will be updated when slides are parsed
+                'slide_index': 1,
+                'ocr_text': ocr_text,
+                'image_hash': text_hash,
+                'ocr_confidence': 0.95
+            }, conflict_columns=['post_id', 'slide_index'])
     
     def migrate_single_ocr_file(self, ocr_file: str) -> Dict[str, int]:
         """
@@ -175,19 +290,12 @@ class OCRDataMigrator(BaseMigrator):
             with open(ocr_path, 'r', encoding='utf-8') as f:
                 ocr_data = json.load(f)
             
-            if isinstance(ocr_data, list):
-                # Process list of OCR posts
-                for ocr_post in ocr_data:
-                    try:
-                        self._process_single_ocr_post(ocr_post)
-                    except Exception as e:
-                        self.log_error(e, f"Error processing OCR post")
-                        continue
-            elif isinstance(ocr_data, dict):
-                # Process single OCR post
-                self._process_single_ocr_post(ocr_data)
-            else:
+            if isinstance(ocr_data, dict):
+                # Single OCR post
+                ocr_data = [ocr_data]
+            elif not isinstance(ocr_data, list):
                 raise ValueError("Invalid OCR data format")
+            self._apply_va_ocr_posts(ocr_data, ocr_path.stem)
             
             # Final commit
             self.batch_commit(1000)
@@ -5,54 +5,104 @@ Created for Issue #6: Complete Data Migration Plan
 """
 
 import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, List, Tuple
 from datetime import datetime
+from sqlalchemy import exists, func
 from sqlalchemy.orm import Session
 
 from .base_migrator import BaseMigrator
 from ..models import Post, Slide
 
+# Common image URL patterns
+VALID_SLIDE_DOMAINS = [
+    'tiktokcdn-us.com',
+    'tiktokcdn.com',
+    'p16-common-sign.tiktokcdn-us.com',
+    'p19-sign.tiktokcdn-us.com'
+]
+
+HASH_LOOKUP_CHUNK = 500  # image hashes per IN (...) lookup
+
+
+def is_valid_slide_url(url: str) -> bool:
+    """
+    Validate slide URL format
+    """
+    if not url or len(url) < 10:
+        return False
+    
+    return any(domain in url for domain in VALID_SLIDE_DOMAINS)
+
+
+def split_slide_urls(slides_str: str) -> Tuple[List[str], List[str]]:
+    """
+    Pipe-separated slide URLs -> (valid URLs, invalid URLs)
+    """
+    if not slides_str:
+        return [], []
+    
+    urls = [url.strip() for url in slides_str.split('|') if url.strip()]
+    valid_urls = [url for url in urls if is_valid_slide_url(url)]
+    invalid_urls = [url for url in urls if not is_valid_slide_url(url)]
+    return valid_urls, invalid_urls
+
+
+def parse_slide_page(rows: List[Tuple[int, str, str]]) -> List[Dict[str, Any]]:
+    """
+    Parse one page of (post_id, post_url, slides) rows; pure, so it runs in worker processes
+    """
+    parsed = []
+    for post_id, post_url, slides_str in rows:
+        valid_urls, invalid_urls = split_slide_urls(slides_str)
+        parsed.append({
+            'post_id': post_id,
+            'post_url': post_url,
+            'slides': [(url, hashlib.md5(url.encode()).hexdigest()) for url in valid_urls],
+            'invalid': invalid_urls
+        })
+    return parsed
+
 
 class SlidesMigrator(BaseMigrator):
     """
     Migrates slide URLs from posts and creates individual slide records
     """
     
-    def __init__(self, db_session: Session):
-        super().__init__(db_session, "slides_import")
+    def __init__(self, db_session: Session, batch_size: int = 1000):
+        super().__init__(db_session, "slides_import", batch_size)
         self.slide_cache = {}  # Cache for slide lookups
     
-    def migrate_slides_from_posts(self, batch_size: int = 1000) -> Dict[str, int]:
+    def migrate_slides_from_posts(self, batch_size: int = 1000, workers: int = 1) -> Dict[str, int]:
         """
         Migrate slides from posts that have slide URLs
+        
+        Posts are streamed in id-ordered pages of `batch_size` (one id range each). With
+        workers > 1 pages are parsed in a process pool while earlier pages are written.
         """
+        self.batch_size = batch_size
         self.start_migration("posts.slides", "Parse slide URLs and create slide records")
         
         try:
-            # Get all posts with slides
-            posts_with_slides = self.db.query(Post).filter(
-                Post.slides.isnot(None),
-                Post.slides != ''
-            ).all()
-            
-            self.log_progress(f"Found {len(posts_with_slides)} posts with slides")
-            
-            # Process posts in batches
-            for i in range(0, len(posts_with_slides), batch_size):
-                batch = posts_with_slides[i:i + batch_size]
-                self.log_progress(f"Processing batch {i//batch_size + 1}: {len(batch)} posts")
-                
-                for post in batch:
-                    try:
-                        self._process_post_slides(post)
-                    except Exception as e:
-                        self.log_error(e, f"Error processing slides for post: {post.post_url}")
-                        continue
-                
-                # Commit batch
-                self.batch_commit(batch_size)
-                self.log_progress(f"Progress: {self.stats['processed']} processed, {self.stats['imported']} slides created")
+            pages = self._iter_slide_pages(batch_size)
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # Keep a bounded window of pages parsing ahead of the writes, in page order
+                    in_flight = deque()
+                    page_number = 0
+                    for page in pages:
+                        in_flight.append(pool.submit(parse_slide_page, page))
+                        if len(in_flight) >= workers * 2:
+                            page_number += 1
+                            self._write_slide_page(in_flight.popleft().result(), page_number)
+                    while in_flight:
+                        page_number += 1
+                        self._write_slide_page(in_flight.popleft().result(), page_number)
+            else:
+                for page_number, page in enumerate(pages, 1):
+                    self._write_slide_page(parse_slide_page(page), page_number)
             
             self.complete_migration(success=True)
             self.log_progress(f"Slides migration completed: {self.stats}")
@@ -63,53 +113,82 @@ class SlidesMigrator(BaseMigrator):
             self.complete_migration(success=False, error_message=str(e))
             raise
     
-    def _process_post_slides(self, post: Post):
+    def _iter_slide_pages(self, batch_size: int) -> Iterator[List[Tuple[int, str, str]]]:
         """
-        Process slides for a single post
+        (id, post_url, slides) of posts with slides, keyset-paginated by id
         """
-        if not post.slides:
-            return
-        
-        # Parse slide URLs
-        slide_urls = self._parse_slide_urls(post.slides)
-        if not slide_urls:
-            return
+        last_id = 0
+        while True:
+            page = self.db.query(Post.id, Post.post_url, Post.slides).filter(
+                Post.id > last_id,
+                Post.slides.isnot(None),
+                Post.slides != ''
+            ).order_by(Post.id).limit(batch_size).all()
+            if not page:
+                return
+            last_id = page[-1][0]
+            yield [tuple(row) for row in page]
+    
+    def _write_slide_page(self, parsed: List[Dict[str, Any]], page_number: int):
+        """
+        Create slide records for one parsed page: existing slides and duplicate hashes are
+        looked up once per page instead of once per post / slide
+        """
+        post_ids = [post['post_id'] for post in parsed]
+        self.log_progress(f"Processing page {page_number}: {len(parsed)} posts (ids {post_ids[0]}-{post_ids[-1]})")
         
-        # Check if slides already exist for this post
-        existing_slides = self.db.query(Slide).filter(Slide.post_id == post.id).all()
-        if existing_slides:
-            self.log_progress(f"Slides already exist for post: {post.post_url}", "warning")
-            self.stats['skipped'] += 1
-            return
+        posts_with_slides = {
+            post_id for (post_id,) in
+            self.db.query(Slide.post_id).filter(Slide.post_id.in_(post_ids)).distinct()
+        }
+        hashes = [image_hash for post in parsed for _, image_hash in post['slides']]
+        existing_hashes = set()
+        for start in range(0, len(hashes), HASH_LOOKUP_CHUNK):
+            chunk = hashes[start:start + HASH_LOOKUP_CHUNK]
+            existing_hashes.update(
+                image_hash for (image_hash,) in
+                self.db.query(Slide.image_hash).filter(Slide.image_hash.in_(chunk))
+            )
         
-        # Create slide records
-        for i, slide_url in enumerate(slide_urls, 1):
-            slide = self._create_slide_record(post, slide_url, i)
-            if slide:
-                if self.safe_add_record(slide, "slide"):
-                    self.stats['imported'] += 1
-                else:
-                    self.stats['failed'] += 1
+        for post in parsed:
+            try:
+                for url in post['invalid']:
+                    self.log_progress(f"Invalid slide URL: {url[:50]}...", "warning")
+                if not post['slides']:
+                    continue
+                if post['post_id'] in posts_with_slides:
+                    self.log_progress(f"Slides already exist for post: {post['post_url']}", "warning")
+                    self.stats['skipped'] += 1
+                    continue
+                
+                for slide_index, (slide_url, image_hash) in enumerate(post['slides'], 1):
+                    if image_hash in existing_hashes:
+                        self.log_progress(f"Duplicate slide found: {slide_url[:50]}...", "warning")
+                        continue
+                    existing_hashes.add(image_hash)
+                    self.queue_row(Slide, {
+                        'post_id': post['post_id'],
+                        'slide_url': slide_url,
+                        'slide_index': slide_index,
+                        'image_hash': image_hash
+                    }, conflict_columns=['post_id', 'slide_index'])
+                
+                self.stats['processed'] += 1
+            except Exception as e:
+                self.log_error(e, f"Error processing slides for post: {post['post_url']}")
+                continue
         
-        self.stats['processed'] += 1
+        # Commit page
+        self.batch_commit()
+        self.log_progress(f"Progress: {self.stats['processed']} processed, {self.stats['imported']} slides created")
     
     def _parse_slide_urls(self, slides_str: str) -> List[str]:
         """
         Parse pipe-separated slide URLs
         """
-        if not slides_str:
-            return []
-        
-        # Split by pipe and clean URLs
-        urls = [url.strip() for url in slides_str.split('|') if url.strip()]
-        
-        # Filter out invalid URLs
-        valid_urls = []
-        for url in urls:
-            if self._is_valid_slide_url(url):
-                valid_urls.append(url)
-            else:
-                self.log_progress(f"Invalid slide URL: {url[:50]}...", "warning")
+        valid_urls, invalid_urls = split_slide_urls(slides_str)
+        for url in invalid_urls:
+            self.log_progress(f"Invalid slide URL: {url[:50]}...", "warning")
         
         return valid_urls
     
@@ -117,48 +196,7 @@ class SlidesMigrator(BaseMigrator):
         """
         Validate slide URL format
         """
-        if not url or len(url) < 10:
-            return False
-        
-        # Check for common image URL patterns
-        valid_domains = [
-            'tiktokcdn-us.com',
-            'tiktokcdn.com',
-            'p16-common-sign.tiktokcdn-us.com',
-            'p19-sign.tiktokcdn-us.com'
-        ]
-        
-        return any(domain in url for domain in valid_domains)
-    
-    def _create_slide_record(self, post: Post, slide_url: str, slide_index: int) -> Optional[Slide]:
-        """
-        Create a slide record
-        """
-        try:
-            # Generate image hash for duplicate detection
-            image_hash = hashlib.md5(slide_url.encode()).hexdigest()
-            
-            # Check for duplicates
-            existing_slide = self.db.query(Slide).filter(
-                Slide.image_hash == image_hash
-            ).first()
-            
-            if existing_slide:
-                self.log_progress(f"Duplicate slide found: {slide_url[:50]}...", "warning")
-                return None
-            
-            slide = Slide(
-                post_id=post.id,
-                slide_url=slide_url,
-                slide_index=slide_index,
-                image_hash=image_hash
-            )
-            
-            return slide
-            
-        except Exception as e:
-            self.log_error(e, f"Error creating slide record: {slide_url}")
-            return None
+        return is_valid_slide_url(url)
     
     def migrate_slides_from_csv(self, csv_path: str, batch_size: int = 1000) -> Dict[str, int]:
         """
@@ -168,6 +206,7 @@ class SlidesMigrator(BaseMigrator):
         if not csv_path.exists():
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
         
+        self.batch_size = batch_size
         self.start_migration(str(csv_path), "Import slides from CSV file")
         
         try:
@@ -186,21 +225,10 @@ class SlidesMigrator(BaseMigrator):
                 total_chunks += 1
                 self.log_progress(f"Processing chunk {total_chunks} ({len(chunk)} records)")
                 
-                for _, row in chunk.iterrows():
-                    try:
-                        if pd.notna(row.get('slides')) and row['slides']:
-                            self._process_csv_row_slides(row)
-                    except Exception as e:
-                        self.log_error(e, f"Error processing CSV row: {row.get('post_url', 'unknown')}")
-                        continue
-                
-                # Commit batch
-                if total_chunks % 10 == 0:
-                    self.batch_commit(batch_size)
-                    self.log_progress(f"Progress: {self.stats['processed']} processed, {self.stats['imported']} slides created")
-            
-            # Final commit
-            self.batch_commit(batch_size)
+                chunk = chunk[chunk['slides'].notna() & (chunk['slides'].astype(str).str.strip() != '')]
+                page = self._resolve_csv_slide_rows(chunk)
+                if page:
+                    self._write_slide_page(parse_slide_page(page), total_chunks)
             
             self.complete_migration(success=True)
             self.log_progress(f"CSV slides migration completed: {self.stats}")
@@ -211,37 +239,24 @@ class SlidesMigrator(BaseMigrator):
             self.complete_migration(success=False, error_message=str(e))
             raise
     
-    def _process_csv_row_slides(self, row):
+    def _resolve_csv_slide_rows(self, chunk) -> List[Tuple[int, str, str]]:
         """
-        Process slides from a CSV row
+        (post_id, post_url, slides) for a CSV chunk, post ids resolved in one IN query
         """
-        post_url = row['post_url']
-        slides_str = row['slides']
+        slides_by_url = dict(zip(chunk['post_url'], chunk['slides']))
+        post_ids = dict(
+            self.db.query(Post.post_url, Post.id).filter(Post.post_url.in_(list(slides_by_url)))
+        )
         
-        # Find the post in database
-        post = self.db.query(Post).filter(Post.post_url == post_url).first()
-        if not post:
-            self.log_progress(f"Post not found in database: {post_url}", "warning")
-            self.stats['skipped'] += 1
-            return
+        for post_url in slides_by_url:
+            if post_url not in post_ids:
+                self.log_progress(f"Post not found in database: {post_url}", "warning")
+                self.stats['skipped'] += 1
         
-        # Check if slides already exist
-        existing_slides = self.db.query(Slide).filter(Slide.post_id == post.id).all()
-        if existing_slides:
-            self.stats['skipped'] += 1
-            return
-        
-        # Parse and create slides
-        slide_urls = self._parse_slide_urls(slides_str)
-        for i, slide_url in enumerate(slide_urls, 1):
-            slide = self._create_slide_record(post, slide_url, i)
-            if slide:
-                if self.safe_add_record(slide, "slide"):
-                    self.stats['imported'] += 1
-                else:
-                    self.stats['failed'] += 1
-        
-        self.stats['processed'] += 1
+        return sorted(
+            (post_ids[post_url], post_url, slides_str)
+            for post_url, slides_str in slides_by_url.items() if post_url in post_ids
+        )
     
     def get_slides_statistics(self) -> Dict[str, Any]:
         """
@@ -260,7 +275,7 @@ class SlidesMigrator(BaseMigrator):
             # Count slides by post
             slides_by_post = self.db.query(
                 Slide.post_id,
-                self.db.func.count(Slide.id).label('slide_count')
+                func.count(Slide.id).label('slide_count')
             ).group_by(Slide.post_id).all()
             
             # Calculate statistics
@@ -290,9 +305,9 @@ class SlidesMigrator(BaseMigrator):
         
         try:
             # Check for orphaned slides
-            orphaned_slides = self.db.query(Slide).filter(
-                ~Slide.post_id.in_(self.db.query(Post.id))
-            ).count()
+            orphaned_slides = self.db.query(func.count(Slide.id)).filter(
+                ~exists().where(Post.id == Slide.post_id)
+            ).scalar()
             
             if orphaned_slides > 0:
                 issues.append(f"Found {orphaned_slides} orphaned slides")
@@ -300,9 +315,9 @@ class SlidesMigrator(BaseMigrator):
             # Check for duplicate slide URLs
             duplicate_urls = self.db.query(
                 Slide.slide_url,
-                self.db.func.count(Slide.id).label('count')
+                func.count(Slide.id).label('count')
             ).group_by(Slide.slide_url).having(
-                self.db.func.count(Slide.id) > 1
+                func.count(Slide.id) > 1
             ).all()
             
             if duplicate_urls:
@@ -329,12 +344,12 @@ class SlidesMigrator(BaseMigrator):
             return {'valid': False, 'issues': [str(e)]}
 
 
-def migrate_slides_from_posts(db_session: Session, batch_size: int = 1000) -> Dict[str, int]:
+def migrate_slides_from_posts(db_session: Session, batch_size: int = 1000, workers: int = 1) -> Dict[str, int]:
     """
     Convenience function to migrate slides from posts
     """
     migrator = SlidesMigrator(db_session)
-    return migrator.migrate_slides_from_posts(batch_size)
+    return migrator.migrate_slides_from_posts(batch_size, workers)
 
 
 def migrate_slides_from_csv(csv_path: str, db_session: Session, batch_size: int = 1000) -> Dict[str, int]:
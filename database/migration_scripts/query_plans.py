@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Query Plan Validation for TikTok Analytics Database
+Performance validation from query plans instead of wall-clock thresholds on count()
+
+- HOT_QUERIES: registry of the queries the dashboard, exports, VA rollups and
+  attribution joins actually run
+- Each query is EXPLAINed (EXPLAIN QUERY PLAN on SQLite, EXPLAIN (FORMAT JSON) on
+  PostgreSQL); full table scans that are not expected are flagged, with the filter
+  columns that an index would need
+- Each query is timed over repeated runs and reported as p50 / p95 against its budget
+
+Usage:
+  python -m database.migration_scripts.query_plans --repeats 20
+"""
+
+import argparse
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from sqlalchemy import DateTime, UniqueConstraint, func, literal_column, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, ClauseElement
+from sqlalchemy.sql.expression import Executable
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.schema import Column
+from sqlalchemy.sql.visitors import iterate
+
+from ..models import Base, VA, Post, MetricsHistory, RefreshSchedule, Comment, Slide
+
+
+# ============= EXPLAIN =============
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN <statement> with the statement's bound parameters intact"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+def _explained(prefix, element, compiler, **kw):
+    sql = compiler.process(element.statement, **kw)
+    # Plan rows are not the statement's columns: drop its result map / type processors
+    compiler._result_columns = []
+    return f'{prefix} {sql}'
+
+
+@compiles(Explain, 'sqlite')
+def _explain_sqlite(element, compiler, **kw):
+    return _explained('EXPLAIN QUERY PLAN', element, compiler, **kw)
+
+
+@compiles(Explain, 'postgresql')
+def _explain_postgresql(element, compiler, **kw):
+    return _explained('EXPLAIN (FORMAT JSON)', element, compiler, **kw)
+
+
+@compiles(Explain)
+def _explain_default(element, compiler, **kw):
+    return _explained('EXPLAIN', element, compiler, **kw)
+
+
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?(.*)$')
+SQLITE_SEARCH = re.compile(r'^SEARCH (?:TABLE )?(\w+)(?: AS \w+)?(.*)$')
+
+
+@dataclass
+class QueryPlan:
+    """What the planner will do: per-table access paths, full scans and sorts"""
+    steps: List[str] = field(default_factory=list)
+    full_scans: List[str] = field(default_factory=list)
+    index_scans: List[str] = field(default_factory=list)
+    index_lookups: List[str] = field(default_factory=list)
+    temp_sorts: int = 0
+
+
+def _sqlite_plan(rows, table_names) -> QueryPlan:
+    plan = QueryPlan()
+    for row in rows:
+        detail = row[-1]
+        plan.steps.append(detail)
+        scan = SQLITE_SCAN.match(detail)
+        search = SQLITE_SEARCH.match(detail)
+        if scan and scan.group(1) in table_names:
+            if 'INDEX' in scan.group(2):
+                plan.index_scans.append(scan.group(1))
+            else:
+                plan.full_scans.append(scan.group(1))
+        elif search and search.group(1) in table_names:
+            plan.index_lookups.append(search.group(1))
+        elif detail.startswith('USE TEMP B-TREE'):
+            plan.temp_sorts += 1
+    return plan
+
+
+def _postgresql_plan(rows, table_names) -> QueryPlan:
+    plan = QueryPlan()
+    document = rows[0][0]
+    if isinstance(document, str):
+        document = json.loads(document)
+
+    def walk(node):
+        node_type = node.get('Node Type', '')
+        relation = node.get('Relation Name')
+        plan.steps.append(f"{node_type} {relation or ''}".strip())
+        if relation in table_names:
+            if node_type == 'Seq Scan':
+                plan.full_scans.append(relation)
+            elif node_type in ('Index Scan', 'Index Only Scan', 'Bitmap Heap Scan'):
+                if node.get('Index Cond') or node.get('Recheck Cond'):
+                    plan.index_lookups.append(relation)
+                else:
+                    plan.index_scans.append(relation)
+        if node_type in ('Sort', 'Incremental Sort'):
+            plan.temp_sorts += 1
+        for child in node.get('Plans', []):
+            walk(child)
+
+    walk(document[0]['Plan'])
+    return plan
+
+
+def explain(db: Session, statement) -> QueryPlan:
+    """Planner output for `statement` on the session's database"""
+    rows = db.execute(Explain(statement)).all()
+    table_names = set(Base.metadata.tables)
+    if db.get_bind().dialect.name == 'postgresql':
+        return _postgresql_plan(rows, table_names)
+    return _sqlite_plan(rows, table_names)
+
+
+FILTER_OPERATORS = {operators.eq, operators.ge, operators.gt, operators.le, operators.lt, operators.in_op}
+
+
+def indexed_columns(table_name: str) -> set:
+    """Columns that lead an index (or the primary key) on `table_name`"""
+    table = Base.metadata.tables[table_name]
+    leading = {column.name for column in table.primary_key.columns[:1]}
+    leading.update(next(iter(index.columns)).name for index in table.indexes)
+    leading.update(
+        next(iter(constraint.columns)).name for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint) and constraint.columns
+    )
+    return leading
+
+
+def filter_columns(statement) -> Dict[str, List[str]]:
+    """Table -> columns compared in WHERE / JOIN ON (where an index would help), in query order"""
+    columns: Dict[str, List[str]] = {}
+    for element in iterate(statement):
+        if isinstance(element, BinaryExpression) and element.operator in FILTER_OPERATORS:
+            for side in (element.left, element.right):
+                if isinstance(side, Column) and side.table is not None and side.table.name in Base.metadata.tables:
+                    names = columns.setdefault(side.table.name, [])
+                    if side.name not in names:
+                        names.append(side.name)
+    return columns
+
+
+# ============= DATE ARITHMETIC =============
+
+class days_after(FunctionElement):
+    """<datetime expression> + N days in the dialect's own date arithmetic
+
+    `column + timedelta` compiles to numeric addition on SQLite, where datetimes are text.
+    """
+    type = DateTime()
+    name = 'days_after'
+    inherit_cache = True
+
+    def __init__(self, expression, days: int):
+        # The day count goes into the SQL text (and the cache key), not a bound parameter
+        super().__init__(expression, literal_column(str(int(days))))
+
+
+@compiles(days_after, 'sqlite')
+def _days_after_sqlite(element, compiler, **kw):
+    expression, days = element.clauses.clauses
+    # %f is SS.SSS; the trailing 000 matches the SS.ffffff text SQLAlchemy stores, so
+    # string comparison with stored datetimes stays in time order
+    return (f"strftime('%Y-%m-%d %H:%M:%f000', {compiler.process(expression, **kw)}, "
+            f"'{days.name} days')")
+
+
+@compiles(days_after)
+def _days_after_default(element, compiler, **kw):
+    expression, days = element.clauses.clauses
+    return f"({compiler.process(expression, **kw)} + INTERVAL '{days.name} days')"
+
+
+# ============= HOT QUERIES =============
+
+@dataclass
+class QueryContext:
+    """Parameter values taken from the data, so lookups hit real rows"""
+    now: datetime
+    post_id: int
+    va_id: Optional[int]
+    account: str
+
+    @classmethod
+    def from_db(cls, db: Session) -> 'QueryContext':
+        newest = db.query(Post.id, Post.va_id, Post.account, Post.created_date) \
+            .order_by(Post.created_date.desc()).first()
+        if newest is None:
+            return cls(now=datetime.utcnow(), post_id=0, va_id=None, account='')
+        return cls(now=newest.created_date, post_id=newest.id, va_id=newest.va_id, account=newest.account)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A production query and what its plan is allowed to do"""
+    name: str
+    category: str                       # dashboard, export, rollup, attribution
+    build: Callable[[QueryContext], Any]
+    budget_ms: float                    # p95 budget
+    scans_ok: FrozenSet[str] = frozenset()   # tables this query is meant to read in full
+    timed: bool = True                  # False: whole-table reads, plan checked only (storage_benchmark times them)
+
+
+def _top_posts_30d(ctx):
+    return (select(Post.id, Post.post_url, Post.account, Post.views, Post.engagement_rate)
+            .where(Post.created_date >= ctx.now - timedelta(days=30))
+            .order_by(Post.views.desc()).limit(50))
+
+
+def _va_recent_posts(ctx):
+    return (select(Post.id, Post.post_url, Post.views, Post.created_date)
+            .where(Post.va_id == ctx.va_id, Post.created_date >= ctx.now - timedelta(days=14))
+            .order_by(Post.created_date.desc()))
+
+
+def _account_timeline(ctx):
+    return (select(Post.id, Post.created_date, Post.views)
+            .where(Post.account == ctx.account)
+            .order_by(Post.created_date.desc()).limit(100))
+
+
+def _post_timeseries(ctx):
+    return (select(MetricsHistory.snapshot_date, MetricsHistory.views, MetricsHistory.engagement)
+            .where(MetricsHistory.post_id == ctx.post_id)
+            .order_by(MetricsHistory.snapshot_date))
+
+
+def _refresh_due(ctx):
+    return (select(RefreshSchedule.post_id)
+            .where(RefreshSchedule.next_due_at <= ctx.now)
+            .order_by(RefreshSchedule.next_due_at).limit(500))
+
+
+def _post_comments(ctx):
+    return (select(Comment.comment_id, Comment.text, Comment.commented_at)
+            .where(Comment.post_id == ctx.post_id)
+            .order_by(Comment.commented_at.desc()).limit(200))
+
+
+def _export_posts_with_va(ctx):
+    return (select(Post.id, Post.post_url, Post.account, VA.name, Post.created_date, Post.views,
+                   Post.likes, Post.comments, Post.shares, Post.engagement_rate)
+            .outerjoin(VA, VA.id == Post.va_id))
+
+
+def _export_metrics_window(ctx):
+    return (select(MetricsHistory.post_id, MetricsHistory.snapshot_date, MetricsHistory.views)
+            .where(MetricsHistory.snapshot_date >= ctx.now - timedelta(days=7)))
+
+
+def _va_performance(ctx):
+    return (select(VA.name, func.count(Post.id), func.sum(Post.views), func.sum(Post.engagement),
+                   func.avg(Post.engagement_rate))
+            .join(Post, Post.va_id == VA.id)
+            .group_by(VA.name))
+
+
+def _va_daily_growth(ctx):
+    day = func.date(MetricsHistory.snapshot_date)
+    return (select(MetricsHistory.va_id, day, func.sum(MetricsHistory.views))
+            .where(MetricsHistory.snapshot_date >= ctx.now - timedelta(days=7))
+            .group_by(MetricsHistory.va_id, day))
+
+
+def _account_summary(ctx):
+    return (select(Post.account, func.count(), func.sum(Post.views), func.avg(Post.engagement_rate))
+            .group_by(Post.account))
+
+
+def _first_day_views(ctx):
+    """Views each recent post gathered in its first day (posting -> growth attribution)"""
+    return (select(MetricsHistory.post_id, Post.va_id, func.max(MetricsHistory.views))
+            .join(MetricsHistory, MetricsHistory.post_id == Post.id)
+            .where(Post.created_date >= ctx.now - timedelta(days=30),
+                   MetricsHistory.snapshot_date <= days_after(Post.created_date, 1))
+            .group_by(MetricsHistory.post_id, Post.va_id))
+
+
+def _slide_text_performance(ctx):
+    """OCR'd slide text joined to its post's performance (content -> views attribution)"""
+    return (select(Slide.post_id, Slide.slide_index, Slide.ocr_text, Post.views, Post.engagement_rate)
+            .join(Post, Post.id == Slide.post_id)
+            .where(Slide.ocr_text.isnot(None)))
+
+
+HOT_QUERIES = [
+    HotQuery('top_posts_30d', 'dashboard', _top_posts_30d, 250),
+    HotQuery('va_recent_posts', 'dashboard', _va_recent_posts, 100),
+    HotQuery('account_timeline', 'dashboard', _account_timeline, 100),
+    HotQuery('post_timeseries', 'dashboard', _post_timeseries, 50),
+    HotQuery('refresh_due', 'dashboard', _refresh_due, 100),
+    HotQuery('post_comments', 'dashboard', _post_comments, 50),
+    HotQuery('posts_with_va', 'export', _export_posts_with_va, 10_000, frozenset({'posts'}), timed=False),
+    HotQuery('metrics_last_7d', 'export', _export_metrics_window, 5_000, timed=False),
+    HotQuery('va_performance', 'rollup', _va_performance, 3_000, frozenset({'posts', 'vas'}), timed=False),
+    HotQuery('va_daily_growth', 'rollup', _va_daily_growth, 3_000, timed=False),
+    HotQuery('account_summary', 'rollup', _account_summary, 3_000, frozenset({'posts'}), timed=False),
+    HotQuery('first_day_views', 'attribution', _first_day_views, 3_000),
+    HotQuery('slide_text_performance', 'attribution', _slide_text_performance, 5_000, frozenset({'slides', 'posts'})),
+]
+
+
+# ============= VALIDATION =============
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    index = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class PerformanceValidator:
+    """EXPLAIN + repeated timing for every registered hot query"""
+
+    def __init__(self, db_session: Session, queries: Optional[List[HotQuery]] = None,
+                 repeats: int = 10, warmup: int = 1, time_all: bool = False):
+        self.db = db_session
+        self.queries = queries if queries is not None else HOT_QUERIES
+        self.repeats = repeats
+        self.warmup = warmup
+        self.time_all = time_all
+
+    def measure(self, statement) -> Dict[str, float]:
+        """p50 / p95 / max wall time (ms) of executing and fetching `statement`"""
+        for _ in range(self.warmup):
+            self.db.execute(statement).all()
+        timings = []
+        rows = 0
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            rows = len(self.db.execute(statement).all())
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return {
+            'p50_ms': round(_percentile(timings, 0.50), 3),
+            'p95_ms': round(_percentile(timings, 0.95), 3),
+            'max_ms': round(timings[-1], 3),
+            'rows': rows,
+        }
+
+    def check_query(self, query: HotQuery, ctx: QueryContext) -> Dict[str, Any]:
+        statement = query.build(ctx)
+        plan = explain(self.db, statement)
+        wanted = filter_columns(statement)
+
+        issues = []
+        missing_indexes = []
+        for table in sorted(set(plan.full_scans) - query.scans_ok):
+            columns = wanted.get(table, [])
+            unindexed = [column for column in columns if column not in indexed_columns(table)]
+            if unindexed:
+                missing_indexes.append({'table': table, 'columns': unindexed})
+                issues.append(f"{query.name}: full scan of {table}, no index on {table}({', '.join(unindexed)})")
+            elif columns:
+                issues.append(f"{query.name}: full scan of {table}, planner skipped indexes on {', '.join(columns)}")
+            else:
+                issues.append(f"{query.name}: full scan of {table}")
+
+        if query.timed or self.time_all:
+            timing = self.measure(statement)
+        else:
+            timing = {'p50_ms': None, 'p95_ms': None, 'max_ms': None, 'rows': None}
+        if timing['p95_ms'] is not None and timing['p95_ms'] > query.budget_ms:
+            issues.append(f"{query.name}: p95 {timing['p95_ms']:.1f}ms over {query.budget_ms:.0f}ms budget")
+
+        return {
+            'category': query.category,
+            'passed': not issues,
+            'issues': issues,
+            'plan': plan.steps,
+            'full_scans': plan.full_scans,
+            'missing_indexes': missing_indexes,
+            'temp_sorts': plan.temp_sorts,
+            **timing,
+            'budget_ms': query.budget_ms,
+        }
+
+    def validate(self) -> Dict[str, Any]:
+        """All hot queries -> {'passed', 'issues', 'metrics': {name: p50/p95}, 'queries': {...}}"""
+        ctx = QueryContext.from_db(self.db)
+        queries = {query.name: self.check_query(query, ctx) for query in self.queries}
+        issues = [issue for result in queries.values() for issue in result['issues']]
+        return {
+            'passed': not issues,
+            'issues': issues,
+            'metrics': {
+                name: {'p50_ms': result['p50_ms'], 'p95_ms': result['p95_ms']}
+                for name, result in queries.items() if result['p50_ms'] is not None
+            },
+            'queries': queries,
+        }
+
+
+def main():
+    from ..config import db_config
+
+    parser = argparse.ArgumentParser(description='EXPLAIN and time the hot queries')
+    parser.add_argument('--repeats', type=int, default=10, help='Timed runs per query')
+    parser.add_argument('--time-all', action='store_true', help='Also time the bulk export / rollup reads')
+    parser.add_argument('--json', action='store_true', help='Print the full result as JSON')
+    args = parser.parse_args()
+
+    session = db_config.get_session()
+    results = PerformanceValidator(session, repeats=args.repeats, time_all=args.time_all).validate()
+    session.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+        return
+
+    print(f"{'✅' if results['passed'] else '❌'} Hot query validation ({len(results['queries'])} queries)")
+    for name, result in results['queries'].items():
+        scans = f" | full scans: {', '.join(result['full_scans'])}" if result['full_scans'] else ''
+        timing = (f"p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms"
+                  if result['p50_ms'] is not None else f"{'plan only':<32}")
+        print(f"   {'✅' if result['passed'] else '❌'} {result['category']:<11} {name:<24} {timing}{scans}")
+    for issue in results['issues']:
+        print(f"   ⚠️ {issue}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,36 @@ Created for Issue #6: Complete Data Migration Plan
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import case, distinct, exists, func
 
 from .base_migrator import BaseMigrator
+from .query_plans import PerformanceValidator
 from ..models import VA, Post, Slide, MetricsHistory, DataImportLog
 
 
+def _count_where(condition):
+    """Number of rows matching `condition`, as an aggregate column"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
 class MigrationValidator(BaseMigrator):
     """
     Validates migration results and data integrity
     """
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, performance_repeats: int = 5):
         super().__init__(db_session, "validation")
+        self.performance_repeats = performance_repeats
+        self._post_stats_cache = None
+        self._slide_stats_cache = None
     
     def validate_complete_migration(self) -> Dict[str, Any]:
         """
         Perform complete migration validation
         """
         self.log_progress("Starting complete migration validation")
+        self._post_stats_cache = None
+        self._slide_stats_cache = None
         
         validation_results = {
             'overall_status': 'passed',
@@ -122,9 +133,45 @@ class MigrationValidator(BaseMigrator):
             self.log_error(e, "Data counts validation failed")
             return {'passed': False, 'error': str(e)}
     
+    def _post_stats(self) -> Dict[str, int]:
+        """
+        Every per-post check in one aggregate pass over posts
+        """
+        if self._post_stats_cache is None:
+            row = self.db.query(
+                func.count(Post.id).label('total_posts'),
+                _count_where(Post.va_id.is_(None)).label('posts_without_va'),
+                _count_where((Post.slides.isnot(None)) & (Post.slides != '')).label('posts_with_slides'),
+                _count_where((Post.post_url.is_(None)) | (Post.post_url == '')).label('posts_without_url'),
+                _count_where(Post.created_date.is_(None)).label('posts_without_date'),
+                _count_where(Post.views > 10000000).label('unrealistic_views'),
+                _count_where((Post.account.is_(None)) | (Post.account == '')).label('posts_without_account'),
+                _count_where((Post.views < 0) | (Post.likes < 0) | (Post.comments < 0) |
+                     (Post.shares < 0) | (Post.engagement < 0)).label('negative_metrics'),
+            ).one()
+            self._post_stats_cache = dict(row._mapping)
+        return self._post_stats_cache
+    
+    def _slide_stats(self) -> Dict[str, int]:
+        """
+        Every per-slide check in one aggregate pass over slides
+        """
+        if self._slide_stats_cache is None:
+            row = self.db.query(
+                func.count(Slide.id).label('total_slides'),
+                func.count(distinct(Slide.post_id)).label('posts_with_slide_records'),
+                _count_where(Slide.slide_index.is_(None)).label('slides_without_index'),
+                _count_where((Slide.ocr_text.isnot(None)) & (Slide.ocr_text != '')).label('slides_with_ocr'),
+            ).one()
+            self._slide_stats_cache = dict(row._mapping)
+        return self._slide_stats_cache
+    
     def _validate_data_integrity(self) -> Dict[str, Any]:
         """
         Validate data integrity constraints
+        
+        Orphan checks are NOT EXISTS anti-joins: one primary-key probe per row instead of
+        NOT IN (SELECT ...) over the whole parent table
         """
         self.log_progress("Validating data integrity")
         
@@ -132,41 +179,41 @@ class MigrationValidator(BaseMigrator):
             issues = []
             
             # Check for orphaned slides
-            orphaned_slides = self.db.query(Slide).filter(
-                ~Slide.post_id.in_(self.db.query(Post.id))
-            ).count()
+            orphaned_slides = self.db.query(func.count(Slide.id)).filter(
+                ~exists().where(Post.id == Slide.post_id)
+            ).scalar()
             
             if orphaned_slides > 0:
                 issues.append(f"Found {orphaned_slides} orphaned slides")
             
             # Check for posts with invalid VA references
-            invalid_va_posts = self.db.query(Post).filter(
+            invalid_va_posts = self.db.query(func.count(Post.id)).filter(
                 Post.va_id.isnot(None),
-                ~Post.va_id.in_(self.db.query(VA.id))
-            ).count()
+                ~exists().where(VA.id == Post.va_id)
+            ).scalar()
             
             if invalid_va_posts > 0:
                 issues.append(f"Found {invalid_va_posts} posts with invalid VA references")
             
-            # Check for duplicate post URLs
-            duplicate_posts = self.db.query(
-                Post.post_url,
-                func.count(Post.id).label('count')
-            ).group_by(Post.post_url).having(
+            # Check for orphaned metrics snapshots
+            orphaned_metrics = self.db.query(func.count(MetricsHistory.id)).filter(
+                ~exists().where(Post.id == MetricsHistory.post_id)
+            ).scalar()
+            
+            if orphaned_metrics > 0:
+                issues.append(f"Found {orphaned_metrics} metrics snapshots for missing posts")
+            
+            # Check for duplicate post URLs (grouped along the unique post_url index)
+            duplicate_urls = self.db.query(Post.post_url).group_by(Post.post_url).having(
                 func.count(Post.id) > 1
-            ).count()
+            ).subquery()
+            duplicate_posts = self.db.query(func.count()).select_from(duplicate_urls).scalar()
             
             if duplicate_posts > 0:
                 issues.append(f"Found {duplicate_posts} duplicate post URLs")
             
             # Check for negative metrics
-            negative_metrics = self.db.query(Post).filter(
-                (Post.views < 0) |
-                (Post.likes < 0) |
-                (Post.comments < 0) |
-                (Post.shares < 0) |
-                (Post.engagement < 0)
-            ).count()
+            negative_metrics = self._post_stats()['negative_metrics']
             
             if negative_metrics > 0:
                 issues.append(f"Found {negative_metrics} posts with negative metrics")
@@ -176,6 +223,7 @@ class MigrationValidator(BaseMigrator):
                 'issues': issues,
                 'orphaned_slides': orphaned_slides,
                 'invalid_va_posts': invalid_va_posts,
+                'orphaned_metrics': orphaned_metrics,
                 'duplicate_posts': duplicate_posts,
                 'negative_metrics': negative_metrics
             }
@@ -192,29 +240,25 @@ class MigrationValidator(BaseMigrator):
         
         try:
             issues = []
+            post_stats = self._post_stats()
+            slide_stats = self._slide_stats()
             
             # Check VA-Post relationships
-            posts_without_va = self.db.query(Post).filter(Post.va_id.is_(None)).count()
-            total_posts = self.db.query(Post).count()
+            posts_without_va = post_stats['posts_without_va']
+            total_posts = post_stats['total_posts']
             
             if posts_without_va > total_posts * 0.1:  # More than 10% without VA
                 issues.append(f"Too many posts without VA: {posts_without_va}/{total_posts}")
             
             # Check Post-Slide relationships
-            posts_with_slides = self.db.query(Post).filter(
-                Post.slides.isnot(None),
-                Post.slides != ''
-            ).count()
-            
-            posts_with_slide_records = self.db.query(Post).join(Slide).distinct().count()
+            posts_with_slides = post_stats['posts_with_slides']
+            posts_with_slide_records = slide_stats['posts_with_slide_records']
             
             if posts_with_slides > 0 and posts_with_slide_records == 0:
                 issues.append("Posts have slide URLs but no slide records")
             
             # Check slide indexing
-            slides_without_index = self.db.query(Slide).filter(
-                Slide.slide_index.is_(None)
-            ).count()
+            slides_without_index = slide_stats['slides_without_index']
             
             if slides_without_index > 0:
                 issues.append(f"Found {slides_without_index} slides without index")
@@ -240,44 +284,32 @@ class MigrationValidator(BaseMigrator):
         
         try:
             issues = []
+            post_stats = self._post_stats()
+            slide_stats = self._slide_stats()
             
             # Check for missing critical data
-            posts_without_url = self.db.query(Post).filter(
-                (Post.post_url.is_(None)) | (Post.post_url == '')
-            ).count()
-            
+            posts_without_url = post_stats['posts_without_url']
             if posts_without_url > 0:
                 issues.append(f"Found {posts_without_url} posts without URL")
             
             # Check for missing dates
-            posts_without_date = self.db.query(Post).filter(
-                Post.created_date.is_(None)
-            ).count()
-            
+            posts_without_date = post_stats['posts_without_date']
             if posts_without_date > 0:
                 issues.append(f"Found {posts_without_date} posts without date")
             
             # Check for unrealistic metrics
-            unrealistic_views = self.db.query(Post).filter(Post.views > 10000000).count()
+            unrealistic_views = post_stats['unrealistic_views']
             if unrealistic_views > 0:
                 issues.append(f"Found {unrealistic_views} posts with unrealistic view counts")
             
             # Check for missing account names
-            posts_without_account = self.db.query(Post).filter(
-                (Post.account.is_(None)) | (Post.account == '')
-            ).count()
-            
+            posts_without_account = post_stats['posts_without_account']
             if posts_without_account > 0:
                 issues.append(f"Found {posts_without_account} posts without account")
             
             # Check OCR data quality
-            slides_with_ocr = self.db.query(Slide).filter(
-                Slide.ocr_text.isnot(None),
-                Slide.ocr_text != ''
-            ).count()
-            
-            total_slides = self.db.query(Slide).count()
-            ocr_coverage = (slides_with_ocr / total_slides * 100) if total_slides > 0 else 0
+            total_slides = slide_stats['total_slides']
+            ocr_coverage = (slide_stats['slides_with_ocr'] / total_slides * 100) if total_slides > 0 else 0
             
             if ocr_coverage < 1:  # Less than 1% OCR coverage
                 issues.append(f"Low OCR coverage: {ocr_coverage:.1f}%")
@@ -299,47 +331,27 @@ class MigrationValidator(BaseMigrator):
     def _validate_performance(self) -> Dict[str, Any]:
         """
         Validate database performance
+        
+        EXPLAINs the hot dashboard / export / rollup / attribution queries, fails on
+        unexpected full table scans and reports p50 / p95 per query (see query_plans.py)
         """
         self.log_progress("Validating performance")
         
         try:
-            issues = []
-            performance_metrics = {}
-            
-            # Test query performance
-            import time
-            
-            # Test VA query
-            start_time = time.time()
-            va_count = self.db.query(VA).count()
-            va_query_time = time.time() - start_time
-            performance_metrics['va_query_time'] = va_query_time
-            
-            if va_query_time > 1.0:  # More than 1 second
-                issues.append(f"VA query too slow: {va_query_time:.2f}s")
-            
-            # Test Post query
-            start_time = time.time()
-            post_count = self.db.query(Post).count()
-            post_query_time = time.time() - start_time
-            performance_metrics['post_query_time'] = post_query_time
-            
-            if post_query_time > 2.0:  # More than 2 seconds
-                issues.append(f"Post query too slow: {post_query_time:.2f}s")
-            
-            # Test complex query (posts with slides)
-            start_time = time.time()
-            posts_with_slides = self.db.query(Post).join(Slide).distinct().count()
-            complex_query_time = time.time() - start_time
-            performance_metrics['complex_query_time'] = complex_query_time
-            
-            if complex_query_time > 5.0:  # More than 5 seconds
-                issues.append(f"Complex query too slow: {complex_query_time:.2f}s")
+            results = PerformanceValidator(self.db, repeats=self.performance_repeats).validate()
             
             return {
-                'passed': len(issues) == 0,
-                'issues': issues,
-                'metrics': performance_metrics
+                'passed': results['passed'],
+                'issues': results['issues'],
+                'metrics': results['metrics'],
+                'plans': {
+                    name: {
+                        'plan': query['plan'],
+                        'full_scans': query['full_scans'],
+                        'missing_indexes': query['missing_indexes']
+                    }
+                    for name, query in results['queries'].items()
+                }
             }
             
         except Exception as e:
@@ -36,11 +36,109 @@ class VA(Base):
     # Relationships
     posts = relationship("Post", back_populates="va")
     metrics_history = relationship("MetricsHistory", back_populates="va")
+    accounts = relationship("Account", back_populates="va")
     
     def __repr__(self):
         return f"<VA(name='{self.name}', creator='{self.creator}')>"
 
 
+class Creator(Base):
+    """
+    Content creators (Tyra, Ariri, Naomi, etc.)
+    One row per creator for every pipeline (proof log, OnlyFans tracking, scrapers)
+    """
+    __tablename__ = 'creators'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True, index=True)
+    display_name = Column(String(200), nullable=True)
+    onlyfans_username = Column(String(100), nullable=True, index=True)
+    status = Column(String(20), default='active', nullable=False)  # active, inactive, suspended
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    content_sets = relationship("ContentSet", back_populates="creator")
+    posts = relationship("Post", back_populates="creator")
+    
+    def __repr__(self):
+        return f"<Creator(name='{self.name}', status='{self.status}')>"
+
+
+class Account(Base):
+    """
+    TikTok accounts, assigned to a VA
+    followers / following cache the latest follower snapshot
+    """
+    __tablename__ = 'accounts'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    username = Column(String(100), nullable=False, unique=True, index=True)
+    display_name = Column(String(200), nullable=True)
+    platform = Column(String(50), default='tiktok', nullable=False)
+    verified = Column(Boolean, default=False, nullable=False)
+    
+    # Assignment
+    va_id = Column(Integer, ForeignKey('vas.id'), nullable=True)
+    primary_creator_id = Column(Integer, ForeignKey('creators.id'), nullable=True, index=True)
+    
+    # Status and latest counts
+    status = Column(String(20), default='active', nullable=False)  # active, inactive, suspended, deleted
+    followers = Column(Integer, default=0, nullable=False)
+    following = Column(Integer, default=0, nullable=False)
+    last_scraped_at = Column(DateTime, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    va = relationship("VA", back_populates="accounts")
+    posts = relationship("Post", back_populates="tiktok_account")
+    follower_snapshots = relationship("FollowerSnapshot", back_populates="account", cascade="all, delete-orphan")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_account_va_status', 'va_id', 'status'),
+    )
+    
+    def __repr__(self):
+        return f"<Account(username='{self.username}', followers={self.followers})>"
+
+
+class ContentSet(Base):
+    """
+    Content sets (Set ID from the proof log), unique per creator
+    """
+    __tablename__ = 'content_sets'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    set_id = Column(Integer, nullable=False)
+    creator_id = Column(Integer, ForeignKey('creators.id'), nullable=False)
+    
+    # Content set metadata
+    name = Column(String(200), nullable=True)
+    content_type = Column(String(20), default='slideshow', nullable=False)  # slideshow, video, image
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    creator = relationship("Creator", back_populates="content_sets")
+    posts = relationship("Post", back_populates="content_set")
+    
+    # Indexes
+    __table_args__ = (
+        UniqueConstraint('creator_id', 'set_id', name='unique_creator_set'),
+    )
+    
+    def __repr__(self):
+        return f"<ContentSet(set_id={self.set_id}, creator_id={self.creator_id})>"
+
+
 class Post(Base):
     """
     Main posts table with all TikTok post data
@@ -51,6 +149,9 @@ class Post(Base):
     post_url = Column(String(500), nullable=False, unique=True, index=True)
     account = Column(String(100), nullable=False, index=True)
     va_id = Column(Integer, ForeignKey('vas.id'), nullable=True, index=True)
+    account_id = Column(Integer, ForeignKey('accounts.id'), nullable=True)  # led by idx_posts_account_id_date
+    creator_id = Column(Integer, ForeignKey('creators.id'), nullable=True, index=True)
+    content_set_id = Column(Integer, ForeignKey('content_sets.id'), nullable=True, index=True)
     
     # Timestamps
     created_date = Column(DateTime, nullable=False, index=True)
@@ -61,6 +162,7 @@ class Post(Base):
     likes = Column(Integer, nullable=False, default=0)
     comments = Column(Integer, nullable=False, default=0)
     shares = Column(Integer, nullable=False, default=0)
+    bookmarks = Column(Integer, nullable=False, default=0)
     engagement = Column(Integer, nullable=False, default=0)
     engagement_rate = Column(Float, nullable=True)
     
@@ -80,19 +182,26 @@ class Post(Base):
     
     # Relationships
     va = relationship("VA", back_populates="posts")
+    tiktok_account = relationship("Account", back_populates="posts")
+    creator = relationship("Creator", back_populates="posts")
+    content_set = relationship("ContentSet", back_populates="posts")
     metrics_history = relationship("MetricsHistory", back_populates="post")
     slides_data = relationship("Slide", back_populates="post")
+    refresh_schedule = relationship("RefreshSchedule", back_populates="post", uselist=False)
+    comments_data = relationship("Comment", back_populates="post")
     
     # Indexes
     __table_args__ = (
         Index('idx_posts_va_date', 'va_id', 'created_date'),
         Index('idx_posts_account_date', 'account', 'created_date'),
+        Index('idx_posts_account_id_date', 'account_id', 'created_date'),
         Index('idx_posts_views', 'views'),
         Index('idx_posts_engagement', 'engagement'),
         CheckConstraint('views >= 0', name='check_views_positive'),
         CheckConstraint('likes >= 0', name='check_likes_positive'),
         CheckConstraint('comments >= 0', name='check_comments_positive'),
         CheckConstraint('shares >= 0', name='check_shares_positive'),
+        CheckConstraint('bookmarks >= 0', name='check_bookmarks_positive'),
         CheckConstraint('engagement >= 0', name='check_engagement_positive'),
     )
     
@@ -107,7 +216,7 @@ class MetricsHistory(Base):
     __tablename__ = 'metrics_history'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    post_id = Column(Integer, ForeignKey('posts.id'), nullable=False, index=True)
+    post_id = Column(Integer, ForeignKey('posts.id'), nullable=False)  # led by idx_metrics_post_latest
     va_id = Column(Integer, ForeignKey('vas.id'), nullable=True, index=True)
     
     # Metrics snapshot
@@ -128,7 +237,9 @@ class MetricsHistory(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_metrics_post_date', 'post_id', 'snapshot_date'),
+        # Covering "latest" index for per-post latest values and trends (see timeseries.py)
+        Index('idx_metrics_post_latest', 'post_id', snapshot_date.desc(),
+              postgresql_include=['views', 'likes', 'comments', 'shares', 'engagement']),
         Index('idx_metrics_va_date', 'va_id', 'snapshot_date'),
         UniqueConstraint('post_id', 'snapshot_date', name='unique_post_snapshot'),
     )
@@ -137,6 +248,153 @@ class MetricsHistory(Base):
         return f"<MetricsHistory(post_id={self.post_id}, views={self.views}, date='{self.snapshot_date}')>"
 
 
+class FollowerSnapshot(Base):
+    """
+    Follower count snapshots per account for growth tracking
+    """
+    __tablename__ = 'follower_snapshots'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_id = Column(Integer, ForeignKey('accounts.id'), nullable=False)  # led by idx_follower_account_latest
+    
+    # Snapshot data
+    snapshot_date = Column(DateTime, default=datetime.utcnow, nullable=False)
+    followers = Column(Integer, nullable=False, default=0)
+    following = Column(Integer, nullable=True)
+    likes = Column(Integer, nullable=True)
+    videos = Column(Integer, nullable=True)
+    
+    # Growth calculations
+    followers_change = Column(Integer, nullable=True)  # Change from the previous snapshot
+    followers_growth_rate = Column(Float, nullable=True)  # Percentage growth
+    
+    # Scraping metadata
+    data_source = Column(String(50), default='scraper', nullable=False)  # scraper, apify, manual, import
+    scraping_status = Column(String(20), default='success', nullable=False)  # success, failed, partial
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    account = relationship("Account", back_populates="follower_snapshots")
+    
+    # Indexes
+    __table_args__ = (
+        # Covering "latest" index for per-account latest values and trends (see timeseries.py)
+        Index('idx_follower_account_latest', 'account_id', snapshot_date.desc(),
+              postgresql_include=['followers']),
+        Index('idx_snapshot_date_account', 'snapshot_date', 'account_id'),
+        UniqueConstraint('account_id', 'snapshot_date', name='unique_account_snapshot'),
+        CheckConstraint('followers >= 0', name='check_followers_positive'),
+    )
+    
+    def __repr__(self):
+        return f"<FollowerSnapshot(account_id={self.account_id}, followers={self.followers}, date='{self.snapshot_date}')>"
+
+
+class RefreshSchedule(Base):
+    """
+    Per-post refresh state for the refresh scheduler
+    next_due_at decides which posts get the next scrape slots (paused posts get a slow re-check)
+    """
+    __tablename__ = 'refresh_schedule'
+    
+    post_id = Column(Integer, ForeignKey('posts.id'), primary_key=True)
+    
+    # Schedule
+    next_due_at = Column(DateTime, nullable=True, index=True)
+    interval_hours = Column(Float, nullable=True)
+    tier = Column(String(20), nullable=True)  # young, fast, growing, slow, stale, paused
+    
+    # Last observation
+    last_views = Column(Integer, nullable=True)
+    last_scraped_at = Column(DateTime, nullable=True)
+    view_velocity = Column(Float, nullable=True)  # views per hour between the last two scrapes
+    flat_scrapes = Column(Integer, default=0, nullable=False)  # consecutive scrapes below dead velocity
+    scrape_count = Column(Integer, default=0, nullable=False)
+    
+    # In flight: handed out and not scraped yet (the hourly budget is counted in refresh_dispatches)
+    last_dispatched_at = Column(DateTime, nullable=True, index=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    post = relationship("Post", back_populates="refresh_schedule")
+    
+    def __repr__(self):
+        return f"<RefreshSchedule(post_id={self.post_id}, tier='{self.tier}', next_due='{self.next_due_at}')>"
+
+
+class RefreshDispatch(Base):
+    """
+    One row per post handed out by the refresh scheduler
+    The hourly budget counts these; recording a scrape never removes them
+    """
+    __tablename__ = 'refresh_dispatches'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    post_id = Column(Integer, ForeignKey('posts.id'), nullable=False, index=True)
+    dispatched_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<RefreshDispatch(post_id={self.post_id}, dispatched_at='{self.dispatched_at}')>"
+
+
+class Comment(Base):
+    """
+    Post comments keyed by TikTok's own comment id (cid)
+    Replies point at their top-level comment through parent_comment_id
+    """
+    __tablename__ = 'comments'
+    
+    comment_id = Column(String(32), primary_key=True)
+    post_id = Column(Integer, ForeignKey('posts.id'), nullable=False, index=True)
+    parent_comment_id = Column(String(32), nullable=True, index=True)  # NULL for top-level comments
+    
+    # Author
+    author_id = Column(String(32), nullable=True)
+    author_username = Column(String(100), nullable=True, index=True)
+    
+    # Content and counters (counters refreshed on every upsert)
+    text = Column(Text, nullable=True)
+    like_count = Column(Integer, default=0, nullable=False)
+    reply_count = Column(Integer, default=0, nullable=False)
+    
+    # Timestamps
+    commented_at = Column(DateTime, nullable=False)  # TikTok create_time
+    first_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    post = relationship("Post", back_populates="comments_data")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_comments_post_time', 'post_id', 'commented_at'),
+        CheckConstraint('like_count >= 0', name='check_comment_likes_positive'),
+        CheckConstraint('reply_count >= 0', name='check_comment_replies_positive'),
+    )
+    
+    def __repr__(self):
+        return f"<Comment(comment_id='{self.comment_id}', post_id={self.post_id}, at='{self.commented_at}')>"
+
+
+class CommentCrawlMark(Base):
+    """
+    Per-post high-water mark for incremental comment fetches
+    Only advanced after a post's comments were paged through without errors or truncation
+    """
+    __tablename__ = 'comment_crawl_marks'
+    
+    post_id = Column(Integer, ForeignKey('posts.id'), primary_key=True)
+    complete_through = Column(DateTime, nullable=False)  # newest top-level comment of a complete fetch
+    completed_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<CommentCrawlMark(post_id={self.post_id}, complete_through='{self.complete_through}')>"
+
+
 class Slide(Base):
     """
     Individual slides with OCR text and metadata
@@ -175,6 +433,46 @@ class Slide(Base):
         return f"<Slide(post_id={self.post_id}, index={self.slide_index}, has_text={bool(self.ocr_text)})>"
 
 
+class ProofLog(Base):
+    """
+    Proof log entries (Telegram → Google Sheets): one row per posted link
+    post_id points at the post once the URL has been scraped into posts
+    """
+    __tablename__ = 'proof_logs'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Telegram metadata
+    timestamp = Column(DateTime, nullable=False, index=True)
+    chat_id = Column(String(50), nullable=False)
+    message_id = Column(String(50), nullable=False)
+    
+    # Who posted what
+    creator_id = Column(Integer, ForeignKey('creators.id'), nullable=True)
+    va_id = Column(Integer, ForeignKey('vas.id'), nullable=True, index=True)
+    account_id = Column(Integer, ForeignKey('accounts.id'), nullable=True, index=True)
+    content_set_id = Column(Integer, ForeignKey('content_sets.id'), nullable=True, index=True)
+    post_id = Column(Integer, ForeignKey('posts.id'), nullable=True, index=True)
+    
+    # Post metadata
+    post_type = Column(String(20), nullable=True)  # NEW, REPOST
+    platform = Column(String(50), default='tiktok', nullable=False)
+    post_url = Column(String(500), nullable=False, index=True)
+    dedupe_key = Column(String(500), nullable=True, index=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        UniqueConstraint('chat_id', 'message_id', name='unique_proof_log_message'),
+        Index('idx_proof_log_creator_va', 'creator_id', 'va_id'),
+    )
+    
+    def __repr__(self):
+        return f"<ProofLog(message_id='{self.message_id}', type='{self.post_type}', url='{self.post_url}')>"
+
+
 class ScrapingJob(Base):
     """
     Track scraping jobs and their status
@@ -9,6 +9,11 @@ This simplified schema focuses on:
 4. Basic creator and VA tracking
 
 Revenue and conversion tracking will be added later.
+
+Legacy schema: the unified tables in database/models.py replace it. Copy a database
+built with this schema into them with `python -m database.unified_schema --import <url>`.
+
+Run as `python -m database.onlyfans_tracking_schema` (CSV imports use database.proof_log_import).
 """
 
 from sqlalchemy import (
@@ -21,6 +26,8 @@ from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
 import json
 
+from .proof_log_import import BulkImporter, read_master_csv, read_proof_log
+
 Base = declarative_base()
 
 class Creator(Base):
@@ -300,6 +307,12 @@ class FollowerSnapshot(Base):
     # Relationships
     account = relationship("TikTokAccount", back_populates="follower_snapshots")
     
+    # Covering "latest" index for per-account latest values and trends
+    __table_args__ = (
+        Index('idx_follower_account_latest', 'account_id', timestamp.desc(),
+              postgresql_include=['followers']),
+    )
+    
     def __repr__(self):
         return f"<FollowerSnapshot(id={self.id}, account_id={self.account_id}, followers={self.followers}, timestamp='{self.timestamp}')>"
 
@@ -327,190 +340,91 @@ class TikTokAnalyticsDatabase:
         """Get a new database session"""
         return self.Session()
     
-    def import_proof_log_data(self, csv_path: str):
+    def import_proof_log_data(self, csv_path: str, chunk_size: int = 5000):
         """Import proof log data from CSV"""
         import pandas as pd
-        from datetime import datetime
-        import re
         
-        session = self.get_session()
         try:
-            df = pd.read_csv(csv_path)
+            df = read_proof_log(csv_path)
             print(f"📊 Importing {len(df)} posts from Proof Log...")
             
-            imported_count = 0
-            for _, row in df.iterrows():
-                # Create or get creator
-                creator = session.query(Creator).filter(
-                    Creator.name == row['Creator']
-                ).first()
-                
-                if not creator:
-                    creator = Creator(
-                        name=row['Creator'],
-                        display_name=row['Creator']
-                    )
-                    session.add(creator)
-                    session.flush()
-                
-                # Create or get VA
-                va = session.query(VA).filter(
-                    VA.name == row['VA']
-                ).first()
-                
-                if not va:
-                    va = VA(name=row['VA'])
-                    session.add(va)
-                    session.flush()
-                
-                # Create or get content set
-                content_set = None
-                if pd.notna(row['Set ID']):
-                    content_set = session.query(ContentSet).filter(
-                        ContentSet.set_id == int(row['Set ID']),
-                        ContentSet.creator_id == creator.id
-                    ).first()
-                    
-                    if not content_set:
-                        content_set = ContentSet(
-                            set_id=int(row['Set ID']),
-                            creator_id=creator.id,
-                            name=f"Set {row['Set ID']} - {creator.name}"
-                        )
-                        session.add(content_set)
-                        session.flush()
-                
-                # Extract username from URL
-                account_username = self._extract_username_from_url(row['Post URL'])
-                account = None
-                if account_username:
-                    account = session.query(TikTokAccount).filter(
-                        TikTokAccount.username == account_username
-                    ).first()
-                    
-                    if not account:
-                        account = TikTokAccount(
-                            username=account_username,
-                            va_id=va.id
-                        )
-                        session.add(account)
-                        session.flush()
-                
-                # Parse timestamp
-                timestamp = datetime.fromisoformat(row['Timestamp'].replace('Z', '+00:00'))
-                
-                # Create TikTok post
-                tiktok_post = TikTokPost(
-                    post_url=row['Post URL'],
-                    creator_id=creator.id,
-                    content_set_id=content_set.id if content_set else None,
-                    account_id=account.id if account else None,
-                    va_id=va.id,
-                    post_type=row['Type'],
-                    created_date=timestamp,
-                    created_time=timestamp
-                )
-                
-                session.add(tiktok_post)
-                imported_count += 1
+            importer = BulkImporter(self.engine, chunk_size=chunk_size)
+            df['creator_id'] = importer.resolve(
+                Creator, pd.DataFrame({'name': df['Creator'], 'display_name': df['Creator']}), ['name'])
+            df['va_id'] = importer.resolve(VA, pd.DataFrame({'name': df['VA']}), ['name'])
+            df['content_set_id'] = importer.resolve(ContentSet, pd.DataFrame({
+                'set_id': df['set_id'],
+                'creator_id': df['creator_id'],
+                'name': 'Set ' + df['set_id'].astype(str) + ' - ' + df['Creator']
+            }), ['set_id', 'creator_id'])
+            df['account_id'] = importer.resolve(TikTokAccount, pd.DataFrame({
+                'username': df['account_username'],
+                'va_id': df['va_id']
+            }), ['username'])
+            
+            stats = importer.insert(TikTokPost, pd.DataFrame({
+                'post_url': df['Post URL'],
+                'creator_id': df['creator_id'],
+                'content_set_id': df['content_set_id'],
+                'account_id': df['account_id'],
+                'va_id': df['va_id'],
+                'post_type': df['Type'],
+                'created_date': df['timestamp'],
+                'created_time': df['timestamp']
+            }), label='Proof Log posts')
             
-            session.commit()
-            print(f"✅ Successfully imported {imported_count} posts")
+            print(f"✅ Successfully imported {stats['inserted']} posts "
+                  f"({stats['skipped']} already present, {stats['invalid']} incomplete)")
+            return stats
             
         except Exception as e:
-            session.rollback()
             print(f"❌ Error importing Proof Log data: {e}")
             raise
-        finally:
-            session.close()
     
-    def import_master_database(self, csv_path: str):
+    def import_master_database(self, csv_path: str, chunk_size: int = 5000):
         """Import master TikTok database"""
         import pandas as pd
-        from datetime import datetime
         
-        session = self.get_session()
         try:
-            df = pd.read_csv(csv_path)
+            df = read_master_csv(csv_path)
             print(f"📊 Importing {len(df)} posts from Master Database...")
             
-            imported_count = 0
-            for _, row in df.iterrows():
-                # Create or get creator
-                creator = session.query(Creator).filter(
-                    Creator.name == row['creator']
-                ).first()
-                
-                if not creator:
-                    creator = Creator(
-                        name=row['creator'],
-                        display_name=row['creator']
-                    )
-                    session.add(creator)
-                    session.flush()
-                
-                # Create or get VA
-                va = session.query(VA).filter(
-                    VA.name == row['va']
-                ).first()
-                
-                if not va:
-                    va = VA(name=row['va'])
-                    session.add(va)
-                    session.flush()
-                
-                # Extract username from URL
-                account_username = self._extract_username_from_url(row['post_url'])
-                account = None
-                if account_username:
-                    account = session.query(TikTokAccount).filter(
-                        TikTokAccount.username == account_username
-                    ).first()
-                    
-                    if not account:
-                        account = TikTokAccount(
-                            username=account_username,
-                            va_id=va.id
-                        )
-                        session.add(account)
-                        session.flush()
-                
-                # Parse timestamp
-                created_date = datetime.strptime(row['created_date'], '%Y-%m-%d')
-                created_time = datetime.strptime(row['created_time'], '%H:%M:%S')
-                
-                # Create TikTok post with metrics
-                tiktok_post = TikTokPost(
-                    post_url=row['post_url'],
-                    creator_id=creator.id,
-                    account_id=account.id if account else None,
-                    va_id=va.id,
-                    post_type='NEW',  # Default for master database
-                    created_date=created_date,
-                    created_time=created_time,
-                    views=row['views'],
-                    likes=row['likes'],
-                    comments=row['comments'],
-                    shares=row['shares'],
-                    engagement=row['engagement'],
-                    engagement_rate=row['engagement_rate'],
-                    hashtags=row['hashtags'],
-                    sound_url=row['sound'],
-                    slides_count=row['slides']
-                )
-                
-                session.add(tiktok_post)
-                imported_count += 1
+            importer = BulkImporter(self.engine, chunk_size=chunk_size)
+            df['creator_id'] = importer.resolve(
+                Creator, pd.DataFrame({'name': df['creator'], 'display_name': df['creator']}), ['name'])
+            df['va_id'] = importer.resolve(VA, pd.DataFrame({'name': df['va']}), ['name'])
+            df['account_id'] = importer.resolve(TikTokAccount, pd.DataFrame({
+                'username': df['account_username'],
+                'va_id': df['va_id']
+            }), ['username'])
             
-            session.commit()
-            print(f"✅ Successfully imported {imported_count} posts from Master Database")
+            # Create TikTok posts with metrics
+            stats = importer.insert(TikTokPost, pd.DataFrame({
+                'post_url': df['post_url'],
+                'creator_id': df['creator_id'],
+                'account_id': df['account_id'],
+                'va_id': df['va_id'],
+                'post_type': 'NEW',  # Default for master database
+                'created_date': df['created_date'],
+                'created_time': df['created_time'],
+                'views': df['views'],
+                'likes': df['likes'],
+                'comments': df['comments'],
+                'shares': df['shares'],
+                'engagement': df['engagement'],
+                'engagement_rate': df['engagement_rate'],
+                'hashtags': df['hashtags'],
+                'sound_url': df['sound'],
+                'slides_count': df['slides']
+            }), label='Master Database posts')
+            
+            print(f"✅ Successfully imported {stats['inserted']} posts from Master Database "
+                  f"({stats['skipped']} already present, {stats['invalid']} incomplete)")
+            return stats
             
         except Exception as e:
-            session.rollback()
             print(f"❌ Error importing Master Database: {e}")
             raise
-        finally:
-            session.close()
     
     def _extract_username_from_url(self, url: str) -> str:
         """Extract TikTok username from URL"""
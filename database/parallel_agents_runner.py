@@ -13,6 +13,12 @@ import os
 from datetime import datetime
 import concurrent.futures
 import threading
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from database.storage_benchmark import latest_results, summarize
 
 class ParallelAgentsRunner:
     """
@@ -29,6 +35,23 @@ class ParallelAgentsRunner:
             {'name': 'Multi-Database', 'file': 'agent_6_multi_db.py'}
         ]
         self.results = {}
+    
+    def measured_performance(self, target_names):
+        """
+        Headline numbers for the best of `target_names` from the latest storage benchmark runs
+        (python -m database.storage_benchmark); None if none of them has been measured
+        """
+        measured = []
+        for name in target_names:
+            run = latest_results(name)
+            if run:
+                summary = summarize(run['targets'][name])
+                if summary['measured']:
+                    measured.append({**summary, 'target': name, 'benchmark_run': run['started_at'],
+                                     'posts': run['scale']['posts']})
+        if not measured:
+            return None
+        return max(measured, key=lambda summary: summary['queries_per_second'])
         
     def run_agent_1_local_sqlite(self):
         """Agent 1: Local SQLite Analysis"""
@@ -67,6 +90,10 @@ class ParallelAgentsRunner:
             'best_for': ['Single user', 'Quick prototyping', 'No dependencies']
         }
         
+        measured = self.measured_performance(['sqlite-tuned', 'sqlite-wal', 'sqlite-default'])
+        if measured:
+            result['performance'].update(measured)
+        
         print("✅ [PARALLEL] Agent 1: Local SQLite completed")
         return result
     
@@ -106,6 +133,10 @@ class ParallelAgentsRunner:
             'best_for': ['Professional teams', 'Production apps', 'High availability']
         }
         
+        measured = self.measured_performance(['postgresql'])
+        if measured:
+            result['performance'].update(measured)
+        
         print("✅ [PARALLEL] Agent 2: Cloud PostgreSQL completed")
         return result
     
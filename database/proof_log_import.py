@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Bulk Proof Log Import for TikTok Analytics Master Database
+Set-based dimension resolution and chunked fact inserts for CSV imports
+
+The schema managers (onlyfans_tracking_schema.py and the proof log / agency
+schemas in 03_Database_Management) import a CSV in three steps:
+
+1. read_proof_log() / read_master_csv() parse the file with vectorized
+   pandas (timestamps, set ids, account usernames from the post URL)
+2. BulkImporter.resolve() maps each dimension (creator, VA, content set,
+   account) to ids: one SELECT for the distinct keys, one
+   INSERT ... ON CONFLICT DO NOTHING for the missing ones
+3. BulkImporter.insert() writes the fact rows in chunks, one transaction
+   per chunk, reporting progress; rows already present are skipped
+
+Works on any declarative schema, so each manager keeps its own models.
+
+Usage:
+    from database.proof_log_import import BulkImporter, read_proof_log
+
+    df = read_proof_log("Proof_Log.csv")
+    importer = BulkImporter(engine)
+    df['va_id'] = importer.resolve(VA, pd.DataFrame({'name': df['VA']}), ['name'])
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+ACCOUNT_IN_URL = r'tiktok\.com/@([^/?]+)'
+KEY_LOOKUP_CHUNK = 500
+
+ProgressCallback = Callable[[str, int, int, float], None]
+
+
+def print_progress(label: str, done: int, total: int, seconds: float):
+    """Default progress callback: one line per chunk"""
+    rate = done / seconds if seconds > 0 else 0
+    print(f"📊 {label}: {done:,}/{total:,} rows ({rate:,.0f} rows/s)")
+
+
+def read_proof_log(csv_path: str) -> pd.DataFrame:
+    """
+    Read a Proof Log export (Timestamp, Chat ID, Message ID, Creator, Set ID, VA,
+    Type, Platform, Post URL, Dedupe Key)
+
+    Adds `timestamp` (naive UTC), `set_id` (nullable int) and `account_username`.
+    """
+    df = pd.read_csv(csv_path, dtype={'Chat ID': str, 'Message ID': str})
+    # ISO8601 parses each row on its own: isoformat() drops the fraction when microseconds are 0
+    df['timestamp'] = pd.to_datetime(df['Timestamp'], utc=True, errors='coerce',
+                                     format='ISO8601').dt.tz_localize(None)
+    df['set_id'] = pd.to_numeric(df.get('Set ID'), errors='coerce').astype('Int64')
+    df['account_username'] = df['Post URL'].str.extract(ACCOUNT_IN_URL, expand=False)
+    return df
+
+
+def read_master_csv(csv_path: str) -> pd.DataFrame:
+    """
+    Read MASTER_TIKTOK_DATABASE.csv
+
+    Parses created_date ('%Y-%m-%d') and created_time ('%H:%M:%S', on 1900-01-01)
+    in place and adds `account_username`.
+    """
+    df = pd.read_csv(csv_path)
+    df['created_date'] = pd.to_datetime(df['created_date'], format='%Y-%m-%d', errors='coerce')
+    df['created_time'] = pd.to_datetime(df['created_time'], format='%H:%M:%S', errors='coerce')
+    df['account_username'] = df['post_url'].str.extract(ACCOUNT_IN_URL, expand=False)
+    return df
+
+
+class BulkImporter:
+    """
+    Set-based get-or-create for dimensions and chunked inserts for facts
+    """
+
+    def __init__(self, engine, chunk_size: int = 5000,
+                 progress: Optional[ProgressCallback] = print_progress):
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.stats = {'inserted': 0, 'skipped': 0, 'invalid': 0}
+
+    def resolve(self, model, rows: pd.DataFrame, key: Sequence[str]) -> pd.Series:
+        """
+        Ids for every row of `rows` (columns named after `model` columns), looked up by
+        the natural `key`; keys not in the table yet are inserted with the row's other
+        columns (first occurrence wins). Rows with a null key get <NA>.
+        """
+        key = list(key)
+        valid = rows.dropna(subset=key).drop_duplicates(subset=key)
+        ids = self._load_ids(model, key, valid)
+        missing = valid[[self._key_of(values) not in ids for values in valid[key].itertuples(index=False)]]
+        if not missing.empty:
+            with self.engine.begin() as conn:
+                conn.execute(self._insert_statement(model), self._records(model, missing))
+            ids.update(self._load_ids(model, key, missing))
+
+        # Look up each distinct key once, then broadcast to the rows
+        keys = rows[key].drop_duplicates()
+        keys['_id'] = pd.Series([ids.get(self._key_of(values)) for values in keys.itertuples(index=False)],
+                                index=keys.index, dtype='Int64')
+        resolved = rows[key].merge(keys, how='left', on=key)['_id']
+        return pd.Series(resolved.to_numpy(), index=rows.index, dtype='Int64')
+
+    def insert(self, model, rows: pd.DataFrame, label: Optional[str] = None) -> Dict[str, int]:
+        """
+        INSERT fact rows in chunks (one transaction each); rows that hit a unique
+        constraint are skipped, rows missing a required column are counted as invalid
+
+        Returns {'inserted', 'skipped', 'invalid'} for this call.
+        """
+        table = model.__table__
+        label = label or table.name
+        required = [c.name for c in table.columns
+                    if c.name in rows and not c.nullable and c.default is None and c.server_default is None]
+        valid = rows.dropna(subset=required)
+        stats = {'inserted': 0, 'skipped': 0, 'invalid': len(rows) - len(valid)}
+
+        stmt = self._insert_statement(model)
+        records = self._records(model, valid)
+        start = time.perf_counter()
+        for offset in range(0, len(records), self.chunk_size):
+            chunk = records[offset:offset + self.chunk_size]
+            with self.engine.begin() as conn:
+                result = conn.execute(stmt, chunk)
+            written = result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(chunk)
+            written = min(written, len(chunk))
+            stats['inserted'] += written
+            stats['skipped'] += len(chunk) - written
+            if self.progress:
+                self.progress(label, offset + len(chunk), len(records), time.perf_counter() - start)
+
+        for name, count in stats.items():
+            self.stats[name] += count
+        return stats
+
+    def _load_ids(self, model, key: List[str], rows: pd.DataFrame) -> Dict[tuple, Any]:
+        """Natural key -> id for the keys in `rows` that exist, in IN (...) chunks"""
+        table = model.__table__
+        pk = list(table.primary_key.columns)[0]
+        columns = [table.c[name] for name in key]
+        lookup = rows[key[0]].drop_duplicates().tolist()
+
+        ids = {}
+        with self.engine.connect() as conn:
+            for offset in range(0, len(lookup), KEY_LOOKUP_CHUNK):
+                chunk = lookup[offset:offset + KEY_LOOKUP_CHUNK]
+                query = select(pk, *columns).where(columns[0].in_(chunk))
+                for row in conn.execute(query):
+                    ids[self._key_of(row[1:])] = row[0]
+        return ids
+
+    def _insert_statement(self, model):
+        table = model.__table__
+        dialect = self.engine.dialect.name
+        if dialect not in ('sqlite', 'postgresql'):
+            return insert(table)
+        return (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(table).on_conflict_do_nothing()
+
+    @staticmethod
+    def _key_of(values) -> tuple:
+        # numpy / pandas scalars -> plain Python, so 5, 5.0 and np.int64(5) match
+        return tuple(value.item() if hasattr(value, 'item') else value for value in values)
+
+    @staticmethod
+    def _records(model, rows: pd.DataFrame) -> List[Dict[str, Any]]:
+        """DataFrame -> INSERT parameters; nulls become the column's scalar default or None"""
+        table = model.__table__
+        frame = rows[[name for name in rows.columns if name in table.c]].astype(object)
+        frame = frame.where(rows[frame.columns].notna(), None)
+        for name in frame.columns:
+            default = table.c[name].default
+            if default is not None and default.is_scalar:
+                frame[name] = frame[name].where(frame[name].notna(), default.arg)
+        return frame.to_dict('records')
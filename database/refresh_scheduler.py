@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Refresh Scheduler for TikTok Analytics Master Database
+Decides which posts get re-scraped next, instead of re-scraping whole lists uniformly
+
+- Each active post gets a RefreshSchedule row with a next-due time
+- The interval comes from post age and view velocity (views/hour between the last two scrapes):
+  young or fast-growing posts often, slow posts daily, stale posts rarely, dead posts paused
+  (re-checked weekly, so a revived post comes back)
+- next_batch() hands out the most urgent due posts under a global per-hour budget; every
+  dispatch is logged in refresh_dispatches and counts for an hour, scraped or not
+
+Usage:
+  python -m database.refresh_scheduler                     # sync + show the plan
+  python -m database.refresh_scheduler --emit 100 --output urls_due.txt
+"""
+
+import argparse
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session, joinedload
+
+from .models import Post, MetricsHistory, RefreshSchedule, RefreshDispatch
+
+
+@dataclass
+class RefreshPolicy:
+    """Age / velocity thresholds (hours, views per hour) that map a post to a refresh tier"""
+    young_hours: float = 24
+    young_interval: float = 1
+    fast_velocity: float = 500
+    fast_interval: float = 2
+    growing_velocity: float = 50
+    growing_interval: float = 6
+    slow_interval: float = 24
+    stale_after_days: float = 14
+    stale_interval: float = 72
+    dead_velocity: float = 1
+    dead_after_days: float = 7
+    dead_after_flat_scrapes: int = 3
+    paused_interval: float = 168
+
+    def classify(self, age_hours: float, velocity: Optional[float], flat_scrapes: int = 0) -> Tuple[str, float]:
+        """-> (tier, interval_hours)"""
+        if age_hours < self.young_hours:
+            return 'young', self.young_interval
+        if velocity is None:
+            # Not scraped twice yet: check again soon to learn the velocity
+            return 'growing', self.growing_interval
+        if velocity >= self.fast_velocity:
+            return 'fast', self.fast_interval
+        if velocity >= self.growing_velocity:
+            return 'growing', self.growing_interval
+        if age_hours >= self.dead_after_days * 24 and flat_scrapes >= self.dead_after_flat_scrapes:
+            return 'paused', self.paused_interval
+        if age_hours >= self.stale_after_days * 24:
+            return 'stale', self.stale_interval
+        return 'slow', self.slow_interval
+
+
+class RefreshScheduler:
+    """
+    Priority-based refresh scheduling on top of Post / MetricsHistory
+
+    Loop: sync() -> next_batch() -> scrape -> record_scrape() (or import snapshots and sync() again)
+    """
+
+    def __init__(self, db_session: Session, hourly_budget: int = 500,
+                 policy: Optional[RefreshPolicy] = None, dispatch_timeout_hours: float = 1):
+        self.db = db_session
+        self.hourly_budget = hourly_budget
+        self.policy = policy or RefreshPolicy()
+        # A dispatched post isn't handed out again until it is scraped or this times out
+        self.dispatch_timeout = timedelta(hours=dispatch_timeout_hours)
+        # Dispatch log rows older than this are pruned (the budget only looks back one hour)
+        self.dispatch_retention = timedelta(days=1)
+
+    # ============= STATE UPDATES =============
+
+    def _apply_observation(self, schedule: RefreshSchedule, post: Post, views: int, observed_at: datetime):
+        """Update velocity from the previous observation, then reschedule"""
+        if schedule.last_scraped_at is not None and observed_at <= schedule.last_scraped_at:
+            return
+
+        if schedule.last_views is not None and schedule.last_scraped_at is not None:
+            hours = (observed_at - schedule.last_scraped_at).total_seconds() / 3600
+            schedule.view_velocity = max(views - schedule.last_views, 0) / hours
+            if schedule.view_velocity < self.policy.dead_velocity:
+                schedule.flat_scrapes = (schedule.flat_scrapes or 0) + 1
+            else:
+                schedule.flat_scrapes = 0
+
+        schedule.last_views = views
+        schedule.last_scraped_at = observed_at
+        schedule.scrape_count = (schedule.scrape_count or 0) + 1
+        schedule.last_dispatched_at = None
+        self._reschedule(schedule, post, observed_at)
+
+    def _reschedule(self, schedule: RefreshSchedule, post: Post, now: datetime):
+        age_hours = max((now - post.created_date).total_seconds() / 3600, 0)
+        post.days_since_posted = int(age_hours // 24)
+
+        tier, interval = self.policy.classify(age_hours, schedule.view_velocity, schedule.flat_scrapes or 0)
+        schedule.tier = tier
+        schedule.interval_hours = interval
+        schedule.next_due_at = (schedule.last_scraped_at or now) + timedelta(hours=interval)
+        if tier == 'paused':
+            post.scraping_status = 'paused'
+        elif post.scraping_status == 'paused':
+            # Revived on a re-check
+            post.scraping_status = 'active'
+
+    def record_scrape(self, post_id: int, views: int, scraped_at: Optional[datetime] = None):
+        """Feed one scrape result back (call after the scraper wrote the post)"""
+        scraped_at = scraped_at or datetime.utcnow()
+        post = self.db.get(Post, post_id)
+        schedule = post.refresh_schedule or RefreshSchedule(post=post, next_due_at=scraped_at)
+        if schedule.post_id is None:
+            self.db.add(schedule)
+        self._apply_observation(schedule, post, views, scraped_at)
+        self.db.commit()
+
+    def sync(self, now: Optional[datetime] = None) -> dict:
+        """
+        Schedule new active posts and apply snapshots imported since the last sync
+
+        New posts are due immediately; the last two newer MetricsHistory snapshots
+        per post give it a velocity without any scraping.
+        """
+        now = now or datetime.utcnow()
+
+        unscheduled = (
+            self.db.query(Post)
+            .outerjoin(RefreshSchedule, RefreshSchedule.post_id == Post.id)
+            .filter(RefreshSchedule.post_id.is_(None), Post.scraping_status == 'active')
+            .all()
+        )
+        for post in unscheduled:
+            schedule = RefreshSchedule(post=post, next_due_at=now, scrape_count=0, flat_scrapes=0)
+            self.db.add(schedule)
+            self._reschedule(schedule, post, now)
+            schedule.next_due_at = now
+        self.db.flush()
+
+        ranked = (
+            select(
+                MetricsHistory.post_id,
+                MetricsHistory.views,
+                MetricsHistory.snapshot_date,
+                func.row_number().over(
+                    partition_by=MetricsHistory.post_id,
+                    order_by=MetricsHistory.snapshot_date.desc()
+                ).label('rank')
+            )
+            .join(RefreshSchedule, RefreshSchedule.post_id == MetricsHistory.post_id)
+            .where(or_(
+                RefreshSchedule.last_scraped_at.is_(None),
+                MetricsHistory.snapshot_date > RefreshSchedule.last_scraped_at
+            ))
+            .subquery()
+        )
+        snapshots = self.db.execute(
+            select(ranked.c.post_id, ranked.c.views, ranked.c.snapshot_date)
+            .where(ranked.c.rank <= 2)
+            .order_by(ranked.c.post_id, ranked.c.snapshot_date)
+        ).all()
+
+        schedules = {}
+        if snapshots:
+            post_ids = {row.post_id for row in snapshots}
+            schedules = {
+                schedule.post_id: schedule
+                for schedule in self.db.query(RefreshSchedule)
+                .options(joinedload(RefreshSchedule.post))
+                .filter(RefreshSchedule.post_id.in_(post_ids))
+            }
+        for row in snapshots:
+            schedule = schedules[row.post_id]
+            self._apply_observation(schedule, schedule.post, row.views, row.snapshot_date)
+
+        self.db.commit()
+        return {'scheduled': len(unscheduled), 'snapshots_applied': len(snapshots)}
+
+    # ============= DISPATCH =============
+
+    def budget_remaining(self, now: Optional[datetime] = None) -> int:
+        """Scrape slots left in the rolling hour (dispatches, whether scraped yet or not)"""
+        now = now or datetime.utcnow()
+        used = (
+            self.db.query(func.count(RefreshDispatch.id))
+            .filter(RefreshDispatch.dispatched_at > now - timedelta(hours=1),
+                    RefreshDispatch.dispatched_at <= now)
+            .scalar()
+        )
+        return max(self.hourly_budget - used, 0)
+
+    def _priority(self, schedule: RefreshSchedule, now: datetime) -> float:
+        """Overdue-ness weighted by how fast the numbers are moving"""
+        interval = schedule.interval_hours or self.policy.young_interval
+        overdue_hours = max((now - schedule.next_due_at).total_seconds() / 3600, 0)
+        velocity = schedule.view_velocity
+        if velocity is None:
+            velocity = self.policy.growing_velocity
+        return (1 + overdue_hours / interval) * (1 + math.log10(1 + velocity))
+
+    def next_batch(self, limit: Optional[int] = None, now: Optional[datetime] = None) -> List[Post]:
+        """
+        Most urgent due posts, capped by the hourly budget
+
+        Returned posts are logged in refresh_dispatches (counted against the budget for an
+        hour) and marked in flight (not handed out again until scraped or the dispatch
+        timeout passes). Paused posts take part at their slow re-check interval.
+        """
+        now = now or datetime.utcnow()
+        size = self.budget_remaining(now)
+        if limit is not None:
+            size = min(size, limit)
+        if size <= 0:
+            return []
+
+        due = (
+            self.db.query(RefreshSchedule)
+            .join(Post, Post.id == RefreshSchedule.post_id)
+            .options(joinedload(RefreshSchedule.post))
+            .filter(
+                RefreshSchedule.next_due_at <= now,
+                or_(Post.scraping_status == 'active', RefreshSchedule.tier == 'paused'),
+                or_(
+                    RefreshSchedule.last_dispatched_at.is_(None),
+                    RefreshSchedule.last_dispatched_at < now - self.dispatch_timeout
+                )
+            )
+            .all()
+        )
+        due.sort(key=lambda schedule: self._priority(schedule, now), reverse=True)
+
+        batch = due[:size]
+        for schedule in batch:
+            schedule.last_dispatched_at = now
+            self.db.add(RefreshDispatch(post_id=schedule.post_id, dispatched_at=now))
+        self.db.query(RefreshDispatch).filter(
+            RefreshDispatch.dispatched_at < now - self.dispatch_retention
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return [schedule.post for schedule in batch]
+
+    def plan(self, now: Optional[datetime] = None) -> dict:
+        """Posts per tier, due now, and remaining budget"""
+        now = now or datetime.utcnow()
+        tiers = dict(
+            self.db.query(RefreshSchedule.tier, func.count(RefreshSchedule.post_id))
+            .group_by(RefreshSchedule.tier)
+            .all()
+        )
+        due = (
+            self.db.query(func.count(RefreshSchedule.post_id))
+            .filter(RefreshSchedule.next_due_at <= now)
+            .scalar()
+        )
+        return {'tiers': tiers, 'due': due, 'budget_remaining': self.budget_remaining(now)}
+
+
+def main():
+    from .config import db_config
+
+    parser = argparse.ArgumentParser(description='Refresh scheduler for re-scraping posts')
+    parser.add_argument('--budget', type=int, default=500, help='Scrapes per hour')
+    parser.add_argument('--emit', type=int, default=0, help='Dispatch up to N due posts')
+    parser.add_argument('--output', help='Write dispatched post URLs to this file (one per line)')
+    args = parser.parse_args()
+
+    session = db_config.get_session()
+    scheduler = RefreshScheduler(session, hourly_budget=args.budget)
+
+    synced = scheduler.sync()
+    print(f"📅 Scheduled {synced['scheduled']} new posts, applied {synced['snapshots_applied']} snapshots")
+
+    plan = scheduler.plan()
+    print(f"⏰ Due now: {plan['due']}  |  Budget left this hour: {plan['budget_remaining']}")
+    for tier, count in sorted(plan['tiers'].items(), key=lambda item: str(item[0])):
+        print(f"   {tier}: {count}")
+
+    if args.emit:
+        posts = scheduler.next_batch(limit=args.emit)
+        urls = [post.post_url for post in posts]
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write('\n'.join(urls) + ('\n' if urls else ''))
+            print(f"💾 {len(urls)} URLs written to {args.output}")
+        else:
+            for url in urls:
+                print(url)
+
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
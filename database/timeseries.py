@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Time-Series Storage for TikTok Analytics Master Database
+Keeps snapshot tables (one row per entity per scrape) fast as history accumulates
+
+Snapshot tables: metrics_history, follower_snapshots, location_metrics. Dashboards
+read the latest value per entity and short trends (entity + last N days), so each
+table gets:
+
+- a covering "latest" index (entity, ts DESC) INCLUDE (hot value columns); the models
+  declare it, ensure_indexes() adds it to databases created before it existed
+- PostgreSQL: monthly RANGE partitions on the time column (partition_table() converts
+  an existing table once; ensure_partitions() creates the coming months ahead of time,
+  so no row ever lands in the DEFAULT partition)
+- SQLite: per-month shadow tables. rotate_sqlite_months() moves months older than the
+  hot window out of the main table into <table>_YYYY_MM and rebuilds the
+  <table>_history view (UNION ALL of the main table and its shadows)
+- compact(): rows older than N days are thinned to the last snapshot per entity per day
+- apply_retention(): drops whole partitions / shadow tables (or rows) past the cutoff
+
+Usage:
+  python -m database.timeseries                               # indexes + partitions ahead
+  python -m database.timeseries --compact-after-days 30 --retain-days 730
+  python -m database.timeseries --hot-months 3                # SQLite: rotate old months out
+  python -m database.timeseries --partition metrics_history   # PostgreSQL: one-time conversion
+"""
+
+import argparse
+import json
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Date, DateTime, bindparam, cast, column, delete, exists, func, inspect, select, table, text
+)
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class TimeSeriesSpec:
+    """A snapshot table: which column identifies the entity, which one is the timestamp"""
+    table: str
+    entity_column: str
+    time_column: str
+    include_columns: Tuple[str, ...] = ()
+    latest_index: str = ''
+
+    @property
+    def index_name(self) -> str:
+        return self.latest_index or f"idx_{self.table}_latest"
+
+    def sa_table(self):
+        """Lightweight table() construct with typed time column (for Core statements)"""
+        return table(self.table, column('id'), column(self.entity_column),
+                     column(self.time_column, DateTime()),
+                     *(column(name) for name in self.include_columns))
+
+
+# follower_snapshots has two layouts (the unified schema vs. the legacy OnlyFans /
+# production schemas); applicable_specs() picks whichever matches the database
+TIME_SERIES_SPECS = (
+    TimeSeriesSpec('metrics_history', 'post_id', 'snapshot_date',
+                   ('views', 'likes', 'comments', 'shares', 'engagement'), 'idx_metrics_post_latest'),
+    TimeSeriesSpec('follower_snapshots', 'account_id', 'snapshot_date',
+                   ('followers',), 'idx_follower_account_latest'),
+    TimeSeriesSpec('follower_snapshots', 'account_id', 'timestamp',
+                   ('followers',), 'idx_follower_account_latest'),
+    TimeSeriesSpec('location_metrics', 'account', 'recorded_at',
+                   ('usa_percentage', 'confidence_score'), 'idx_location_metrics_account_latest'),
+)
+
+SHADOW_TABLE = re.compile(r'^(?P<table>.+)_(?P<year>\d{4})_(?P<month>\d{2})$')
+PARTITION_TABLE = re.compile(r'^(?P<table>.+)_y(?P<year>\d{4})m(?P<month>\d{2})$')
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month = value.month - 1 + months
+    return date(value.year + month // 12, month % 12 + 1, 1)
+
+
+def month_range(first: date, last: date) -> List[date]:
+    """First day of every month from first's month through last's month"""
+    months, current = [], month_start(first)
+    while current <= last:
+        months.append(current)
+        current = add_months(current, 1)
+    return months
+
+
+def partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+
+def shadow_name(table_name: str, month: date) -> str:
+    return f"{table_name}_{month.year:04d}_{month.month:02d}"
+
+
+def partition_ddl(spec: TimeSeriesSpec, month: date, parent: Optional[str] = None) -> str:
+    """CREATE TABLE ... PARTITION OF for one month (bounds are [first of month, first of next))"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(spec.table, month)} "
+        f"PARTITION OF {parent or spec.table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def latest_index_ddl(spec: TimeSeriesSpec, dialect: str, table_name: Optional[str] = None,
+                     index_name: Optional[str] = None) -> str:
+    """(entity, ts DESC) index; PostgreSQL also INCLUDEs the value columns (index-only scans)"""
+    ddl = (f"CREATE INDEX IF NOT EXISTS {index_name or spec.index_name} "
+           f"ON {table_name or spec.table} ({spec.entity_column}, {spec.time_column} DESC)")
+    if dialect == 'postgresql' and spec.include_columns:
+        ddl += f" INCLUDE ({', '.join(spec.include_columns)})"
+    return ddl
+
+
+def applicable_specs(bind, specs: Sequence[TimeSeriesSpec] = TIME_SERIES_SPECS) -> List[TimeSeriesSpec]:
+    """Specs whose table and columns exist in this database (one per table)"""
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    found = {}
+    for spec in specs:
+        if spec.table in found or spec.table not in tables:
+            continue
+        columns = {col['name'] for col in inspector.get_columns(spec.table)}
+        if {spec.entity_column, spec.time_column} <= columns:
+            found[spec.table] = spec
+    return list(found.values())
+
+
+def latest_query(spec: TimeSeriesSpec, entity_ids: Iterable[Any]):
+    """Newest row per entity: an index-only max() per entity on the latest index, then that row"""
+    t = spec.sa_table()
+    inner = spec.sa_table().alias('newest')
+    newest_ts = (
+        select(func.max(inner.c[spec.time_column]))
+        .where(inner.c[spec.entity_column] == t.c[spec.entity_column])
+        .scalar_subquery()
+    )
+    return (
+        select(t.c[spec.entity_column], t.c[spec.time_column], *(t.c[name] for name in spec.include_columns))
+        .where(t.c[spec.entity_column].in_(list(entity_ids)), t.c[spec.time_column] == newest_ts)
+    )
+
+
+def trend_query(spec: TimeSeriesSpec, entity_id: Any, since: datetime):
+    """One entity's rows since a point in time, oldest first: a single index range scan"""
+    t = spec.sa_table()
+    return (
+        select(t.c[spec.time_column], *(t.c[name] for name in spec.include_columns))
+        .where(t.c[spec.entity_column] == entity_id, t.c[spec.time_column] >= since)
+        .order_by(t.c[spec.time_column])
+    )
+
+
+class TimeSeriesMaintenance:
+    """Indexes, partitions / shadow tables, compaction and retention for the snapshot tables"""
+
+    def __init__(self, db_session: Session, specs: Optional[Sequence[TimeSeriesSpec]] = None,
+                 now: Optional[datetime] = None):
+        self.db = db_session
+        self.dialect = db_session.get_bind().dialect.name
+        self.specs = applicable_specs(db_session.connection(), specs or TIME_SERIES_SPECS)
+        self.now = now or datetime.utcnow()
+
+    # --- indexes ---------------------------------------------------------------------
+
+    def ensure_indexes(self) -> List[str]:
+        """Create missing latest indexes; returns the tables that got one"""
+        created = []
+        inspector = inspect(self.db.connection())
+        for spec in self.specs:
+            existing = {index['name'] for index in inspector.get_indexes(spec.table)}
+            if spec.index_name not in existing:
+                self.db.execute(text(latest_index_ddl(spec, self.dialect)))
+                created.append(spec.table)
+        self.db.commit()
+        return created
+
+    # --- PostgreSQL partitions ---------------------------------------------------------
+
+    def is_partitioned(self, spec: TimeSeriesSpec) -> bool:
+        if self.dialect != 'postgresql':
+            return False
+        return self.db.execute(
+            text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)"),
+            {'name': spec.table}
+        ).first() is not None
+
+    def ensure_partitions(self, months_ahead: int = 3) -> Dict[str, List[str]]:
+        """PostgreSQL: create this month's and the next `months_ahead` partitions"""
+        created = {}
+        for spec in self.specs:
+            if not self.is_partitioned(spec):
+                continue
+            existing = set(self._partitions(spec))
+            months = month_range(self.now.date(), add_months(self.now.date(), months_ahead))
+            missing = [month for month in months if partition_name(spec.table, month) not in existing]
+            for month in missing:
+                self.db.execute(text(partition_ddl(spec, month)))
+            if missing:
+                created[spec.table] = [partition_name(spec.table, month) for month in missing]
+        self.db.commit()
+        return created
+
+    def _partitions(self, spec: TimeSeriesSpec) -> List[str]:
+        return [name for (name,) in self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:name)"
+        ), {'name': spec.table})]
+
+    def partition_table(self, spec: TimeSeriesSpec, months_ahead: int = 3) -> Dict[str, Any]:
+        """
+        PostgreSQL: convert a plain snapshot table into a monthly RANGE-partitioned one
+
+        Runs in one transaction: build <table>__partitioned with PK (id, ts), a partition
+        per month from the oldest row through `months_ahead`, and a DEFAULT partition;
+        copy the rows; swap the tables; re-create unique constraints (only those that
+        contain the time column can exist on a partitioned table), foreign keys and indexes
+        """
+        if self.dialect != 'postgresql':
+            raise ValueError("Range partitioning needs PostgreSQL; use rotate_sqlite_months() on SQLite")
+        if self.is_partitioned(spec):
+            return {'table': spec.table, 'status': 'already partitioned'}
+
+        conn = self.db.connection()
+        inspector = inspect(conn)
+        uniques = inspector.get_unique_constraints(spec.table)
+        foreign_keys = inspector.get_foreign_keys(spec.table)
+        indexes = [index for index in inspector.get_indexes(spec.table) if not index.get('unique')]
+        sequence = self.db.execute(text("SELECT pg_get_serial_sequence(:name, 'id')"),
+                                   {'name': spec.table}).scalar()
+        oldest, = self.db.execute(text(f"SELECT min({spec.time_column}) FROM {spec.table}")).one()
+
+        staging = f"{spec.table}__partitioned"
+        months = month_range((oldest or self.now).date(), add_months(self.now.date(), months_ahead))
+        statements = [
+            f"CREATE TABLE {staging} (LIKE {spec.table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({spec.time_column})",
+            f"ALTER TABLE {staging} ADD PRIMARY KEY (id, {spec.time_column})",
+            *(partition_ddl(spec, month, parent=staging) for month in months),
+            f"CREATE TABLE IF NOT EXISTS {spec.table}_default PARTITION OF {staging} DEFAULT",
+            f"INSERT INTO {staging} SELECT * FROM {spec.table}",
+        ]
+        if sequence:
+            statements.append(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+        statements += [f"DROP TABLE {spec.table}", f"ALTER TABLE {staging} RENAME TO {spec.table}"]
+        if sequence:
+            statements.append(f"ALTER SEQUENCE {sequence} OWNED BY {spec.table}.id")
+
+        skipped = []
+        for unique in uniques:
+            if spec.time_column in unique['column_names']:
+                statements.append(f"ALTER TABLE {spec.table} ADD CONSTRAINT {unique['name']} "
+                                  f"UNIQUE ({', '.join(unique['column_names'])})")
+            else:
+                skipped.append(unique['name'])
+        for fk in foreign_keys:
+            statements.append(
+                f"ALTER TABLE {spec.table} ADD "
+                + (f"CONSTRAINT {fk['name']} " if fk.get('name') else '')
+                + f"FOREIGN KEY ({', '.join(fk['constrained_columns'])}) "
+                f"REFERENCES {fk['referred_table']} ({', '.join(fk['referred_columns'])})"
+            )
+        for index in indexes:
+            sorting = index.get('column_sorting') or {}
+            columns = ', '.join(
+                f"{name} DESC" if 'desc' in sorting.get(name, ()) else name for name in index['column_names']
+            )
+            include = index.get('include_columns') or (index.get('dialect_options') or {}).get('postgresql_include')
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {index['name']} ON {spec.table} ({columns})"
+                + (f" INCLUDE ({', '.join(include)})" if include else '')
+            )
+        statements.append(latest_index_ddl(spec, 'postgresql'))
+
+        for statement in statements:
+            self.db.execute(text(statement))
+        self.db.commit()
+        return {'table': spec.table, 'status': 'partitioned',
+                'partitions': [partition_name(spec.table, month) for month in months],
+                'skipped_unique_constraints': skipped}
+
+    # --- SQLite shadow tables -----------------------------------------------------------
+
+    def _shadow_tables(self, spec: TimeSeriesSpec) -> List[Tuple[str, date]]:
+        shadows = []
+        for name in inspect(self.db.connection()).get_table_names():
+            match = SHADOW_TABLE.match(name)
+            if match and match.group('table') == spec.table:
+                shadows.append((name, date(int(match.group('year')), int(match.group('month')), 1)))
+        return sorted(shadows, key=lambda shadow: shadow[1])
+
+    def rotate_sqlite_months(self, hot_months: int = 3) -> Dict[str, Dict[str, int]]:
+        """
+        SQLite: move months before the hot window (current month + hot_months - 1 before it)
+        into <table>_YYYY_MM shadow tables, then rebuild the <table>_history view
+        """
+        if self.dialect != 'sqlite':
+            return {}
+        cutoff = datetime.combine(add_months(self.now.date(), -(hot_months - 1)), datetime.min.time())
+        moved = {}
+        for spec in self.specs:
+            t = spec.sa_table()
+            ts = t.c[spec.time_column]
+            months = sorted(
+                month for (month,) in self.db.execute(select(func.substr(ts, 1, 7)).where(ts < cutoff).distinct())
+                if month
+            )
+            for month_key in months:
+                month = date(int(month_key[:4]), int(month_key[5:7]), 1)
+                shadow = shadow_name(spec.table, month)
+                start = datetime.combine(month, datetime.min.time())
+                end = datetime.combine(add_months(month, 1), datetime.min.time())
+                self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {shadow} AS SELECT * FROM {spec.table} WHERE 0"))
+                self.db.execute(text(latest_index_ddl(spec, 'sqlite', shadow, f"idx_{shadow}_latest")))
+                self.db.execute(
+                    text(f"INSERT INTO {shadow} SELECT * FROM {spec.table} "
+                         f"WHERE {spec.time_column} >= :start AND {spec.time_column} < :end")
+                    .bindparams(bindparam('start', start, type_=DateTime()), bindparam('end', end, type_=DateTime()))
+                )
+                count = self.db.execute(delete(t).where(ts >= start, ts < end)).rowcount
+                moved.setdefault(spec.table, {})[shadow] = count
+            self._rebuild_history_view(spec)
+        self.db.commit()
+        return moved
+
+    def _rebuild_history_view(self, spec: TimeSeriesSpec):
+        """<table>_history: the main table plus every shadow month, for full-history reads"""
+        parts = [spec.table] + [name for name, _ in self._shadow_tables(spec)]
+        self.db.execute(text(f"DROP VIEW IF EXISTS {spec.table}_history"))
+        self.db.execute(text(
+            f"CREATE VIEW {spec.table}_history AS "
+            + " UNION ALL ".join(f"SELECT * FROM {name}" for name in parts)
+        ))
+
+    # --- compaction and retention ---------------------------------------------------------
+
+    def _day(self, ts):
+        return func.date(ts) if self.dialect == 'sqlite' else cast(ts, Date)
+
+    def compact(self, older_than_days: int = 30) -> Dict[str, int]:
+        """
+        Thin rows older than `older_than_days` to the last snapshot per entity per day
+
+        Daily resolution is all the trend charts need for old data; returns rows deleted
+        per table.
+        """
+        cutoff = self.now - timedelta(days=older_than_days)
+        deleted = {}
+        for spec in self.specs:
+            t = spec.sa_table()
+            newer = spec.sa_table().alias('newer')
+            ts, newer_ts = t.c[spec.time_column], newer.c[spec.time_column]
+            superseded = exists().where(
+                newer.c[spec.entity_column] == t.c[spec.entity_column],
+                newer_ts > ts,
+                self._day(newer_ts) == self._day(ts),
+            )
+            deleted[spec.table] = self.db.execute(delete(t).where(ts < cutoff, superseded)).rowcount
+        self.db.commit()
+        return deleted
+
+    def apply_retention(self, retain_days: int) -> Dict[str, Any]:
+        """
+        Drop history older than `retain_days`: whole months first (PostgreSQL partitions,
+        SQLite shadow tables), then remaining rows of the main table
+        """
+        cutoff = self.now - timedelta(days=retain_days)
+        report = {}
+        for spec in self.specs:
+            dropped = []
+            if self.is_partitioned(spec):
+                for name in self._partitions(spec):
+                    match = PARTITION_TABLE.match(name)
+                    if match:
+                        month = date(int(match.group('year')), int(match.group('month')), 1)
+                        if datetime.combine(add_months(month, 1), datetime.min.time()) <= cutoff:
+                            self.db.execute(text(f"DROP TABLE {name}"))
+                            dropped.append(name)
+            elif self.dialect == 'sqlite':
+                shadows = self._shadow_tables(spec)
+                for name, month in shadows:
+                    if datetime.combine(add_months(month, 1), datetime.min.time()) <= cutoff:
+                        self.db.execute(text(f"DROP TABLE {name}"))
+                        dropped.append(name)
+                if dropped:
+                    self._rebuild_history_view(spec)
+
+            t = spec.sa_table()
+            rows = self.db.execute(delete(t).where(t.c[spec.time_column] < cutoff)).rowcount
+            report[spec.table] = {'dropped_tables': dropped, 'deleted_rows': rows}
+        self.db.commit()
+        return report
+
+    def run(self, months_ahead: int = 3, compact_after_days: Optional[int] = None,
+            retain_days: Optional[int] = None, hot_months: Optional[int] = None) -> Dict[str, Any]:
+        """
+        The scheduled job: indexes, upcoming partitions, then the optional compaction,
+        SQLite month rotation and retention steps
+        """
+        report = {
+            'tables': [spec.table for spec in self.specs],
+            'indexes_created': self.ensure_indexes(),
+            'partitions_created': self.ensure_partitions(months_ahead),
+        }
+        if compact_after_days is not None:
+            report['compacted'] = self.compact(compact_after_days)
+        if hot_months is not None:
+            report['rotated'] = self.rotate_sqlite_months(hot_months)
+        if retain_days is not None:
+            report['retention'] = self.apply_retention(retain_days)
+        return report
+
+
+def main():
+    from .config import db_config
+
+    parser = argparse.ArgumentParser(description='Maintain the snapshot (time-series) tables')
+    parser.add_argument('--months-ahead', type=int, default=3, help='PostgreSQL partitions to keep created ahead')
+    parser.add_argument('--compact-after-days', type=int, help='Thin older rows to one per entity per day')
+    parser.add_argument('--retain-days', type=int, help='Drop history older than this')
+    parser.add_argument('--hot-months', type=int, help='SQLite: months kept in the main tables')
+    parser.add_argument('--partition', metavar='TABLE', help='PostgreSQL: convert TABLE to monthly partitions')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    session = db_config.get_session()
+    try:
+        maintenance = TimeSeriesMaintenance(session)
+        if args.partition:
+            spec = next((spec for spec in maintenance.specs if spec.table == args.partition), None)
+            if spec is None:
+                parser.error(f"{args.partition} is not a snapshot table in this database")
+            report = maintenance.partition_table(spec, args.months_ahead)
+        else:
+            report = maintenance.run(args.months_ahead, args.compact_after_days, args.retain_days, args.hot_months)
+    finally:
+        session.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+
+    print(f"✅ Time-series maintenance ({maintenance.dialect})")
+    for key, value in report.items():
+        print(f"   {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
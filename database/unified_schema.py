@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Unified Schema for TikTok Analytics Master Database
+One set of tables for every pipeline, plus views under the legacy table names
+
+database/models.py is the single schema (and the Alembic target). The older
+per-pipeline schemas map onto it like this:
+
+    legacy table (schema)                              unified table
+    vas (all)                                          vas
+    creators / onlyfans_creators                       creators
+    accounts / tiktok_accounts                         accounts
+    content_sets                                       content_sets
+    tiktok_posts (local_database_setup, OnlyFans),     posts
+      posts (production, proof log)
+    tiktok_slides / post_slides                        slides
+    metrics_snapshots                                  metrics_history
+    follower_snapshots                                 follower_snapshots
+    proof_logs                                         proof_logs
+
+Compatibility views keep queries written against the old names working on the
+unified database (read-only). A view is skipped where a real table of that name
+exists, e.g. the raw tiktok_posts table that sqlite_writer.py still writes to;
+`--import` copies such tables into the unified tables instead.
+
+Usage:
+    python -m database.unified_schema                          # create / refresh views
+    python -m database.unified_schema --import sqlite:///proof_log_analytics.db
+    python -m database.unified_schema --drop-views
+"""
+
+import argparse
+import json
+from contextlib import nullcontext
+from typing import Dict, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from . import models  # noqa: F401  (registers the unified tables)
+
+
+def _days_ago(dialect: str, days: int) -> str:
+    if dialect == 'postgresql':
+        return f"(now() - interval '{int(days)} days')"
+    return f"datetime('now', '-{int(days)} days')"
+
+
+def compat_views(dialect: str = 'sqlite') -> Dict[str, str]:
+    """
+    View name -> SELECT over the unified tables, in creation order
+    (a view only depends on views before it)
+    """
+    week_ago = _days_ago(dialect, 7)
+    return {
+        'tiktok_posts': """
+            SELECT p.id, p.post_url, p.created_date, c.name AS creator, cs.set_id, v.name AS va,
+                   p.account, COALESCE(a.username, p.account) AS account_username,
+                   a.followers AS account_followers,
+                   p.views, p.likes, p.comments, p.shares, p.bookmarks, p.engagement, p.engagement_rate,
+                   p.hashtags, p.sound AS sound_title, p.source AS scraping_method,
+                   p.updated_at AS scraped_at, p.updated_at AS last_scraped_at,
+                   p.va_id, p.account_id, p.creator_id, p.content_set_id
+            FROM posts p
+            LEFT JOIN vas v ON v.id = p.va_id
+            LEFT JOIN accounts a ON a.id = p.account_id
+            LEFT JOIN creators c ON c.id = p.creator_id
+            LEFT JOIN content_sets cs ON cs.id = p.content_set_id
+        """,
+        'tiktok_slides': """
+            SELECT id, post_id, slide_index AS slide_number, slide_url, created_at AS uploaded_at
+            FROM slides
+        """,
+        'post_slides': """
+            SELECT id, post_id, slide_index AS slide_number, slide_url, ocr_text,
+                   (ocr_text IS NOT NULL AND ocr_text <> '') AS has_text, created_at, updated_at
+            FROM slides
+        """,
+        'metrics_snapshots': """
+            SELECT id, post_id, post_id AS tiktok_post_id, views, likes, comments, shares,
+                   engagement, engagement_rate, snapshot_date AS "timestamp"
+            FROM metrics_history
+        """,
+        'tiktok_accounts': """
+            SELECT id, username, display_name, va_id, primary_creator_id, status, followers,
+                   following, last_scraped_at, created_at, updated_at
+            FROM accounts
+        """,
+        'onlyfans_creators': """
+            SELECT id, name, display_name, onlyfans_username, status, created_at, updated_at
+            FROM creators
+        """,
+        # Latest follower count and 7-day change per account; both lookups are
+        # newest-first seeks on idx_follower_account_latest
+        'account_summary': f"""
+            SELECT a.id AS account_id, a.username, a.va_id, v.name AS va_name,
+                   latest.followers AS current_followers,
+                   latest.followers - week.followers AS followers_change_7d,
+                   CASE WHEN week.followers > 0
+                        THEN (latest.followers - week.followers) * 100.0 / week.followers END
+                        AS followers_growth_rate_7d,
+                   latest.snapshot_date AS last_updated, a.status
+            FROM accounts a
+            LEFT JOIN vas v ON v.id = a.va_id
+            LEFT JOIN follower_snapshots latest ON latest.id = (
+                SELECT f.id FROM follower_snapshots f WHERE f.account_id = a.id
+                ORDER BY f.snapshot_date DESC LIMIT 1)
+            LEFT JOIN follower_snapshots week ON week.id = (
+                SELECT f.id FROM follower_snapshots f
+                WHERE f.account_id = a.id AND f.snapshot_date <= {week_ago}
+                ORDER BY f.snapshot_date DESC LIMIT 1)
+        """,
+        'va_summary': """
+            SELECT v.id AS va_id, v.name AS va_name, COUNT(s.account_id) AS total_accounts,
+                   COALESCE(SUM(s.current_followers), 0) AS total_followers,
+                   COALESCE(SUM(s.followers_change_7d), 0) AS total_followers_gained_7d,
+                   AVG(s.followers_growth_rate_7d) AS average_growth_rate_7d,
+                   (SELECT b.username FROM account_summary b
+                    WHERE b.va_id = v.id AND b.followers_change_7d IS NOT NULL
+                    ORDER BY b.followers_change_7d DESC LIMIT 1) AS best_account,
+                   (SELECT w.username FROM account_summary w
+                    WHERE w.va_id = v.id AND w.followers_change_7d IS NOT NULL
+                    ORDER BY w.followers_change_7d ASC LIMIT 1) AS worst_account,
+                   MAX(s.last_updated) AS last_updated
+            FROM vas v
+            LEFT JOIN account_summary s ON s.va_id = v.id
+            GROUP BY v.id, v.name
+        """,
+    }
+
+
+def create_compat_views(bind) -> Tuple[List[str], List[str]]:
+    """
+    Create (or re-create) the compatibility views on a connection or engine
+
+    Returns (created, skipped); names held by a real table are skipped.
+    """
+    dialect = bind.dialect.name
+    views = compat_views(dialect)
+    tables = set(inspect(bind).get_table_names())
+    created, skipped = [], []
+
+    drop_compat_views(bind)
+    with _begin(bind) as conn:
+        for name, select_sql in views.items():
+            if name in tables:
+                skipped.append(name)
+                continue
+            conn.execute(text(f"CREATE VIEW {name} AS {select_sql}"))
+            created.append(name)
+    return created, skipped
+
+
+def drop_compat_views(bind) -> List[str]:
+    """Drop the compatibility views that exist (dependents first)"""
+    existing = set(inspect(bind).get_view_names())
+    dropped = []
+    with _begin(bind) as conn:
+        for name in reversed(list(compat_views(bind.dialect.name))):
+            if name in existing:
+                conn.execute(text(f"DROP VIEW {name}"))
+                dropped.append(name)
+    return dropped
+
+
+def _begin(bind):
+    """engine.begin() for an Engine; a Connection is used as-is (its owner commits)"""
+    return bind.begin() if isinstance(bind, Engine) else nullcontext(bind)
+
+
+def main():
+    """Command-line entry point"""
+    from .config import db_config
+    from .migration_scripts.migrate_legacy_schemas import LegacySchemaMigrator
+
+    parser = argparse.ArgumentParser(description='Unified schema: compatibility views and legacy database import')
+    parser.add_argument('--import', dest='sources', nargs='+', default=[], metavar='URL',
+                        help='Legacy database URLs to copy into the unified tables')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT batch')
+    parser.add_argument('--drop-views', action='store_true', help='Drop the compatibility views and exit')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    args = parser.parse_args()
+
+    engine = db_config.engine or db_config.initialize()
+    if args.drop_views:
+        dropped = drop_compat_views(engine)
+        print(f"🗑️ Dropped {len(dropped)} views: {', '.join(dropped) or '-'}")
+        return
+
+    models.Base.metadata.create_all(engine)
+    result = {'imports': {}}
+    if args.sources:
+        session = db_config.get_session()
+        try:
+            for source in args.sources:
+                migrator = LegacySchemaMigrator(session, batch_size=args.batch_size)
+                result['imports'][source] = migrator.migrate_database(source)
+        finally:
+            session.close()
+
+    created, skipped = create_compat_views(engine)
+    result['views'] = {'created': created, 'skipped': skipped}
+
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+        return
+    for source, summary in result['imports'].items():
+        stats = summary['stats']
+        print(f"📥 {source}: {stats['imported']:,} rows imported, {stats['skipped']:,} already present, "
+              f"{stats['failed']:,} failed")
+    print(f"👁️ Views created: {', '.join(created) or '-'}")
+    if skipped:
+        print(f"⏭️ Kept as tables (import them with --import): {', '.join(skipped)}")
+
+
+if __name__ == "__main__":
+    main()
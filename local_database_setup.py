@@ -5,10 +5,69 @@ Creates the same schema as Supabase but runs locally
 No account needed, works immediately
 """
 
+import re
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 
+HASHTAG_PATTERN = re.compile(r'#(\w+)')
+
+
+def parse_hashtags(text):
+    """'#fyp #viral, #FYP' -> ['fyp', 'viral'] (#-prefixed tokens only, lowercase, deduplicated)"""
+    if not text:
+        return []
+    return list(dict.fromkeys(tag.lower() for tag in HASHTAG_PATTERN.findall(text)))
+
+
+def create_tag_tables(cursor):
+    """
+    Sound / hashtag dimension tables plus post links
+    Safe to run on existing databases (IF NOT EXISTS)
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sounds (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        author TEXT NOT NULL DEFAULT '',
+        UNIQUE(title, author)
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS hashtags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tag TEXT UNIQUE NOT NULL
+    )
+    """)
+
+    # One sound per post
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS post_sounds (
+        post_id INTEGER PRIMARY KEY,
+        sound_id INTEGER NOT NULL,
+
+        FOREIGN KEY (post_id) REFERENCES tiktok_posts(id) ON DELETE CASCADE,
+        FOREIGN KEY (sound_id) REFERENCES sounds(id)
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS post_hashtags (
+        post_id INTEGER NOT NULL,
+        hashtag_id INTEGER NOT NULL,
+
+        PRIMARY KEY (post_id, hashtag_id),
+        FOREIGN KEY (post_id) REFERENCES tiktok_posts(id) ON DELETE CASCADE,
+        FOREIGN KEY (hashtag_id) REFERENCES hashtags(id)
+    )
+    """)
+
+    # Reverse lookups: all posts for a sound / hashtag
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_sounds_sound ON post_sounds(sound_id, post_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_hashtags_hashtag ON post_hashtags(hashtag_id, post_id)")
+
+
 def create_local_database(db_path: str = "./tiktok_analytics.db"):
     """Create local SQLite database with production schema"""
 
@@ -119,6 +178,10 @@ def create_local_database(db_path: str = "./tiktok_analytics.db"):
     )
     """)
 
+    # Tables 4-7: Sound / hashtag index
+    print("🎵 Creating sound/hashtag index tables...")
+    create_tag_tables(cursor)
+
     # Create indexes for performance
     print("⚡ Creating indexes...")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_url ON tiktok_posts(post_url)")
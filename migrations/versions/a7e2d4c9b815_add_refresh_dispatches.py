@@ -0,0 +1,41 @@
+"""Add refresh_dispatches table
+
+Revision ID: a7e2d4c9b815
+Revises: f3c8a1d5b274
+Create Date: 2025-10-29 09:41:17.204553
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e2d4c9b815'
+down_revision: Union[str, Sequence[str], None] = 'f3c8a1d5b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_dispatches',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('dispatched_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_refresh_dispatches_post_id'), 'refresh_dispatches', ['post_id'], unique=False)
+    op.create_index(op.f('ix_refresh_dispatches_dispatched_at'), 'refresh_dispatches', ['dispatched_at'], unique=False)
+    # Paused posts now get a slow re-check; existing ones are due for their first one right away
+    op.execute("UPDATE refresh_schedule SET interval_hours = 168, "
+               "next_due_at = COALESCE(last_scraped_at, updated_at) WHERE tier = 'paused' AND next_due_at IS NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_dispatches_dispatched_at'), table_name='refresh_dispatches')
+    op.drop_index(op.f('ix_refresh_dispatches_post_id'), table_name='refresh_dispatches')
+    op.drop_table('refresh_dispatches')
@@ -0,0 +1,47 @@
+"""Add refresh_schedule table
+
+Revision ID: b7c41e9d2a53
+Revises: 4cd4c3d452e6
+Create Date: 2025-10-24 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41e9d2a53'
+down_revision: Union[str, Sequence[str], None] = '4cd4c3d452e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_schedule',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('next_due_at', sa.DateTime(), nullable=True),
+    sa.Column('interval_hours', sa.Float(), nullable=True),
+    sa.Column('tier', sa.String(length=20), nullable=True),
+    sa.Column('last_views', sa.Integer(), nullable=True),
+    sa.Column('last_scraped_at', sa.DateTime(), nullable=True),
+    sa.Column('view_velocity', sa.Float(), nullable=True),
+    sa.Column('flat_scrapes', sa.Integer(), nullable=False),
+    sa.Column('scrape_count', sa.Integer(), nullable=False),
+    sa.Column('last_dispatched_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index(op.f('ix_refresh_schedule_next_due_at'), 'refresh_schedule', ['next_due_at'], unique=False)
+    op.create_index(op.f('ix_refresh_schedule_last_dispatched_at'), 'refresh_schedule', ['last_dispatched_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_schedule_last_dispatched_at'), table_name='refresh_schedule')
+    op.drop_index(op.f('ix_refresh_schedule_next_due_at'), table_name='refresh_schedule')
+    op.drop_table('refresh_schedule')
@@ -0,0 +1,35 @@
+"""Add comment_crawl_marks table
+
+Revision ID: c6b2e8f4a917
+Revises: a7e2d4c9b815
+Create Date: 2025-10-30 10:12:44.381905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6b2e8f4a917'
+down_revision: Union[str, Sequence[str], None] = 'a7e2d4c9b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # No marks yet: the first incremental run after this re-pages every post once
+    op.create_table('comment_crawl_marks',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('complete_through', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('comment_crawl_marks')
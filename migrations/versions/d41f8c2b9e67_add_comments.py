@@ -0,0 +1,52 @@
+"""Add comments table
+
+Revision ID: d41f8c2b9e67
+Revises: b7c41e9d2a53
+Create Date: 2025-10-25 09:41:07.215334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f8c2b9e67'
+down_revision: Union[str, Sequence[str], None] = 'b7c41e9d2a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('comments',
+    sa.Column('comment_id', sa.String(length=32), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('parent_comment_id', sa.String(length=32), nullable=True),
+    sa.Column('author_id', sa.String(length=32), nullable=True),
+    sa.Column('author_username', sa.String(length=100), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('like_count', sa.Integer(), nullable=False),
+    sa.Column('reply_count', sa.Integer(), nullable=False),
+    sa.Column('commented_at', sa.DateTime(), nullable=False),
+    sa.Column('first_seen_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('like_count >= 0', name='check_comment_likes_positive'),
+    sa.CheckConstraint('reply_count >= 0', name='check_comment_replies_positive'),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('comment_id')
+    )
+    op.create_index('idx_comments_post_time', 'comments', ['post_id', 'commented_at'], unique=False)
+    op.create_index(op.f('ix_comments_post_id'), 'comments', ['post_id'], unique=False)
+    op.create_index(op.f('ix_comments_parent_comment_id'), 'comments', ['parent_comment_id'], unique=False)
+    op.create_index(op.f('ix_comments_author_username'), 'comments', ['author_username'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_comments_author_username'), table_name='comments')
+    op.drop_index(op.f('ix_comments_parent_comment_id'), table_name='comments')
+    op.drop_index(op.f('ix_comments_post_id'), table_name='comments')
+    op.drop_index('idx_comments_post_time', table_name='comments')
+    op.drop_table('comments')
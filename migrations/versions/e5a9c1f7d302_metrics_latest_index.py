@@ -0,0 +1,34 @@
+"""Covering latest index on metrics_history
+
+Revision ID: e5a9c1f7d302
+Revises: d41f8c2b9e67
+Create Date: 2025-10-27 10:12:44.381907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c1f7d302'
+down_revision: Union[str, Sequence[str], None] = 'd41f8c2b9e67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_metrics_post_latest', 'metrics_history', ['post_id', sa.text('snapshot_date DESC')],
+                    unique=False, postgresql_include=['views', 'likes', 'comments', 'shares', 'engagement'])
+    # Both are prefixes of the new index
+    op.drop_index('idx_metrics_post_date', table_name='metrics_history')
+    op.drop_index(op.f('ix_metrics_history_post_id'), table_name='metrics_history')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_metrics_history_post_id'), 'metrics_history', ['post_id'], unique=False)
+    op.create_index('idx_metrics_post_date', 'metrics_history', ['post_id', 'snapshot_date'], unique=False)
+    op.drop_index('idx_metrics_post_latest', table_name='metrics_history')
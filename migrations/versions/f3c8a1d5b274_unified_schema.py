@@ -0,0 +1,243 @@
+"""Unified schema: creators, accounts, content sets, follower snapshots, proof logs
+
+Revision ID: f3c8a1d5b274
+Revises: e5a9c1f7d302
+Create Date: 2025-10-28 09:03:18.552140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.unified_schema import create_compat_views, drop_compat_views
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1d5b274'
+down_revision: Union[str, Sequence[str], None] = 'e5a9c1f7d302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('creators',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('display_name', sa.String(length=200), nullable=True),
+    sa.Column('onlyfans_username', sa.String(length=100), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_creators_name'), 'creators', ['name'], unique=True)
+    op.create_index(op.f('ix_creators_onlyfans_username'), 'creators', ['onlyfans_username'], unique=False)
+
+    op.create_table('accounts',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('display_name', sa.String(length=200), nullable=True),
+    sa.Column('platform', sa.String(length=50), nullable=False),
+    sa.Column('verified', sa.Boolean(), nullable=False),
+    sa.Column('va_id', sa.Integer(), nullable=True),
+    sa.Column('primary_creator_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('followers', sa.Integer(), nullable=False),
+    sa.Column('following', sa.Integer(), nullable=False),
+    sa.Column('last_scraped_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['primary_creator_id'], ['creators.id'], ),
+    sa.ForeignKeyConstraint(['va_id'], ['vas.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_account_va_status', 'accounts', ['va_id', 'status'], unique=False)
+    op.create_index(op.f('ix_accounts_username'), 'accounts', ['username'], unique=True)
+    op.create_index(op.f('ix_accounts_primary_creator_id'), 'accounts', ['primary_creator_id'], unique=False)
+
+    op.create_table('content_sets',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('set_id', sa.Integer(), nullable=False),
+    sa.Column('creator_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=True),
+    sa.Column('content_type', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['creator_id'], ['creators.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('creator_id', 'set_id', name='unique_creator_set')
+    )
+
+    op.create_table('follower_snapshots',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('snapshot_date', sa.DateTime(), nullable=False),
+    sa.Column('followers', sa.Integer(), nullable=False),
+    sa.Column('following', sa.Integer(), nullable=True),
+    sa.Column('likes', sa.Integer(), nullable=True),
+    sa.Column('videos', sa.Integer(), nullable=True),
+    sa.Column('followers_change', sa.Integer(), nullable=True),
+    sa.Column('followers_growth_rate', sa.Float(), nullable=True),
+    sa.Column('data_source', sa.String(length=50), nullable=False),
+    sa.Column('scraping_status', sa.String(length=20), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('followers >= 0', name='check_followers_positive'),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_id', 'snapshot_date', name='unique_account_snapshot')
+    )
+    op.create_index('idx_follower_account_latest', 'follower_snapshots', ['account_id', sa.text('snapshot_date DESC')],
+                    unique=False, postgresql_include=['followers'])
+    op.create_index('idx_snapshot_date_account', 'follower_snapshots', ['snapshot_date', 'account_id'], unique=False)
+
+    op.create_table('growth_milestones',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('milestone_type', sa.String(length=50), nullable=False),
+    sa.Column('milestone_value', sa.Integer(), nullable=False),
+    sa.Column('achieved_at', sa.DateTime(), nullable=False),
+    sa.Column('previous_value', sa.Integer(), nullable=True),
+    sa.Column('days_to_achieve', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_milestone_account_type', 'growth_milestones', ['account_id', 'milestone_type'], unique=False)
+    op.create_index('idx_milestone_achieved', 'growth_milestones', ['achieved_at'], unique=False)
+    op.create_index(op.f('ix_growth_milestones_account_id'), 'growth_milestones', ['account_id'], unique=False)
+    op.create_index(op.f('ix_growth_milestones_achieved_at'), 'growth_milestones', ['achieved_at'], unique=False)
+
+    op.create_table('va_performance',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('va_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.DateTime(), nullable=False),
+    sa.Column('period_end', sa.DateTime(), nullable=False),
+    sa.Column('period_type', sa.String(length=20), nullable=False),
+    sa.Column('total_accounts', sa.Integer(), nullable=True),
+    sa.Column('total_followers', sa.Integer(), nullable=True),
+    sa.Column('total_followers_gained', sa.Integer(), nullable=True),
+    sa.Column('average_growth_rate', sa.Float(), nullable=True),
+    sa.Column('best_performing_account', sa.String(length=100), nullable=True),
+    sa.Column('worst_performing_account', sa.String(length=100), nullable=True),
+    sa.Column('follower_rank', sa.Integer(), nullable=True),
+    sa.Column('growth_rank', sa.Integer(), nullable=True),
+    sa.Column('account_rank', sa.Integer(), nullable=True),
+    sa.Column('calculated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['va_id'], ['vas.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('va_id', 'period_start', 'period_end', 'period_type', name='unique_va_period')
+    )
+    op.create_index('idx_performance_period', 'va_performance', ['period_start', 'period_end'], unique=False)
+    op.create_index('idx_performance_ranks', 'va_performance', ['follower_rank', 'growth_rank'], unique=False)
+    op.create_index(op.f('ix_va_performance_va_id'), 'va_performance', ['va_id'], unique=False)
+    op.create_index(op.f('ix_va_performance_period_start'), 'va_performance', ['period_start'], unique=False)
+    op.create_index(op.f('ix_va_performance_period_end'), 'va_performance', ['period_end'], unique=False)
+
+    # posts: links to the new dimension tables (batch mode rebuilds the table on SQLite)
+    with op.batch_alter_table('posts') as batch_op:
+        batch_op.add_column(sa.Column('account_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('creator_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('content_set_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('bookmarks', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_foreign_key('fk_posts_account_id', 'accounts', ['account_id'], ['id'])
+        batch_op.create_foreign_key('fk_posts_creator_id', 'creators', ['creator_id'], ['id'])
+        batch_op.create_foreign_key('fk_posts_content_set_id', 'content_sets', ['content_set_id'], ['id'])
+        batch_op.create_check_constraint('check_bookmarks_positive', 'bookmarks >= 0')
+        batch_op.create_index('idx_posts_account_id_date', ['account_id', 'created_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_posts_creator_id'), ['creator_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_posts_content_set_id'), ['content_set_id'], unique=False)
+
+    op.create_table('proof_logs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('chat_id', sa.String(length=50), nullable=False),
+    sa.Column('message_id', sa.String(length=50), nullable=False),
+    sa.Column('creator_id', sa.Integer(), nullable=True),
+    sa.Column('va_id', sa.Integer(), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('content_set_id', sa.Integer(), nullable=True),
+    sa.Column('post_id', sa.Integer(), nullable=True),
+    sa.Column('post_type', sa.String(length=20), nullable=True),
+    sa.Column('platform', sa.String(length=50), nullable=False),
+    sa.Column('post_url', sa.String(length=500), nullable=False),
+    sa.Column('dedupe_key', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['content_set_id'], ['content_sets.id'], ),
+    sa.ForeignKeyConstraint(['creator_id'], ['creators.id'], ),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.ForeignKeyConstraint(['va_id'], ['vas.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('chat_id', 'message_id', name='unique_proof_log_message')
+    )
+    op.create_index('idx_proof_log_creator_va', 'proof_logs', ['creator_id', 'va_id'], unique=False)
+    op.create_index(op.f('ix_proof_logs_timestamp'), 'proof_logs', ['timestamp'], unique=False)
+    op.create_index(op.f('ix_proof_logs_va_id'), 'proof_logs', ['va_id'], unique=False)
+    op.create_index(op.f('ix_proof_logs_account_id'), 'proof_logs', ['account_id'], unique=False)
+    op.create_index(op.f('ix_proof_logs_content_set_id'), 'proof_logs', ['content_set_id'], unique=False)
+    op.create_index(op.f('ix_proof_logs_post_id'), 'proof_logs', ['post_id'], unique=False)
+    op.create_index(op.f('ix_proof_logs_post_url'), 'proof_logs', ['post_url'], unique=False)
+    op.create_index(op.f('ix_proof_logs_dedupe_key'), 'proof_logs', ['dedupe_key'], unique=False)
+
+    # Legacy table names as read-only views (skipped where a real table has the name)
+    create_compat_views(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_compat_views(op.get_bind())
+
+    op.drop_index(op.f('ix_proof_logs_dedupe_key'), table_name='proof_logs')
+    op.drop_index(op.f('ix_proof_logs_post_url'), table_name='proof_logs')
+    op.drop_index(op.f('ix_proof_logs_post_id'), table_name='proof_logs')
+    op.drop_index(op.f('ix_proof_logs_content_set_id'), table_name='proof_logs')
+    op.drop_index(op.f('ix_proof_logs_account_id'), table_name='proof_logs')
+    op.drop_index(op.f('ix_proof_logs_va_id'), table_name='proof_logs')
+    op.drop_index(op.f('ix_proof_logs_timestamp'), table_name='proof_logs')
+    op.drop_index('idx_proof_log_creator_va', table_name='proof_logs')
+    op.drop_table('proof_logs')
+
+    with op.batch_alter_table('posts') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_posts_content_set_id'))
+        batch_op.drop_index(batch_op.f('ix_posts_creator_id'))
+        batch_op.drop_index('idx_posts_account_id_date')
+        batch_op.drop_constraint('check_bookmarks_positive', type_='check')
+        batch_op.drop_constraint('fk_posts_content_set_id', type_='foreignkey')
+        batch_op.drop_constraint('fk_posts_creator_id', type_='foreignkey')
+        batch_op.drop_constraint('fk_posts_account_id', type_='foreignkey')
+        batch_op.drop_column('bookmarks')
+        batch_op.drop_column('content_set_id')
+        batch_op.drop_column('creator_id')
+        batch_op.drop_column('account_id')
+
+    op.drop_index(op.f('ix_va_performance_period_end'), table_name='va_performance')
+    op.drop_index(op.f('ix_va_performance_period_start'), table_name='va_performance')
+    op.drop_index(op.f('ix_va_performance_va_id'), table_name='va_performance')
+    op.drop_index('idx_performance_ranks', table_name='va_performance')
+    op.drop_index('idx_performance_period', table_name='va_performance')
+    op.drop_table('va_performance')
+
+    op.drop_index(op.f('ix_growth_milestones_achieved_at'), table_name='growth_milestones')
+    op.drop_index(op.f('ix_growth_milestones_account_id'), table_name='growth_milestones')
+    op.drop_index('idx_milestone_achieved', table_name='growth_milestones')
+    op.drop_index('idx_milestone_account_type', table_name='growth_milestones')
+    op.drop_table('growth_milestones')
+
+    op.drop_index('idx_snapshot_date_account', table_name='follower_snapshots')
+    op.drop_index('idx_follower_account_latest', table_name='follower_snapshots')
+    op.drop_table('follower_snapshots')
+
+    op.drop_table('content_sets')
+
+    op.drop_index(op.f('ix_accounts_primary_creator_id'), table_name='accounts')
+    op.drop_index(op.f('ix_accounts_username'), table_name='accounts')
+    op.drop_index('idx_account_va_status', table_name='accounts')
+    op.drop_table('accounts')
+
+    op.drop_index(op.f('ix_creators_onlyfans_username'), table_name='creators')
+    op.drop_index(op.f('ix_creators_name'), table_name='creators')
+    op.drop_table('creators')
@@ -8,10 +8,61 @@ from playwright.async_api import async_playwright
 import json
 import os
 
+from metric_parser import parse_count
+from dom_probe import FieldProbe, TEXT_TAGS, probe_page
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Every profile selector, probed in one page.evaluate
+PROFILE_PROBES = (
+    FieldProbe('followers', (
+        '[data-e2e="followers-count"]',
+        '[data-e2e="follower-count"]',
+        'strong[data-e2e="followers-count"]',
+        'div[data-e2e="followers-count"]',
+        'span[data-e2e="followers-count"]',
+        '.follower-count',
+        '.followers-count',
+        '[class*="follower"]',
+        '[class*="Follower"]'
+    ), contains=('follower',), numeric=True, max_length=19),
+    FieldProbe('followers_text', (TEXT_TAGS,), contains=('followers',), numeric=True, max_length=40),
+    FieldProbe('following', (
+        '[data-e2e="following-count"]',
+        'strong[data-e2e="following-count"]',
+        'div[data-e2e="following-count"]',
+        'span[data-e2e="following-count"]'
+    ), numeric=True),
+    FieldProbe('likes', (
+        '[data-e2e="likes-count"]',
+        'strong[data-e2e="likes-count"]',
+        'div[data-e2e="likes-count"]',
+        'span[data-e2e="likes-count"]'
+    ), numeric=True),
+    FieldProbe('videos', (
+        '[data-e2e="video-count"]',
+        'strong[data-e2e="video-count"]',
+        'div[data-e2e="video-count"]',
+        'span[data-e2e="video-count"]'
+    ), numeric=True),
+    FieldProbe('bio', (
+        '[data-e2e="user-bio"]',
+        '.user-bio',
+        '.bio',
+        '[class*="bio"]',
+        'h1 + div',
+        'h2 + div'
+    )),
+    FieldProbe('verified', (
+        '[data-e2e="verified-icon"]',
+        '.verified',
+        '[class*="verified"]',
+        'svg[class*="verified"]'
+    ), exists=True),
+)
+
 class TikTokAccountScraper:
     """
     Professional TikTok account follower scraper
@@ -116,43 +167,33 @@ class TikTokAccountScraper:
         }
         
         try:
+            # One HTML snapshot for the JSON data, one DOM probe for every selector
+            page_content = await page.content()
+            hits = await probe_page(page, PROFILE_PROBES)
+            logger.debug(f"DOM probe matched for @{username}: {hits.matched()}")
+            
             # Extract follower count - try multiple methods
-            followers = await self._extract_followers_comprehensive(page)
+            followers = self._extract_followers_comprehensive(page_content, hits)
             account_data["followers"] = followers
             
             # Extract following count
-            following = await self._extract_metric(page, [
-                '[data-e2e="following-count"]',
-                'strong[data-e2e="following-count"]',
-                'div[data-e2e="following-count"]',
-                'span[data-e2e="following-count"]'
-            ])
+            following = self._extract_metric(hits, 'following')
             account_data["following"] = following
             
             # Extract likes count
-            likes = await self._extract_metric(page, [
-                '[data-e2e="likes-count"]',
-                'strong[data-e2e="likes-count"]',
-                'div[data-e2e="likes-count"]',
-                'span[data-e2e="likes-count"]'
-            ])
+            likes = self._extract_metric(hits, 'likes')
             account_data["likes"] = likes
             
             # Extract video count
-            videos = await self._extract_metric(page, [
-                '[data-e2e="video-count"]',
-                'strong[data-e2e="video-count"]',
-                'div[data-e2e="video-count"]',
-                'span[data-e2e="video-count"]'
-            ])
+            videos = self._extract_metric(hits, 'videos')
             account_data["videos"] = videos
             
             # Extract bio
-            bio = await self._extract_bio(page)
+            bio = self._extract_bio(hits)
             account_data["bio"] = bio
             
             # Check if verified
-            verified = await self._check_verified(page)
+            verified = self._check_verified(hits)
             account_data["verified"] = verified
             
             logger.info(f"Successfully scraped @{username}: {followers:,} followers")
@@ -164,131 +205,51 @@ class TikTokAccountScraper:
         
         return account_data
 
-    async def _extract_followers_comprehensive(self, page):
+    def _extract_followers_comprehensive(self, page_content, hits):
         """
         Comprehensive follower extraction with multiple methods
         """
         # Method 1: Extract from JSON data in page
-        try:
-            page_content = await page.content()
-            
-            # Look for follower count in JSON data
-            follower_match = re.search(r'"followerCount":(\d+)', page_content)
-            if follower_match:
-                followers = int(follower_match.group(1))
-                logger.info(f"Found followers in JSON data: {followers}")
-                return followers
-        except Exception as e:
-            logger.debug(f"JSON extraction failed: {e}")
+        follower_match = re.search(r'"followerCount":(\d+)', page_content)
+        if follower_match:
+            followers = int(follower_match.group(1))
+            logger.info(f"Found followers in JSON data: {followers}")
+            return followers
         
-        # Method 2: Try follower selectors
-        follower_selectors = [
-            '[data-e2e="followers-count"]',
-            '[data-e2e="follower-count"]',
-            'strong[data-e2e="followers-count"]',
-            'div[data-e2e="followers-count"]',
-            'span[data-e2e="followers-count"]',
-            '.follower-count',
-            '.followers-count',
-            '[class*="follower"]',
-            '[class*="Follower"]'
-        ]
+        # Method 2: Follower selectors (text must look like a follower count)
+        text = hits.value('followers')
+        if text and self._looks_like_followers(text):
+            parsed = self._parse_metric(text)
+            if parsed > 0:
+                logger.info(f"Found followers with selector '{hits.selector('followers')}': {text} -> {parsed}")
+                return parsed
         
-        for selector in follower_selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text and self._looks_like_followers(text):
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            logger.info(f"Found followers with selector '{selector}': {text} -> {parsed}")
-                            return parsed
-            except Exception:
-                continue
-        
-        # Method 3: Look for any element containing "followers"
-        try:
-            all_elements = await page.query_selector_all('span, div, strong, p, h1, h2, h3')
-            for element in all_elements:
-                text = await element.text_content()
-                if text and 'followers' in text.lower():
-                    parsed = self._parse_metric(text)
-                    if parsed > 0:
-                        logger.info(f"Found followers in text: {text} -> {parsed}")
-                        return parsed
-        except Exception:
-            pass
+        # Method 3: Any element containing "followers"
+        parsed = hits.count('followers_text')
+        if parsed > 0:
+            logger.info(f"Found followers in text: {hits.value('followers_text')} -> {parsed}")
+            return parsed
         
         logger.warning("Could not extract followers with any method")
         return 0
 
-    async def _extract_metric(self, page, selectors):
+    def _extract_metric(self, hits, field):
         """
-        Try multiple selectors to extract a metric
+        Parsed count for a probed field (0 if none of its selectors matched)
         """
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        return self._parse_metric(text)
-            except Exception:
-                continue
-        return 0
+        return hits.count(field)
 
-    async def _extract_bio(self, page):
+    def _extract_bio(self, hits):
         """
         Extract account bio/description
         """
-        try:
-            bio_selectors = [
-                '[data-e2e="user-bio"]',
-                '.user-bio',
-                '.bio',
-                '[class*="bio"]',
-                'h1 + div',
-                'h2 + div'
-            ]
-            
-            for selector in bio_selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        bio = await element.text_content()
-                        if bio and len(bio.strip()) > 0:
-                            return bio.strip()
-                except Exception:
-                    continue
-        except Exception:
-            pass
-        
-        return ""
+        return hits.value('bio', '')
 
-    async def _check_verified(self, page):
+    def _check_verified(self, hits):
         """
         Check if account is verified
         """
-        try:
-            verified_selectors = [
-                '[data-e2e="verified-icon"]',
-                '.verified',
-                '[class*="verified"]',
-                'svg[class*="verified"]'
-            ]
-            
-            for selector in verified_selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        return True
-                except Exception:
-                    continue
-        except Exception:
-            pass
-        
-        return False
+        return bool(hits.value('verified', False))
 
     def _looks_like_followers(self, text):
         """
@@ -305,21 +266,7 @@ class TikTokAccountScraper:
         """
         Parse a metric string (e.g., "10.5K", "1.2M") into an integer
         """
-        text = text.replace(',', '').strip()
-        text = text.lower()
-
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        elif 'b' in text:
-            return int(float(text.replace('b', '')) * 1000000000)
-        else:
-            # Extract only digits
-            digits = re.findall(r'\d+', text)
-            if digits:
-                return int("".join(digits))
-            return 0
+        return parse_count(text)
 
     async def scrape_accounts_batch(self, accounts: list, delay_between_accounts: float = 2.0) -> list:
         """
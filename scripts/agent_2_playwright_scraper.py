@@ -5,12 +5,13 @@ TikTok Metrics Scraper using Playwright with minimal overhead
 """
 
 import asyncio
-import re
 import time
 from typing import Dict, List, Optional
 from playwright.async_api import async_playwright, Browser, Page
 import logging
 
+from metric_parser import parse_count
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -160,23 +161,7 @@ class PlaywrightTikTokScraper:
         """
         Parse TikTok metric format (e.g., '10.5K' -> 10500)
         """
-        if not value:
-            return 0
-        
-        # Remove any non-numeric characters except K, M, B
-        value = re.sub(r'[^\d.KMB]', '', str(value).upper())
-        
-        if 'K' in value:
-            return int(float(value.replace('K', '')) * 1000)
-        elif 'M' in value:
-            return int(float(value.replace('M', '')) * 1000000)
-        elif 'B' in value:
-            return int(float(value.replace('B', '')) * 1000000000)
-        else:
-            try:
-                return int(value)
-            except ValueError:
-                return 0
+        return parse_count(value)
     
     async def scrape_batch(self, post_urls: List[str], delay: float = 2.0) -> List[Dict]:
         """
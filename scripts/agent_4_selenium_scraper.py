@@ -19,6 +19,8 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+from metric_parser import parse_count
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -175,23 +177,7 @@ class SeleniumTikTokScraper:
         """
         Parse TikTok metric format (e.g., '10.5K' -> 10500)
         """
-        if not value:
-            return 0
-        
-        import re
-        value = re.sub(r'[^\d.KMB]', '', str(value).upper())
-        
-        if 'K' in value:
-            return int(float(value.replace('K', '')) * 1000)
-        elif 'M' in value:
-            return int(float(value.replace('M', '')) * 1000000)
-        elif 'B' in value:
-            return int(float(value.replace('B', '')) * 1000000000)
-        else:
-            try:
-                return int(value)
-            except ValueError:
-                return 0
+        return parse_count(value)
     
     def scrape_post(self, post_url: str, proxy: Optional[str] = None) -> Dict:
         """
@@ -13,6 +13,12 @@ from enum import Enum
 import logging
 import json
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent / "02_Scraping_Systems" / "01_TikTok_Scrapers"))
+from method_telemetry import TelemetryRegistry
+from http_item_fetcher import HttpItemFetcher, load_cookies
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -58,6 +64,12 @@ class HybridTikTokScraper:
     def __init__(self, config: Dict = None):
         self.config = config or self._default_config()
         self.method_stats = {method: MethodStats(method) for method in ScrapingMethod}
+        self.telemetry = TelemetryRegistry(
+            [method.value for method in ScrapingMethod],
+            path=self.config.get("telemetry_path"),
+            window=self.config.get("telemetry_window", 100)
+        )
+        self.http_fetcher = None
         self.cost_tracker = CostTracker()
         self.rate_limiter = RateLimiter()
         self.fallback_chain = self._build_fallback_chain()
@@ -78,7 +90,13 @@ class HybridTikTokScraper:
             },
             "success_rate_threshold": 0.8,
             "max_retries": 3,
-            "retry_delay": 2.0
+            "retry_delay": 2.0,
+            "telemetry_path": "agent_6_telemetry.json",
+            "telemetry_window": 100,
+            "routing": {
+                "weights": {"cost": 0.4, "success": 0.4, "latency": 0.2},
+                "max_p95_seconds": None
+            }
         }
     
     def _build_fallback_chain(self) -> List[ScrapingMethod]:
@@ -88,7 +106,7 @@ class HybridTikTokScraper:
             ScrapingMethod.PUPPETEER,   # Secondary: Good stealth, moderate cost
             ScrapingMethod.SELENIUM,    # Tertiary: High reliability, higher cost
             ScrapingMethod.APIFY,       # Fallback: Managed service, highest cost
-            ScrapingMethod.API          # Last resort: Lowest cost, lowest reliability
+            ScrapingMethod.API          # Last resort: HTTP only, cheapest, misses login-walled pages
         ]
     
     async def scrape_post(self, post_url: str) -> ScrapingResult:
@@ -134,30 +152,26 @@ class HybridTikTokScraper:
         """
         Select the best method based on cost, success rate, and availability
         """
-        # Filter methods by success rate threshold
+        # Filter methods by moving-window success rate (methods without data yet stay viable)
         viable_methods = [
-            method for method, stats in self.method_stats.items()
-            if stats.success_rate >= self.config["success_rate_threshold"] or stats.total_attempts == 0
+            ScrapingMethod(name) for name in self.telemetry.viable(
+                [method.value for method in ScrapingMethod], self.config["success_rate_threshold"]
+            )
         ]
         
         if not viable_methods:
             # If no viable methods, use the first fallback method
             return self.fallback_chain[0]
         
-        # Score methods based on cost and success rate
-        method_scores = {}
-        for method in viable_methods:
-            stats = self.method_stats[method]
-            cost_score = 1.0 / (self.config["cost_weights"][method] + 0.0001)
-            success_score = stats.success_rate
-            recency_score = 1.0 / (time.time() - stats.last_used + 1)
-            
-            # Weighted score
-            method_scores[method] = (
-                cost_score * 0.4 +      # 40% cost weight
-                success_score * 0.4 +   # 40% success rate weight
-                recency_score * 0.2     # 20% recency weight
-            )
+        # Score on cost per successful post, window success rate and p95 latency
+        routing = self.config.get("routing", {})
+        scores = self.telemetry.rank(
+            [method.value for method in viable_methods],
+            {method.value: self.config["cost_weights"][method] for method in viable_methods},
+            weights=routing.get("weights"),
+            max_p95_seconds=routing.get("max_p95_seconds")
+        )
+        method_scores = {ScrapingMethod(name): score for name, score in scores.items()}
         
         # Select method with highest score
         best_method = max(method_scores, key=method_scores.get)
@@ -195,7 +209,7 @@ class HybridTikTokScraper:
             # Update cost tracker
             self.cost_tracker.add_cost(method, cost)
             
-            return ScrapingResult(
+            result = ScrapingResult(
                 post_url=post_url,
                 method=method,
                 success=True,
@@ -203,6 +217,8 @@ class HybridTikTokScraper:
                 cost=cost,
                 duration=duration
             )
+            self.telemetry.record(method.value, True, duration, cost)
+            return result
             
         except Exception as e:
             duration = time.time() - start_time
@@ -210,7 +226,7 @@ class HybridTikTokScraper:
             
             logger.error(f"Method {method.value} failed for {post_url}: {str(e)}")
             
-            return ScrapingResult(
+            result = ScrapingResult(
                 post_url=post_url,
                 method=method,
                 success=False,
@@ -219,6 +235,8 @@ class HybridTikTokScraper:
                 duration=duration,
                 error=str(e)
             )
+            self.telemetry.record(method.value, False, duration, cost)
+            return result
     
     async def _scrape_with_playwright(self, post_url: str) -> Dict:
         """Scrape using Playwright (placeholder)"""
@@ -273,22 +291,35 @@ class HybridTikTokScraper:
         }
     
     async def _scrape_with_api(self, post_url: str) -> Dict:
-        """Scrape using API (placeholder)"""
-        # This would integrate with the actual API scraper
-        await asyncio.sleep(0.02)  # Simulate scraping time
-        # Simulate high failure rate for API
-        if random.random() < 0.7:  # 70% failure rate
-            raise Exception("API request failed")
+        """Scrape over plain HTTP: rehydration JSON from the page HTML, no browser"""
+        if self.http_fetcher is None:
+            fetcher = HttpItemFetcher(
+                concurrency=self.config.get("http_concurrency", 32),
+                cookies=load_cookies(self.config.get("cookie_file", "tiktok_cookies.json"))
+            )
+            await fetcher.__aenter__()
+            self.http_fetcher = fetcher
+        
+        fetch = await self.http_fetcher.fetch(post_url)
+        if not fetch.success:
+            # Login wall / captcha: the fallback chain hands the URL to a browser method
+            raise Exception(f"HTTP fetch failed: {fetch.error}")
         
         return {
-            "views": random.randint(1000, 100000),
-            "likes": random.randint(100, 10000),
-            "comments": random.randint(10, 1000),
-            "shares": random.randint(5, 500),
-            "bookmarks": random.randint(0, 100),
-            "engagement_rate": random.uniform(1.0, 10.0)
+            "views": fetch.fields["views"],
+            "likes": fetch.fields["likes"],
+            "comments": fetch.fields["comments"],
+            "shares": fetch.fields["shares"],
+            "bookmarks": fetch.fields["bookmarks"],
+            "engagement_rate": fetch.fields.get("engagement_rate", 0.0)
         }
     
+    async def close(self):
+        """Close the shared HTTP connection pool"""
+        if self.http_fetcher:
+            await self.http_fetcher.__aexit__(None, None, None)
+            self.http_fetcher = None
+    
     def _update_method_stats(self, result: ScrapingResult):
         """Update statistics for a method"""
         stats = self.method_stats[result.method]
@@ -329,6 +360,8 @@ class HybridTikTokScraper:
             if (i + 1) % 10 == 0:
                 logger.info(f"Processed {i + 1}/{len(post_urls)} posts")
         
+        await self.close()
+        self.telemetry.save()
         return results
     
     def get_performance_report(self) -> Dict:
@@ -349,7 +382,15 @@ class HybridTikTokScraper:
                     "total_cost": stats.total_cost
                 }
         
+        report["telemetry"] = self.telemetry.to_json()
+        
         return report
+    
+    def export_telemetry(self, format: str = "json") -> str:
+        """Method telemetry for dashboards ("json" or "prometheus")"""
+        if format == "prometheus":
+            return self.telemetry.to_prometheus()
+        return json.dumps(self.telemetry.to_json(), indent=2)
 
 class CostTracker:
     """Track costs across methods"""
@@ -438,6 +479,11 @@ async def test_hybrid_scraper():
     for method, stats in report["methods"].items():
         print(f"  {method}: {stats['success_rate']:.1%} success, ${stats['avg_cost']:.4f} avg cost")
     
+    for method, telemetry in report["telemetry"].items():
+        if telemetry["attempts"]:
+            print(f"  {method}: p50 {telemetry['latency_p50']:.2f}s, p95 {telemetry['latency_p95']:.2f}s, "
+                  f"p99 {telemetry['latency_p99']:.2f}s")
+    
     return results
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Apify Stream Reader
+Streams large Apify tiktok-scraper dataset exports item by item
+
+- JSON array exports (dataset_tiktok-scraper_*.json): ijson (yajl2_c backend when available)
+- Line-delimited exports (.jsonl / .ndjson): orjson per line (json fallback)
+- Each item is projected to a small typed ApifyPostRecord and then dropped,
+  so peak memory is one item + one record, regardless of dump size
+
+Benchmark:
+  python apify_stream_reader.py dataset.json --benchmark
+  python apify_stream_reader.py --benchmark --synthetic 200000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List
+
+import ijson
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+LINE_DELIMITED_SUFFIXES = ('.jsonl', '.ndjson')
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class ApifyPostRecord:
+    """The fields merge_complete_database needs from one Apify item"""
+    post_url: str
+    account: str
+    views: int
+    likes: int
+    comments: int
+    shares: int
+    created: str
+    hashtags: str
+    sound_link: str
+    slides: List[str] = field(default_factory=list)
+
+    def to_post(self, source):
+        """Record -> merge_complete_database loader dict"""
+        return {
+            'post_url': self.post_url,
+            'account': self.account,
+            'views': self.views,
+            'likes': self.likes,
+            'comments': self.comments,
+            'shares': self.shares,
+            'created': self.created,
+            'hashtags': self.hashtags,
+            'sound_link': self.sound_link,
+            'slides': self.slides,
+            'source': source
+        }
+
+
+def _nested(item, dotted_key):
+    """Apify exports either flatten ('authorMeta.name') or nest ({'authorMeta': {'name'}})"""
+    if dotted_key in item:
+        return item[dotted_key]
+    parent, _, child = dotted_key.partition('.')
+    value = item.get(parent)
+    return value.get(child) if isinstance(value, dict) else None
+
+
+def project_item(item):
+    """Apify item -> ApifyPostRecord (None for error rows / rows without createTimeISO)"""
+    if 'error' in item or 'createTimeISO' not in item:
+        return None
+
+    # Slideshow images: first URL of each imagePost.images[].imageURL.imageUrlList
+    images = (item.get('imagePost') or {}).get('images') or ()
+    slides = [
+        url_list[0]
+        for url_list in ((img.get('imageURL') or {}).get('imageUrlList') for img in images)
+        if url_list
+    ]
+
+    return ApifyPostRecord(
+        post_url=item.get('webVideoUrl', '') or '',
+        account=_nested(item, 'authorMeta.name') or '',
+        views=int(item.get('playCount', 0) or 0),
+        likes=int(item.get('diggCount', 0) or 0),
+        comments=int(item.get('commentCount', 0) or 0),
+        shares=int(item.get('shareCount', 0) or 0),
+        created=item.get('createTimeISO', ''),
+        hashtags=item.get('text', '') or '',
+        sound_link=_nested(item, 'musicMeta.musicName') or '',
+        slides=slides
+    )
+
+
+def iter_items(path):
+    """Yield raw top-level items of a JSON array or line-delimited export"""
+    path = Path(path)
+    if path.suffix.lower() in LINE_DELIMITED_SUFFIXES:
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield _loads(line)
+    else:
+        with open(path, 'rb') as f:
+            # use_float: plain floats instead of Decimal (much cheaper, counts are ints anyway)
+            yield from ijson.items(f, 'item', use_float=True, buf_size=READ_BUFFER_SIZE)
+
+
+def iter_records(path) -> Iterator[ApifyPostRecord]:
+    """Yield projected records, skipping error rows"""
+    for item in iter_items(path):
+        record = project_item(item)
+        if record is not None:
+            yield record
+
+
+# ============= BENCHMARK =============
+
+def _json_load_records(path):
+    """Old path: json.load the whole dump, then project"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return [r for r in (project_item(item) for item in data) if r is not None]
+
+
+def _measure(label, func, path):
+    """Time one pass, then measure peak Python allocations in a second (tracemalloc skews timing)"""
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    start = time.perf_counter()
+    rows = func(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<22} {rows:>10,} rows  {elapsed:>7.2f}s  "
+          f"{rows / elapsed:>10,.0f} rows/s  {size_mb / elapsed:>7.1f} MB/s  peak {peak / 1024 / 1024:>8.1f} MB")
+    return {'rows': rows, 'seconds': elapsed, 'peak_mb': peak / 1024 / 1024}
+
+
+def write_synthetic_dump(path, item_count):
+    """Write an Apify-shaped JSON array (slideshow posts, flattened meta keys)"""
+    with open(path, 'w') as f:
+        f.write('[')
+        for i in range(item_count):
+            item = {
+                'id': str(7500000000000000000 + i),
+                'webVideoUrl': f'https://www.tiktok.com/@account_{i % 500}/video/{7500000000000000000 + i}',
+                'authorMeta.name': f'account_{i % 500}',
+                'playCount': i * 37 % 250000,
+                'diggCount': i % 9000,
+                'commentCount': i % 300,
+                'shareCount': i % 120,
+                'createTimeISO': f'2025-10-{i % 28 + 1:02d}T12:00:00.000Z',
+                'text': f'caption {i} #fyp #viral #slideshow',
+                'musicMeta.musicName': f'original sound - {i % 800}',
+                'videoMeta': {'height': 1024, 'width': 576, 'duration': 0, 'subtitleLinks': []},
+                'imagePost': {'images': [
+                    {'imageURL': {'imageUrlList': [f'https://p16-sign.tiktokcdn.com/obj/{i}_{n}.jpeg',
+                                                   f'https://p19-sign.tiktokcdn.com/obj/{i}_{n}.jpeg']}}
+                    for n in range(6)
+                ]}
+            }
+            if i:
+                f.write(',')
+            f.write(json.dumps(item))
+        f.write(']')
+
+
+def benchmark(path):
+    """Compare json.load + project vs. streaming on one dump"""
+    print(f"\n📊 {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB, ijson backend: {ijson.backend})")
+    results = {'streaming': _measure('ijson stream', lambda p: sum(1 for _ in iter_records(p)), path)}
+    if Path(path).suffix.lower() not in LINE_DELIMITED_SUFFIXES:
+        results['json_load'] = _measure('json.load (old)', lambda p: len(_json_load_records(p)), path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream Apify tiktok-scraper exports')
+    parser.add_argument('path', nargs='?', help='Apify export (.json array or .jsonl)')
+    parser.add_argument('--benchmark', action='store_true', help='Measure throughput and peak memory')
+    parser.add_argument('--synthetic', type=int, default=0, help='Benchmark on a generated dump with N items')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'synthetic_dataset.json'
+            write_synthetic_dump(path, args.synthetic)
+            benchmark(path)
+        return
+
+    if not args.path:
+        parser.error('path is required (or use --synthetic N)')
+
+    if args.benchmark:
+        benchmark(args.path)
+    else:
+        count = sum(1 for _ in iter_records(args.path))
+        print(f"✅ {count:,} valid posts in {args.path}")
+
+
+if __name__ == "__main__":
+    main()
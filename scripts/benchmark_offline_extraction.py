@@ -0,0 +1,657 @@
+#!/usr/bin/env python3
+"""
+Offline Extraction Benchmark
+Runs the page-parsing strategies against the saved TikTok debug pages - no network
+
+Fixtures:
+- the *debug*.html pages captured in the repo root
+- fixtures/debug_pages_golden.json: golden field values per page, keyed by file name + sha256.
+  Built from what the rendered page displays (like/comment/share buttons, profile counts,
+  author link, caption tooltip), not from the __UNIVERSAL_DATA_FOR_REHYDRATION__ JSON most
+  strategies parse; fields the page doesn't display aren't scored. None of the saved post
+  pages renders or embeds a comment, so embedded comment counts have no golden value and
+  debug_comments is timed but reported as unscored
+
+Strategies:
+- rehydration_json       reference parser (json of the rehydration script tag)
+- swarm_regex            SwarmCompleteDataScraper._extract_complete_data, page_content (regex) path only
+- swarm_dom              same, with DOM selectors on a Playwright page filled via set_content
+- production_universal   ProductionTikTokScraper._parse_universal_data
+- reliable_universal     ReliableTikTokScraper._parse_universal_data
+- debug_comments         extract_comments_from_debug (extract_json_data + parse_comments_from_json)
+- http_item_fetcher      http_item_fetcher.parse_item_detail (HTTP fast path, item pages only)
+
+Reports per strategy: median / p95 latency per page, peak Python allocations, field accuracy
+(unscored when none of its fields has a golden value).
+Strategies whose scraper module (or Playwright browser) is unavailable are reported as skipped.
+
+Usage:
+  python benchmark_offline_extraction.py
+  python benchmark_offline_extraction.py --strategy swarm_regex --repeat 20 --details
+  python benchmark_offline_extraction.py --update-golden
+  python benchmark_offline_extraction.py --save-baseline
+  python benchmark_offline_extraction.py --check          # exit 1 on latency/accuracy regression
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent
+TIKTOK_SCRAPERS_DIR = REPO_ROOT / '02_Scraping_Systems' / '01_TikTok_Scrapers'
+
+sys.path.append(str(SCRIPTS_DIR))
+sys.path.append(str(TIKTOK_SCRAPERS_DIR))
+
+PAGE_GLOB = '*debug*.html'
+GOLDEN_FILE = SCRIPTS_DIR / 'fixtures' / 'debug_pages_golden.json'
+BASELINE_FILE = SCRIPTS_DIR / 'fixtures' / 'offline_extraction_baseline.json'
+
+REHYDRATION_PATTERN = re.compile(
+    r'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+# Fields a strategy may produce; a page's golden values cover the ones it displays
+# (None in the golden file = the page shows nothing, so the strategy must not invent a value)
+GOLDEN_FIELDS = [
+    'views', 'likes', 'comments', 'shares', 'bookmarks',
+    'account_username', 'account_followers', 'account_following', 'account_posts',
+    'account_likes', 'account_verified',
+    'post_description', 'hashtags', 'sound_title', 'sound_author', 'slide_count'
+]
+
+METRIC_FIELDS = ('views', 'likes', 'comments', 'shares', 'bookmarks')
+
+# data-e2e element -> field, for counts rendered as text ('2560', '24.1K')
+VISIBLE_POST_COUNTS = {'play-side-like': 'likes', 'play-side-comment': 'comments', 'play-side-share': 'shares'}
+VISIBLE_ACCOUNT_COUNTS = {
+    'followers-count': 'account_followers', 'following-count': 'account_following', 'likes-count': 'account_likes'
+}
+COUNT_SUFFIXES = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+
+# ============= REFERENCE PARSER =============
+
+def extract_rehydration_json(html):
+    """The __UNIVERSAL_DATA_FOR_REHYDRATION__ payload as a dict (None if missing)"""
+    match = REHYDRATION_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+def parse_rehydration_page(html):
+    """
+    Reference extraction: every field straight from the rehydration JSON
+
+    Handles video detail (desktop + mobile reflow) and account pages; login walls /
+    captcha pages only carry the canonical URL, everything else stays None.
+    """
+    values = dict.fromkeys(GOLDEN_FIELDS)
+    values['page_type'] = 'login_wall'
+    values['url'] = ''
+
+    data = extract_rehydration_json(html)
+    scope = (data or {}).get('__DEFAULT_SCOPE__', {})
+    values['url'] = (scope.get('seo.abtest') or {}).get('canonical', '')
+
+    username = re.search(r'/@([^/?]+)', values['url'])
+    if username:
+        values['account_username'] = username.group(1)
+
+    detail = scope.get('webapp.video-detail') or scope.get('webapp.reflow.video.detail')
+    item = ((detail or {}).get('itemInfo') or {}).get('itemStruct')
+    if item:
+        stats = item.get('stats') or {}
+        author = item.get('author') or {}
+        author_stats = item.get('authorStats') or {}
+        music = item.get('music') or {}
+        images = (item.get('imagePost') or {}).get('images') or []
+
+        values.update({
+            'page_type': 'post',
+            'views': stats.get('playCount'),
+            'likes': stats.get('diggCount'),
+            'comments': stats.get('commentCount'),
+            'shares': stats.get('shareCount'),
+            'bookmarks': stats.get('collectCount'),
+            'account_username': author.get('uniqueId') or values['account_username'],
+            'account_followers': author_stats.get('followerCount'),
+            'account_following': author_stats.get('followingCount'),
+            'account_posts': author_stats.get('videoCount'),
+            'account_likes': author_stats.get('heartCount'),
+            'account_verified': bool(author.get('verified')),
+            'post_description': item.get('desc', ''),
+            'hashtags': ', '.join(
+                extra['hashtagName'] for extra in item.get('textExtra') or [] if extra.get('hashtagName')
+            ),
+            'sound_title': music.get('title', ''),
+            'sound_author': music.get('authorName', ''),
+            'slide_count': len(images),
+            'embedded_comments': len(item.get('comments') or [])
+        })
+        return values
+
+    user_info = (scope.get('webapp.user-detail') or {}).get('userInfo')
+    if user_info:
+        user = user_info.get('user') or {}
+        stats = user_info.get('stats') or {}
+        values.update({
+            'page_type': 'account',
+            'account_username': user.get('uniqueId') or values['account_username'],
+            'account_followers': stats.get('followerCount'),
+            'account_following': stats.get('followingCount'),
+            'account_posts': stats.get('videoCount'),
+            'account_likes': stats.get('heartCount'),
+            'account_verified': bool(user.get('verified'))
+        })
+    return values
+
+
+# ============= GOLDEN VALUES (RENDERED PAGE) =============
+
+def _element_text(html, e2e):
+    """First text node inside the data-e2e element (up to the next data-e2e element)"""
+    match = re.search(rf'data-e2e="{e2e}"(?:(?!data-e2e=).)*?>\s*([^<>]*?\S)\s*<', html, re.DOTALL)
+    return match.group(1) if match else None
+
+
+def _element_attribute(html, e2e, attribute):
+    """First `attribute` value inside the data-e2e element"""
+    match = re.search(rf'data-e2e="{e2e}"(?:(?!data-e2e=).)*?\s{attribute}="([^"]*)"', html, re.DOTALL)
+    return match.group(1) if match else None
+
+
+def visible_count(text):
+    """
+    Count as displayed: '2560' -> 2560; abbreviated counts stay as text ('24.1K'),
+    scored within their display precision by field_matches
+    """
+    text = (text or '').replace(',', '').strip()
+    if re.fullmatch(r'\d+', text):
+        return int(text)
+    if re.fullmatch(r'\d+(?:\.\d+)?[KMB]', text):
+        return text
+    return None
+
+
+def parse_visible_page(html):
+    """
+    Golden values from what the rendered page shows, independent of the rehydration JSON
+
+    Post pages: like/comment/share buttons, author link, caption hashtags (link tooltip).
+    Account pages: profile counts and handle. Login walls / captcha pages render none
+    of these, so every field is expected to be empty - except the username, which
+    strategies may take from the URL.
+    """
+    counts = {name: visible_count(_element_text(html, e2e)) for e2e, name in VISIBLE_POST_COUNTS.items()}
+    if any(value is not None for value in counts.values()):
+        expected = dict(counts)
+        author = re.match(r'/@([^/?"]+)', _element_attribute(html, 'play-side-author', 'href') or '')
+        if author:
+            expected['account_username'] = author.group(1)
+        caption = _element_attribute(html, 'play-side-like', 'title')
+        if caption is not None:
+            expected['hashtags'] = ', '.join(re.findall(r'#(\w+)', caption))
+        return 'post', expected
+
+    counts = {name: visible_count(_element_text(html, e2e)) for e2e, name in VISIBLE_ACCOUNT_COUNTS.items()}
+    if any(value is not None for value in counts.values()):
+        expected = dict(counts)
+        handle = _element_text(html, 'user-title')
+        if handle:
+            expected['account_username'] = handle.lstrip('@').strip()
+        return 'account', expected
+
+    return 'login_wall', {name: None for name in GOLDEN_FIELDS if name != 'account_username'}
+
+
+def page_sha256(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+def find_pages(pages_dir):
+    return sorted(Path(pages_dir).glob(PAGE_GLOB))
+
+
+def build_golden(pages):
+    """Golden fixture dict for the given page files"""
+    golden = {}
+    for path in pages:
+        html = path.read_text(encoding='utf-8')
+        page_type, expected = parse_visible_page(html)
+        golden[path.name] = {
+            'sha256': page_sha256(html),
+            'page_type': page_type,
+            # The URL the scraper navigated to (extractor input, not a scored value)
+            'url': parse_rehydration_page(html)['url'],
+            'expected': expected
+        }
+    return golden
+
+
+def load_fixtures(pages_dir, golden_file):
+    """
+    [(name, html, url, expected)] for every page that has golden values
+
+    Pages that changed since the golden file was written are skipped with a warning.
+    """
+    with open(golden_file, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+
+    fixtures = []
+    for path in find_pages(pages_dir):
+        entry = golden.get(path.name)
+        if entry is None:
+            print(f"⚠️  {path.name}: no golden values (run --update-golden)")
+            continue
+        html = path.read_text(encoding='utf-8')
+        if page_sha256(html) != entry['sha256']:
+            print(f"⚠️  {path.name}: page changed since golden values were built, skipped")
+            continue
+        fixtures.append((path.name, html, entry['url'], entry['expected']))
+    return fixtures
+
+
+# ============= STRATEGIES =============
+
+@dataclass
+class Strategy:
+    """One page-parsing strategy: extract(html, url) -> {field: value}"""
+    name: str
+    fields: Tuple[str, ...] = ()
+    extract: Optional[Callable] = None
+    close: Optional[Callable] = None
+    skipped: str = ''
+
+
+class _ContentOnlyPage:
+    """Page without a DOM: selector lookups find nothing, so only the page_content path runs"""
+
+    def __init__(self, html):
+        self.html = html
+
+    async def content(self):
+        return self.html
+
+    async def query_selector(self, selector):
+        return None
+
+    async def query_selector_all(self, selector):
+        return []
+
+    async def evaluate(self, script, arg=None):
+        return {}
+
+
+SWARM_FIELDS = tuple(GOLDEN_FIELDS)
+
+
+def _swarm_values(result):
+    """_extract_complete_data result -> scored fields (a failed result scores as empty)"""
+    if not result.get('scraping_success'):
+        return {}
+    return {name: result.get(name) for name in SWARM_FIELDS}
+
+
+def build_rehydration_strategy(loop):
+    return Strategy(
+        name='rehydration_json',
+        fields=tuple(GOLDEN_FIELDS),
+        extract=lambda html, url: parse_rehydration_page(html)
+    )
+
+
+def build_swarm_regex_strategy(loop):
+    try:
+        from swarm_complete_data_scraper import SwarmCompleteDataScraper
+    except ImportError as e:
+        return Strategy('swarm_regex', skipped=f'import failed: {e}')
+
+    scraper = SwarmCompleteDataScraper(headless=True)
+
+    def extract(html, url):
+        result = loop.run_until_complete(
+            scraper._extract_complete_data(_ContentOnlyPage(html), url, 'offline_regex')
+        )
+        return _swarm_values(result)
+
+    return Strategy('swarm_regex', fields=SWARM_FIELDS, extract=extract)
+
+
+def build_swarm_dom_strategy(loop):
+    try:
+        from playwright.async_api import async_playwright
+        from swarm_complete_data_scraper import SwarmCompleteDataScraper
+    except ImportError as e:
+        return Strategy('swarm_dom', skipped=f'import failed: {e}')
+
+    async def start():
+        playwright = await async_playwright().start()
+        browser = await playwright.chromium.launch(headless=True)
+        # No JS and no requests: the captured HTML is the whole page
+        context = await browser.new_context(java_script_enabled=False)
+        await context.route('**/*', lambda route: route.abort())
+        page = await context.new_page()
+        return playwright, browser, page
+
+    try:
+        playwright, browser, page = loop.run_until_complete(start())
+    except Exception as e:
+        return Strategy('swarm_dom', skipped=f'browser launch failed: {e}')
+
+    scraper = SwarmCompleteDataScraper(headless=True)
+
+    async def run(html, url):
+        await page.set_content(html, wait_until='domcontentloaded')
+        return await scraper._extract_complete_data(page, url, 'offline_dom')
+
+    async def stop():
+        await browser.close()
+        await playwright.stop()
+
+    return Strategy(
+        'swarm_dom',
+        fields=SWARM_FIELDS,
+        extract=lambda html, url: _swarm_values(loop.run_until_complete(run(html, url))),
+        close=lambda: loop.run_until_complete(stop())
+    )
+
+
+def _universal_data_strategy(name, module_name, class_name, fields):
+    """_parse_universal_data on the JSON the scraper's page.evaluate would return"""
+    def build(loop):
+        try:
+            module = __import__(module_name)
+        except ImportError as e:
+            return Strategy(name, skipped=f'import failed: {e}')
+
+        # No short-link cache: offline pages never navigate
+        scraper = getattr(module, class_name)(short_link_db=None)
+
+        def extract(html, url):
+            data = extract_rehydration_json(html)
+            return (scraper._parse_universal_data(data) if data else None) or {}
+
+        return Strategy(name, fields=fields, extract=extract)
+    return build
+
+
+def build_debug_comments_strategy(loop):
+    try:
+        from extract_comments_from_debug import extract_json_data, parse_comments_from_json
+    except ImportError as e:
+        return Strategy('debug_comments', skipped=f'import failed: {e}')
+
+    def extract(html, url):
+        # The extractor reports progress with print(); keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            json_data = extract_json_data(html)
+            comments = parse_comments_from_json(json_data) if json_data else []
+        return {'embedded_comments': len(comments)}
+
+    # No fixture page has comments to count against, so there is nothing to score
+    return Strategy('debug_comments', extract=extract)
+
+
+def build_http_item_strategy(loop):
+    try:
+        from http_item_fetcher import parse_item_detail
+    except ImportError as e:
+        return Strategy('http_item_fetcher', skipped=f'import failed: {e}')
+
+    # Item pages only: account pages and login walls come back empty (-> browser fallback)
+    fields = METRIC_FIELDS + (
+        'post_description', 'hashtags', 'sound_title', 'sound_author', 'slide_count'
+    )
+    return Strategy(
+        'http_item_fetcher',
+        fields=fields,
+        extract=lambda html, url: parse_item_detail(html) or {}
+    )
+
+
+STRATEGY_BUILDERS = {
+    'rehydration_json': build_rehydration_strategy,
+    'swarm_regex': build_swarm_regex_strategy,
+    'swarm_dom': build_swarm_dom_strategy,
+    'production_universal': _universal_data_strategy(
+        'production_universal', 'production_scraper_237_urls', 'ProductionTikTokScraper', METRIC_FIELDS
+    ),
+    'reliable_universal': _universal_data_strategy(
+        'reliable_universal', 'reliable_tiktok_scraper', 'ReliableTikTokScraper',
+        METRIC_FIELDS + ('account_username', 'account_followers')
+    ),
+    'debug_comments': build_debug_comments_strategy,
+    'http_item_fetcher': build_http_item_strategy
+}
+
+
+# ============= SCORING =============
+
+def _tag_set(value):
+    return {tag.lower() for tag in re.findall(r'\w+', str(value or ''))}
+
+
+def field_matches(name, expected, actual):
+    """Compare one extracted value with its golden value"""
+    if expected is None:
+        # Nothing on the page: the strategy must not invent a value
+        return actual in (None, 0, '', False, 'Unknown')
+    if name == 'hashtags':
+        return _tag_set(expected) == _tag_set(actual)
+    if isinstance(expected, str) and expected[-1:] in COUNT_SUFFIXES:
+        # Abbreviated on the page: '24.1K' matches anything that displays as 24.1K
+        number, unit = expected[:-1], COUNT_SUFFIXES[expected[-1]]
+        step = unit / 10 ** len(number.partition('.')[2])
+        try:
+            return abs(int(actual) - float(number) * unit) < step
+        except (TypeError, ValueError):
+            return False
+    if isinstance(expected, bool):
+        return bool(actual) == expected
+    if isinstance(expected, int):
+        try:
+            return int(actual) == expected
+        except (TypeError, ValueError):
+            return False
+    return str(actual or '').strip() == str(expected).strip()
+
+
+def score_page(strategy, expected, values):
+    """[(field, expected, actual, ok)] for every field the strategy produces that the page displays"""
+    return [
+        (name, expected[name], values.get(name), field_matches(name, expected[name], values.get(name)))
+        for name in strategy.fields if name in expected
+    ]
+
+
+# ============= BENCHMARK =============
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_strategy(strategy, fixtures, repeat):
+    """
+    Time `repeat` passes over all fixtures, then one tracemalloc pass
+    (tracemalloc skews timing, so allocations are measured separately)
+    """
+    # Warm-up pass doubles as the accuracy pass
+    checks = {}
+    for name, html, url, expected in fixtures:
+        checks[name] = score_page(strategy, expected, strategy.extract(html, url))
+
+    samples = []
+    for _ in range(repeat):
+        for name, html, url, expected in fixtures:
+            start = time.perf_counter()
+            strategy.extract(html, url)
+            samples.append(time.perf_counter() - start)
+
+    peak_per_page = []
+    tracemalloc.start()
+    for name, html, url, expected in fixtures:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        strategy.extract(html, url)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_per_page.append(peak - baseline)
+    tracemalloc.stop()
+
+    results = [ok for page_checks in checks.values() for (_, _, _, ok) in page_checks]
+    return {
+        'pages': len(fixtures),
+        'median_ms': statistics.median(samples) * 1000,
+        'p95_ms': _percentile(samples, 95) * 1000,
+        'pages_per_sec': len(samples) / sum(samples) if sum(samples) else 0.0,
+        'peak_kb': max(peak_per_page) / 1024,
+        'mean_peak_kb': statistics.mean(peak_per_page) / 1024,
+        'accuracy': sum(results) / len(results) if results else None,
+        'fields_checked': len(results),
+        'checks': checks
+    }
+
+
+def print_report(report, show_details=False):
+    print(f"\n{'Strategy':<22} {'pages':>5} {'median ms':>10} {'p95 ms':>9} {'pages/s':>9} "
+          f"{'peak KB':>9} {'accuracy':>9}")
+    print("-" * 80)
+    for name, stats in report.items():
+        if 'skipped' in stats:
+            print(f"{name:<22} ⏭️  skipped ({stats['skipped']})")
+            continue
+        accuracy = 'unscored' if stats['accuracy'] is None else f"{stats['accuracy']:.1%}"
+        print(f"{name:<22} {stats['pages']:>5} {stats['median_ms']:>10.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['pages_per_sec']:>9.0f} {stats['peak_kb']:>9.0f} {accuracy:>9}")
+
+    if not show_details:
+        return
+
+    for name, stats in report.items():
+        if 'skipped' in stats:
+            continue
+        misses = [
+            (page, field_name, expected, actual)
+            for page, page_checks in stats['checks'].items()
+            for field_name, expected, actual, ok in page_checks if not ok
+        ]
+        print(f"\n🔍 {name}: {len(misses)} field mismatches")
+        for page, field_name, expected, actual in misses[:40]:
+            print(f"   {page:<42} {field_name:<18} expected {str(expected)[:30]!r:<34} got {str(actual)[:30]!r}")
+
+
+def check_against_baseline(report, baseline, tolerance):
+    """Regressions vs. a saved baseline: slower than tolerance x median, or lower accuracy"""
+    regressions = []
+    for name, stats in report.items():
+        previous = baseline.get(name)
+        if 'skipped' in stats or not previous:
+            continue
+        if stats['median_ms'] > previous['median_ms'] * tolerance:
+            regressions.append(f"{name}: median {stats['median_ms']:.2f} ms vs baseline {previous['median_ms']:.2f} ms")
+        if None in (stats['accuracy'], previous.get('accuracy')):
+            continue
+        if stats['accuracy'] + 1e-9 < previous['accuracy']:
+            regressions.append(f"{name}: accuracy {stats['accuracy']:.1%} vs baseline {previous['accuracy']:.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark page extractors on the saved debug pages')
+    parser.add_argument('--pages-dir', default=str(REPO_ROOT), help='Directory with the *debug*.html pages')
+    parser.add_argument('--golden', default=str(GOLDEN_FILE), help='Golden values JSON')
+    parser.add_argument('--strategy', action='append', choices=list(STRATEGY_BUILDERS),
+                        help='Only run these strategies (repeatable)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes over all pages')
+    parser.add_argument('--details', action='store_true', help='List field mismatches per strategy')
+    parser.add_argument('--update-golden', action='store_true', help='Rebuild golden values from the pages')
+    parser.add_argument('--baseline', default=str(BASELINE_FILE), help='Baseline JSON for --save-baseline/--check')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--check', action='store_true', help='Exit 1 on regression vs. the baseline')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='Allowed median latency ratio for --check')
+    args = parser.parse_args()
+
+    if args.update_golden:
+        pages = find_pages(args.pages_dir)
+        golden = build_golden(pages)
+        Path(args.golden).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.golden, 'w', encoding='utf-8') as f:
+            json.dump(golden, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        types = [entry['page_type'] for entry in golden.values()]
+        print(f"✅ Golden values for {len(golden)} pages → {args.golden}")
+        print(f"   {types.count('post')} posts, {types.count('account')} accounts, "
+              f"{types.count('login_wall')} login walls")
+        return
+
+    fixtures = load_fixtures(args.pages_dir, args.golden)
+    if not fixtures:
+        print("❌ No fixtures to benchmark")
+        sys.exit(1)
+
+    print(f"📄 {len(fixtures)} debug pages, {args.repeat} timed passes per strategy")
+
+    loop = asyncio.new_event_loop()
+    report = {}
+    try:
+        for name in args.strategy or list(STRATEGY_BUILDERS):
+            strategy = STRATEGY_BUILDERS[name](loop)
+            if strategy.skipped:
+                report[name] = {'skipped': strategy.skipped}
+                continue
+            try:
+                report[name] = run_strategy(strategy, fixtures, args.repeat)
+            finally:
+                if strategy.close:
+                    strategy.close()
+    finally:
+        loop.close()
+
+    print_report(report, args.details)
+
+    summary = {
+        name: {k: v for k, v in stats.items() if k != 'checks'}
+        for name, stats in report.items() if 'skipped' not in stats
+    }
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+            f.write('\n')
+        print(f"\n💾 Baseline saved to {args.baseline}")
+
+    if args.check:
+        if not Path(args.baseline).exists():
+            print(f"\n❌ No baseline at {args.baseline} (run --save-baseline first)")
+            sys.exit(1)
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = check_against_baseline(summary, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("\n✅ No regressions vs. baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,13 @@ Scraping all comments to track VA performance and engagement quality
 import asyncio
 import pandas as pd
 import time
-import random
 import re
 from datetime import datetime
 from playwright.async_api import async_playwright
 import logging
 
+from comment_analytics import CANONICAL_ACCOUNT, summarize_comments
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -176,14 +177,15 @@ class CommentsVAPerformanceScraper:
             data["comments"] = comments
             data["total_comments"] = len(comments)
             
-            # Analyze VA performance
+            # One batch-analytics pass feeds both reports
             logger.info("👥 Analyzing VA performance...")
-            va_analysis = await self._analyze_va_performance(comments, va_name)
+            summary = summarize_comments(comments, post_url=post_url, va=va_name)
+            va_analysis = self._analyze_va_performance(comments, va_name, summary, post_url)
             data["va_performance"] = va_analysis
             
             # Calculate engagement metrics
             logger.info("📊 Calculating engagement metrics...")
-            engagement_metrics = await self._calculate_engagement_metrics(comments)
+            engagement_metrics = self._calculate_engagement_metrics(comments, summary)
             data["engagement_metrics"] = engagement_metrics
             
             logger.info(f"✅ Extracted {len(comments)} comments")
@@ -325,8 +327,13 @@ class CommentsVAPerformanceScraper:
         
         return comments
 
-    async def _analyze_va_performance(self, comments, va_name):
-        """Analyze VA performance based on comments"""
+    def _analyze_va_performance(self, comments, va_name, summary, post_url=None):
+        """
+        VA performance from the comment_analytics summary
+
+        VA comments are the ones written by the post's account (parsed from a
+        canonical @account URL); response rate / time come from their replies.
+        """
         va_analysis = {
             "va_name": va_name,
             "va_comments_count": 0,
@@ -337,27 +344,23 @@ class CommentsVAPerformanceScraper:
         }
         
         try:
-            # Look for VA comments (this would need VA account mapping)
-            # For now, we'll simulate VA comment detection
-            
-            # Simulate finding VA comments
-            va_comments = []
-            for comment in comments:
-                # This is where we'd check if the comment is from the VA
-                # For now, we'll use a simple heuristic
-                if random.random() < 0.1:  # 10% chance of being VA comment
-                    va_comments.append(comment)
-                    va_analysis["va_comments_count"] += 1
-            
-            va_analysis["va_comments"] = va_comments
-            
-            # Calculate engagement quality
-            if va_analysis["va_comments_count"] > 0:
-                va_analysis["engagement_quality"] = "good"
-                va_analysis["comment_quality_score"] = 8.5
-            else:
-                va_analysis["engagement_quality"] = "needs_improvement"
-                va_analysis["comment_quality_score"] = 3.0
+            account = CANONICAL_ACCOUNT.search(post_url or "")
+            if account:
+                va_analysis["va_comments"] = [
+                    comment for comment in comments
+                    if str(comment.get("author", "")).lower().lstrip("@") == account.group(1).lower()
+                ]
+            va_analysis["va_comments_count"] = int(summary.get("creator_comments", 0))
+            
+            response_rate = summary.get("response_rate_pct")
+            if not pd.isna(response_rate):  # NaN without fan comments
+                va_analysis["response_rate"] = response_rate
+                va_analysis["comment_quality_score"] = round(response_rate / 10, 1)
+                va_analysis["engagement_quality"] = "good" if response_rate >= 50 else "needs_improvement"
+            
+            minutes = summary.get("median_minutes_to_first_reply")
+            if not pd.isna(minutes):
+                va_analysis["response_time"] = f"{minutes:.0f} min"
             
         except Exception as e:
             logger.error(f"❌ Error analyzing VA performance: {e}")
@@ -365,8 +368,8 @@ class CommentsVAPerformanceScraper:
         
         return va_analysis
 
-    async def _calculate_engagement_metrics(self, comments):
-        """Calculate engagement metrics from comments"""
+    def _calculate_engagement_metrics(self, comments, summary):
+        """Engagement metrics from the comment_analytics summary"""
         metrics = {
             "total_comments": len(comments),
             "avg_comment_length": 0,
@@ -377,9 +380,9 @@ class CommentsVAPerformanceScraper:
         
         try:
             if comments:
-                # Calculate average comment length
-                total_length = sum(len(comment.get("text", "")) for comment in comments)
-                metrics["avg_comment_length"] = total_length / len(comments)
+                metrics["avg_comment_length"] = float(summary.get("avg_length", 0))
+                metrics["p90_comment_length"] = float(summary.get("p90_length", 0))
+                metrics["keyword_hits"] = int(summary.get("keyword_hits", 0))
                 
                 # Calculate engagement quality
                 if len(comments) > 10:
@@ -389,8 +392,9 @@ class CommentsVAPerformanceScraper:
                 else:
                     metrics["comment_quality"] = "low"
                 
-                # Calculate response rate (simplified)
-                metrics["response_rate"] = min(100, len(comments) * 10)
+                response_rate = summary.get("response_rate_pct")
+                if not pd.isna(response_rate):
+                    metrics["response_rate"] = response_rate
             
         except Exception as e:
             logger.error(f"❌ Error calculating engagement metrics: {e}")
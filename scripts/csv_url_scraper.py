@@ -13,6 +13,8 @@ from typing import Dict, Optional
 
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeout
 
+from metric_parser import parse_count
+
 
 # Configure logging
 logging.basicConfig(
@@ -163,27 +165,7 @@ class TikTokScraper:
     @staticmethod
     def _parse_count(text: str) -> int:
         """Parse TikTok count strings like '1.2M', '45.3K', '234' to integers"""
-        text = text.strip().upper()
-
-        # Remove any non-numeric characters except K, M, B, and decimal point
-        text = ''.join(c for c in text if c.isdigit() or c in ['K', 'M', 'B', '.'])
-
-        multiplier = 1
-        if 'K' in text:
-            multiplier = 1_000
-            text = text.replace('K', '')
-        elif 'M' in text:
-            multiplier = 1_000_000
-            text = text.replace('M', '')
-        elif 'B' in text:
-            multiplier = 1_000_000_000
-            text = text.replace('B', '')
-
-        try:
-            number = float(text) if text else 0
-            return int(number * multiplier)
-        except ValueError:
-            return 0
+        return parse_count(text)
 
 
 def process_csv(input_csv_path: str, output_csv_path: Optional[str] = None, headless: bool = True):
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+DOM Probe - every selector for every field in ONE page.evaluate
+The selector-based extractors used to do one CDP round-trip per query_selector /
+text_content / get_attribute (hundreds per page once the "scan every span/div"
+fallbacks kick in). probe_page() ships all candidates to the page at once and gets
+back a compact {field: (value, matched selector)} dict.
+
+- FieldProbe: one field = ordered selector candidates + filters (digit required,
+  keywords, prefix, max length, regex), text or attributes, exists / collect-all modes
+- Playwright-only `tag:has-text("x")` selectors become a tag scan filtered on the text
+- Invalid selectors are skipped in the page instead of failing the whole probe
+- ProbeHits.matched() reports which selector won for each field
+
+Usage:
+  hits = await probe_page(page, VIDEO_PROBES)
+  views = hits.count('views')
+  logger.info(hits.matched())
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from metric_parser import parse_count
+
+logger = logging.getLogger(__name__)
+
+# Tags the "any element mentioning X" fallbacks used to walk element by element
+TEXT_TAGS = 'span, div, strong, p, h1, h2, h3'
+
+HAS_TEXT_PATTERN = re.compile(r'^(.*?):has-text\(["\'](.+)["\']\)$')
+
+PROBE_SCRIPT = """
+(probes) => {
+    const hits = {};
+    const lower = (text) => (text || '').toLowerCase();
+
+    for (const probe of probes) {
+        const pattern = probe.pattern ? new RegExp(probe.pattern, 'i') : null;
+        const accepts = (value) => {
+            if (!value) return false;
+            if (probe.maxLength && value.length > probe.maxLength) return false;
+            if (probe.prefix && !value.startsWith(probe.prefix)) return false;
+            if (probe.numeric && !/\\d/.test(value)) return false;
+            if (probe.contains.length && !probe.contains.some((word) => lower(value).includes(word))) return false;
+            if (pattern && !pattern.test(value)) return false;
+            return true;
+        };
+
+        const values = [];
+        const selectors = [];
+        scan:
+        for (const [css, hasText, label] of probe.candidates) {
+            let elements;
+            try {
+                elements = document.querySelectorAll(css);
+            } catch (e) {
+                continue;  // invalid selector
+            }
+            for (const element of elements) {
+                if (hasText && !lower(element.textContent).includes(hasText)) continue;
+                if (probe.exists) {
+                    values.push(true);
+                    selectors.push(label);
+                    break scan;
+                }
+                const candidates = probe.attributes.length
+                    ? probe.attributes.map((name) => (element.getAttribute(name) || '').trim())
+                    : [(element.textContent || '').trim()];
+                for (const value of candidates) {
+                    if (!accepts(value) || values.includes(value)) continue;
+                    values.push(value);
+                    if (!selectors.includes(label)) selectors.push(label);
+                    if (!probe.many || values.length >= probe.limit) break scan;
+                }
+            }
+        }
+        if (values.length) {
+            hits[probe.name] = probe.many ? [values, selectors] : [values[0], selectors[0]];
+        }
+    }
+    return hits;
+}
+"""
+
+
+@dataclass(frozen=True)
+class FieldProbe:
+    """Selector candidates and filters for one field"""
+    name: str
+    selectors: Tuple[str, ...] = ()
+    attributes: Tuple[str, ...] = ()   # read these attributes instead of the text
+    contains: Tuple[str, ...] = ()     # text must mention one of these (case-insensitive)
+    prefix: str = ''                   # value must start with this ('#', '@', 'http')
+    numeric: bool = False              # text must contain a digit
+    max_length: int = 0                # skip longer texts (0 = no limit)
+    pattern: str = ''                  # JS regex the value must match (case-insensitive)
+    exists: bool = False               # value is True as soon as any selector matches
+    many: bool = False                 # collect every accepted value (deduplicated, in order)
+    limit: int = 50                    # cap for many=True
+
+
+class ProbeHit(NamedTuple):
+    value: Any        # str, list of str (many=True) or True (exists=True)
+    selector: Any     # the selector that matched (list of selectors for many=True)
+
+
+class ProbeHits(dict):
+    """{field: ProbeHit} for the fields that matched"""
+
+    def value(self, name: str, default=None):
+        hit = self.get(name)
+        return hit.value if hit else default
+
+    def count(self, name: str) -> int:
+        """Field text parsed as a displayed count (0 if it didn't match)"""
+        return parse_count(self.value(name))
+
+    def selector(self, name: str) -> Optional[str]:
+        hit = self.get(name)
+        return hit.selector if hit else None
+
+    def matched(self) -> Dict[str, Any]:
+        """{field: selector that produced it}"""
+        return {name: hit.selector for name, hit in self.items()}
+
+
+def _candidate(selector: str) -> Tuple[str, str, str]:
+    """selector -> (css, required text, label)"""
+    match = HAS_TEXT_PATTERN.match(selector)
+    if match:
+        return (match.group(1) or '*', match.group(2).lower(), selector)
+    return (selector, '', selector)
+
+
+@lru_cache(maxsize=64)
+def build_payload(probes: Tuple[FieldProbe, ...]) -> Tuple[dict, ...]:
+    """JSON-able probe specs for PROBE_SCRIPT (built once per probe set)"""
+    return tuple({
+        'name': probe.name,
+        'candidates': [_candidate(selector) for selector in probe.selectors],
+        'attributes': list(probe.attributes),
+        'contains': [word.lower() for word in probe.contains],
+        'prefix': probe.prefix,
+        'numeric': probe.numeric,
+        'maxLength': probe.max_length,
+        'pattern': probe.pattern,
+        'exists': probe.exists,
+        'many': probe.many,
+        'limit': probe.limit,
+    } for probe in probes)
+
+
+async def probe_page(page, probes: Sequence[FieldProbe]) -> ProbeHits:
+    """Run all probes in one page.evaluate; empty hits if the page can't evaluate"""
+    evaluate = getattr(page, 'evaluate', None)
+    if evaluate is None:
+        return ProbeHits()
+    try:
+        raw = await evaluate(PROBE_SCRIPT, list(build_payload(tuple(probes))))
+    except Exception as e:
+        logger.debug(f"DOM probe failed: {e}")
+        return ProbeHits()
+    return ProbeHits({name: ProbeHit(*hit) for name, hit in (raw or {}).items()})
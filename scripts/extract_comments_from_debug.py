@@ -10,6 +10,12 @@ import json
 import html
 from datetime import datetime
 
+import pandas as pd
+
+from comment_analytics import KeywordMatcher
+
+CREATOR_KEYWORDS = ['creator', 'author', 'op', 'poster', 'sofia', 'tiktok']
+
 def extract_comments_from_debug_html(html_file_path):
     """
     Extract real comments from TikTok debug HTML
@@ -170,20 +176,15 @@ def analyze_comments(comments):
     print(f"💬 Total Comments: {len(comments)}")
     
     # Analyze comment lengths
-    lengths = [len(comment["text"]) for comment in comments]
-    avg_length = sum(lengths) / len(lengths) if lengths else 0
-    print(f"📏 Average Length: {avg_length:.1f} characters")
-    print(f"📏 Shortest: {min(lengths)} characters")
-    print(f"📏 Longest: {max(lengths)} characters")
-    
-    # Look for creator comments (simplified heuristic)
-    creator_comments = []
-    creator_keywords = ['creator', 'author', 'op', 'poster', 'sofia', 'tiktok']
-    
-    for comment in comments:
-        text_lower = comment["text"].lower()
-        if any(keyword in text_lower for keyword in creator_keywords):
-            creator_comments.append(comment)
+    texts = pd.Series([comment["text"] for comment in comments])
+    lengths = texts.str.len()
+    print(f"📏 Average Length: {lengths.mean():.1f} characters")
+    print(f"📏 Shortest: {lengths.min()} characters")
+    print(f"📏 Longest: {lengths.max()} characters")
+    
+    # Look for creator comments (simplified heuristic): one whole-word keyword scan
+    hit_rows = KeywordMatcher(CREATOR_KEYWORDS).find(texts).index.unique()
+    creator_comments = [comments[i] for i in hit_rows]
     
     print(f"👤 Potential Creator Comments: {len(creator_comments)}")
     
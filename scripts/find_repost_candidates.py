@@ -9,10 +9,19 @@ Identifies top viral posts worth reposting based on:
 """
 
 import json
+import numpy as np
 import pandas as pd
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).parent))
+
+from post_features import load_posts_with_features
+
+# Recency part of the viral score is measured against the end of the report window
+REPORT_END_DATE = pd.Timestamp('2025-10-16')
+
 class RepostCandidateFinder:
     def __init__(self, database_csv, ocr_data_dir):
         self.database_csv = Path(database_csv)
@@ -20,14 +29,9 @@ class RepostCandidateFinder:
 
         # Load database
         print("Loading database...")
-        self.df = pd.read_csv(self.database_csv, quotechar='"', escapechar='\\')
-        self.df['created_date'] = pd.to_datetime(self.df['created_date'])
-
-        # Filter October
-        self.oct_df = self.df[
-            (self.df['created_date'] >= '2025-10-01') &
-            (self.df['created_date'] <= '2025-10-16')
-        ]
+        # Filter October (pushed down into the Parquet store when it exists),
+        # joined with the precomputed per-post features
+        self.oct_df = load_posts_with_features(self.database_csv, start_date='2025-10-01', end_date='2025-10-16')
 
         print(f"✅ Loaded {len(self.oct_df)} October posts")
 
@@ -71,6 +75,10 @@ class RepostCandidateFinder:
         viral_posts = self.oct_df[self.oct_df['views'] >= min_views].copy()
         print(f"📊 Found {len(viral_posts)} viral posts (≥{min_views:,} views)")
 
+        # Repost analysis for all viral posts at once
+        viral_posts['repost_type'] = self.classify_repost_types(viral_posts)
+        viral_posts['viral_score'] = self.calculate_viral_scores(viral_posts)
+
         # Enrich with OCR data
         candidates = []
 
@@ -94,9 +102,9 @@ class RepostCandidateFinder:
                 'slides': post.get('slides', ''),
                 'hashtags': post.get('hashtags', ''),
                 # Repost analysis
-                'repost_type': self.classify_repost_type(post, viral_posts),
-                'engagement_rate': self.calculate_engagement_rate(post),
-                'viral_score': self.calculate_viral_score(post)
+                'repost_type': post['repost_type'],
+                'engagement_rate': float(post['engagement_rate_pct']),
+                'viral_score': float(post['viral_score'])
             }
 
             candidates.append(candidate)
@@ -111,63 +119,40 @@ class RepostCandidateFinder:
 
         return top_candidates
 
-    def classify_repost_type(self, post, all_viral_posts):
+    def classify_repost_types(self, viral_posts):
         """
-        Classify repost opportunity type:
+        Classify repost opportunity type for every viral post:
         - "same_account": Repost on same account (proven winner)
         - "same_va": Repost on different account managed by same VA
         - "cross_creator": Repost on account with similar creator type
         """
 
-        # Check if same account has other viral posts
-        same_account_virals = all_viral_posts[
-            all_viral_posts['account'] == post['account']
-        ]
-
-        if len(same_account_virals) > 1:
-            return "same_account"
+        # Other viral posts on the same account
+        account_virals = viral_posts.groupby('account')['post_url'].transform('size')
 
-        # Check if same VA has viral posts on other accounts
-        same_va_virals = all_viral_posts[
-            (all_viral_posts['va'] == post['va']) &
-            (all_viral_posts['account'] != post['account'])
-        ]
+        # Viral posts of the same VA on other accounts
+        va_virals = viral_posts.groupby('va')['post_url'].transform('size')
+        va_account_virals = viral_posts.groupby(['va', 'account'])['post_url'].transform('size')
+        other_account_va_virals = (va_virals - va_account_virals).fillna(0)
 
-        if len(same_va_virals) > 0:
-            return "same_va"
+        return np.select(
+            [account_virals > 1, other_account_va_virals > 0],
+            ['same_account', 'same_va'],
+            default='cross_creator'
+        )
 
-        return "cross_creator"
-
-    def calculate_engagement_rate(self, post):
-        """Calculate engagement rate (likes + comments + shares) / views"""
-        views = post['views']
-        if views == 0:
-            return 0
-
-        engagement = post['likes'] + post['comments'] + post['shares']
-        return round(engagement / views * 100, 2)
-
-    def calculate_viral_score(self, post):
+    def calculate_viral_scores(self, posts):
         """
-        Calculate viral score based on:
-        - Views (60%)
-        - Engagement rate (30%)
-        - Recency (10%)
+        Viral score based on:
+        - Views (60%)            precomputed in viral_base_score
+        - Engagement rate (30%)  precomputed in viral_base_score
+        - Recency (10%)          newer = better, max 16 days
         """
 
-        # Normalize views (assume max 1M)
-        views_score = min(post['views'] / 1000000, 1) * 60
-
-        # Engagement rate (assume max 20%)
-        engagement_rate = self.calculate_engagement_rate(post)
-        engagement_score = min(engagement_rate / 20, 1) * 30
-
-        # Recency (newer = better, max 16 days)
-        post_date = pd.to_datetime(post['created_date'])
-        days_old = (pd.Timestamp('2025-10-16') - post_date).days
-        recency_score = (1 - days_old / 16) * 10 if days_old <= 16 else 0
+        days_old = (REPORT_END_DATE - posts['created_date']).dt.days
+        recency_score = np.where(days_old <= 16, (1 - days_old / 16) * 10, 0)
 
-        return round(views_score + engagement_score + recency_score, 2)
+        return (posts['viral_base_score'] + recency_score).round(2)
 
     def generate_report(self, candidates):
         """Generate repost candidates report"""
@@ -10,10 +10,15 @@ Combines:
 
 import json
 import pandas as pd
+import sys
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).parent))
+
+from post_features import load_posts_with_features
+
 class VAQualityReporter:
     def __init__(self, database_csv, ocr_data_dir, config_file):
         self.database_csv = Path(database_csv)
@@ -22,14 +27,8 @@ class VAQualityReporter:
 
         # Load database
         print("Loading database...")
-        self.df = pd.read_csv(self.database_csv, quotechar='"', escapechar='\\')
-        self.df['created_date'] = pd.to_datetime(self.df['created_date'])
-
-        # Filter October
-        self.oct_df = self.df[
-            (self.df['created_date'] >= '2025-10-01') &
-            (self.df['created_date'] <= '2025-10-16')
-        ]
+        # Filter October (pushed down into the Parquet store when it exists)
+        self.oct_df = load_posts_with_features(self.database_csv, start_date='2025-10-01', end_date='2025-10-16')
 
         print(f"✅ Loaded {len(self.oct_df)} October posts")
 
@@ -65,38 +64,37 @@ class VAQualityReporter:
         return va_ocr_data
 
     def calculate_va_metrics(self):
-        """Calculate performance metrics per VA"""
-        va_metrics = {}
-
-        for va in self.oct_df['va'].unique():
-            va_posts = self.oct_df[self.oct_df['va'] == va]
-
-            total_views = va_posts['views'].sum()
-            avg_views = va_posts['views'].mean()
-            median_views = va_posts['views'].median()
-
-            viral_posts = va_posts[va_posts['views'] >= 10000]
-            viral_rate = len(viral_posts) / len(va_posts) if len(va_posts) > 0 else 0
-
-            # Account diversity
-            unique_accounts = va_posts['account'].nunique()
-
-            # Posting frequency
-            date_range = va_posts['created_date'].max() - va_posts['created_date'].min()
-            days = date_range.days if date_range.days > 0 else 1
-            posts_per_day = len(va_posts) / days
+        """Calculate performance metrics per VA (one groupby over the October posts)"""
+        per_va = self.oct_df.groupby('va', sort=False).agg(
+            total_posts=('post_url', 'size'),
+            unique_accounts=('account', 'nunique'),
+            total_views=('views', 'sum'),
+            avg_views=('views', 'mean'),
+            median_views=('views', 'median'),
+            top_post_views=('views', 'max'),
+            viral_posts=('is_viral', 'sum'),
+            first_post=('created_date', 'min'),
+            last_post=('created_date', 'max')
+        )
+
+        # Posting frequency
+        days = (per_va['last_post'] - per_va['first_post']).dt.days
+        per_va['posts_per_day'] = per_va['total_posts'] / days.where(days > 0, 1)
+        per_va['viral_rate'] = per_va['viral_posts'] / per_va['total_posts']
 
+        va_metrics = {}
+        for va, metrics in per_va.iterrows():
             va_metrics[va] = {
                 'va': va,
-                'total_posts': len(va_posts),
-                'unique_accounts': unique_accounts,
-                'total_views': int(total_views),
-                'avg_views': int(avg_views),
-                'median_views': int(median_views),
-                'viral_posts': len(viral_posts),
-                'viral_rate': round(viral_rate, 3),
-                'posts_per_day': round(posts_per_day, 2),
-                'top_post_views': int(va_posts['views'].max()) if len(va_posts) > 0 else 0
+                'total_posts': int(metrics['total_posts']),
+                'unique_accounts': int(metrics['unique_accounts']),
+                'total_views': int(metrics['total_views']),
+                'avg_views': int(metrics['avg_views']),
+                'median_views': int(metrics['median_views']),
+                'viral_posts': int(metrics['viral_posts']),
+                'viral_rate': round(metrics['viral_rate'], 3),
+                'posts_per_day': round(metrics['posts_per_day'], 2),
+                'top_post_views': int(metrics['top_post_views'])
             }
 
         return va_metrics
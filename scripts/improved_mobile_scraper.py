@@ -13,6 +13,8 @@ from datetime import datetime
 from playwright.async_api import async_playwright
 import logging
 
+from metric_parser import parse_count
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -542,21 +544,7 @@ class ImprovedMobileScraper:
     
     def _parse_metric(self, text: str) -> int:
         """Parse a metric string (e.g., "10.5K", "1.2M") into an integer"""
-        text = text.replace(',', '').strip()
-        text = text.lower()
-
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        elif 'b' in text:
-            return int(float(text.replace('b', '')) * 1000000000)
-        else:
-            # Extract only digits, handle cases like "22 comments"
-            digits = re.findall(r'\d+', text)
-            if digits:
-                return int("".join(digits))
-            return 0
+        return parse_count(text)
 
     async def scrape_posts(self, posts_data: list) -> pd.DataFrame:
         """
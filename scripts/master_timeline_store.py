@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Master Timeline Store
+Partitioned Parquet copy of MASTER_TIKTOK_DATABASE.csv
+
+Layout: <root>/month=YYYY-MM/creator=<account>/part-0.parquet
+- merge_complete_database.py upserts into it (only touched partitions are rewritten);
+  a full merge rebuilds it, dropping posts that are no longer in any source
+- <root>/_post_index.parquet maps post_url -> partition, so an upsert finds a post's
+  current partition without scanning every partition file
+- Analysis scripts read only the months/accounts/columns they need (predicate pushdown)
+- Optional DuckDB SQL over the same files via MasterTimelineStore.query()
+- SourceRegistry (<root>/_sources.json) remembers which input files were merged
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Same columns (and order) as MASTER_TIKTOK_DATABASE.csv
+MASTER_COLUMNS = [
+    'created_date',
+    'created_time',
+    'account',
+    'va',
+    'post_url',
+    'views',
+    'likes',
+    'comments',
+    'shares',
+    'engagement',
+    'engagement_rate',
+    'hashtags',
+    'sound',
+    'slides',
+    'source'
+]
+
+# Store-only column: when the source row was scraped (drives "newer scrape wins")
+STORE_COLUMNS = MASTER_COLUMNS + ['scraped_at']
+
+INT_COLUMNS = ['views', 'likes', 'comments', 'shares', 'engagement']
+METRIC_COLUMNS = INT_COLUMNS + ['engagement_rate']
+
+# How to resolve a post_url that is seen more than once:
+# - newest: value from the most recent scrape
+# - newest_non_empty: most recent non-empty value
+# - first_seen: value from the earliest scrape (non-empty)
+FIELD_PRECEDENCE = {
+    'created_date': 'first_seen',
+    'created_time': 'first_seen',
+    'account': 'newest_non_empty',
+    'va': 'newest_non_empty',
+    'views': 'newest',
+    'likes': 'newest',
+    'comments': 'newest',
+    'shares': 'newest',
+    'engagement': 'newest',
+    'engagement_rate': 'newest',
+    'hashtags': 'newest_non_empty',
+    'sound': 'newest_non_empty',
+    'slides': 'newest_non_empty',
+    'source': 'first_seen',
+    'scraped_at': 'newest'
+}
+
+MASTER_SCHEMA = pa.schema([
+    ('created_date', pa.string()),
+    ('created_time', pa.string()),
+    ('account', pa.string()),
+    ('va', pa.string()),
+    ('post_url', pa.string()),
+    ('views', pa.int64()),
+    ('likes', pa.int64()),
+    ('comments', pa.int64()),
+    ('shares', pa.int64()),
+    ('engagement', pa.int64()),
+    ('engagement_rate', pa.float64()),
+    ('hashtags', pa.string()),
+    ('sound', pa.string()),
+    ('slides', pa.string()),
+    ('source', pa.string()),
+    ('scraped_at', pa.string())
+])
+
+DATASET_SCHEMA = MASTER_SCHEMA.append(pa.field('month', pa.string())).append(pa.field('creator', pa.string()))
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('month', pa.string()), ('creator', pa.string())]),
+    flavor='hive'
+)
+
+UNKNOWN_PARTITION = '__unknown__'
+
+# Leading underscore: skipped by pyarrow dataset discovery, like the store's other side files
+POST_INDEX_FILE = '_post_index.parquet'
+PART_GLOB = 'month=*/creator=*/part-0.parquet'
+
+
+def normalize_rows(posts):
+    """Coerce master-format rows (dicts or DataFrame) into the store schema, plus month / creator"""
+    df = pd.DataFrame(posts)
+    for column in STORE_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+
+    df = df[STORE_COLUMNS].copy()
+    for column in INT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype('int64')
+    df['engagement_rate'] = pd.to_numeric(df['engagement_rate'], errors='coerce').fillna(0.0)
+
+    string_columns = [c for c in STORE_COLUMNS if c not in METRIC_COLUMNS]
+    df[string_columns] = df[string_columns].fillna('').astype(str)
+
+    df = df[df['post_url'] != '']
+    df['month'] = df['created_date'].str[:7].replace('', UNKNOWN_PARTITION)
+    df['creator'] = df['account'].replace('', UNKNOWN_PARTITION)
+    return df
+
+
+def default_store_path(database_csv):
+    """Store directory that sits next to a master CSV (MASTER_X.csv -> MASTER_X_parquet/)"""
+    database_csv = Path(database_csv)
+    return database_csv.parent / f"{database_csv.stem}_parquet"
+
+
+class MasterTimelineStore:
+    """Month/creator partitioned Parquet store for the master post timeline"""
+
+    def __init__(self, root_dir):
+        self.root_dir = Path(root_dir)
+
+    def exists(self):
+        """True once at least one partition has been written"""
+        return self.root_dir.exists() and any(self.root_dir.glob(PART_GLOB))
+
+    # ============= WRITE =============
+
+    def _partition_path(self, month, creator):
+        """Directory for one (month, creator) partition"""
+        return self.root_dir / f"month={quote(month, safe='')}" / f"creator={quote(creator, safe='')}"
+
+    def _read_partition(self, month, creator):
+        """Stored rows of one partition (None if it has no file yet)"""
+        part_file = self._partition_path(month, creator) / 'part-0.parquet'
+        if not part_file.exists():
+            return None
+        return normalize_rows(pq.read_table(part_file).to_pandas())[STORE_COLUMNS]
+
+    def _stored_partitions(self):
+        """(month, creator) of every partition file on disk"""
+        return {
+            (unquote(path.parent.parent.name.partition('=')[2]), unquote(path.parent.name.partition('=')[2]))
+            for path in self.root_dir.glob(PART_GLOB)
+        }
+
+    def _load_index(self):
+        """post_url -> (month, creator) for every stored post (read once per write batch)"""
+        index_file = self.root_dir / POST_INDEX_FILE
+        if index_file.exists():
+            frame = pd.read_parquet(index_file)
+        elif self.exists():
+            # Store written before the index existed: one scan builds it
+            frame = self._dataset().to_table(columns=['post_url', 'month', 'creator']).to_pandas()
+        else:
+            return {}
+        return dict(zip(frame['post_url'], zip(frame['month'], frame['creator'])))
+
+    def _save_index(self, index):
+        index_file = self.root_dir / POST_INDEX_FILE
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        frame = pd.DataFrame(
+            [(post_url, month, creator) for post_url, (month, creator) in index.items()],
+            columns=['post_url', 'month', 'creator']
+        )
+        tmp_file = self.root_dir / f".{POST_INDEX_FILE}.tmp"
+        frame.to_parquet(tmp_file, index=False, compression='zstd')
+        os.replace(tmp_file, index_file)
+
+    def _write_partition(self, month, creator, existing, rows):
+        """
+        Replace one partition's rows (the file is deleted when `rows` is empty)
+
+        Returns False and leaves the file alone when no post was added, removed or
+        had its metrics changed.
+        """
+        rows = rows.sort_values(['created_date', 'created_time'], kind='stable')
+        changes = summarize_changes(existing, rows)
+        moved_out = 0 if existing is None else int((~existing['post_url'].isin(rows['post_url'])).sum())
+        if changes['inserted'] == 0 and changes['updated'] == 0 and moved_out == 0:
+            return False
+
+        part_dir = self._partition_path(month, creator)
+        part_file = part_dir / 'part-0.parquet'
+        if len(rows) == 0:
+            part_file.unlink()
+            return True
+
+        part_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = part_dir / '.part-0.parquet.tmp'  # dot prefix: ignored by dataset discovery
+        table = pa.Table.from_pandas(rows, schema=MASTER_SCHEMA, preserve_index=False)
+        pq.write_table(table, tmp_file, compression='zstd')
+        os.replace(tmp_file, part_file)
+        return True
+
+    def write_posts(self, posts, scraped_at=None):
+        """
+        Upsert master-format rows (dicts or DataFrame) by post_url
+
+        Only the (month, creator) partitions that hold or receive these post_urls
+        are read and rewritten, so a daily batch costs time proportional to its
+        own size. Duplicate post_urls are resolved field by field with
+        FIELD_PRECEDENCE, ordered by `scraped_at` (per-row column, or this default
+        for the batch). A post whose resolved account / created_date now points
+        at another partition is moved there (removed from the old one).
+
+        Returns change summary: partitions, inserted, updated, unchanged.
+        """
+        df = normalize_rows(posts)
+        if scraped_at is not None:
+            df['scraped_at'] = df['scraped_at'].where(df['scraped_at'] != '', scraped_at)
+
+        summary = {'partitions': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0}
+        if len(df) == 0:
+            return summary
+
+        incoming = df[STORE_COLUMNS]
+        post_urls = set(incoming['post_url'])
+
+        # Partitions currently holding any of these post_urls (wherever the old row was filed)
+        index = self._load_index()
+        located = {index[post_url] for post_url in post_urls if post_url in index}
+        partitions = {key: self._read_partition(*key) for key in located}
+        previous = [rows[rows['post_url'].isin(post_urls)] for rows in partitions.values() if rows is not None]
+        previous = pd.concat(previous, ignore_index=True) if previous else None
+
+        resolved = resolve_duplicates(incoming if previous is None else pd.concat([previous, incoming], ignore_index=True))
+        resolved = normalize_rows(resolved)
+        for key in set(zip(resolved['month'], resolved['creator'])) - set(partitions):
+            partitions[key] = self._read_partition(*key)
+
+        changes = summarize_changes(None if previous is None else resolve_duplicates(previous), resolved[STORE_COLUMNS])
+        for key, value in changes.items():
+            summary[key] += value
+
+        for (month, creator), existing in partitions.items():
+            incoming_part = resolved[(resolved['month'] == month) & (resolved['creator'] == creator)][STORE_COLUMNS]
+            kept = None if existing is None else existing[~existing['post_url'].isin(post_urls)]
+            merged = incoming_part if kept is None else pd.concat([kept, incoming_part], ignore_index=True)
+            summary['partitions'] += int(self._write_partition(month, creator, existing, merged))
+
+        filed = dict(zip(resolved['post_url'], zip(resolved['month'], resolved['creator'])))
+        if summary['partitions'] or not (self.root_dir / POST_INDEX_FILE).exists():
+            index.update(filed)
+            self._save_index(index)
+
+        return summary
+
+    def rebuild(self, posts):
+        """
+        Replace the whole store with master-format rows (full merge)
+
+        Duplicate post_urls are resolved as in write_posts. Partitions whose posts and
+        metrics are unchanged keep their files; partitions left without posts are
+        deleted, so posts that are no longer in any source leave the store.
+
+        Returns change summary: partitions, inserted, updated, unchanged, removed.
+        """
+        resolved = normalize_rows(resolve_duplicates(normalize_rows(posts)))
+        partitions = {key: self._read_partition(*key) for key in self._stored_partitions()}
+        for key in set(zip(resolved['month'], resolved['creator'])) - set(partitions):
+            partitions[key] = None
+
+        stored = [rows for rows in partitions.values() if rows is not None]
+        stored = pd.concat(stored, ignore_index=True) if stored else None
+        summary = {'partitions': 0, **summarize_changes(stored, resolved[STORE_COLUMNS])}
+        summary['removed'] = 0 if stored is None else int((~stored['post_url'].isin(resolved['post_url'])).sum())
+
+        for (month, creator), existing in partitions.items():
+            rows = resolved[(resolved['month'] == month) & (resolved['creator'] == creator)][STORE_COLUMNS]
+            summary['partitions'] += int(self._write_partition(month, creator, existing, rows))
+
+        self._save_index(dict(zip(resolved['post_url'], zip(resolved['month'], resolved['creator']))))
+        return summary
+
+    # ============= READ =============
+
+    def _dataset(self):
+        return ds.dataset(self.root_dir, format='parquet', schema=DATASET_SCHEMA, partitioning=PARTITIONING)
+
+    def read(self, columns=None, start_date=None, end_date=None, accounts=None, vas=None, min_views=None):
+        """
+        Load posts as a DataFrame, reading only what is needed
+
+        start_date/end_date ('YYYY-MM-DD', inclusive) prune month partitions,
+        accounts prunes creator partitions, and all filters are pushed down
+        into the Parquet row-group scan. `columns` limits the columns decoded.
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"Master timeline store not found: {self.root_dir}")
+
+        conditions = []
+        if start_date is not None:
+            start_date = str(pd.Timestamp(start_date).date())
+            conditions.append(ds.field('month') >= start_date[:7])
+            conditions.append(ds.field('created_date') >= start_date)
+        if end_date is not None:
+            end_date = str(pd.Timestamp(end_date).date())
+            conditions.append(ds.field('month') <= end_date[:7])
+            conditions.append(ds.field('created_date') <= end_date)
+        if accounts is not None:
+            conditions.append(ds.field('creator').isin(list(accounts)))
+        if vas is not None:
+            conditions.append(ds.field('va').isin(list(vas)))
+        if min_views is not None:
+            conditions.append(ds.field('views') >= min_views)
+
+        row_filter = None
+        for condition in conditions:
+            row_filter = condition if row_filter is None else row_filter & condition
+
+        table = self._dataset().to_table(columns=list(columns or MASTER_COLUMNS), filter=row_filter)
+        return table.to_pandas()
+
+    def query(self, sql):
+        """
+        Run SQL over the store with DuckDB (view name: posts)
+
+        Example: store.query("SELECT va, SUM(views) FROM posts WHERE month = '2025-10' GROUP BY va")
+        """
+        import duckdb
+
+        con = duckdb.connect()
+        try:
+            pattern = str(self.root_dir / 'month=*' / 'creator=*' / '*.parquet')
+            con.execute(
+                f"CREATE VIEW posts AS SELECT * FROM read_parquet('{pattern}', hive_partitioning = true)"
+            )
+            return con.execute(sql).df()
+        finally:
+            con.close()
+
+
+def resolve_duplicates(df):
+    """
+    Collapse rows sharing a post_url into one, field by field (FIELD_PRECEDENCE)
+
+    Rows are ordered by scraped_at; ties keep input order, so later rows
+    count as newer. Empty strings never win a *_non_empty / first_seen field.
+    """
+    df = df.reset_index(drop=True)
+    if not df['post_url'].duplicated().any():
+        return df
+
+    ordered = df.sort_values('scraped_at', kind='stable')
+    grouped_columns = {}
+    for column, rule in FIELD_PRECEDENCE.items():
+        values = ordered[column]
+        if rule != 'newest':
+            values = values.mask(values == '')
+        group = values.groupby(ordered['post_url'], sort=False)
+        grouped_columns[column] = group.first() if rule == 'first_seen' else group.last()
+
+    resolved = pd.DataFrame(grouped_columns)
+    resolved.index.name = 'post_url'
+    resolved = resolved.reset_index()
+    string_columns = [c for c in STORE_COLUMNS if c not in METRIC_COLUMNS]
+    resolved[string_columns] = resolved[string_columns].fillna('')
+    return resolved[STORE_COLUMNS]
+
+
+def summarize_changes(existing, merged):
+    """Count inserted / updated (metric changed) / unchanged post_urls for one partition"""
+    if existing is None or len(existing) == 0:
+        return {'inserted': len(merged), 'updated': 0, 'unchanged': 0}
+
+    before = existing.set_index('post_url')[METRIC_COLUMNS]
+    after = merged.set_index('post_url')[METRIC_COLUMNS]
+    is_new = ~after.index.isin(before.index)
+    common = after.index[~is_new]
+    changed = (after.loc[common] != before.loc[common]).any(axis=1)
+
+    return {
+        'inserted': int(is_new.sum()),
+        'updated': int(changed.sum()),
+        'unchanged': int((~changed).sum())
+    }
+
+
+class SourceRegistry:
+    """
+    Remembers every input file merged into the store (hash + row count)
+
+    Stored as <store>/_sources.json. A file is re-parsed only when its size or
+    mtime changed AND its content hash differs from the recorded one.
+    """
+
+    def __init__(self, store_root):
+        self.path = Path(store_root) / '_sources.json'
+        self.sources = {}
+        self.account_to_va = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.sources = data.get('sources', {})
+            self.account_to_va = data.get('account_to_va', {})
+
+    @staticmethod
+    def file_hash(path, chunk_size=1024 * 1024):
+        """sha256 of a file, streamed"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def has_changed(self, path):
+        """True if the file is new or its content differs from the last merge"""
+        path = Path(path)
+        entry = self.sources.get(str(path))
+        if entry is None:
+            return True
+
+        stat = path.stat()
+        if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return False  # Cheap check first: unchanged files are never re-hashed
+
+        return entry['sha256'] != self.file_hash(path)
+
+    def record(self, path, row_count):
+        """Mark a file as merged"""
+        path = Path(path)
+        stat = path.stat()
+        self.sources[str(path)] = {
+            'sha256': self.file_hash(path),
+            'rows': row_count,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'merged_at': datetime.now().isoformat()
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name('_sources.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'sources': self.sources, 'account_to_va': self.account_to_va}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def load_master_posts(database_csv, columns=None, start_date=None, end_date=None, **filters):
+    """
+    Load master timeline rows from the Parquet store when present, else from the CSV
+
+    Returns a DataFrame with `created_date` parsed as datetime.
+    """
+    store = MasterTimelineStore(default_store_path(database_csv))
+
+    if store.exists():
+        df = store.read(columns=columns, start_date=start_date, end_date=end_date, **filters)
+        # Match read_csv semantics: empty strings come back as NaN
+        text_columns = [c for c in df.columns if c in MASTER_SCHEMA.names and pa.types.is_string(MASTER_SCHEMA.field(c).type)]
+        df[text_columns] = df[text_columns].replace('', float('nan'))
+        # Chronological like the CSV (partition files come back in directory order)
+        sort_columns = [c for c in ['created_date', 'created_time'] if c in df.columns]
+        if sort_columns:
+            df = df.sort_values(sort_columns, kind='stable').reset_index(drop=True)
+    else:
+        usecols = None if columns is None else list(dict.fromkeys(list(columns) + ['created_date']))
+        df = pd.read_csv(database_csv, quotechar='"', escapechar='\\', usecols=usecols)
+        df['created_date'] = pd.to_datetime(df['created_date'])
+        if start_date is not None:
+            df = df[df['created_date'] >= start_date]
+        if end_date is not None:
+            df = df[df['created_date'] <= end_date]
+        if filters.get('accounts') is not None:
+            df = df[df['account'].isin(list(filters['accounts']))]
+        if filters.get('vas') is not None:
+            df = df[df['va'].isin(list(filters['vas']))]
+        if filters.get('min_views') is not None:
+            df = df[df['views'] >= filters['min_views']]
+        df = df.reset_index(drop=True)
+
+    if 'created_date' in df.columns:
+        df['created_date'] = pd.to_datetime(df['created_date'])
+    return df
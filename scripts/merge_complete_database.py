@@ -3,292 +3,376 @@
 MASTER DATABASE CREATION
 Merges all TikTok data sources into one complete timeline
 Mai 9, 2025 → Oct 18, 2025
+
+Usage:
+  python merge_complete_database.py                  # full rebuild (CSV + Parquet store)
+  python merge_complete_database.py --incremental    # only new/changed sources → Parquet store
+  python merge_complete_database.py --incremental --export-csv
 """
 
+import argparse
 import csv
-import json
+import sys
 from datetime import datetime
-
-print("🔥 CREATING MASTER TIKTOK DATABASE")
-print("=" * 80)
-
-# ============= LOAD ALL DATA SOURCES =============
-all_posts = []
-
-# 1. OLD CLEAN DATA (Mai 9 - Sept 15)
-print("\n📂 Loading old clean data (Mai-Sept)...")
-with open('/Users/felixhergenroeder/Downloads/Master-Proof-Log - clean_old.csv', 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if not row.get('createTimeISO'):
-            continue
-
-        # Extract slideshow links (slide1_link through slide12_link)
-        slides = []
-        for i in range(1, 13):
-            slide_link = row.get(f'slide{i}_link', '')
-            if slide_link and slide_link.strip():
-                slides.append(slide_link.strip())
-
-        all_posts.append({
-            'post_url': row.get('post_url', ''),
-            'account': row.get('author', ''),
-            'views': int(row.get('playCount', 0) or 0),
-            'likes': int(row.get('diggCount', 0) or 0),
-            'comments': int(row.get('commentCount', 0) or 0),
-            'shares': int(row.get('shareCount', 0) or 0),
-            'created': row.get('createTimeISO', ''),
-            'hashtags': row.get('hashtags', ''),
-            'sound_link': row.get('sound_link', ''),
-            'slides': slides,
-            'source': 'old_clean'
-        })
-
-print(f"  ✅ Loaded {len(all_posts)} posts from old_clean")
-
-# 2. SEPT 23-29 SCRAPE
-print("\n📂 Loading Sept 23-29 scrape...")
-sept_start = len(all_posts)
-with open('/Users/felixhergenroeder/Downloads/dataset_tiktok-scraper_2025-10-18_19-45-32-750.json', 'r') as f:
-    sept_data = json.load(f)
-    for item in sept_data:
-        if 'error' in item or 'createTimeISO' not in item:
-            continue
-
-        # Extract slideshow images from imagePost.images
-        slides = []
-        if 'imagePost' in item and 'images' in item['imagePost']:
-            for img in item['imagePost']['images']:
-                if 'imageURL' in img and 'imageUrlList' in img['imageURL']:
-                    url_list = img['imageURL']['imageUrlList']
-                    if url_list and len(url_list) > 0:
-                        slides.append(url_list[0])  # Use first URL from list
-
-        all_posts.append({
-            'post_url': item.get('webVideoUrl', ''),
-            'account': item.get('authorMeta.name', ''),
-            'views': int(item.get('playCount', 0) or 0),
-            'likes': int(item.get('diggCount', 0) or 0),
-            'comments': int(item.get('commentCount', 0) or 0),
-            'shares': int(item.get('shareCount', 0) or 0),
-            'created': item.get('createTimeISO', ''),
-            'hashtags': item.get('text', ''),
-            'sound_link': item.get('musicMeta.musicName', ''),
-            'slides': slides,
-            'source': 'sept_scrape'
-        })
-
-print(f"  ✅ Loaded {len(all_posts) - sept_start} posts from Sept scrape")
-
-# 3. OCT 12-13 MERGED (includes test)
-print("\n📂 Loading Oct 12-13 scrape (merged)...")
-oct_start = len(all_posts)
-with open('/Users/felixhergenroeder/oct_12-13_complete.json', 'r') as f:
-    oct_data = json.load(f)
-    for item in oct_data:
-        if 'error' in item or 'createTimeISO' not in item:
-            continue
-
-        # Extract slideshow images from imagePost.images
-        slides = []
-        if 'imagePost' in item and 'images' in item['imagePost']:
-            for img in item['imagePost']['images']:
-                if 'imageURL' in img and 'imageUrlList' in img['imageURL']:
-                    url_list = img['imageURL']['imageUrlList']
-                    if url_list and len(url_list) > 0:
-                        slides.append(url_list[0])  # Use first URL from list
-
-        all_posts.append({
-            'post_url': item.get('webVideoUrl', ''),
-            'account': item.get('authorMeta.name', ''),
-            'views': int(item.get('playCount', 0) or 0),
-            'likes': int(item.get('diggCount', 0) or 0),
-            'comments': int(item.get('commentCount', 0) or 0),
-            'shares': int(item.get('shareCount', 0) or 0),
-            'created': item.get('createTimeISO', ''),
-            'hashtags': item.get('text', ''),
-            'sound_link': item.get('musicMeta.musicName', ''),
-            'slides': slides,
-            'source': 'oct_scrape'
-        })
-
-print(f"  ✅ Loaded {len(all_posts) - oct_start} posts from Oct scrape")
-
-# 4. CURRENT METRICS LOG (Sept 15 - Oct 18)
-print("\n📂 Loading current metrics log...")
-current_start = len(all_posts)
-with open('/Users/felixhergenroeder/Downloads/Master-Proof-Log - Metrics_Log.csv', 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if not row.get('createTimeISO'):
-            continue
-
-        # Extract slideshow links (slide1_link through slide12_link)
-        slides = []
-        for i in range(1, 13):
-            slide_link = row.get(f'slide{i}_link', '')
-            if slide_link and slide_link.strip():
-                slides.append(slide_link.strip())
-
-        all_posts.append({
-            'post_url': row.get('post_url', ''),
-            'account': row.get('author', ''),
-            'views': int(row.get('playCount', 0) or 0),
-            'likes': int(row.get('diggCount', 0) or 0),
-            'comments': int(row.get('commentCount', 0) or 0),
-            'shares': int(row.get('shareCount', 0) or 0),
-            'created': row.get('createTimeISO', ''),
-            'hashtags': row.get('hashtags', ''),
-            'sound_link': row.get('sound_link', ''),
-            'slides': slides,
-            'source': 'current_metrics'
-        })
-
-print(f"  ✅ Loaded {len(all_posts) - current_start} posts from current metrics")
-
-# ============= DEDUPLICATE =============
-print(f"\n🔄 Deduplicating...")
-print(f"  Before: {len(all_posts)} posts")
-
-# Remove duplicates by post_url
-seen_urls = set()
-unique_posts = []
-
-for post in all_posts:
-    url = post['post_url']
-    if url and url not in seen_urls:
-        seen_urls.add(url)
-        unique_posts.append(post)
-
-print(f"  After: {len(unique_posts)} unique posts")
-print(f"  Removed: {len(all_posts) - len(unique_posts)} duplicates")
-
-# ============= SORT BY DATE =============
-print(f"\n📅 Sorting by createTime...")
-unique_posts.sort(key=lambda x: x['created'])
-
-# ============= ADD VA MAPPING =============
-print(f"\n👥 Adding VA mapping from current metrics...")
-
-# Build account -> VA mapping from current metrics
-account_to_va = {}
-with open('/Users/felixhergenroeder/Downloads/Master-Proof-Log - Metrics_Log.csv', 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        account = row.get('author', '').strip().lower()
-        va = row.get('va', '').strip()
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from apify_stream_reader import iter_records
+from master_timeline_store import (
+    MASTER_COLUMNS, UNKNOWN_PARTITION, MasterTimelineStore, SourceRegistry, default_store_path, normalize_rows,
+    resolve_duplicates
+)
+from post_features import INPUT_COLUMNS as FEATURE_INPUT_COLUMNS, PostFeatureTable, feature_table_path
+
+OUTPUT_FILE = '/Users/felixhergenroeder/MASTER_TIKTOK_DATABASE.csv'
+METRICS_LOG = '/Users/felixhergenroeder/Downloads/Master-Proof-Log - Metrics_Log.csv'
+
+# (source name, path, format, label) - duplicates are resolved with FIELD_PRECEDENCE in both modes
+SOURCES = [
+    ('old_clean', '/Users/felixhergenroeder/Downloads/Master-Proof-Log - clean_old.csv', 'csv',
+     'old clean data (Mai-Sept)'),
+    ('sept_scrape', '/Users/felixhergenroeder/Downloads/dataset_tiktok-scraper_2025-10-18_19-45-32-750.json', 'json',
+     'Sept 23-29 scrape'),
+    ('oct_scrape', '/Users/felixhergenroeder/oct_12-13_complete.json', 'json',
+     'Oct 12-13 scrape (merged)'),
+    ('current_metrics', METRICS_LOG, 'csv',
+     'current metrics log'),
+]
+
+
+# ============= SOURCE LOADERS =============
+
+def load_proof_log_csv(path, source):
+    """Proof Log CSV export (clean_old / Metrics_Log)"""
+    posts = []
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if not row.get('createTimeISO'):
+                continue
+
+            # Extract slideshow links (slide1_link through slide12_link)
+            slides = []
+            for i in range(1, 13):
+                slide_link = row.get(f'slide{i}_link', '')
+                if slide_link and slide_link.strip():
+                    slides.append(slide_link.strip())
+
+            posts.append({
+                'post_url': row.get('post_url', ''),
+                'account': row.get('author', ''),
+                'va': row.get('va', '').strip(),
+                'views': int(row.get('playCount', 0) or 0),
+                'likes': int(row.get('diggCount', 0) or 0),
+                'comments': int(row.get('commentCount', 0) or 0),
+                'shares': int(row.get('shareCount', 0) or 0),
+                'created': row.get('createTimeISO', ''),
+                'hashtags': row.get('hashtags', ''),
+                'sound_link': row.get('sound_link', ''),
+                'slides': slides,
+                'source': source
+            })
+    return posts
+
+
+def load_apify_json(path, source):
+    """Apify tiktok-scraper dataset export (JSON array or .jsonl), streamed item by item"""
+    return [record.to_post(source) for record in iter_records(path)]
+
+
+LOADERS = {
+    'csv': load_proof_log_csv,
+    'json': load_apify_json,
+}
+
+
+def source_scraped_at(path):
+    """Scrape time of a source file (its mtime) - newer scrape wins for metrics"""
+    return datetime.fromtimestamp(Path(path).stat().st_mtime).isoformat()
+
+
+def build_account_to_va(posts):
+    """account (lowercase) -> VA from Proof Log rows"""
+    account_to_va = {}
+    for post in posts:
+        account = post['account'].strip().lower()
+        va = post.get('va', '')
         if account and va:
             account_to_va[account] = va
+    return account_to_va
+
+
+def to_master_row(post):
+    """Raw loader record -> MASTER_TIKTOK_DATABASE.csv row"""
+    # Parse date
+    created_iso = post['created']
+    try:
+        dt = datetime.fromisoformat(created_iso.replace('Z', '+00:00'))
+        created_date = dt.strftime('%Y-%m-%d')
+        created_time = dt.strftime('%H:%M:%S')
+    except:
+        created_date = created_iso[:10] if created_iso else ''
+        created_time = created_iso[11:19] if len(created_iso) > 11 else ''
+
+    engagement = post['likes'] + post['comments'] + post['shares']
+    engagement_rate = (engagement / post['views'] * 100) if post['views'] > 0 else 0
+
+    # Format slides as pipe-separated URLs (klein & unauffällig)
+    slides_str = '|'.join(post.get('slides', [])) if post.get('slides') else ''
+
+    return {
+        'created_date': created_date,
+        'created_time': created_time,
+        'account': post['account'],
+        'va': post['va'],
+        'post_url': post['post_url'],
+        'views': post['views'],
+        'likes': post['likes'],
+        'comments': post['comments'],
+        'shares': post['shares'],
+        'engagement': engagement,
+        'engagement_rate': f"{engagement_rate:.2f}",
+        'hashtags': post['hashtags'],
+        'sound': post['sound_link'],
+        'slides': slides_str,
+        'source': post['source']
+    }
+
+
+# ============= FULL REBUILD =============
+
+def full_merge():
+    """Re-read every source and rebuild the CSV and the Parquet store"""
+    store = MasterTimelineStore(default_store_path(OUTPUT_FILE))
+    registry = SourceRegistry(store.root_dir)
+
+    # ============= LOAD ALL DATA SOURCES =============
+    all_posts = []
+    source_counts = {}
+
+    for source, path, fmt, label in SOURCES:
+        print(f"\n📂 Loading {label}...")
+        posts = LOADERS[fmt](path, source)
+        scraped_at = source_scraped_at(path)
+        for post in posts:
+            post['scraped_at'] = scraped_at
+        all_posts.extend(posts)
+        source_counts[path] = len(posts)
+        print(f"  ✅ Loaded {len(posts)} posts from {source}")
+
+    # ============= DEDUPLICATE =============
+    # Same per-field precedence as --incremental (newer scrape wins for metrics,
+    # first seen wins for created_date), so both modes build the same timeline
+    print(f"\n🔄 Deduplicating...")
+    print(f"  Before: {len(all_posts)} posts")
+
+    master_rows = [dict(to_master_row(post), scraped_at=post['scraped_at']) for post in all_posts]
+    timeline = resolve_duplicates(normalize_rows(master_rows))
+
+    print(f"  After: {len(timeline)} unique posts")
+    print(f"  Removed: {len(all_posts) - len(timeline)} duplicates")
+
+    # ============= SORT BY DATE =============
+    print(f"\n📅 Sorting by createTime...")
+    timeline = timeline.sort_values(['created_date', 'created_time'], kind='stable').reset_index(drop=True)
+
+    # ============= ADD VA MAPPING =============
+    print(f"\n👥 Adding VA mapping from current metrics...")
+
+    # Build account -> VA mapping from current metrics
+    account_to_va = build_account_to_va(load_proof_log_csv(METRICS_LOG, 'current_metrics'))
+
+    # Add VA to all posts
+    timeline['va'] = timeline['account'].str.lower().map(account_to_va).fillna('')
+
+    # ============= SAVE MASTER DATABASE =============
+    print(f"\n💾 Saving Master Database...")
+
+    csv_rows = timeline[MASTER_COLUMNS].copy()
+    csv_rows['engagement_rate'] = csv_rows['engagement_rate'].map('{:.2f}'.format)
+    csv_rows.to_csv(OUTPUT_FILE, index=False, encoding='utf-8')
+
+    print(f"✅ Saved to: {OUTPUT_FILE}")
+
+    # Columnar copy for the analysis scripts (only changed month/creator partitions are rewritten,
+    # posts no longer in any source are dropped)
+    summary = store.rebuild(timeline)
+    print(f"✅ Parquet store rebuilt: {store.root_dir} ({summary['partitions']} partitions written, "
+          f"{summary['removed']} posts removed)")
+
+    # Per-post features for the analysis scripts (recomputed only where metrics changed)
+    features = PostFeatureTable(feature_table_path(OUTPUT_FILE))
+    feature_summary = features.refresh(timeline)
+    print(f"✅ Feature table: {feature_summary['recomputed']:,} recomputed, {feature_summary['reused']:,} reused")
+
+    # Baseline for later --incremental runs
+    for path, row_count in source_counts.items():
+        registry.record(path, row_count)
+    registry.account_to_va = account_to_va
+    registry.save()
+
+    print_statistics(timeline)
+
+
+# ============= INCREMENTAL MERGE =============
+
+def incremental_merge(source_paths=None, export_csv=False):
+    """
+    Parse only new/changed sources and upsert them into the Parquet store
+
+    source_paths: extra files to merge (format from extension) on top of SOURCES.
+    Per-field precedence (newer scrape wins for metrics, first seen wins for
+    created_date) is applied by MasterTimelineStore.write_posts.
+    """
+    store = MasterTimelineStore(default_store_path(OUTPUT_FILE))
+    registry = SourceRegistry(store.root_dir)
+
+    sources = [(source, path, fmt) for source, path, fmt, _ in SOURCES]
+    for path in source_paths or []:
+        fmt = 'json' if str(path).endswith(('.json', '.jsonl', '.ndjson')) else 'csv'
+        sources.append((Path(path).stem, str(path), fmt))
+
+    # ============= DETECT CHANGED SOURCES =============
+    print(f"\n🔎 Checking {len(sources)} sources against registry...")
+    changed = []
+    for source, path, fmt in sources:
+        if not Path(path).exists():
+            print(f"  ⚠️  Missing: {path}")
+        elif registry.has_changed(path):
+            changed.append((source, path, fmt))
+            print(f"  🆕 {source}: new or changed")
+        else:
+            print(f"  ✓ {source}: unchanged, skipped")
+
+    if not changed:
+        print(f"\n✅ Nothing to merge - store is up to date")
+        return {'sources': 0, 'partitions': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+    # ============= PARSE CHANGED SOURCES =============
+    new_posts = []
+    source_counts = {}
+    for source, path, fmt in changed:
+        posts = LOADERS[fmt](path, source)
+        scraped_at = source_scraped_at(path)
+        for post in posts:
+            post['scraped_at'] = scraped_at
+        new_posts.extend(posts)
+        source_counts[path] = len(posts)
+        print(f"  ✅ Parsed {len(posts)} posts from {source}")
+
+    # VA mapping: remembered from earlier merges, refreshed from any re-parsed Proof Log
+    registry.account_to_va.update(build_account_to_va(new_posts))
+    for post in new_posts:
+        post['va'] = registry.account_to_va.get(post['account'].lower(), '')
+
+    # ============= UPSERT =============
+    print(f"\n🔄 Upserting {len(new_posts)} rows by post_url...")
+    master_rows = [dict(to_master_row(post), scraped_at=post['scraped_at']) for post in new_posts if post['post_url']]
+    summary = store.write_posts(master_rows)
+
+    # Features from the stored (precedence-resolved) rows of the touched accounts only;
+    # everything after a FEATURE_VERSION bump
+    features = PostFeatureTable(feature_table_path(OUTPUT_FILE))
+    feature_input = ['post_url'] + FEATURE_INPUT_COLUMNS
+    if features.is_current():
+        # Store partitions rows without an account under UNKNOWN_PARTITION
+        touched_accounts = {row['account'] or UNKNOWN_PARTITION for row in master_rows}
+        feature_summary = features.refresh(store.read(columns=feature_input, accounts=touched_accounts))
+    else:
+        feature_summary = features.refresh(store.read(columns=feature_input))
+
+    for path, row_count in source_counts.items():
+        registry.record(path, row_count)
+    registry.save()
+
+    if export_csv:
+        print(f"\n💾 Exporting {OUTPUT_FILE} from store...")
+        df = store.read().sort_values(['created_date', 'created_time'], kind='stable')
+        df['engagement_rate'] = df['engagement_rate'].map('{:.2f}'.format)
+        df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8')
+
+    # ============= CHANGE SUMMARY =============
+    print(f"\n" + "=" * 80)
+    print("📊 INCREMENTAL MERGE SUMMARY")
+    print("=" * 80)
+    print(f"  Sources merged: {len(changed)}")
+    print(f"  Rows parsed: {len(master_rows):,}")
+    print(f"  New posts: {summary['inserted']:,}")
+    print(f"  Updated posts (metrics changed): {summary['updated']:,}")
+    print(f"  Unchanged posts: {summary['unchanged']:,}")
+    print(f"  Partitions rewritten: {summary['partitions']:,}")
+    print(f"  Features recomputed: {feature_summary['recomputed']:,}")
+
+    summary['sources'] = len(changed)
+    return summary
 
-# Add VA to all posts
-for post in unique_posts:
-    account_lower = post['account'].lower()
-    post['va'] = account_to_va.get(account_lower, '')
-
-# ============= SAVE MASTER DATABASE =============
-print(f"\n💾 Saving Master Database...")
-
-output_file = '/Users/felixhergenroeder/MASTER_TIKTOK_DATABASE.csv'
-
-with open(output_file, 'w', encoding='utf-8', newline='') as f:
-    fieldnames = [
-        'created_date',
-        'created_time',
-        'account',
-        'va',
-        'post_url',
-        'views',
-        'likes',
-        'comments',
-        'shares',
-        'engagement',
-        'engagement_rate',
-        'hashtags',
-        'sound',
-        'slides',
-        'source'
-    ]
-
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-
-    for post in unique_posts:
-        # Parse date
-        created_iso = post['created']
-        try:
-            dt = datetime.fromisoformat(created_iso.replace('Z', '+00:00'))
-            created_date = dt.strftime('%Y-%m-%d')
-            created_time = dt.strftime('%H:%M:%S')
-        except:
-            created_date = created_iso[:10] if created_iso else ''
-            created_time = created_iso[11:19] if len(created_iso) > 11 else ''
-
-        engagement = post['likes'] + post['comments'] + post['shares']
-        engagement_rate = (engagement / post['views'] * 100) if post['views'] > 0 else 0
-
-        # Format slides as pipe-separated URLs (klein & unauffällig)
-        slides_str = '|'.join(post.get('slides', [])) if post.get('slides') else ''
-
-        writer.writerow({
-            'created_date': created_date,
-            'created_time': created_time,
-            'account': post['account'],
-            'va': post['va'],
-            'post_url': post['post_url'],
-            'views': post['views'],
-            'likes': post['likes'],
-            'comments': post['comments'],
-            'shares': post['shares'],
-            'engagement': engagement,
-            'engagement_rate': f"{engagement_rate:.2f}",
-            'hashtags': post['hashtags'],
-            'sound': post['sound_link'],
-            'slides': slides_str,
-            'source': post['source']
-        })
-
-print(f"✅ Saved to: {output_file}")
 
 # ============= STATISTICS =============
-print(f"\n" + "=" * 80)
-print("📊 MASTER DATABASE STATISTICS")
-print("=" * 80)
-
-# Date range
-dates = [p['created'][:10] for p in unique_posts if p['created']]
-print(f"\n📅 Date Range:")
-print(f"  First post: {min(dates)}")
-print(f"  Last post: {max(dates)}")
-print(f"  Total days: {(datetime.fromisoformat(max(dates)) - datetime.fromisoformat(min(dates))).days + 1}")
-
-# Posts by source
-from collections import Counter
-sources = Counter(p['source'] for p in unique_posts)
-print(f"\n📂 Posts by Source:")
-for source, count in sources.most_common():
-    print(f"  {source}: {count:,} posts")
-
-# Posts by VA
-vas = Counter(p['va'] for p in unique_posts if p['va'])
-print(f"\n👥 Posts by VA (Top 10):")
-for va, count in vas.most_common(10):
-    print(f"  {va}: {count:,} posts")
-
-# Total metrics
-total_views = sum(p['views'] for p in unique_posts)
-total_engagement = sum(p['likes'] + p['comments'] + p['shares'] for p in unique_posts)
-print(f"\n📈 Total Metrics:")
-print(f"  Posts: {len(unique_posts):,}")
-print(f"  Views: {total_views:,}")
-print(f"  Engagement: {total_engagement:,}")
-print(f"  Avg Views/Post: {total_views/len(unique_posts):,.0f}")
-
-# Slideshow coverage
-posts_with_slides = sum(1 for p in unique_posts if p.get('slides'))
-total_slides = sum(len(p.get('slides', [])) for p in unique_posts)
-print(f"\n🖼️  Slideshow Coverage:")
-print(f"  Posts with slides: {posts_with_slides:,} ({posts_with_slides/len(unique_posts)*100:.1f}%)")
-print(f"  Total slide images: {total_slides:,}")
-print(f"  Avg slides/post: {total_slides/posts_with_slides:.1f}" if posts_with_slides > 0 else "  Avg slides/post: N/A")
-
-print(f"\n🎯 MASTER DATABASE READY FOR ANALYSIS!")
\ No newline at end of file
+
+def print_statistics(timeline):
+    """Summary of the merged timeline (master-format DataFrame)"""
+    print(f"\n" + "=" * 80)
+    print("📊 MASTER DATABASE STATISTICS")
+    print("=" * 80)
+
+    # Date range
+    dates = timeline['created_date'][timeline['created_date'] != '']
+    print(f"\n📅 Date Range:")
+    print(f"  First post: {dates.min()}")
+    print(f"  Last post: {dates.max()}")
+    print(f"  Total days: {(datetime.fromisoformat(dates.max()) - datetime.fromisoformat(dates.min())).days + 1}")
+
+    # Posts by source
+    print(f"\n📂 Posts by Source:")
+    for source, count in timeline['source'].value_counts().items():
+        print(f"  {source}: {count:,} posts")
+
+    # Posts by VA
+    vas = timeline['va'][timeline['va'] != ''].value_counts()
+    print(f"\n👥 Posts by VA (Top 10):")
+    for va, count in vas.head(10).items():
+        print(f"  {va}: {count:,} posts")
+
+    # Total metrics
+    total_views = int(timeline['views'].sum())
+    total_engagement = int((timeline['likes'] + timeline['comments'] + timeline['shares']).sum())
+    print(f"\n📈 Total Metrics:")
+    print(f"  Posts: {len(timeline):,}")
+    print(f"  Views: {total_views:,}")
+    print(f"  Engagement: {total_engagement:,}")
+    print(f"  Avg Views/Post: {total_views/len(timeline):,.0f}")
+
+    # Slideshow coverage
+    slide_counts = timeline['slides'].map(lambda slides: len(slides.split('|')) if slides else 0)
+    posts_with_slides = int((slide_counts > 0).sum())
+    total_slides = int(slide_counts.sum())
+    print(f"\n🖼️  Slideshow Coverage:")
+    print(f"  Posts with slides: {posts_with_slides:,} ({posts_with_slides/len(timeline)*100:.1f}%)")
+    print(f"  Total slide images: {total_slides:,}")
+    print(f"  Avg slides/post: {total_slides/posts_with_slides:.1f}" if posts_with_slides > 0 else "  Avg slides/post: N/A")
+
+    print(f"\n🎯 MASTER DATABASE READY FOR ANALYSIS!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge all TikTok data sources into the master timeline')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only parse new/changed sources and upsert them into the Parquet store')
+    parser.add_argument('--source', action='append', default=[],
+                        help='Extra source file to merge (.csv Proof Log or .json/.jsonl Apify export), repeatable')
+    parser.add_argument('--export-csv', action='store_true',
+                        help='With --incremental: rewrite MASTER_TIKTOK_DATABASE.csv from the store')
+    args = parser.parse_args()
+
+    print("🔥 CREATING MASTER TIKTOK DATABASE")
+    print("=" * 80)
+
+    if args.incremental:
+        incremental_merge(args.source, export_csv=args.export_csv)
+    else:
+        full_merge()
+
+
+if __name__ == "__main__":
+    main()
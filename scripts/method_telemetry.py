@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Method Telemetry for the smart-routing scrapers
+Per-method latency histograms, moving-window success rates and cost per successful post
+
+- LatencyHistogram: HDR-style log-linear buckets (~1.6% relative error, any range),
+  sparse so it persists as a small JSON dict
+- MethodTelemetry: histogram + last-N attempts window + lifetime totals for one method
+- TelemetryRegistry: all methods, JSON persistence across runs, Prometheus / JSON export,
+  and rank() used by _select_best_method (tail latency + cost per success)
+
+Used by optimal_metrics_scraper.py and agent_6_hybrid_scraper.py.
+
+Usage:
+  python method_telemetry.py method_telemetry.json                    # JSON
+  python method_telemetry.py method_telemetry.json --format prometheus
+"""
+
+import argparse
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# 64 linear sub-buckets per power of two -> worst-case relative error 1/64
+SUB_BUCKET_BITS = 6
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+DEFAULT_WEIGHTS = {"cost": 0.4, "success": 0.4, "latency": 0.2}
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram (microsecond resolution)"""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _index(micros: int) -> int:
+        if micros < 2 * SUB_BUCKET_COUNT:
+            return micros
+        shift = micros.bit_length() - (SUB_BUCKET_BITS + 1)
+        return shift * SUB_BUCKET_COUNT + (micros >> shift)
+
+    @staticmethod
+    def _value(index: int) -> float:
+        """Midpoint of a bucket, in seconds"""
+        if index < 2 * SUB_BUCKET_COUNT:
+            return index / 1e6
+        shift = index // SUB_BUCKET_COUNT - 1
+        lower = (index - shift * SUB_BUCKET_COUNT) << shift
+        return (lower + (1 << shift) / 2) / 1e6
+
+    def record(self, seconds: float):
+        micros = max(int(seconds * 1e6), 0)
+        index = self._index(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency (seconds) at percentile p (0-100); None without samples"""
+        if not self.count:
+            return None
+        target = max(p / 100 * self.count, 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "counts": {str(index): count for index, count in self.counts.items()},
+            "count": self.count,
+            "total": self.total,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data.get("counts", {}).items()}
+        histogram.count = data.get("count", sum(histogram.counts.values()))
+        histogram.total = data.get("total", 0.0)
+        histogram.max = data.get("max", 0.0)
+        return histogram
+
+
+class MethodTelemetry:
+    """Telemetry for one scraping method"""
+
+    def __init__(self, method: str, window: int = 100):
+        self.method = method
+        self.latency = LatencyHistogram()
+        # (success, cost) of the last `window` attempts
+        self.recent = deque(maxlen=window)
+        self.attempts = 0
+        self.successes = 0
+        self.total_cost = 0.0
+
+    def record(self, success: bool, duration: float, cost: float):
+        self.latency.record(duration)
+        self.recent.append((bool(success), cost))
+        self.attempts += 1
+        self.successes += int(bool(success))
+        self.total_cost += cost
+
+    @property
+    def window_success_rate(self) -> Optional[float]:
+        if not self.recent:
+            return None
+        return sum(1 for success, _ in self.recent if success) / len(self.recent)
+
+    @property
+    def cost_per_success(self) -> Optional[float]:
+        """Money spent per successful post over the window (failed attempts cost too)"""
+        successes = sum(1 for success, _ in self.recent if success)
+        if not successes:
+            return None
+        return sum(cost for _, cost in self.recent) / successes
+
+    def summary(self) -> Dict:
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "total_cost": self.total_cost,
+            "window_size": len(self.recent),
+            "window_success_rate": self.window_success_rate,
+            "cost_per_success": self.cost_per_success,
+            "latency_p50": self.latency.percentile(50),
+            "latency_p95": self.latency.percentile(95),
+            "latency_p99": self.latency.percentile(99),
+            "latency_mean": self.latency.mean,
+            "latency_max": self.latency.max if self.latency.count else None
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "latency": self.latency.to_dict(),
+            "recent": [[success, cost] for success, cost in self.recent],
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "total_cost": self.total_cost
+        }
+
+    @classmethod
+    def from_dict(cls, method: str, data: Dict, window: int = 100) -> "MethodTelemetry":
+        telemetry = cls(method, window)
+        telemetry.latency = LatencyHistogram.from_dict(data.get("latency", {}))
+        telemetry.recent.extend((bool(success), cost) for success, cost in data.get("recent", []))
+        telemetry.attempts = data.get("attempts", 0)
+        telemetry.successes = data.get("successes", 0)
+        telemetry.total_cost = data.get("total_cost", 0.0)
+        return telemetry
+
+
+class TelemetryRegistry:
+    """Telemetry for all methods, persisted as JSON between runs"""
+
+    def __init__(self, methods: Iterable[str], path: Optional[str] = None, window: int = 100):
+        self.path = path
+        self.window = window
+        self.methods = {method: MethodTelemetry(method, window) for method in methods}
+        if path and Path(path).exists():
+            self.load(path)
+
+    def record(self, method: str, success: bool, duration: float, cost: float):
+        if method not in self.methods:
+            self.methods[method] = MethodTelemetry(method, self.window)
+        self.methods[method].record(success, duration, cost)
+
+    def load(self, path: str):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        for method, method_data in data.get("methods", {}).items():
+            self.methods[method] = MethodTelemetry.from_dict(method, method_data, self.window)
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        # Write-then-rename so a crash never leaves half a file behind
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"methods": {m: t.to_dict() for m, t in self.methods.items()}}, f)
+        os.replace(tmp_path, path)
+
+    # ============= ROUTING =============
+
+    def viable(self, candidates: List[str], success_rate_threshold: float) -> List[str]:
+        """Candidates whose window success rate meets the threshold (no data yet counts as viable)"""
+        viable = []
+        for method in candidates:
+            telemetry = self.methods.get(method)
+            rate = telemetry.window_success_rate if telemetry else None
+            if rate is None or rate >= success_rate_threshold:
+                viable.append(method)
+        return viable
+
+    def rank(self, candidates: List[str], cost_weights: Dict[str, float],
+             weights: Optional[Dict[str, float]] = None,
+             max_p95_seconds: Optional[float] = None) -> Dict[str, float]:
+        """
+        Score candidate methods (higher is better)
+
+        cost:    cheapest expected cost per successful post / this method's
+        success: moving-window success rate
+        latency: lowest p95 / this method's p95
+        Methods without data get their configured cost and neutral latency/success,
+        so they are tried. Methods over max_p95_seconds are dropped unless none are left.
+        """
+        weights = weights or DEFAULT_WEIGHTS
+
+        expected = {}
+        for method in candidates:
+            telemetry = self.methods.get(method)
+            cost_per_success = telemetry.cost_per_success if telemetry else None
+            success_rate = telemetry.window_success_rate if telemetry else None
+            p95 = telemetry.latency.percentile(95) if telemetry else None
+            expected[method] = (
+                cost_per_success if cost_per_success is not None else cost_weights[method],
+                success_rate if success_rate is not None else 1.0,
+                p95
+            )
+
+        if max_p95_seconds is not None:
+            within_slo = [m for m in candidates if expected[m][2] is None or expected[m][2] <= max_p95_seconds]
+            candidates = within_slo or candidates
+
+        best_cost = min(expected[m][0] for m in candidates)
+        known_p95 = [expected[m][2] for m in candidates if expected[m][2]]
+        best_p95 = min(known_p95) if known_p95 else None
+
+        scores = {}
+        for method in candidates:
+            cost, success_rate, p95 = expected[method]
+            cost_score = (best_cost + 1e-9) / (cost + 1e-9)
+            latency_score = best_p95 / p95 if best_p95 and p95 else 1.0
+            scores[method] = (
+                cost_score * weights.get("cost", 0.0) +
+                success_rate * weights.get("success", 0.0) +
+                latency_score * weights.get("latency", 0.0)
+            )
+        return scores
+
+    # ============= EXPORT =============
+
+    def to_json(self) -> Dict:
+        return {method: telemetry.summary() for method, telemetry in self.methods.items()}
+
+    def to_prometheus(self, prefix: str = "tiktok_scraper") -> str:
+        """Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_method_latency_seconds Scrape latency per method",
+            f"# TYPE {prefix}_method_latency_seconds summary"
+        ]
+        for method, telemetry in self.methods.items():
+            if not telemetry.latency.count:
+                continue
+            for quantile in (0.5, 0.95, 0.99):
+                value = telemetry.latency.percentile(quantile * 100)
+                lines.append(f'{prefix}_method_latency_seconds{{method="{method}",quantile="{quantile}"}} {value:.6f}')
+            lines.append(f'{prefix}_method_latency_seconds_sum{{method="{method}"}} {telemetry.latency.total:.6f}')
+            lines.append(f'{prefix}_method_latency_seconds_count{{method="{method}"}} {telemetry.latency.count}')
+
+        series = [
+            ("attempts_total", "counter", "Scrape attempts per method", lambda t: t.attempts),
+            ("successes_total", "counter", "Successful scrapes per method", lambda t: t.successes),
+            ("cost_dollars_total", "counter", "Money spent per method", lambda t: t.total_cost),
+            ("window_success_ratio", "gauge", "Success rate over the recent window", lambda t: t.window_success_rate),
+            ("cost_per_success_dollars", "gauge", "Cost per successful post over the recent window",
+             lambda t: t.cost_per_success),
+        ]
+        for name, metric_type, help_text, value_of in series:
+            lines.append(f"# HELP {prefix}_method_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_method_{name} {metric_type}")
+            for method, telemetry in self.methods.items():
+                value = value_of(telemetry)
+                if value is not None and telemetry.attempts:
+                    lines.append(f'{prefix}_method_{name}{{method="{method}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export persisted scraper method telemetry')
+    parser.add_argument('telemetry_file', help='Telemetry JSON written by the scraper')
+    parser.add_argument('--format', choices=['json', 'prometheus'], default='json')
+    args = parser.parse_args()
+
+    registry = TelemetryRegistry([], path=args.telemetry_file)
+    if args.format == 'prometheus':
+        print(registry.to_prometheus(), end='')
+    else:
+        print(json.dumps(registry.to_json(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Metric Parser - the one count parser for every scraper
+Turns TikTok's displayed counts ("10.5K", "1,234", "12,3 Mio.", "2.1万", "22 comments")
+into integers.
+
+- Patterns compiled once at import
+- Locale-aware: decimal comma vs. thousands separators, English / German / French /
+  Spanish / Italian / Russian / CJK magnitude suffixes
+- Suffixes match whole words ("22 kommentare" is 22, not 22,000)
+- LRU cache for repeated strings (the same "1.2K" shows up on every other page)
+
+Scrapers keep their _parse_metric / _parse_count methods as thin wrappers around parse_count.
+
+Usage:
+  python metric_parser.py "12,3 Mio" "1.2K" "22 comments"
+  python metric_parser.py --benchmark
+"""
+
+import argparse
+import re
+import time
+from functools import lru_cache
+from typing import Optional
+
+# First number in the text plus the word glued to (or right after) it
+NUMBER_PATTERN = re.compile(
+    r"(\d{1,3}(?:[ \u00a0\u202f'\u2019]\d{3})+(?:[.,]\d+)?|\d[\d.,]*)\s*([^\W\d_]+\.?)?"
+)
+GROUPING_PATTERN = re.compile(r"[ \u00a0\u202f'\u2019]")
+
+MULTIPLIERS = {
+    # English
+    'k': 1_000, 'thousand': 1_000,
+    'm': 1_000_000, 'mn': 1_000_000, 'mm': 1_000_000, 'million': 1_000_000, 'millions': 1_000_000,
+    'b': 1_000_000_000, 'bn': 1_000_000_000, 'billion': 1_000_000_000, 'billions': 1_000_000_000,
+    # German
+    'tsd': 1_000, 'tausend': 1_000,
+    'mio': 1_000_000, 'millionen': 1_000_000,
+    'mrd': 1_000_000_000, 'milliarde': 1_000_000_000, 'milliarden': 1_000_000_000,
+    # French / Spanish / Portuguese / Italian
+    'mille': 1_000, 'mil': 1_000,
+    'mill': 1_000_000, 'mln': 1_000_000, 'milioni': 1_000_000, 'millones': 1_000_000,
+    'md': 1_000_000_000, 'mld': 1_000_000_000,
+    # Russian
+    'тыс': 1_000, 'млн': 1_000_000, 'млрд': 1_000_000_000,
+}
+
+# Chinese / Japanese / Korean units are one character, usually glued to the next word ("1.2万次播放")
+CJK_MULTIPLIERS = {
+    '千': 1_000, '万': 10_000, '萬': 10_000, '亿': 100_000_000, '億': 100_000_000,
+    '천': 1_000, '만': 10_000, '억': 100_000_000,
+}
+
+
+def _to_float(number: str, has_suffix: bool) -> float:
+    """'1,234' -> 1234, '12,3' -> 12.3, '1.234.567' -> 1234567, '1,234.5' -> 1234.5"""
+    number = GROUPING_PATTERN.sub('', number).rstrip('.,')
+    dots, commas = number.count('.'), number.count(',')
+
+    if dots and commas:
+        # The last separator is the decimal one
+        decimal, grouping = ('.', ',') if number.rfind('.') > number.rfind(',') else (',', '.')
+        number = number.replace(grouping, '').replace(decimal, '.')
+    elif dots + commas:
+        separator = '.' if dots else ','
+        head, _, tail = number.rpartition(separator)
+        # "1.234" / "1,234" without a suffix is a grouped integer, "12,3" / "1.5K" a decimal
+        if dots + commas > 1 or (len(tail) == 3 and not has_suffix):
+            number = number.replace(separator, '')
+        else:
+            number = head.replace(separator, '') + '.' + tail
+    return float(number)
+
+
+@lru_cache(maxsize=8192)
+def _parse_text(text: str) -> Optional[int]:
+    if text.isdigit():
+        return int(text)
+    match = NUMBER_PATTERN.search(text)
+    if not match:
+        return None
+    number, word = match.groups()
+    multiplier = 1
+    if word:
+        multiplier = MULTIPLIERS.get(word.rstrip('.').lower()) or CJK_MULTIPLIERS.get(word[0], 1)
+    try:
+        return int(round(_to_float(number, multiplier != 1) * multiplier))
+    except ValueError:
+        return None
+
+
+def parse_count(value, default: int = 0) -> int:
+    """
+    Displayed count -> int ("10.5K" -> 10500, "12,3 Mio" -> 12300000, "22 comments" -> 22)
+
+    Numbers pass through; None, empty or number-free text returns `default`.
+    """
+    if value.__class__ is str:
+        parsed = _parse_text(value)
+    elif value is None or isinstance(value, bool):
+        return default
+    elif isinstance(value, (int, float)):
+        return int(round(value))
+    else:
+        parsed = _parse_text(str(value))
+    return default if parsed is None else parsed
+
+
+def cache_info():
+    return _parse_text.cache_info()
+
+
+# ============= BENCHMARK =============
+
+def _legacy_parse_metric(text: str) -> int:
+    """The copy most scrapers carried before this module (for the benchmark only)"""
+    text = text.replace(',', '').strip()
+    text = text.lower()
+
+    if 'k' in text:
+        return int(float(text.replace('k', '')) * 1000)
+    elif 'm' in text:
+        return int(float(text.replace('m', '')) * 1000000)
+    elif 'b' in text:
+        return int(float(text.replace('b', '')) * 1000000000)
+    else:
+        digits = re.findall(r'\d+', text)
+        if digits:
+            return int("".join(digits))
+        return 0
+
+
+def benchmark(iterations: int = 200_000):
+    """Time parse_count (with and without the cache) against the legacy per-call parser"""
+    import random
+
+    rng = random.Random(7)
+    samples = []
+    for _ in range(2_000):
+        n = rng.choice([rng.randint(0, 999), rng.randint(1_000, 999_999), rng.randint(10 ** 6, 10 ** 9)])
+        if n >= 10 ** 6:
+            samples.append(f"{n / 10 ** 6:.1f}M")
+        elif n >= 10 ** 4:
+            samples.append(f"{n / 1000:.1f}K")
+        else:
+            samples.append(f"{n:,}")
+    workload = [samples[rng.randrange(len(samples))] for _ in range(iterations)]
+
+    def timed(fn):
+        start = time.perf_counter()
+        for text in workload:
+            fn(text)
+        return time.perf_counter() - start
+
+    legacy = timed(_legacy_parse_metric)
+    uncached = timed(_parse_text.__wrapped__)
+    _parse_text.cache_clear()
+    cached = timed(parse_count)
+
+    print(f"📊 {iterations:,} parses, {len(samples):,} distinct strings")
+    print(f"   legacy _parse_metric: {legacy * 1e9 / iterations:8.0f} ns/parse")
+    print(f"   parse_count (no cache): {uncached * 1e9 / iterations:7.0f} ns/parse")
+    print(f"   parse_count (cached): {cached * 1e9 / iterations:8.0f} ns/parse")
+    print(f"   cache: {cache_info()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse displayed TikTok counts')
+    parser.add_argument('texts', nargs='*', help='Count strings to parse')
+    parser.add_argument('--benchmark', action='store_true', help='Time against the legacy parser')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+    for text in args.texts:
+        print(f"{text!r} -> {parse_count(text):,}")
+
+
+if __name__ == "__main__":
+    main()
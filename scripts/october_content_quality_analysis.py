@@ -20,6 +20,14 @@ import json
 from io import BytesIO
 from urllib.parse import urlparse
 import time
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+
+from post_features import load_posts_with_features
+
+# Columns used by analyze_post (the rest of the master timeline is never decoded; is_viral comes from the feature table)
+ANALYSIS_COLUMNS = ['created_date', 'account', 'va', 'post_url', 'views', 'engagement_rate', 'sound', 'slides']
 
 class ContentQualityAnalyzer:
     def __init__(self, database_path, output_dir):
@@ -51,17 +59,14 @@ class ContentQualityAnalyzer:
         """Load October data from master database"""
         print(f"\n📊 Loading data from {start_date} to {end_date}...")
 
-        # Read CSV in chunks (it's 32MB) with proper quoting
-        chunks = []
-        for chunk in pd.read_csv(self.database_path, chunksize=10000, quotechar='"', escapechar='\\'):
-            # Filter October dates
-            chunk['created_date'] = pd.to_datetime(chunk['created_date'])
-            mask = (chunk['created_date'] >= start_date) & (chunk['created_date'] <= end_date)
-            october_chunk = chunk[mask]
-            if len(october_chunk) > 0:
-                chunks.append(october_chunk)
-
-        self.df = pd.concat(chunks, ignore_index=True)
+        # Parquet store: only the October month partitions and needed columns are read
+        # (falls back to scanning the CSV when the store hasn't been built yet)
+        self.df = load_posts_with_features(
+            self.database_path,
+            columns=ANALYSIS_COLUMNS,
+            start_date=start_date,
+            end_date=end_date
+        )
         print(f"✅ Loaded {len(self.df)} posts from October 1-16")
         print(f"   VAs found: {self.df['va'].nunique()}")
         print(f"   Accounts: {self.df['account'].nunique()}")
@@ -151,7 +156,7 @@ class ContentQualityAnalyzer:
             'sound': row.get('sound', ''),
             'slides': [],
             'slide_texts': [],
-            'is_viral': row['views'] >= 10000,
+            'is_viral': bool(row['is_viral']),
             'text_hash': None
         }
 
@@ -13,9 +13,18 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 from pathlib import Path
-import sqlite3
+import sys
 from datetime import datetime, timedelta
 
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent / "02_Scraping_Systems" / "01_TikTok_Scrapers"))
+sys.path.append(str(Path(__file__).parent.parent))
+from method_telemetry import TelemetryRegistry
+from http_item_fetcher import HttpItemFetcher, load_cookies
+from short_link_cache import ShortLinkCache, dedupe_urls, resolve_short_links
+from database.async_sink import AsyncWriteSink
+from database.engine_registry import get_engine
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +38,7 @@ class ScrapingMethod(Enum):
     PUPPETEER = "puppeteer"
     SELENIUM = "selenium"
     APIFY = "apify"
+    API = "api"
 
 @dataclass
 class ScrapingResult:
@@ -63,12 +73,32 @@ class OptimalTikTokScraper:
     def __init__(self, config_path: str = "scraper_config.json"):
         self.config = self._load_config(config_path)
         self.method_stats = {method: MethodStats(method) for method in ScrapingMethod}
+        monitoring = self.config.get("monitoring", {})
+        self.telemetry = TelemetryRegistry(
+            [method.value for method in ScrapingMethod],
+            path=monitoring.get("telemetry_path", "method_telemetry.json"),
+            window=monitoring.get("telemetry_window", 100)
+        )
         self.cost_tracker = CostTracker()
-        self.rate_limiter = RateLimiter()
+        self.rate_limiter = RateLimiter(self.config.get("rate_limits"))
+        self.http_fetcher = None
         self.db_manager = DatabaseManager(self.config.get("database_path", "tiktok_analytics.db"))
+        short_link_db = self.config.get("short_link_db")
+        self.link_cache = ShortLinkCache(short_link_db) if short_link_db else None
+        self.max_concurrent = max(1, self.config.get("scraping", {}).get("max_concurrent", 1))
+        
+        # Batch throughput (accumulated over all scrape_batch calls)
+        self.throughput = {
+            "posts": 0,
+            "successful": 0,
+            "elapsed": 0.0,
+            "rows_written": 0,
+            "write_batches": 0
+        }
         
         # Initialize fallback chain
         self.fallback_chain = [
+            ScrapingMethod.API,         # HTTP only: cheapest, misses login-walled pages
             ScrapingMethod.PLAYWRIGHT,  # Primary: Low cost, good reliability
             ScrapingMethod.PUPPETEER,   # Secondary: Good stealth, moderate cost
             ScrapingMethod.SELENIUM,    # Tertiary: High reliability, higher cost
@@ -89,52 +119,58 @@ class OptimalTikTokScraper:
                 "apify": 0.0025,
                 "playwright": 0.0001,
                 "selenium": 0.0002,
-                "puppeteer": 0.00015
+                "puppeteer": 0.00015,
+                "api": 0.00001
             },
             "database_path": "tiktok_analytics.db",
+            "short_link_db": "short_links.db",
             "log_level": "INFO"
         }
         
         if Path(config_path).exists():
             with open(config_path, 'r') as f:
                 user_config = json.load(f)
+                # Keep default cost weights for methods the user config doesn't list
+                cost_weights = {**default_config["cost_weights"], **user_config.get("cost_weights", {})}
                 default_config.update(user_config)
+                default_config["cost_weights"] = cost_weights
         
         return default_config
     
     def _select_best_method(self) -> ScrapingMethod:
         """Select the best method based on cost, success rate, and availability"""
-        # Filter methods by success rate threshold
+        # Filter methods by moving-window success rate (methods without data yet stay viable)
         viable_methods = [
-            method for method, stats in self.method_stats.items()
-            if stats.success_rate >= self.config["success_rate_threshold"] or stats.total_attempts == 0
+            ScrapingMethod(name) for name in self.telemetry.viable(
+                [method.value for method in ScrapingMethod], self.config["success_rate_threshold"]
+            )
         ]
         
         if not viable_methods:
             return self.fallback_chain[0]
         
-        # Score methods based on cost and success rate
-        method_scores = {}
-        for method in viable_methods:
-            stats = self.method_stats[method]
-            cost_score = 1.0 / (self.config["cost_weights"][method.value] + 0.0001)
-            success_score = stats.success_rate
-            recency_score = 1.0 / (time.time() - stats.last_used + 1)
-            
-            # Weighted score
-            method_scores[method] = (
-                cost_score * 0.4 +      # 40% cost weight
-                success_score * 0.4 +   # 40% success rate weight
-                recency_score * 0.2     # 20% recency weight
-            )
+        # Score on cost per successful post, window success rate and p95 latency
+        routing = self.config.get("routing", {})
+        scores = self.telemetry.rank(
+            [method.value for method in viable_methods],
+            {method.value: self.config["cost_weights"][method.value] for method in viable_methods},
+            weights=routing.get("weights"),
+            max_p95_seconds=routing.get("max_p95_seconds")
+        )
+        method_scores = {ScrapingMethod(name): score for name, score in scores.items()}
         
         best_method = max(method_scores, key=method_scores.get)
         logger.info(f"Selected method: {best_method.value} (score: {method_scores[best_method]:.2f})")
         
         return best_method
     
-    async def scrape_post(self, post_url: str) -> ScrapingResult:
-        """Scrape a single post using intelligent method selection"""
+    async def scrape_post(self, post_url: str, target_url: Optional[str] = None) -> ScrapingResult:
+        """
+        Scrape a single post using intelligent method selection
+        
+        target_url: resolved canonical URL to fetch instead of post_url (skips the /t/ redirect);
+        the result is still reported under post_url
+        """
         # Check budget constraints
         if self.cost_tracker.daily_cost >= self.config["max_budget_per_day"]:
             return ScrapingResult(
@@ -151,8 +187,11 @@ class OptimalTikTokScraper:
         # Select best method
         method = self._select_best_method()
         
+        self.cost_tracker.add_post()
+        
         # Try primary method
-        result = await self._scrape_with_method(method, post_url)
+        fetch_url = target_url or post_url
+        result = await self._scrape_with_method(method, fetch_url)
         
         # If failed, try fallback methods
         if not result.success:
@@ -161,11 +200,13 @@ class OptimalTikTokScraper:
                     continue
                 
                 logger.info(f"Trying fallback method: {fallback_method.value}")
-                result = await self._scrape_with_method(fallback_method, post_url)
+                result = await self._scrape_with_method(fallback_method, fetch_url)
                 
                 if result.success:
                     break
         
+        result.post_url = post_url
+        
         # Update statistics
         self._update_method_stats(result)
         
@@ -188,6 +229,8 @@ class OptimalTikTokScraper:
                 metrics = await self._scrape_with_selenium(post_url)
             elif method == ScrapingMethod.APIFY:
                 metrics = await self._scrape_with_apify(post_url)
+            elif method == ScrapingMethod.API:
+                metrics = await self._scrape_with_api(post_url)
             else:
                 raise ValueError(f"Unknown method: {method}")
             
@@ -197,7 +240,7 @@ class OptimalTikTokScraper:
             # Update cost tracker
             self.cost_tracker.add_cost(method, cost)
             
-            return ScrapingResult(
+            result = ScrapingResult(
                 post_url=post_url,
                 method=method,
                 success=True,
@@ -206,6 +249,8 @@ class OptimalTikTokScraper:
                 duration=duration,
                 scraped_at=time.time()
             )
+            self.telemetry.record(method.value, True, duration, cost)
+            return result
             
         except Exception as e:
             duration = time.time() - start_time
@@ -213,7 +258,7 @@ class OptimalTikTokScraper:
             
             logger.error(f"Method {method.value} failed for {post_url}: {str(e)}")
             
-            return ScrapingResult(
+            result = ScrapingResult(
                 post_url=post_url,
                 method=method,
                 success=False,
@@ -223,6 +268,8 @@ class OptimalTikTokScraper:
                 error=str(e),
                 scraped_at=time.time()
             )
+            self.telemetry.record(method.value, False, duration, cost)
+            return result
     
     async def _scrape_with_playwright(self, post_url: str) -> Dict:
         """Scrape using Playwright"""
@@ -297,6 +344,36 @@ class OptimalTikTokScraper:
             "engagement_rate": round(random.uniform(1.0, 10.0), 2)
         }
     
+    async def _scrape_with_api(self, post_url: str) -> Dict:
+        """Scrape over plain HTTP: rehydration JSON from the page HTML, no browser"""
+        if self.http_fetcher is None:
+            fetcher = HttpItemFetcher(
+                concurrency=self.config.get("http_concurrency", 32),
+                cookies=load_cookies(self.config.get("cookie_file", "tiktok_cookies.json"))
+            )
+            await fetcher.__aenter__()
+            self.http_fetcher = fetcher
+        
+        fetch = await self.http_fetcher.fetch(post_url)
+        if not fetch.success:
+            # Login wall / captcha: the fallback chain hands the URL to a browser method
+            raise Exception(f"HTTP fetch failed: {fetch.error}")
+        
+        return {
+            "views": fetch.fields["views"],
+            "likes": fetch.fields["likes"],
+            "comments": fetch.fields["comments"],
+            "shares": fetch.fields["shares"],
+            "bookmarks": fetch.fields["bookmarks"],
+            "engagement_rate": fetch.fields.get("engagement_rate", 0.0)
+        }
+    
+    async def close(self):
+        """Close the shared HTTP connection pool"""
+        if self.http_fetcher:
+            await self.http_fetcher.__aexit__(None, None, None)
+            self.http_fetcher = None
+    
     def _update_method_stats(self, result: ScrapingResult):
         """Update statistics for a method"""
         stats = self.method_stats[result.method]
@@ -313,33 +390,93 @@ class OptimalTikTokScraper:
         stats.avg_cost_per_post = stats.total_cost / stats.total_attempts
         stats.avg_duration_per_post = stats.total_duration / stats.total_attempts
     
+    def _daily_limit_reached(self, reserved_cost: float = 0.0) -> Optional[str]:
+        """Reason to stop dispatching, if the daily cost or post cap is (about to be) hit"""
+        if self.cost_tracker.daily_cost + reserved_cost >= self.config["max_budget_per_day"]:
+            return "Daily budget exceeded, stopping batch"
+        if self.cost_tracker.daily_posts >= self.config["max_posts_per_day"]:
+            return "Daily post limit exceeded, stopping batch"
+        return None
+    
+    def _record_write(self, batch: List[ScrapingResult]):
+        self.throughput["rows_written"] += len(batch)
+        self.throughput["write_batches"] += 1
+    
     async def scrape_batch(self, post_urls: List[str]) -> List[ScrapingResult]:
-        """Scrape multiple posts with intelligent routing"""
-        results = []
+        """
+        Scrape multiple posts with intelligent routing
+        
+        Runs up to scraping.max_concurrent posts at once (each method still paced by the
+        RateLimiter) and hands successful results to an AsyncWriteSink, which writes them
+        in batches on its own thread. Short links are resolved (and deduped by video id)
+        through the short-link cache before any post is fetched.
+        """
+        # Short links -> canonical URLs (HTTP redirects, cached), then dedup by video id
+        targets = {}
+        if self.link_cache:
+            targets = await resolve_short_links(post_urls, self.link_cache)
+            post_urls = dedupe_urls(post_urls, self.link_cache)
+        
+        results: List[Optional[ScrapingResult]] = [None] * len(post_urls)
+        save_to_database = self.config.get("scraping", {}).get("save_to_database", True)
+        
+        logger.info(f"Starting batch scraping of {len(post_urls)} posts "
+                    f"({self.max_concurrent} concurrent)")
         
-        logger.info(f"Starting batch scraping of {len(post_urls)} posts")
+        start_time = time.time()
+        # Results are written in batches on the sink's own thread, never on the event loop
+        writer = AsyncWriteSink(
+            self.db_manager.save_metrics_batch, maxsize=self.max_concurrent * 50,
+            batch_size=50, flush_interval=1.0, on_written=self._record_write, name="metrics-writer"
+        ) if save_to_database else None
+        
+        # In-flight posts reserve the most expensive method's cost so the budget can't be overshot
+        worst_case_cost = max(self.config["cost_weights"].values())
+        state = {"next": 0, "reserved": 0.0, "completed": 0, "stopped": False}
+        
+        async def worker():
+            while not state["stopped"] and state["next"] < len(post_urls):
+                reason = self._daily_limit_reached(state["reserved"] + worst_case_cost)
+                if reason:
+                    logger.warning(reason)
+                    state["stopped"] = True
+                    return
+                
+                index = state["next"]
+                state["next"] += 1
+                state["reserved"] += worst_case_cost
+                try:
+                    result = await self.scrape_post(post_urls[index], target_url=targets.get(post_urls[index]))
+                finally:
+                    state["reserved"] -= worst_case_cost
+                results[index] = result
+                
+                if result.success and writer:
+                    await writer.put(result)
+                
+                state["completed"] += 1
+                if state["completed"] % 10 == 0:
+                    logger.info(f"Processed {state['completed']}/{len(post_urls)} posts")
         
-        for i, url in enumerate(post_urls):
-            # Check daily limits
-            if self.cost_tracker.daily_cost >= self.config["max_budget_per_day"]:
-                logger.warning("Daily budget exceeded, stopping batch")
-                break
-            
-            if len(results) >= self.config["max_posts_per_day"]:
-                logger.warning("Daily post limit exceeded, stopping batch")
-                break
-            
-            # Scrape post
-            result = await self.scrape_post(url)
-            results.append(result)
-            
-            # Save to database
-            if result.success:
-                await self.db_manager.save_metrics(result)
-            
-            # Progress logging
-            if (i + 1) % 10 == 0:
-                logger.info(f"Processed {i + 1}/{len(post_urls)} posts")
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrent)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # gather() doesn't cancel siblings when one worker fails (or the batch is cancelled):
+            # stop them before the writer and the HTTP pool they use are closed
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if writer:
+                await writer.close()
+            await self.close()
+        
+        results = [result for result in results if result is not None]
+        self.telemetry.save()
+        
+        self.throughput["posts"] += len(results)
+        self.throughput["successful"] += sum(1 for result in results if result.success)
+        self.throughput["elapsed"] += time.time() - start_time
         
         logger.info(f"Batch scraping completed: {len(results)} results")
         return results
@@ -367,59 +504,110 @@ class OptimalTikTokScraper:
                     "total_cost": stats.total_cost
                 }
         
+        elapsed = self.throughput["elapsed"]
+        report["throughput"] = {
+            "max_concurrent": self.max_concurrent,
+            "elapsed_seconds": round(elapsed, 2),
+            "posts_per_minute": self.throughput["posts"] / elapsed * 60 if elapsed else 0.0,
+            "successful_per_minute": self.throughput["successful"] / elapsed * 60 if elapsed else 0.0,
+            "rows_written": self.throughput["rows_written"],
+            "write_batches": self.throughput["write_batches"],
+            "avg_rows_per_write": (self.throughput["rows_written"] / self.throughput["write_batches"]
+                                   if self.throughput["write_batches"] else 0.0)
+        }
+        
+        report["telemetry"] = self.telemetry.to_json()
+        
         return report
+    
+    def export_telemetry(self, format: str = "json") -> str:
+        """Method telemetry for dashboards ("json" or "prometheus")"""
+        if format == "prometheus":
+            return self.telemetry.to_prometheus()
+        return json.dumps(self.telemetry.to_json(), indent=2)
 
 class CostTracker:
     """Track costs across methods"""
     
     def __init__(self):
         self.daily_cost = 0.0
+        self.daily_posts = 0
         self.method_costs = {method: 0.0 for method in ScrapingMethod}
         self.daily_reset_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     
-    def add_cost(self, method: ScrapingMethod, cost: float):
-        """Add cost for a method"""
-        # Reset daily cost if new day
+    def _reset_if_new_day(self):
         if datetime.now() > self.daily_reset_time + timedelta(days=1):
             self.daily_cost = 0.0
+            self.daily_posts = 0
             self.method_costs = {method: 0.0 for method in ScrapingMethod}
             self.daily_reset_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        
+    
+    def add_cost(self, method: ScrapingMethod, cost: float):
+        """Add cost for a method"""
+        self._reset_if_new_day()
         self.daily_cost += cost
         self.method_costs[method] += cost
+    
+    def add_post(self):
+        """Count one post attempt against the daily post cap"""
+        self._reset_if_new_day()
+        self.daily_posts += 1
 
 class RateLimiter:
     """Rate limiting for different methods"""
     
-    def __init__(self):
+    def __init__(self, delays: Optional[Dict[str, float]] = None):
         self.last_request = {method: 0.0 for method in ScrapingMethod}
         self.delays = {
             ScrapingMethod.APIFY: 1.0,
             ScrapingMethod.PLAYWRIGHT: 2.0,
             ScrapingMethod.SELENIUM: 2.5,
             ScrapingMethod.PUPPETEER: 2.0,
+            ScrapingMethod.API: 0.0,
         }
+        # Per-method overrides from scraper_config.json "rate_limits"
+        for name, delay in (delays or {}).items():
+            self.delays[ScrapingMethod(name)] = delay
+        # Concurrent callers of the same method queue up; different methods don't block each other
+        self.locks = {method: asyncio.Lock() for method in ScrapingMethod}
     
     async def wait(self, method: ScrapingMethod):
         """Wait if necessary to respect rate limits"""
-        delay = self.delays[method]
-        time_since_last = time.time() - self.last_request[method]
-        
-        if time_since_last < delay:
-            await asyncio.sleep(delay - time_since_last)
-        
-        self.last_request[method] = time.time()
+        async with self.locks[method]:
+            delay = self.delays[method]
+            time_since_last = time.time() - self.last_request[method]
+            
+            if time_since_last < delay:
+                await asyncio.sleep(delay - time_since_last)
+            
+            self.last_request[method] = time.time()
 
 class DatabaseManager:
     """Manage database operations"""
     
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self.conn = None
+        self._sink: Optional[AsyncWriteSink] = None
         self._init_database()
     
+    def _connect(self):
+        """
+        One long-lived connection (only the batch writer thread uses it at a time),
+        checked out of the shared per-process pool (WAL, busy_timeout)
+        """
+        if self.conn is None:
+            self.conn = get_engine(f"sqlite:///{self.db_path}").raw_connection()
+        return self.conn
+    
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+    
     def _init_database(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Create metrics_snapshots table if it doesn't exist
@@ -440,31 +628,43 @@ class DatabaseManager:
         """)
         
         conn.commit()
-        conn.close()
+    
+    def save_metrics_batch(self, results: List[ScrapingResult]):
+        """Insert many results in one transaction"""
+        conn = self._connect()
+        with conn.driver_connection:  # sqlite3 transaction: commit, or roll back on error
+            conn.executemany("""
+                INSERT INTO metrics_snapshots 
+                (post_url, method, views, likes, comments, shares, bookmarks, engagement_rate, scraped_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    result.post_url,
+                    result.method.value,
+                    result.metrics.get("views", 0),
+                    result.metrics.get("likes", 0),
+                    result.metrics.get("comments", 0),
+                    result.metrics.get("shares", 0),
+                    result.metrics.get("bookmarks", 0),
+                    result.metrics.get("engagement_rate", 0.0),
+                    result.scraped_at
+                )
+                for result in results
+            ])
     
     async def save_metrics(self, result: ScrapingResult):
-        """Save metrics to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO metrics_snapshots 
-            (post_url, method, views, likes, comments, shares, bookmarks, engagement_rate, scraped_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            result.post_url,
-            result.method.value,
-            result.metrics.get("views", 0),
-            result.metrics.get("likes", 0),
-            result.metrics.get("comments", 0),
-            result.metrics.get("shares", 0),
-            result.metrics.get("bookmarks", 0),
-            result.metrics.get("engagement_rate", 0.0),
-            result.scraped_at
-        ))
-        
-        conn.commit()
-        conn.close()
+        """Queue metrics for the batched writer thread (written by aclose() at the latest)"""
+        if self._sink is None:
+            self._sink = AsyncWriteSink(self.save_metrics_batch, batch_size=50, flush_interval=1.0,
+                                        name="metrics-writer")
+        await self._sink.put(result)
+    
+    async def aclose(self):
+        """Write queued metrics, then close the connection"""
+        if self._sink is not None:
+            await self._sink.close()
+            self._sink = None
+        self.close()
 
 # Test function
 async def test_optimal_scraper():
@@ -519,6 +719,16 @@ async def test_optimal_scraper():
     for method, stats in report["methods"].items():
         print(f"  {method}: {stats['success_rate']:.1%} success, ${stats['avg_cost']:.4f} avg cost")
     
+    for method, telemetry in report["telemetry"].items():
+        if telemetry["attempts"]:
+            print(f"  {method}: p50 {telemetry['latency_p50']:.2f}s, p95 {telemetry['latency_p95']:.2f}s, "
+                  f"p99 {telemetry['latency_p99']:.2f}s")
+    
+    throughput = report["throughput"]
+    print(f"  Throughput: {throughput['posts_per_minute']:.1f} posts/minute "
+          f"({throughput['max_concurrent']} concurrent), "
+          f"{throughput['rows_written']} rows in {throughput['write_batches']} writes")
+    
     return results
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Post Feature Table
+Per-post features computed once (vectorized) and persisted next to the master timeline store
+
+Features (keyed by post_id = TikTok video id; short and canonical URLs of one video share a row):
+- engagement, engagement_rate_pct      (likes + comments + shares, % of views)
+- is_viral, view_bracket               (≥10k views, <1K / 1K-10K / 10K-100K / 100K-1M / 1M+)
+- viral_base_score                     (views 60% + engagement 30% of the repost viral score;
+                                        the 10% recency part depends on the report date)
+- sound_id                             (stable 64-bit id of the sound string, 0 = no sound)
+
+Stored in <store>/_features/post_features.parquet with FEATURE_VERSION.
+refresh() recomputes only posts that are new or whose metrics/sound changed;
+a FEATURE_VERSION bump recomputes everything.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from master_timeline_store import default_store_path, load_master_posts
+
+FEATURE_VERSION = 1
+
+VIRAL_THRESHOLD = 10000
+VIEW_BRACKET_EDGES = [-1, 999, 9999, 99999, 999999, np.inf]
+VIEW_BRACKET_LABELS = ['<1K', '1K-10K', '10K-100K', '100K-1M', '1M+']
+
+# Master columns the features are derived from (a change in any of them triggers a recompute)
+INPUT_COLUMNS = ['views', 'likes', 'comments', 'shares', 'sound']
+
+FEATURE_COLUMNS = [
+    'engagement',
+    'engagement_rate_pct',
+    'is_viral',
+    'view_bracket',
+    'viral_base_score',
+    'sound_id'
+]
+
+TABLE_COLUMNS = ['post_id', 'post_url'] + INPUT_COLUMNS + FEATURE_COLUMNS + ['feature_version']
+
+
+def feature_table_path(database_csv):
+    """Feature table for a master CSV (lives inside its Parquet store)"""
+    return default_store_path(database_csv) / '_features' / 'post_features.parquet'
+
+
+def extract_post_ids(post_urls):
+    """Video id from .../video/<id> or .../photo/<id>, else the URL itself"""
+    post_urls = post_urls.fillna('').astype(str)
+    ids = post_urls.str.extract(r'/(?:video|photo)/(\d+)', expand=False)
+    return ids.fillna(post_urls)
+
+
+def input_values(posts):
+    """post_id + INPUT_COLUMNS of master rows, normalized the way they are stored"""
+    values = pd.DataFrame({'post_id': extract_post_ids(posts['post_url']).to_numpy()})
+    for column in ['views', 'likes', 'comments', 'shares']:
+        values[column] = pd.to_numeric(posts[column], errors='coerce').fillna(0).astype('int64').to_numpy()
+    values['sound'] = posts['sound'].fillna('').astype(str).to_numpy()
+    return values
+
+
+def stale_rows(stored, values):
+    """
+    Mask over `values` (input_values() rows): True where `stored` (post_id-indexed
+    INPUT_COLUMNS) has no row for the post or its inputs differ
+    """
+    aligned = stored.reindex(values['post_id'])
+    unchanged = np.ones(len(values), dtype=bool)
+    for column in INPUT_COLUMNS:
+        unchanged &= (aligned[column].to_numpy() == values[column].to_numpy())
+    return ~unchanged
+
+
+def compute_features(posts):
+    """
+    Compute all features for a DataFrame of master rows in one vectorized pass
+
+    Needs post_url + INPUT_COLUMNS; returns a frame with TABLE_COLUMNS.
+    """
+    features = input_values(posts)
+    features.insert(1, 'post_url', posts['post_url'].fillna('').astype(str).to_numpy())
+
+    views = features['views']
+    features['engagement'] = features['likes'] + features['comments'] + features['shares']
+    rate = np.where(views > 0, features['engagement'] / views.where(views > 0, 1) * 100, 0.0)
+    features['engagement_rate_pct'] = np.round(rate, 2)
+
+    features['is_viral'] = views >= VIRAL_THRESHOLD
+    features['view_bracket'] = pd.cut(
+        views, bins=VIEW_BRACKET_EDGES, labels=VIEW_BRACKET_LABELS
+    ).astype(str)
+
+    # Same weights as RepostCandidateFinder.calculate_viral_score (views capped at 1M, rate at 20%)
+    views_score = np.minimum(views / 1000000, 1) * 60
+    engagement_score = np.minimum(features['engagement_rate_pct'] / 20, 1) * 30
+    features['viral_base_score'] = views_score + engagement_score
+
+    sound_hash = pd.util.hash_pandas_object(features['sound'], index=False).astype('int64')
+    features['sound_id'] = sound_hash.where(features['sound'] != '', 0)
+
+    features['feature_version'] = FEATURE_VERSION
+    return features[TABLE_COLUMNS]
+
+
+class PostFeatureTable:
+    """Persisted per-post feature table with change-based refresh"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def exists(self):
+        return self.path.exists()
+
+    def is_current(self):
+        """True if the table exists and was built with this FEATURE_VERSION"""
+        if not self.exists():
+            return False
+        versions = pd.read_parquet(self.path, columns=['feature_version'])['feature_version']
+        return bool((versions == FEATURE_VERSION).all())
+
+    def load(self, columns=None, post_ids=None):
+        """
+        Current features (empty frame if never built or built by an older FEATURE_VERSION)
+
+        post_ids restricts the rows read (pushed down into the Parquet scan).
+        """
+        if not self.exists():
+            return pd.DataFrame(columns=TABLE_COLUMNS)
+
+        row_filter = [('post_id', 'in', list(post_ids))] if post_ids is not None else None
+        table = pd.read_parquet(
+            self.path,
+            columns=list(columns) + ['feature_version'] if columns else None,
+            filters=row_filter
+        )
+        if len(table) and (table['feature_version'] != FEATURE_VERSION).any():
+            return pd.DataFrame(columns=TABLE_COLUMNS)
+        return table[list(columns)] if columns else table
+
+    def refresh(self, posts):
+        """
+        Upsert features for master rows in `posts`
+
+        Rows whose inputs (metrics + sound) match the stored ones are kept as-is;
+        only new/changed posts are recomputed. Posts not in `posts` are untouched,
+        so incremental batches can be passed directly. One row per post_id: of
+        several URLs for the same video, the last one in `posts` wins.
+
+        Returns dict: recomputed, reused, total.
+        """
+        post_ids = extract_post_ids(posts['post_url'])
+        posts = posts[~post_ids.duplicated(keep='last').to_numpy()]
+        # Tables written before post_id was deduplicated may still hold repeats
+        current = self.load()
+        current = current.drop_duplicates('post_id', keep='last')
+        stored = current[['post_id'] + INPUT_COLUMNS].set_index('post_id')
+        unchanged = ~stale_rows(stored, input_values(posts))
+
+        changed_posts = posts[~unchanged]
+        recomputed = compute_features(changed_posts) if len(changed_posts) else None
+
+        if recomputed is None:
+            return {'recomputed': 0, 'reused': int(unchanged.sum()), 'total': len(current)}
+
+        kept = current[~current['post_id'].isin(recomputed['post_id'])]
+        table = pd.concat([kept, recomputed], ignore_index=True) if len(kept) else recomputed
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        table.to_parquet(tmp_path, index=False, compression='zstd')
+        os.replace(tmp_path, self.path)
+
+        return {'recomputed': len(recomputed), 'reused': int(unchanged.sum()), 'total': len(table)}
+
+
+def load_posts_with_features(database_csv, columns=None, start_date=None, end_date=None, **filters):
+    """
+    Master rows joined with their precomputed features
+
+    A stored row is only used while its inputs (metrics + sound) match the post's
+    current ones; new posts, posts whose metrics changed since the last refresh, and
+    a table that hasn't been built fall back to computing features on the fly.
+    """
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ['post_url'] + INPUT_COLUMNS))
+    posts = load_master_posts(database_csv, columns=columns, start_date=start_date, end_date=end_date, **filters)
+
+    posts = posts.drop(columns=[c for c in FEATURE_COLUMNS if c in posts.columns])
+    values = input_values(posts)
+
+    table = PostFeatureTable(feature_table_path(database_csv))
+    features = table.load(columns=['post_id'] + INPUT_COLUMNS + FEATURE_COLUMNS,
+                          post_ids=values['post_id'].unique())
+    features = features.drop_duplicates('post_id', keep='last').set_index('post_id')
+
+    merged = posts.reset_index(drop=True)
+    for column in FEATURE_COLUMNS:
+        merged[column] = values['post_id'].map(features[column]).to_numpy()
+
+    # New posts and posts whose metrics moved since the last refresh: compute inline
+    stale = stale_rows(features[INPUT_COLUMNS], values)
+    if stale.any():
+        inline = compute_features(merged[stale])
+        for column in FEATURE_COLUMNS:
+            merged.loc[stale, column] = inline[column].to_numpy()
+
+    merged['is_viral'] = merged['is_viral'].astype(bool)
+    return merged
@@ -15,6 +15,8 @@ from datetime import datetime
 from playwright.async_api import async_playwright
 import logging
 
+from metric_parser import parse_count
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -424,16 +426,7 @@ class ProfessionalCommentScraper:
 
     def _parse_metric(self, text: str) -> int:
         """Parse metric text to integer"""
-        text = text.replace(',', '').strip().lower()
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        else:
-            digits = re.findall(r'\d+', text)
-            if digits:
-                return int("".join(digits))
-            return 0
+        return parse_count(text)
 
 async def main():
     """Main execution"""
@@ -12,6 +12,8 @@ from datetime import datetime
 from playwright.async_api import async_playwright
 import logging
 
+from metric_parser import parse_count
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -400,26 +402,7 @@ class RealTikTokScraper:
         """
         Parse TikTok metric format (e.g., '10.5K' -> 10500)
         """
-        if not text:
-            return 0
-        
-        # Clean the text
-        text = str(text).strip().upper()
-        
-        # Remove any non-numeric characters except K, M, B
-        text = re.sub(r'[^\d.KMB]', '', text)
-        
-        if 'K' in text:
-            return int(float(text.replace('K', '')) * 1000)
-        elif 'M' in text:
-            return int(float(text.replace('M', '')) * 1000000)
-        elif 'B' in text:
-            return int(float(text.replace('B', '')) * 1000000000)
-        else:
-            try:
-                return int(text)
-            except ValueError:
-                return 0
+        return parse_count(text)
     
     def _looks_like_metric(self, text):
         """
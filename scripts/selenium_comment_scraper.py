@@ -19,6 +19,8 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+from metric_parser import parse_count
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -407,16 +409,7 @@ class SeleniumCommentScraper:
 
     def _parse_metric(self, text: str) -> int:
         """Parse metric text to integer"""
-        text = text.replace(',', '').strip().lower()
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        else:
-            digits = re.findall(r'\d+', text)
-            if digits:
-                return int("".join(digits))
-            return 0
+        return parse_count(text)
 
 def main():
     """Main execution"""
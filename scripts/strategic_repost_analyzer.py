@@ -11,17 +11,27 @@ Output: Per account, show:
 """
 
 import pandas as pd
+import sys
 from pathlib import Path
-from collections import defaultdict
 from datetime import datetime
 
-def load_all_data(database_path):
-    """Load ALL data (not just October) to find post history"""
-    print("📊 Loading FULL database (all months)...")
-    print("   This may take a moment (32MB file)...\n")
+sys.path.append(str(Path(__file__).parent))
 
-    df = pd.read_csv(database_path, quotechar='"', escapechar='\\')
-    df['created_date'] = pd.to_datetime(df['created_date'])
+from master_timeline_store import load_master_posts
+from post_features import load_posts_with_features
+
+# Columns used by analyze_account_reposts (is_viral / sound_id come from the feature table)
+REPOST_COLUMNS = ['created_date', 'account', 'va', 'post_url', 'views', 'sound']
+
+def load_all_data(database_path, start_date='2025-10-01', end_date='2025-10-16'):
+    """Load ALL months (not just October) for accounts active in the window, to find post history"""
+    print("📊 Loading full post history for accounts active in the window...")
+
+    # Accounts with activity in the window (month partitions pruned, one column read)
+    active = load_master_posts(database_path, columns=['account'], start_date=start_date, end_date=end_date)
+
+    # Full history for only those accounts (creator partitions pruned)
+    df = load_posts_with_features(database_path, columns=REPOST_COLUMNS, accounts=active['account'].unique())
 
     print(f"✅ Loaded {len(df):,} total posts")
     print(f"   Date range: {df['created_date'].min()} to {df['created_date'].max()}")
@@ -61,49 +71,42 @@ def analyze_account_reposts(df, account_name, start_date='2025-10-01', end_date=
 
     # Group by sound URL (proxy for same content)
     # In real version, we'd use OCR text hash, but for now use sound
-    sound_groups = defaultdict(list)
-
-    for idx, post in account_posts.iterrows():
-        sound = post.get('sound', '')
-        if pd.notna(sound) and sound != '':
-            sound_groups[sound].append({
-                'url': post['post_url'],
-                'date': post['created_date'],
-                'views': post['views'],
-                'is_october': start_date <= post['created_date'] <= end_date,
-                'is_viral': post['views'] >= 10000
-            })
+    with_sound = account_posts[account_posts['sound_id'] != 0].assign(
+        is_october=lambda posts: (posts['created_date'] >= start_date) & (posts['created_date'] <= end_date)
+    )
 
     # Find repost groups (same sound used multiple times)
     repost_groups = []
 
-    for sound, posts_list in sound_groups.items():
-        if len(posts_list) <= 1:
+    for _, group in with_sound.groupby('sound_id', sort=False):
+        if len(group) <= 1:
             continue  # Not a repost, skip
 
-        # Sort by date
-        posts_list = sorted(posts_list, key=lambda x: x['date'])
-
         # Count October reposts
-        oct_reposts = [p for p in posts_list if p['is_october']]
+        oct_reposts = int(group['is_october'].sum())
 
-        if len(oct_reposts) == 0:
+        if oct_reposts == 0:
             continue  # No October activity
 
         # Find best performing (original viral post)
-        best_post = max(posts_list, key=lambda x: x['views'])
+        best_views = group['views'].max()
 
         # Determine if strategic
-        was_viral_before_oct = any(p['is_viral'] and not p['is_october'] for p in posts_list)
+        was_viral_before_oct = bool((group['is_viral'] & ~group['is_october']).any())
+
+        # Timeline sorted by date (account_posts is already date-sorted)
+        timeline = group[['post_url', 'created_date', 'views', 'is_october', 'is_viral']].rename(
+            columns={'post_url': 'url', 'created_date': 'date'}
+        ).to_dict('records')
 
         repost_groups.append({
-            'sound': sound[:80] + '...',
-            'total_posts': len(posts_list),
-            'oct_reposts': len(oct_reposts),
-            'timeline': posts_list,
-            'best_views': best_post['views'],
+            'sound': group['sound'].iloc[0][:80] + '...',
+            'total_posts': len(group),
+            'oct_reposts': oct_reposts,
+            'timeline': timeline,
+            'best_views': best_views,
             'was_viral_before': was_viral_before_oct,
-            'strategic': was_viral_before_oct and len(oct_reposts) > 0
+            'strategic': was_viral_before_oct and oct_reposts > 0
         })
 
     # Calculate strategic score
@@ -138,11 +141,14 @@ def generate_report(df, output_dir):
 
     results = []
 
+    # Split once instead of re-filtering the full frame per account
+    account_frames = dict(tuple(df[df['account'].isin(oct_accounts)].groupby('account', sort=False)))
+
     for i, account in enumerate(oct_accounts, 1):
         if i % 50 == 0:
             print(f"   Progress: {i}/{len(oct_accounts)} accounts...")
 
-        analysis = analyze_account_reposts(df, account)
+        analysis = analyze_account_reposts(account_frames[account], account)
         if analysis:
             results.append(analysis)
 
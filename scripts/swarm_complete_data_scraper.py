@@ -17,22 +17,184 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 import aiohttp
 import aiofiles
+import sys
+from pathlib import Path
+
+from metric_parser import parse_count
+from dom_probe import FieldProbe, probe_page
+
+sys.path.append(str(Path(__file__).parent.parent / "02_Scraping_Systems" / "01_TikTok_Scrapers"))
+from short_link_cache import ShortLinkCache, dedupe_urls, resolve_short_links
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Selector fallbacks for every field, probed in one page.evaluate per page
+SWARM_PROBES = (
+    FieldProbe('views', (
+        '[data-e2e="video-views"]',
+        'strong[data-e2e="video-views"]',
+        'span[data-e2e="video-views"]',
+        '[class*="view"] strong',
+        '[class*="View"] strong'
+    ), numeric=True),
+    FieldProbe('views_text', ('span, div, strong',), contains=('view',), numeric=True, max_length=19,
+               many=True, limit=20),
+    FieldProbe('likes', (
+        '[data-e2e="like-count"]',
+        'strong[data-e2e="like-count"]',
+        'div[data-e2e="like-count"]',
+        'span[data-e2e="like-count"]',
+        '[class*="like"] strong',
+        '[class*="Like"] strong',
+        '[class*="heart"] strong',
+        '[class*="Heart"] strong'
+    ), numeric=True),
+    FieldProbe('comments', (
+        '[data-e2e="comment-count"]',
+        'strong[data-e2e="comment-count"]',
+        'div[data-e2e="comment-count"]',
+        'span[data-e2e="comment-count"]',
+        '[class*="comment"] strong',
+        '[class*="Comment"] strong'
+    ), numeric=True),
+    FieldProbe('shares', (
+        '[data-e2e="share-count"]',
+        'strong[data-e2e="share-count"]',
+        'div[data-e2e="share-count"]',
+        'span[data-e2e="share-count"]',
+        '[class*="share"] strong',
+        '[class*="Share"] strong'
+    ), numeric=True),
+    FieldProbe('bookmarks', (
+        '[data-e2e="collect-count"]',
+        'strong[data-e2e="collect-count"]',
+        'div[data-e2e="collect-count"]',
+        'span[data-e2e="collect-count"]',
+        '[class*="collect"] strong',
+        '[class*="Collect"] strong',
+        '[class*="bookmark"] strong',
+        '[class*="Bookmark"] strong'
+    ), numeric=True),
+    FieldProbe('username', (
+        '[data-e2e="user-title"]',
+        '[class*="username"]',
+        '[class*="Username"]',
+        '[class*="user-name"]',
+        '[class*="User-name"]'
+    )),
+    FieldProbe('followers', (
+        '[data-e2e="followers-count"] strong',
+        'strong[data-e2e="followers-count"]',
+        'div[data-e2e="followers-count"]',
+        'span[data-e2e="followers-count"]',
+        '[class*="follower"] strong',
+        '[class*="Follower"] strong',
+        '[class*="follow"] strong',
+        '[class*="Follow"] strong'
+    ), numeric=True),
+    FieldProbe('following', (
+        '[data-e2e="following-count"] strong',
+        'strong[data-e2e="following-count"]',
+        'div[data-e2e="following-count"]',
+        'span[data-e2e="following-count"]',
+        '[class*="following"] strong',
+        '[class*="Following"] strong'
+    ), numeric=True),
+    FieldProbe('posts', (
+        '[data-e2e="posts-count"] strong',
+        'strong[data-e2e="posts-count"]',
+        'div[data-e2e="posts-count"]',
+        'span[data-e2e="posts-count"]',
+        '[class*="post"] strong',
+        '[class*="Post"] strong',
+        '[class*="video"] strong',
+        '[class*="Video"] strong'
+    ), numeric=True),
+    FieldProbe('account_likes', (
+        '[data-e2e="total-likes-count"] strong',
+        'strong[data-e2e="total-likes-count"]',
+        'div[data-e2e="total-likes-count"]',
+        'span[data-e2e="total-likes-count"]',
+        '[class*="total-like"] strong',
+        '[class*="Total-like"] strong'
+    ), numeric=True),
+    FieldProbe('verified', (
+        '[data-e2e="verified-icon"]',
+        '[class*="verified"]',
+        '[class*="Verified"]',
+        '[class*="checkmark"]',
+        '[class*="Checkmark"]'
+    ), exists=True),
+    FieldProbe('description', (
+        '[data-e2e="video-desc"]',
+        '[class*="description"]',
+        '[class*="Description"]',
+        '[class*="caption"]',
+        '[class*="Caption"]',
+        '[class*="text"]',
+        '[class*="Text"]'
+    )),
+    FieldProbe('hashtags', (
+        '[data-e2e="hashtag"]',
+        '[class*="hashtag"]',
+        '[class*="Hashtag"]',
+        '[class*="tag"]',
+        '[class*="Tag"]'
+    ), prefix='#', many=True),
+    FieldProbe('mentions', (
+        '[data-e2e="mention"]',
+        '[class*="mention"]',
+        '[class*="Mention"]',
+        '[class*="at"]',
+        '[class*="At"]'
+    ), prefix='@', many=True),
+    FieldProbe('sound_title', (
+        '[data-e2e="sound-title"]',
+        '[class*="sound-title"]',
+        '[class*="Sound-title"]',
+        '[class*="music-title"]',
+        '[class*="Music-title"]'
+    )),
+    FieldProbe('sound_url', (
+        '[data-e2e="sound-link"]',
+        '[class*="sound-link"]',
+        '[class*="Sound-link"]',
+        '[class*="music-link"]',
+        '[class*="Music-link"]'
+    ), attributes=('href',)),
+    FieldProbe('sound_author', (
+        '[data-e2e="sound-author"]',
+        '[class*="sound-author"]',
+        '[class*="Sound-author"]',
+        '[class*="music-author"]',
+        '[class*="Music-author"]'
+    )),
+    FieldProbe('slides', (
+        '[data-e2e="slide"]',
+        '[class*="slide"]',
+        '[class*="Slide"]',
+        '[class*="image"]',
+        '[class*="Image"]',
+        '[class*="thumbnail"]',
+        '[class*="Thumbnail"]'
+    ), attributes=('src', 'data-src'), prefix='http', many=True, limit=12),
+)
+
 class SwarmCompleteDataScraper:
     """
     SWARM MODE: 6 parallel agents testing different scraping methods
     """
     
-    def __init__(self, headless=True, debug=False):
+    def __init__(self, headless=True, debug=False, short_link_db="short_links.db"):
         self.headless = headless
         self.debug = debug
         self.results = []
         self.success_count = 0
         self.failure_count = 0
+        self.link_cache = ShortLinkCache(short_link_db) if short_link_db else None
+        self.targets = {}  # input URL -> canonical URL, filled per swarm run
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -43,6 +205,8 @@ class SwarmCompleteDataScraper:
         """Async context manager exit"""
         if self.playwright:
             await self.playwright.stop()
+        if self.link_cache:
+            self.link_cache.close()
 
     async def agent_1_mobile_optimized(self, urls: list) -> list:
         """
@@ -73,7 +237,7 @@ class SwarmCompleteDataScraper:
                     # Mobile viewport
                     await page.set_viewport_size({"width": 375, "height": 667})
                     
-                    await page.goto(url, wait_until='networkidle', timeout=30000)
+                    await page.goto(self.targets.get(url, url), wait_until='networkidle', timeout=30000)
                     await page.wait_for_timeout(3000)
                     
                     # Extract data
@@ -125,7 +289,7 @@ class SwarmCompleteDataScraper:
                     # Desktop viewport
                     await page.set_viewport_size({"width": 1920, "height": 1080})
                     
-                    await page.goto(url, wait_until='networkidle', timeout=30000)
+                    await page.goto(self.targets.get(url, url), wait_until='networkidle', timeout=30000)
                     await page.wait_for_timeout(3000)
                     
                     # Extract data
@@ -194,7 +358,7 @@ class SwarmCompleteDataScraper:
                     # Add random delay
                     await asyncio.sleep(random.uniform(1, 3))
                     
-                    await page.goto(url, wait_until='networkidle', timeout=30000)
+                    await page.goto(self.targets.get(url, url), wait_until='networkidle', timeout=30000)
                     await page.wait_for_timeout(random.uniform(2, 5))
                     
                     # Extract data
@@ -228,7 +392,7 @@ class SwarmCompleteDataScraper:
             for i, url in enumerate(urls, 1):
                 try:
                     # Extract video ID from URL
-                    video_id = self._extract_video_id(url)
+                    video_id = self._extract_video_id(self.targets.get(url, url))
                     if not video_id:
                         results.append(self._create_failed_result(url, "api_scraper", "Could not extract video ID"))
                         continue
@@ -304,7 +468,7 @@ class SwarmCompleteDataScraper:
                     
                     await page.set_viewport_size({"width": 375, "height": 667})
                     
-                    await page.goto(url, wait_until='networkidle', timeout=30000)
+                    await page.goto(self.targets.get(url, url), wait_until='networkidle', timeout=30000)
                     await page.wait_for_timeout(3000)
                     
                     # Extract data with multiple methods
@@ -358,7 +522,7 @@ class SwarmCompleteDataScraper:
                     
                     await page.set_viewport_size({"width": 1920, "height": 1080})
                     
-                    await page.goto(url, wait_until='networkidle', timeout=30000)
+                    await page.goto(self.targets.get(url, url), wait_until='networkidle', timeout=30000)
                     await page.wait_for_timeout(3000)
                     
                     # Extract data
@@ -395,40 +559,43 @@ class SwarmCompleteDataScraper:
         try:
             # Get page content
             page_content = await page.content()
+            hits = await probe_page(page, SWARM_PROBES)
+            if self.debug:
+                logger.info(f"🔎 DOM probe matched: {hits.matched()}")
             
             # Extract all metrics
-            views = await self._extract_views_comprehensive(page, page_content)
-            likes = await self._extract_likes_comprehensive(page, page_content)
-            comments = await self._extract_comments_comprehensive(page, page_content)
-            shares = await self._extract_shares_comprehensive(page, page_content)
-            bookmarks = await self._extract_bookmarks_comprehensive(page, page_content)
+            views = self._extract_views_comprehensive(page_content, hits)
+            likes = self._extract_likes_comprehensive(page_content, hits)
+            comments = self._extract_comments_comprehensive(page_content, hits)
+            shares = self._extract_shares_comprehensive(page_content, hits)
+            bookmarks = self._extract_bookmarks_comprehensive(page_content, hits)
             
             # Calculate engagement
             engagement = likes + comments + shares + bookmarks
             engagement_rate = (engagement / views * 100) if views > 0 else 0.0
             
             # Extract account details
-            account_username = await self._extract_username_comprehensive(page, page_content, url)
-            account_followers = await self._extract_followers_comprehensive(page, page_content)
-            account_following = await self._extract_following_comprehensive(page, page_content)
-            account_posts = await self._extract_posts_comprehensive(page, page_content)
-            account_likes = await self._extract_account_likes_comprehensive(page, page_content)
-            account_verified = await self._extract_verified_comprehensive(page, page_content)
+            account_username = self._extract_username_comprehensive(page_content, hits, url)
+            account_followers = self._extract_followers_comprehensive(page_content, hits)
+            account_following = self._extract_following_comprehensive(page_content, hits)
+            account_posts = self._extract_posts_comprehensive(page_content, hits)
+            account_likes = self._extract_account_likes_comprehensive(page_content, hits)
+            account_verified = self._extract_verified_comprehensive(page_content, hits)
             
             # Extract content details
-            post_description = await self._extract_description_comprehensive(page, page_content)
-            hashtags = await self._extract_hashtags_comprehensive(page, page_content)
-            mentions = await self._extract_mentions_comprehensive(page, page_content)
+            post_description = self._extract_description_comprehensive(page_content, hits)
+            hashtags = self._extract_hashtags_comprehensive(page_content, hits)
+            mentions = self._extract_mentions_comprehensive(page_content, hits)
             content_length = len(post_description) if post_description else 0
             
             # Extract sound details
-            sound_title = await self._extract_sound_title_comprehensive(page, page_content)
-            sound_url = await self._extract_sound_url_comprehensive(page, page_content)
-            sound_author = await self._extract_sound_author_comprehensive(page, page_content)
+            sound_title = self._extract_sound_title_comprehensive(page_content, hits)
+            sound_url = self._extract_sound_url_comprehensive(page_content, hits)
+            sound_author = self._extract_sound_author_comprehensive(page_content, hits)
             has_sound = bool(sound_url)
             
             # Extract slides
-            slides = await self._extract_slides_comprehensive(page, page_content)
+            slides = self._extract_slides_comprehensive(page_content, hits)
             slide_count = len([s for s in slides if s])
             
             # Create result
@@ -495,14 +662,15 @@ class SwarmCompleteDataScraper:
         if result.get('views', 0) == 0:
             # Try alternative view extraction
             page_content = await page.content()
-            views = await self._extract_views_alternative(page, page_content)
+            hits = await probe_page(page, SWARM_PROBES)
+            views = self._extract_views_alternative(page_content, hits)
             if views > 0:
                 result['views'] = views
                 result['data_quality'] = "Hybrid"
         
         return result
 
-    async def _extract_views_comprehensive(self, page, page_content: str) -> int:
+    def _extract_views_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive view extraction"""
         # Method 1: JSON data
         try:
@@ -512,46 +680,21 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="video-views"]',
-            'strong[data-e2e="video-views"]',
-            'span[data-e2e="video-views"]',
-            '[class*="view"] strong',
-            '[class*="View"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('views')
 
-    async def _extract_views_alternative(self, page, page_content: str) -> int:
+    def _extract_views_alternative(self, page_content: str, hits) -> int:
         """Alternative view extraction methods"""
-        # Look for any large numbers that could be views
-        try:
-            all_elements = await page.query_selector_all('span, div, strong')
-            for element in all_elements:
-                text = await element.text_content()
-                if text and self._looks_like_views(text):
-                    parsed = self._parse_metric(text)
-                    if parsed > 100:  # Views should be at least 100
-                        return parsed
-        except:
-            pass
+        # Any short text mentioning views (DOM probe)
+        for text in hits.value('views_text', []):
+            if self._looks_like_views(text):
+                parsed = self._parse_metric(text)
+                if parsed > 100:  # Views should be at least 100
+                    return parsed
         
         return 0
 
-    async def _extract_likes_comprehensive(self, page, page_content: str) -> int:
+    def _extract_likes_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive likes extraction"""
         # Method 1: JSON data
         try:
@@ -569,33 +712,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="like-count"]',
-            'strong[data-e2e="like-count"]',
-            'div[data-e2e="like-count"]',
-            'span[data-e2e="like-count"]',
-            '[class*="like"] strong',
-            '[class*="Like"] strong',
-            '[class*="heart"] strong',
-            '[class*="Heart"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('likes')
 
-    async def _extract_comments_comprehensive(self, page, page_content: str) -> int:
+    def _extract_comments_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive comments extraction"""
         # Method 1: JSON data
         try:
@@ -612,31 +732,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="comment-count"]',
-            'strong[data-e2e="comment-count"]',
-            'div[data-e2e="comment-count"]',
-            'span[data-e2e="comment-count"]',
-            '[class*="comment"] strong',
-            '[class*="Comment"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('comments')
 
-    async def _extract_shares_comprehensive(self, page, page_content: str) -> int:
+    def _extract_shares_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive shares extraction"""
         # Method 1: JSON data
         try:
@@ -653,31 +752,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="share-count"]',
-            'strong[data-e2e="share-count"]',
-            'div[data-e2e="share-count"]',
-            'span[data-e2e="share-count"]',
-            '[class*="share"] strong',
-            '[class*="Share"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('shares')
 
-    async def _extract_bookmarks_comprehensive(self, page, page_content: str) -> int:
+    def _extract_bookmarks_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive bookmarks extraction"""
         # Method 1: JSON data
         try:
@@ -694,33 +772,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="collect-count"]',
-            'strong[data-e2e="collect-count"]',
-            'div[data-e2e="collect-count"]',
-            'span[data-e2e="collect-count"]',
-            '[class*="collect"] strong',
-            '[class*="Collect"] strong',
-            '[class*="bookmark"] strong',
-            '[class*="Bookmark"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('bookmarks')
 
-    async def _extract_username_comprehensive(self, page, page_content: str, url: str) -> str:
+    def _extract_username_comprehensive(self, page_content: str, hits, url: str) -> str:
         """Comprehensive username extraction"""
         # Method 1: From URL
         try:
@@ -730,28 +785,14 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: From page
-        selectors = [
-            '[data-e2e="user-title"]',
-            '[class*="username"]',
-            '[class*="Username"]',
-            '[class*="user-name"]',
-            '[class*="User-name"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        return text.replace('@', '').strip()
-            except:
-                continue
+        # Method 2: From page (DOM probe)
+        username = hits.value('username')
+        if username:
+            return username.replace('@', '').strip()
         
         return "Unknown"
 
-    async def _extract_followers_comprehensive(self, page, page_content: str) -> int:
+    def _extract_followers_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive followers extraction"""
         # Method 1: JSON data
         try:
@@ -768,33 +809,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="followers-count"] strong',
-            'strong[data-e2e="followers-count"]',
-            'div[data-e2e="followers-count"]',
-            'span[data-e2e="followers-count"]',
-            '[class*="follower"] strong',
-            '[class*="Follower"] strong',
-            '[class*="follow"] strong',
-            '[class*="Follow"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('followers')
 
-    async def _extract_following_comprehensive(self, page, page_content: str) -> int:
+    def _extract_following_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive following extraction"""
         # Method 1: JSON data
         try:
@@ -810,31 +828,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="following-count"] strong',
-            'strong[data-e2e="following-count"]',
-            'div[data-e2e="following-count"]',
-            'span[data-e2e="following-count"]',
-            '[class*="following"] strong',
-            '[class*="Following"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('following')
 
-    async def _extract_posts_comprehensive(self, page, page_content: str) -> int:
+    def _extract_posts_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive posts extraction"""
         # Method 1: JSON data
         try:
@@ -851,33 +848,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="posts-count"] strong',
-            'strong[data-e2e="posts-count"]',
-            'div[data-e2e="posts-count"]',
-            'span[data-e2e="posts-count"]',
-            '[class*="post"] strong',
-            '[class*="Post"] strong',
-            '[class*="video"] strong',
-            '[class*="Video"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('posts')
 
-    async def _extract_account_likes_comprehensive(self, page, page_content: str) -> int:
+    def _extract_account_likes_comprehensive(self, page_content: str, hits) -> int:
         """Comprehensive account likes extraction"""
         # Method 1: JSON data
         try:
@@ -894,31 +868,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="total-likes-count"] strong',
-            'strong[data-e2e="total-likes-count"]',
-            'div[data-e2e="total-likes-count"]',
-            'span[data-e2e="total-likes-count"]',
-            '[class*="total-like"] strong',
-            '[class*="Total-like"] strong'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            return parsed
-            except:
-                continue
-        
-        return 0
+        # Method 2: Selectors (DOM probe)
+        return hits.count('account_likes')
 
-    async def _extract_verified_comprehensive(self, page, page_content: str) -> bool:
+    def _extract_verified_comprehensive(self, page_content: str, hits) -> bool:
         """Comprehensive verified extraction"""
         # Method 1: JSON data
         try:
@@ -928,26 +881,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="verified-icon"]',
-            '[class*="verified"]',
-            '[class*="Verified"]',
-            '[class*="checkmark"]',
-            '[class*="Checkmark"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    return True
-            except:
-                continue
-        
-        return False
+        # Method 2: Selectors (DOM probe)
+        return bool(hits.value('verified', False))
 
-    async def _extract_description_comprehensive(self, page, page_content: str) -> str:
+    def _extract_description_comprehensive(self, page_content: str, hits) -> str:
         """Comprehensive description extraction"""
         # Method 1: JSON data
         try:
@@ -964,30 +901,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="video-desc"]',
-            '[class*="description"]',
-            '[class*="Description"]',
-            '[class*="caption"]',
-            '[class*="Caption"]',
-            '[class*="text"]',
-            '[class*="Text"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        return text.strip()
-            except:
-                continue
-        
-        return ""
+        # Method 2: Selectors (DOM probe)
+        return hits.value('description', '')
 
-    async def _extract_hashtags_comprehensive(self, page, page_content: str) -> str:
+    def _extract_hashtags_comprehensive(self, page_content: str, hits) -> str:
         """Comprehensive hashtags extraction"""
         # Method 1: JSON data
         try:
@@ -1003,29 +920,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="hashtag"]',
-            '[class*="hashtag"]',
-            '[class*="Hashtag"]',
-            '[class*="tag"]',
-            '[class*="Tag"]'
-        ]
-        
-        hashtags = []
-        for selector in selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    text = await element.text_content()
-                    if text and text.startswith('#'):
-                        hashtags.append(text)
-            except:
-                continue
-        
-        return ', '.join(hashtags)
+        # Method 2: Selectors (DOM probe)
+        return ', '.join(hits.value('hashtags', []))
 
-    async def _extract_mentions_comprehensive(self, page, page_content: str) -> str:
+    def _extract_mentions_comprehensive(self, page_content: str, hits) -> str:
         """Comprehensive mentions extraction"""
         # Method 1: JSON data
         try:
@@ -1041,29 +939,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="mention"]',
-            '[class*="mention"]',
-            '[class*="Mention"]',
-            '[class*="at"]',
-            '[class*="At"]'
-        ]
-        
-        mentions = []
-        for selector in selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    text = await element.text_content()
-                    if text and text.startswith('@'):
-                        mentions.append(text)
-            except:
-                continue
-        
-        return ', '.join(mentions)
+        # Method 2: Selectors (DOM probe)
+        return ', '.join(hits.value('mentions', []))
 
-    async def _extract_sound_title_comprehensive(self, page, page_content: str) -> str:
+    def _extract_sound_title_comprehensive(self, page_content: str, hits) -> str:
         """Comprehensive sound title extraction"""
         # Method 1: JSON data
         try:
@@ -1080,28 +959,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="sound-title"]',
-            '[class*="sound-title"]',
-            '[class*="Sound-title"]',
-            '[class*="music-title"]',
-            '[class*="Music-title"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        return text.strip()
-            except:
-                continue
-        
-        return ""
+        # Method 2: Selectors (DOM probe)
+        return hits.value('sound_title', '')
 
-    async def _extract_sound_url_comprehensive(self, page, page_content: str) -> str:
+    def _extract_sound_url_comprehensive(self, page_content: str, hits) -> str:
         """Comprehensive sound URL extraction"""
         # Method 1: JSON data
         try:
@@ -1118,28 +979,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="sound-link"]',
-            '[class*="sound-link"]',
-            '[class*="Sound-link"]',
-            '[class*="music-link"]',
-            '[class*="Music-link"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    href = await element.get_attribute('href')
-                    if href:
-                        return href
-            except:
-                continue
-        
-        return ""
+        # Method 2: Selectors (DOM probe)
+        return hits.value('sound_url', '')
 
-    async def _extract_sound_author_comprehensive(self, page, page_content: str) -> str:
+    def _extract_sound_author_comprehensive(self, page_content: str, hits) -> str:
         """Comprehensive sound author extraction"""
         # Method 1: JSON data
         try:
@@ -1156,28 +999,10 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="sound-author"]',
-            '[class*="sound-author"]',
-            '[class*="Sound-author"]',
-            '[class*="music-author"]',
-            '[class*="Music-author"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        return text.strip()
-            except:
-                continue
-        
-        return ""
+        # Method 2: Selectors (DOM probe)
+        return hits.value('sound_author', '')
 
-    async def _extract_slides_comprehensive(self, page, page_content: str) -> list:
+    def _extract_slides_comprehensive(self, page_content: str, hits) -> list:
         """Comprehensive slides extraction"""
         slides = []
         
@@ -1205,32 +1030,8 @@ class SwarmCompleteDataScraper:
         except:
             pass
         
-        # Method 2: Selectors
-        selectors = [
-            '[data-e2e="slide"]',
-            '[class*="slide"]',
-            '[class*="Slide"]',
-            '[class*="image"]',
-            '[class*="Image"]',
-            '[class*="thumbnail"]',
-            '[class*="Thumbnail"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    # Try to get src attribute
-                    src = await element.get_attribute('src')
-                    if src and src.startswith('http'):
-                        slides.append(src)
-                    
-                    # Try to get data-src attribute
-                    data_src = await element.get_attribute('data-src')
-                    if data_src and data_src.startswith('http'):
-                        slides.append(data_src)
-            except:
-                continue
+        # Method 2: Selectors (DOM probe, src / data-src)
+        slides.extend(hits.value('slides', []))
         
         # Remove duplicates and limit to 12
         unique_slides = list(dict.fromkeys(slides))[:12]
@@ -1366,21 +1167,7 @@ class SwarmCompleteDataScraper:
 
     def _parse_metric(self, text: str) -> int:
         """Parse a metric string (e.g., "10.5K", "1.2M") into an integer"""
-        text = text.replace(',', '').strip()
-        text = text.lower()
-
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        elif 'b' in text:
-            return int(float(text.replace('b', '')) * 1000000000)
-        else:
-            # Extract only digits, handle cases like "22 comments"
-            digits = re.findall(r'\d+', text)
-            if digits:
-                return int("".join(digits))
-            return 0
+        return parse_count(text)
 
     async def run_swarm_test(self, urls: list, test_name: str) -> pd.DataFrame:
         """
@@ -1389,6 +1176,11 @@ class SwarmCompleteDataScraper:
         logger.info(f"🚀 SWARM MODE: {test_name} - Testing {len(urls)} URLs")
         logger.info("=" * 80)
         
+        # Short links -> canonical URLs (HTTP redirects, cached), then dedup by video id
+        if self.link_cache:
+            self.targets = await resolve_short_links(urls, self.link_cache)
+            urls = dedupe_urls(urls, self.link_cache)
+        
         # Split URLs among agents
         chunk_size = max(1, len(urls) // 6)  # Ensure chunk_size is at least 1
         url_chunks = [urls[i:i + chunk_size] for i in range(0, len(urls), chunk_size)]
@@ -12,21 +12,108 @@ import re
 from datetime import datetime
 from playwright.async_api import async_playwright
 import logging
+import sys
+from pathlib import Path
+
+from metric_parser import parse_count
+from dom_probe import FieldProbe, TEXT_TAGS, probe_page
+
+sys.path.append(str(Path(__file__).parent.parent / "02_Scraping_Systems" / "01_TikTok_Scrapers"))
+from short_link_cache import ShortLinkCache, dedupe_urls, resolve_short_links
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Any of these on the page means the metric bar has rendered
+METRIC_ANCHORS = '[data-e2e="like-count"], [data-e2e="video-views"], [data-e2e="browse-video-view-count"]'
+
+# Every selector the ultimate extractors try, probed in one page.evaluate
+POST_PROBES = (
+    FieldProbe('views', (
+        '[data-e2e="video-views"]',
+        '[data-e2e="video-view-count"]',
+        '[data-e2e="browse-video-view-count"]',
+        'strong[data-e2e="video-views"]',
+        'span[data-e2e="video-views"]',
+        '.video-count',
+        '.view-count',
+        '[class*="view"] strong',
+        '[class*="View"] strong',
+        'span:has-text("views")',
+        'div:has-text("views")',
+        'strong:has-text("views")',
+        '[class*="count"] strong',
+        '[class*="Count"] strong'
+    ), numeric=True, max_length=40),
+    FieldProbe('views_text', (TEXT_TAGS,), contains=('view',), numeric=True, max_length=40),
+    FieldProbe('large_numbers', ('span, div, strong',), pattern=r'^[\d.,\s]+[KMB]?$', many=True, limit=20),
+    FieldProbe('likes', (
+        '[data-e2e="like-count"]',
+        'strong[data-e2e="like-count"]',
+        'div[data-e2e="like-count"]',
+        'span[data-e2e="like-count"]',
+        '[class*="like"] strong',
+        '[class*="Like"] strong',
+        '[class*="heart"] strong',
+        '[class*="Heart"] strong'
+    ), numeric=True),
+    FieldProbe('comments', (
+        '[data-e2e="comment-count"]',
+        'strong[data-e2e="comment-count"]',
+        'div[data-e2e="comment-count"]',
+        'span[data-e2e="comment-count"]',
+        '[class*="comment"] strong',
+        '[class*="Comment"] strong'
+    ), numeric=True),
+    FieldProbe('shares', (
+        '[data-e2e="share-count"]',
+        'strong[data-e2e="share-count"]',
+        'div[data-e2e="share-count"]',
+        'span[data-e2e="share-count"]',
+        '[class*="share"] strong',
+        '[class*="Share"] strong'
+    ), numeric=True),
+    FieldProbe('bookmarks', (
+        '[data-e2e="collect-count"]',
+        'strong[data-e2e="collect-count"]',
+        'div[data-e2e="collect-count"]',
+        'span[data-e2e="collect-count"]',
+        '[class*="collect"] strong',
+        '[class*="Collect"] strong',
+        '[class*="bookmark"] strong',
+        '[class*="Bookmark"] strong'
+    ), numeric=True),
+    FieldProbe('username', (
+        '[data-e2e="user-title"]',
+        '[class*="username"]',
+        '[class*="Username"]',
+        '[class*="user-name"]',
+        '[class*="User-name"]'
+    )),
+    FieldProbe('followers', (
+        '[data-e2e="followers-count"] strong',
+        'strong[data-e2e="followers-count"]',
+        'div[data-e2e="followers-count"]',
+        'span[data-e2e="followers-count"]',
+        '[class*="follower"] strong',
+        '[class*="Follower"] strong',
+        '[class*="follow"] strong',
+        '[class*="Follow"] strong'
+    ), numeric=True),
+)
+
 class UltimateScraper:
     """
     Ultimate scraper with longer wait times and better methods
     """
     
-    def __init__(self, headless=True, debug=False):
+    def __init__(self, headless=True, debug=False, short_link_db="short_links.db"):
         self.headless = headless
         self.debug = debug
         self.browser = None
         self.playwright = None
+        self.link_cache = ShortLinkCache(short_link_db) if short_link_db else None
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -52,10 +139,14 @@ class UltimateScraper:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        if self.link_cache:
+            self.link_cache.close()
 
-    async def scrape_post_ultimate(self, post_url, baseline_data=None):
+    async def scrape_post_ultimate(self, post_url, baseline_data=None, target_url=None):
         """
         Ultimate scraping with longer wait times and better methods
+
+        target_url: resolved canonical URL to load instead of post_url (skips the /t/ redirect)
         """
         try:
             # Create new page
@@ -78,7 +169,7 @@ class UltimateScraper:
             logger.info(f"🚀 Ultimate scraping: {post_url}")
             
             # Navigate to post with longer timeout
-            await page.goto(post_url, wait_until='domcontentloaded', timeout=60000)
+            await page.goto(target_url or post_url, wait_until='domcontentloaded', timeout=60000)
             
             # Wait for initial load
             await page.wait_for_timeout(5000)
@@ -135,25 +226,34 @@ class UltimateScraper:
         try:
             # Wait for page to fully load
             await page.wait_for_timeout(5000)
+            try:
+                await page.wait_for_selector(METRIC_ANCHORS, timeout=5000)
+            except Exception:
+                pass
+            
+            # One HTML snapshot for the JSON patterns, one DOM probe for every selector
+            page_content = await page.content()
+            hits = await probe_page(page, POST_PROBES)
+            logger.info(f"🔎 Ultimate DOM probe matched: {hits.matched()}")
             
             # Extract views with ultimate methods
-            views = await self._extract_views_ultimate(page)
+            views = self._extract_views_ultimate(page_content, hits)
             metrics["views"] = views
             
             # Extract likes with ultimate methods
-            likes = await self._extract_likes_ultimate(page)
+            likes = self._extract_likes_ultimate(page_content, hits)
             metrics["likes"] = likes
 
             # Extract comments with ultimate methods
-            comments = await self._extract_comments_ultimate(page)
+            comments = self._extract_comments_ultimate(page_content, hits)
             metrics["comments"] = comments
 
             # Extract shares with ultimate methods
-            shares = await self._extract_shares_ultimate(page)
+            shares = self._extract_shares_ultimate(page_content, hits)
             metrics["shares"] = shares
 
             # Extract bookmarks with ultimate methods
-            bookmarks = await self._extract_bookmarks_ultimate(page)
+            bookmarks = self._extract_bookmarks_ultimate(page_content, hits)
             metrics["bookmarks"] = bookmarks
 
             # Calculate engagement
@@ -166,7 +266,7 @@ class UltimateScraper:
                 metrics["engagement_rate"] = 0.0
             
             # Extract account details with ultimate methods
-            account_data = await self._extract_account_details_ultimate(page, post_url)
+            account_data = self._extract_account_details_ultimate(page_content, hits, post_url)
             metrics.update(account_data)
             
             logger.info(f"🚀 Ultimate success: {post_url} - Views: {metrics['views']:,}, Likes: {metrics['likes']:,}, Comments: {metrics['comments']:,}")
@@ -184,302 +284,90 @@ class UltimateScraper:
         
         return metrics
     
-    async def _extract_views_ultimate(self, page):
+    def _extract_count_ultimate(self, label, page_content, patterns, hits, field):
+        """JSON patterns first, then the field's DOM probe hit"""
+        for pattern in patterns:
+            match = re.search(pattern, page_content)
+            if match:
+                count = int(match.group(1))
+                logger.info(f"🚀 Ultimate: Found {label} in JSON pattern '{pattern}': {count}")
+                return count
+        
+        parsed = hits.count(field)
+        if parsed > 0:
+            logger.info(f"🚀 Ultimate: Found {label} with selector '{hits.selector(field)}': {hits.value(field)} -> {parsed}")
+            return parsed
+        return 0
+    
+    def _extract_views_ultimate(self, page_content, hits):
         """
-        Ultimate view extraction with multiple methods and longer waits
+        Ultimate view extraction with multiple methods
         """
-        # Method 1: Wait for page to load and extract from JSON data
-        try:
-            await page.wait_for_timeout(3000)
-            page_content = await page.content()
-            
-            # Look for playCount in the JSON data
-            playcount_match = re.search(r'"playCount":(\d+)', page_content)
-            if playcount_match:
-                views = int(playcount_match.group(1))
-                logger.info(f"🚀 Ultimate: Found views in JSON data: {views}")
-                return views
-        except Exception as e:
-            logger.debug(f"🚀 Ultimate JSON extraction failed: {e}")
+        # Method 1: JSON data, Method 2: view selectors
+        views = self._extract_count_ultimate('views', page_content, [r'"playCount":(\d+)'], hits, 'views')
+        if views:
+            return views
         
-        # Method 2: Try to wait for specific elements and extract
-        try:
-            # Wait for video elements to load
-            await page.wait_for_timeout(5000)
-            
-            # Try multiple selectors with waits
-            view_selectors = [
-                '[data-e2e="video-views"]',
-                '[data-e2e="video-view-count"]',
-                '[data-e2e="browse-video-view-count"]',
-                'strong[data-e2e="video-views"]',
-                'span[data-e2e="video-views"]',
-                '.video-count',
-                '.view-count',
-                '[class*="view"] strong',
-                '[class*="View"] strong',
-                'span:has-text("views")',
-                'div:has-text("views")',
-                'strong:has-text("views")',
-                '[class*="count"] strong',
-                '[class*="Count"] strong'
-            ]
-            
-            for selector in view_selectors:
-                try:
-                    # Wait for element to appear
-                    await page.wait_for_selector(selector, timeout=5000)
-                    element = await page.query_selector(selector)
-                    if element:
-                        text = await element.text_content()
-                        if text:
-                            parsed = self._parse_metric(text)
-                            if parsed > 0:
-                                logger.info(f"🚀 Ultimate: Found views with selector '{selector}': {text} -> {parsed}")
-                                return parsed
-                except Exception:
-                    continue
-        except Exception as e:
-            logger.debug(f"🚀 Ultimate selector extraction failed: {e}")
+        # Method 3: Any element containing numbers and "views"
+        views = hits.count('views_text')
+        if views > 0:
+            logger.info(f"🚀 Ultimate: Found views in text: {hits.value('views_text')} -> {views}")
+            return views
         
-        # Method 3: Look for any element containing numbers and "views"
-        try:
-            await page.wait_for_timeout(3000)
-            all_elements = await page.query_selector_all('span, div, strong, p, h1, h2, h3')
-            for element in all_elements:
-                text = await element.text_content()
-                if text and ('views' in text.lower() or 'view' in text.lower()):
-                    parsed = self._parse_metric(text)
-                    if parsed > 0:
-                        logger.info(f"🚀 Ultimate: Found views in text: {text} -> {parsed}")
-                        return parsed
-        except Exception as e:
-            logger.debug(f"🚀 Ultimate text extraction failed: {e}")
-        
-        # Method 4: Look for large numbers that could be views
-        try:
-            await page.wait_for_timeout(3000)
-            all_elements = await page.query_selector_all('span, div, strong')
-            for element in all_elements:
-                text = await element.text_content()
-                if text and self._looks_like_large_number(text):
-                    parsed = self._parse_metric(text)
-                    if parsed > 100:  # Views should be at least 100
-                        logger.info(f"🚀 Ultimate: Found potential views (large number): {text} -> {parsed}")
-                        return parsed
-        except Exception as e:
-            logger.debug(f"🚀 Ultimate large number extraction failed: {e}")
+        # Method 4: Large numbers that could be views
+        for text in hits.value('large_numbers', []):
+            if self._looks_like_large_number(text):
+                parsed = self._parse_metric(text)
+                if parsed > 100:  # Views should be at least 100
+                    logger.info(f"🚀 Ultimate: Found potential views (large number): {text} -> {parsed}")
+                    return parsed
         
         logger.warning("🚀 Ultimate: Could not extract views with any method")
         return 0
     
-    async def _extract_likes_ultimate(self, page):
+    def _extract_likes_ultimate(self, page_content, hits):
         """Ultimate likes extraction"""
-        try:
-            await page.wait_for_timeout(3000)
-            page_content = await page.content()
-            
-            # JSON patterns
-            like_patterns = [
-                r'"diggCount":(\d+)',
-                r'"likeCount":(\d+)',
-                r'"likes":(\d+)',
-                r'"heartCount":(\d+)'
-            ]
-            
-            for pattern in like_patterns:
-                match = re.search(pattern, page_content)
-                if match:
-                    likes = int(match.group(1))
-                    logger.info(f"🚀 Ultimate: Found likes in JSON pattern '{pattern}': {likes}")
-                    return likes
-        except Exception:
-            pass
-        
-        # Selectors
-        like_selectors = [
-            '[data-e2e="like-count"]',
-            'strong[data-e2e="like-count"]',
-            'div[data-e2e="like-count"]',
-            'span[data-e2e="like-count"]',
-            '[class*="like"] strong',
-            '[class*="Like"] strong',
-            '[class*="heart"] strong',
-            '[class*="Heart"] strong'
-        ]
-        
-        for selector in like_selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=3000)
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            logger.info(f"🚀 Ultimate: Found likes with selector '{selector}': {text} -> {parsed}")
-                            return parsed
-            except Exception:
-                continue
-        
-        return 0
+        return self._extract_count_ultimate('likes', page_content, [
+            r'"diggCount":(\d+)',
+            r'"likeCount":(\d+)',
+            r'"likes":(\d+)',
+            r'"heartCount":(\d+)'
+        ], hits, 'likes')
     
-    async def _extract_comments_ultimate(self, page):
+    def _extract_comments_ultimate(self, page_content, hits):
         """Ultimate comments extraction"""
-        try:
-            await page.wait_for_timeout(3000)
-            page_content = await page.content()
-            
-            # JSON patterns
-            comment_patterns = [
-                r'"commentCount":(\d+)',
-                r'"comments":(\d+)',
-                r'"replyCount":(\d+)'
-            ]
-            
-            for pattern in comment_patterns:
-                match = re.search(pattern, page_content)
-                if match:
-                    comments = int(match.group(1))
-                    logger.info(f"🚀 Ultimate: Found comments in JSON pattern '{pattern}': {comments}")
-                    return comments
-        except Exception:
-            pass
-        
-        # Selectors
-        comment_selectors = [
-            '[data-e2e="comment-count"]',
-            'strong[data-e2e="comment-count"]',
-            'div[data-e2e="comment-count"]',
-            'span[data-e2e="comment-count"]',
-            '[class*="comment"] strong',
-            '[class*="Comment"] strong'
-        ]
-        
-        for selector in comment_selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=3000)
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            logger.info(f"🚀 Ultimate: Found comments with selector '{selector}': {text} -> {parsed}")
-                            return parsed
-            except Exception:
-                continue
-        
-        return 0
+        return self._extract_count_ultimate('comments', page_content, [
+            r'"commentCount":(\d+)',
+            r'"comments":(\d+)',
+            r'"replyCount":(\d+)'
+        ], hits, 'comments')
     
-    async def _extract_shares_ultimate(self, page):
+    def _extract_shares_ultimate(self, page_content, hits):
         """Ultimate shares extraction"""
-        try:
-            await page.wait_for_timeout(3000)
-            page_content = await page.content()
-            
-            # JSON patterns
-            share_patterns = [
-                r'"shareCount":(\d+)',
-                r'"shares":(\d+)',
-                r'"forwardCount":(\d+)'
-            ]
-            
-            for pattern in share_patterns:
-                match = re.search(pattern, page_content)
-                if match:
-                    shares = int(match.group(1))
-                    logger.info(f"🚀 Ultimate: Found shares in JSON pattern '{pattern}': {shares}")
-                    return shares
-        except Exception:
-            pass
-        
-        # Selectors
-        share_selectors = [
-            '[data-e2e="share-count"]',
-            'strong[data-e2e="share-count"]',
-            'div[data-e2e="share-count"]',
-            'span[data-e2e="share-count"]',
-            '[class*="share"] strong',
-            '[class*="Share"] strong'
-        ]
-        
-        for selector in share_selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=3000)
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            logger.info(f"🚀 Ultimate: Found shares with selector '{selector}': {text} -> {parsed}")
-                            return parsed
-            except Exception:
-                continue
-        
-        return 0
+        return self._extract_count_ultimate('shares', page_content, [
+            r'"shareCount":(\d+)',
+            r'"shares":(\d+)',
+            r'"forwardCount":(\d+)'
+        ], hits, 'shares')
     
-    async def _extract_bookmarks_ultimate(self, page):
+    def _extract_bookmarks_ultimate(self, page_content, hits):
         """Ultimate bookmarks extraction"""
-        try:
-            await page.wait_for_timeout(3000)
-            page_content = await page.content()
-            
-            # JSON patterns
-            bookmark_patterns = [
-                r'"collectCount":(\d+)',
-                r'"bookmarkCount":(\d+)',
-                r'"saves":(\d+)'
-            ]
-            
-            for pattern in bookmark_patterns:
-                match = re.search(pattern, page_content)
-                if match:
-                    bookmarks = int(match.group(1))
-                    logger.info(f"🚀 Ultimate: Found bookmarks in JSON pattern '{pattern}': {bookmarks}")
-                    return bookmarks
-        except Exception:
-            pass
-        
-        # Selectors
-        bookmark_selectors = [
-            '[data-e2e="collect-count"]',
-            'strong[data-e2e="collect-count"]',
-            'div[data-e2e="collect-count"]',
-            'span[data-e2e="collect-count"]',
-            '[class*="collect"] strong',
-            '[class*="Collect"] strong',
-            '[class*="bookmark"] strong',
-            '[class*="Bookmark"] strong'
-        ]
-        
-        for selector in bookmark_selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=3000)
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            logger.info(f"🚀 Ultimate: Found bookmarks with selector '{selector}': {text} -> {parsed}")
-                            return parsed
-            except Exception:
-                continue
-        
-        return 0
+        return self._extract_count_ultimate('bookmarks', page_content, [
+            r'"collectCount":(\d+)',
+            r'"bookmarkCount":(\d+)',
+            r'"saves":(\d+)'
+        ], hits, 'bookmarks')
     
-    async def _extract_account_details_ultimate(self, page, post_url: str) -> dict:
+    def _extract_account_details_ultimate(self, page_content, hits, post_url: str) -> dict:
         """Ultimate account details extraction"""
         try:
             logger.info(f"🚀 Ultimate: Extracting account details from: {post_url}")
             
             # Extract username
-            username = await self._extract_username_ultimate(page, post_url)
+            username = self._extract_username_ultimate(hits, post_url)
             
             # Extract followers
-            followers = await self._extract_followers_ultimate(page)
+            followers = self._extract_followers_ultimate(page_content, hits)
             
             return {
                 "account_username": username,
@@ -493,89 +381,26 @@ class UltimateScraper:
                 "account_followers": 0
             }
     
-    async def _extract_username_ultimate(self, page, post_url: str) -> str:
+    def _extract_username_ultimate(self, hits, post_url: str) -> str:
         """Ultimate username extraction"""
-        try:
-            # From URL
-            url_match = re.search(r'@([^/]+)', post_url)
-            if url_match:
-                return url_match.group(1)
-            
-            # From page
-            await page.wait_for_timeout(3000)
-            username_selectors = [
-                '[data-e2e="user-title"]',
-                '[class*="username"]',
-                '[class*="Username"]',
-                '[class*="user-name"]',
-                '[class*="User-name"]'
-            ]
-            
-            for selector in username_selectors:
-                try:
-                    await page.wait_for_selector(selector, timeout=3000)
-                    element = await page.query_selector(selector)
-                    if element:
-                        text = await element.text_content()
-                        if text:
-                            return text.replace('@', '').strip()
-                except Exception:
-                    continue
-            
-            return "Unknown"
-            
-        except Exception:
-            return "Unknown"
+        # From URL
+        url_match = re.search(r'@([^/]+)', post_url)
+        if url_match:
+            return url_match.group(1)
+        
+        # From page
+        username = hits.value('username')
+        if username:
+            return username.replace('@', '').strip()
+        return "Unknown"
     
-    async def _extract_followers_ultimate(self, page):
+    def _extract_followers_ultimate(self, page_content, hits):
         """Ultimate followers extraction"""
-        try:
-            await page.wait_for_timeout(3000)
-            page_content = await page.content()
-            
-            # JSON patterns
-            follower_patterns = [
-                r'"followerCount":(\d+)',
-                r'"followers":(\d+)',
-                r'"fans":(\d+)'
-            ]
-            
-            for pattern in follower_patterns:
-                match = re.search(pattern, page_content)
-                if match:
-                    followers = int(match.group(1))
-                    logger.info(f"🚀 Ultimate: Found followers in JSON pattern '{pattern}': {followers}")
-                    return followers
-        except Exception:
-            pass
-        
-        # Selectors
-        follower_selectors = [
-            '[data-e2e="followers-count"] strong',
-            'strong[data-e2e="followers-count"]',
-            'div[data-e2e="followers-count"]',
-            'span[data-e2e="followers-count"]',
-            '[class*="follower"] strong',
-            '[class*="Follower"] strong',
-            '[class*="follow"] strong',
-            '[class*="Follow"] strong'
-        ]
-        
-        for selector in follower_selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=3000)
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    if text:
-                        parsed = self._parse_metric(text)
-                        if parsed > 0:
-                            logger.info(f"🚀 Ultimate: Found followers with selector '{selector}': {text} -> {parsed}")
-                            return parsed
-            except Exception:
-                continue
-        
-        return 0
+        return self._extract_count_ultimate('followers', page_content, [
+            r'"followerCount":(\d+)',
+            r'"followers":(\d+)',
+            r'"fans":(\d+)'
+        ], hits, 'followers')
     
     def _looks_like_large_number(self, text):
         """Check if text looks like a large number (could be views)"""
@@ -616,31 +441,24 @@ class UltimateScraper:
     
     def _parse_metric(self, text: str) -> int:
         """Parse a metric string (e.g., "10.5K", "1.2M") into an integer"""
-        text = text.replace(',', '').strip()
-        text = text.lower()
-
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        elif 'b' in text:
-            return int(float(text.replace('b', '')) * 1000000000)
-        else:
-            # Extract only digits, handle cases like "22 comments"
-            digits = re.findall(r'\d+', text)
-            if digits:
-                return int("".join(digits))
-            return 0
+        return parse_count(text)
 
     async def scrape_posts_ultimate(self, urls: list) -> pd.DataFrame:
         """
         Ultimate scraping of multiple posts with better error handling
         """
         results = []
+
+        # Short links -> canonical URLs (HTTP redirects, cached), then dedup by video id
+        targets = {}
+        if self.link_cache:
+            targets = await resolve_short_links(urls, self.link_cache)
+            urls = dedupe_urls(urls, self.link_cache)
+
         for i, url in enumerate(urls, 1):
             logger.info(f"🚀 Ultimate scraping post {i}/{len(urls)}: {url}")
             
-            result = await self.scrape_post_ultimate(url)
+            result = await self.scrape_post_ultimate(url, target_url=targets.get(url))
             results.append(result)
             
             # Add delay between posts
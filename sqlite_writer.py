@@ -12,6 +12,9 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import logging
 
+from local_database_setup import create_tag_tables, parse_hashtags
+from database.engine_registry import get_engine
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -32,14 +35,17 @@ class SQLiteWriter:
             create_local_database(self.db_path)
 
     def connect(self):
-        """Open database connection"""
+        """Check out a connection from the shared per-process pool (WAL, busy_timeout)"""
         if not self.conn:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row  # Access columns by name
+            self.conn = get_engine(f"sqlite:///{self.db_path}").raw_connection()
+            # Access columns by name (reset when the connection goes back to the pool)
+            self.conn.driver_connection.row_factory = sqlite3.Row
+            # Databases created before the sound/hashtag index get its tables here
+            create_tag_tables(self.conn.cursor())
         return self.conn
 
     def close(self):
-        """Close database connection"""
+        """Return the connection to the pool"""
         if self.conn:
             self.conn.close()
             self.conn = None
@@ -120,17 +126,60 @@ class SQLiteWriter:
         ))
 
         post_id = cursor.lastrowid
+        self._link_sound_and_hashtags(cursor, post_id, post_data)
         self.conn.commit()
         logger.info(f"✅ Inserted post ID: {post_id}")
         return post_id
 
+    def _link_sound_and_hashtags(self, cursor, post_id: int, post_data: Dict):
+        """Populate sounds/hashtags dimensions and the post links (same transaction as the post)"""
+        sound_title = (post_data.get('sound_title') or '').strip()
+        if sound_title:
+            sound_author = (post_data.get('sound_author') or '').strip()
+            cursor.execute("INSERT OR IGNORE INTO sounds (title, author) VALUES (?, ?)",
+                           (sound_title, sound_author))
+            cursor.execute("""
+            INSERT OR REPLACE INTO post_sounds (post_id, sound_id)
+            SELECT ?, id FROM sounds WHERE title = ? AND author = ?
+            """, (post_id, sound_title, sound_author))
+
+        tags = parse_hashtags(post_data.get('hashtags'))
+        if tags:
+            cursor.executemany("INSERT OR IGNORE INTO hashtags (tag) VALUES (?)",
+                               [(tag,) for tag in tags])
+            cursor.executemany("""
+            INSERT OR IGNORE INTO post_hashtags (post_id, hashtag_id)
+            SELECT ?, id FROM hashtags WHERE tag = ?
+            """, [(post_id, tag) for tag in tags])
+
+    def rebuild_tag_index(self) -> Dict:
+        """Backfill sound/hashtag links for posts inserted before the index existed"""
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+        SELECT id, sound_title, sound_author, hashtags FROM tiktok_posts
+        WHERE NOT EXISTS (SELECT 1 FROM post_sounds ps WHERE ps.post_id = tiktok_posts.id)
+          AND NOT EXISTS (SELECT 1 FROM post_hashtags ph WHERE ph.post_id = tiktok_posts.id)
+        """)
+        rows = cursor.fetchall()
+
+        for row in rows:
+            self._link_sound_and_hashtags(cursor, row['id'], dict(row))
+
+        conn.commit()
+        logger.info(f"✅ Indexed sounds/hashtags for {len(rows)} posts")
+        return {'posts_indexed': len(rows)}
+
     def _update_post(self, cursor, post_id: int, post_data: Dict) -> int:
-        """Update existing post"""
+        """Update existing post (sound/hashtag links are replaced when the scrape carries them)"""
         cursor.execute("""
         UPDATE tiktok_posts SET
             views = ?, likes = ?, comments = ?, shares = ?, bookmarks = ?,
             engagement = ?, engagement_rate = ?, account_followers = ?,
-            account_following = ?, account_posts = ?, last_scraped_at = ?
+            account_following = ?, account_posts = ?, last_scraped_at = ?,
+            hashtags = COALESCE(?, hashtags), sound_title = COALESCE(?, sound_title),
+            sound_author = COALESCE(?, sound_author)
         WHERE id = ?
         """, (
             post_data.get('views', 0),
@@ -144,9 +193,19 @@ class SQLiteWriter:
             post_data.get('account_following', 0),
             post_data.get('account_posts', 0),
             datetime.now().isoformat(),
+            post_data.get('hashtags'),
+            post_data.get('sound_title'),
+            post_data.get('sound_author'),
             post_id
         ))
 
+        # Fields missing from this scrape keep their existing links
+        if 'sound_title' in post_data:
+            cursor.execute("DELETE FROM post_sounds WHERE post_id = ?", (post_id,))
+        if 'hashtags' in post_data:
+            cursor.execute("DELETE FROM post_hashtags WHERE post_id = ?", (post_id,))
+        self._link_sound_and_hashtags(cursor, post_id, post_data)
+
         self.conn.commit()
         logger.info(f"✅ Updated post ID: {post_id}")
         return post_id
@@ -208,6 +267,64 @@ class SQLiteWriter:
 
         return results
 
+    def top_posts_by_sound(self, sound_title: str, sound_author: Optional[str] = None,
+                           limit: int = 10) -> List[Dict]:
+        """Top-N posts using a sound, across all accounts, by views"""
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        query = """
+        SELECT p.post_url, p.account, p.va, p.created_date, p.views, p.likes,
+               s.title AS sound_title, s.author AS sound_author
+        FROM sounds s
+        JOIN post_sounds ps ON ps.sound_id = s.id
+        JOIN tiktok_posts p ON p.id = ps.post_id
+        WHERE s.title = ?
+        """
+        params = [sound_title]
+        if sound_author is not None:
+            query += " AND s.author = ?"
+            params.append(sound_author)
+        query += " ORDER BY p.views DESC LIMIT ?"
+        params.append(limit)
+
+        cursor.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def top_posts_by_hashtag(self, tag: str, limit: int = 10) -> List[Dict]:
+        """Top-N posts using a hashtag ('#fyp' or 'fyp'), across all accounts, by views"""
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+        SELECT p.post_url, p.account, p.va, p.created_date, p.views, p.likes, h.tag
+        FROM hashtags h
+        JOIN post_hashtags ph ON ph.hashtag_id = h.id
+        JOIN tiktok_posts p ON p.id = ph.post_id
+        WHERE h.tag = ?
+        ORDER BY p.views DESC
+        LIMIT ?
+        """, (tag.lstrip('#').lower(), limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def top_sounds(self, limit: int = 10) -> List[Dict]:
+        """Sounds ranked by total views, with post and account counts"""
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+        SELECT s.title AS sound_title, s.author AS sound_author,
+               COUNT(*) AS posts, COUNT(DISTINCT p.account) AS accounts,
+               SUM(p.views) AS total_views, MAX(p.views) AS best_views
+        FROM sounds s
+        JOIN post_sounds ps ON ps.sound_id = s.id
+        JOIN tiktok_posts p ON p.id = ps.post_id
+        GROUP BY s.id
+        ORDER BY total_views DESC
+        LIMIT ?
+        """, (limit,))
+        return [dict(row) for row in cursor.fetchall()]
+
     def get_stats(self) -> Dict:
         """Get database statistics"""
         conn = self.connect()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming Apify dataset exports (JSON array and line-delimited)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from apify_stream_reader import iter_records, project_item, write_synthetic_dump
+
+NESTED = {
+    'webVideoUrl': 'https://www.tiktok.com/@amy/photo/7560000000000000001',
+    'authorMeta': {'name': 'amy', 'fans': 1200},
+    'musicMeta': {'musicName': 'original sound - amy'},
+    'playCount': 1500.0, 'diggCount': 120, 'commentCount': None, 'shareCount': '4',
+    'createTimeISO': '2025-10-01T10:00:00.000Z',
+    'text': 'caption #fyp',
+    'imagePost': {'images': [
+        {'imageURL': {'imageUrlList': ['https://cdn.example.com/1a.jpeg', 'https://cdn.example.com/1b.jpeg']}},
+        {'imageURL': {'imageUrlList': []}},
+        {'imageURL': {'imageUrlList': ['https://cdn.example.com/3a.jpeg']}},
+    ]},
+}
+FLATTENED = {
+    'webVideoUrl': 'https://www.tiktok.com/@bob/video/7560000000000000002',
+    'authorMeta.name': 'bob',
+    'musicMeta.musicName': 'song',
+    'playCount': 10,
+    'createTimeISO': '2025-10-02T10:00:00.000Z',
+}
+
+
+class TestProjectItem:
+
+    def test_nested_keys(self):
+        record = project_item(NESTED)
+
+        assert (record.account, record.sound_link) == ('amy', 'original sound - amy')
+        assert (record.views, record.likes, record.comments, record.shares) == (1500, 120, 0, 4)
+        assert record.slides == ['https://cdn.example.com/1a.jpeg', 'https://cdn.example.com/3a.jpeg']
+        assert record.hashtags == 'caption #fyp'
+
+    def test_flattened_keys(self):
+        record = project_item(FLATTENED)
+
+        assert (record.account, record.sound_link, record.views) == ('bob', 'song', 10)
+        assert record.slides == []
+        assert record.to_post('sept_scrape')['source'] == 'sept_scrape'
+
+    def test_missing_meta_and_error_rows(self):
+        record = project_item({'createTimeISO': '2025-10-02T10:00:00.000Z', 'authorMeta': None})
+        assert (record.post_url, record.account, record.sound_link) == ('', '', '')
+
+        assert project_item({'error': 'Post not found', 'createTimeISO': 'x'}) is None
+        assert project_item({'webVideoUrl': 'https://www.tiktok.com/@amy/video/1'}) is None
+
+
+class TestIterRecords:
+
+    @pytest.mark.parametrize('suffix', ['.json', '.jsonl'])
+    def test_array_and_line_delimited_exports(self, tmp_path, suffix):
+        items = [NESTED, {'error': 'blocked'}, FLATTENED]
+        path = tmp_path / f'dataset{suffix}'
+        if suffix == '.json':
+            path.write_text(json.dumps(items))
+        else:
+            path.write_text('\n'.join(json.dumps(item) for item in items) + '\n\n')
+
+        records = list(iter_records(path))
+
+        assert [record.account for record in records] == ['amy', 'bob']
+        assert isinstance(records[0].views, int)
+
+    def test_synthetic_dump_round_trip(self, tmp_path):
+        path = tmp_path / 'synthetic.json'
+        write_synthetic_dump(path, 3)
+
+        records = list(iter_records(path))
+
+        assert [record.account for record in records] == ['account_0', 'account_1', 'account_2']
+        assert len(records[0].slides) == 6
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for AsyncWriteSink: batched writes on a writer thread, backpressure, error isolation
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from database.async_sink import AsyncWriteSink
+
+
+class RecordingWriter:
+    """Blocking write_batch stand-in that records batches and the thread it ran on"""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.batches = []
+        self.threads = set()
+
+    def __call__(self, rows):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)  # blocking, like a database commit
+        if self.fail_on is not None and self.fail_on in rows:
+            raise ValueError('bad row')
+        self.batches.append(list(rows))
+
+
+class TestAsyncWriteSink:
+
+    def test_coalesces_rows_into_batches_off_the_loop(self):
+        writer = RecordingWriter()
+
+        async def run():
+            async with AsyncWriteSink(writer, batch_size=100, flush_interval=0.05, name='test-writer') as sink:
+                for i in range(250):
+                    await sink.put(i)
+            return sink
+
+        sink = asyncio.run(run())
+        assert [len(batch) for batch in writer.batches] == [100, 100, 50]
+        assert [row for batch in writer.batches for row in batch] == list(range(250))
+        assert writer.threads == {'test-writer_0'}
+        assert (sink.stats['rows_written'], sink.stats['batches']) == (250, 3)
+
+    def test_full_queue_applies_backpressure_without_blocking_the_loop(self):
+        writer = RecordingWriter(delay=0.2)
+        ticks = []
+
+        async def ticker(stop):
+            while not stop.is_set():
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        async def run():
+            stop = asyncio.Event()
+            tick_task = asyncio.create_task(ticker(stop))
+            sink = AsyncWriteSink(writer, maxsize=5, batch_size=5, flush_interval=0.01)
+            for i in range(15):
+                await sink.put(i)
+            await sink.close()
+            stop.set()
+            await tick_task
+            return sink
+
+        sink = asyncio.run(run())
+        assert sink.stats['rows_written'] == 15
+        assert sink.stats['backpressure_waits'] > 0
+        assert sink.stats['max_queue_depth'] <= 5
+        # The event loop kept running while the writer slept in its thread
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+    def test_failed_batch_does_not_stop_the_writer(self):
+        writer = RecordingWriter(fail_on=3)
+
+        async def run():
+            async with AsyncWriteSink(writer, batch_size=5, flush_interval=0.01) as sink:
+                for i in range(12):
+                    await sink.put(i)
+            return sink
+
+        sink = asyncio.run(run())
+        assert sink.stats['failed_rows'] == 5
+        assert sink.stats['rows_written'] == 7
+        assert [row for batch in writer.batches for row in batch] == list(range(5, 12))
+
+    def test_flush_waits_for_queued_rows_and_calls_on_written(self):
+        writer = RecordingWriter(delay=0.01)
+        written = []
+
+        async def run():
+            sink = AsyncWriteSink(writer, batch_size=10, flush_interval=0.01, on_written=written.extend)
+            for i in range(4):
+                await sink.put(i)
+            await sink.flush()
+            flushed = list(written)
+            await sink.close()
+            with pytest.raises(RuntimeError):
+                await sink.put(5)
+            return flushed
+
+        assert asyncio.run(run()) == [0, 1, 2, 3]
+
+    def test_failing_on_written_does_not_stop_the_writer(self):
+        writer = RecordingWriter()
+        calls = []
+
+        def on_written(rows):
+            calls.append(list(rows))
+            raise ValueError('callback failed')
+
+        async def run():
+            sink = AsyncWriteSink(writer, batch_size=2, flush_interval=0.01, on_written=on_written)
+            for i in range(5):
+                await sink.put(i)
+            # Would hang if the writer task had died without task_done()
+            await asyncio.wait_for(sink.flush(), timeout=2)
+            await asyncio.wait_for(sink.close(), timeout=2)
+            return sink
+
+        sink = asyncio.run(run())
+        assert sink.stats['rows_written'] == 5
+        assert [row for batch in writer.batches for row in batch] == list(range(5))
+        assert len(calls) == len(writer.batches)
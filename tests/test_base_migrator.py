@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for BaseMigrator batching: buffered Core inserts, ON CONFLICT, bad-row isolation
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.models import Base, VA, Post
+from database.migration_scripts.base_migrator import BaseMigrator
+from database.migration_scripts.migrate_csv_data import CSVDataMigrator
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """Create a temporary database for testing"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'batching.db'}",
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+def post_values(i, **overrides):
+    values = dict(post_url=f'https://www.tiktok.com/@a/video/{i}', account='a',
+                  created_date=datetime(2025, 9, 1), source='test', views=i)
+    values.update(overrides)
+    return values
+
+
+class TestBatching:
+
+    def test_flushes_every_batch_size_rows(self, db_session):
+        migrator = BaseMigrator(db_session, 'test', batch_size=100)
+        for i in range(250):
+            migrator.queue_row(Post, post_values(i), conflict_columns=['post_url'])
+
+        # Two full batches written, 50 rows still buffered
+        assert db_session.query(Post).count() == 200
+        migrator.batch_commit()
+        assert db_session.query(Post).count() == 250
+        assert migrator.write_stats['batches'] == 3
+        assert migrator.stats['imported'] == 250
+        assert migrator.rows_per_second > 0
+
+    def test_conflicts_are_skipped_not_failed(self, db_session):
+        migrator = BaseMigrator(db_session, 'test', batch_size=10)
+        for i in list(range(10)) + list(range(5)):
+            migrator.queue_row(Post, post_values(i), conflict_columns=['post_url'])
+        migrator.batch_commit()
+
+        assert migrator.stats['imported'] == 10
+        assert migrator.stats['skipped'] == 5
+        assert migrator.stats['failed'] == 0
+
+    def test_one_bad_row_does_not_drop_the_batch(self, db_session):
+        migrator = BaseMigrator(db_session, 'test', batch_size=1000)
+        for i in range(999):
+            migrator.queue_row(Post, post_values(i, views=-1 if i == 500 else i),
+                               conflict_columns=['post_url'])
+        migrator.batch_commit()
+
+        assert db_session.query(Post).count() == 998
+        assert migrator.stats['imported'] == 998
+        assert migrator.stats['failed'] == 1
+        assert 'check_views_positive' in migrator.stats['errors'][0]
+        # Bisection: log2(999) levels down to the single bad row
+        assert migrator.write_stats['bisections'] == 10
+
+    def test_upsert_updates_columns(self, db_session):
+        migrator = BaseMigrator(db_session, 'test')
+        migrator.queue_row(Post, post_values(1, views=10), conflict_columns=['post_url'])
+        migrator.batch_commit()
+        migrator.queue_row(Post, post_values(1, views=99), on_conflict='update',
+                           conflict_columns=['post_url'], update_columns=['views'])
+        migrator.batch_commit()
+
+        assert db_session.query(Post.views).scalar() == 99
+
+    def test_failed_migration_discards_buffer(self, db_session):
+        migrator = BaseMigrator(db_session, 'test')
+        migrator.start_migration('test source')
+        migrator.queue_row(Post, post_values(1), conflict_columns=['post_url'])
+        migrator.complete_migration(success=False, error_message='boom')
+
+        assert db_session.query(Post).count() == 0
+        assert migrator.import_log.status == 'failed'
+
+    def test_safe_add_record_isolates_integrity_errors(self, db_session):
+        migrator = BaseMigrator(db_session, 'test')
+        db_session.add(VA(name='VA1'))
+        db_session.commit()
+
+        assert migrator.safe_add_record(VA(name='VA2'), 'va') is True
+        assert migrator.safe_add_record(VA(name='VA1'), 'va') is False
+        db_session.commit()
+
+        assert {name for (name,) in db_session.query(VA.name)} == {'VA1', 'VA2'}
+        assert migrator.stats['skipped'] == 1
+
+
+class TestCSVMigratorBatching:
+
+    def test_rerun_skips_existing_posts(self, db_session, tmp_path):
+        rows = [{
+            'created_date': '2025-09-01', 'created_time': '12:00', 'account': 'a', 'va': 'VA1',
+            'post_url': f'https://www.tiktok.com/@a/video/{i}', 'views': i, 'likes': 0,
+            'comments': 0, 'shares': 0, 'engagement': 0, 'engagement_rate': None,
+            'hashtags': None, 'sound': None, 'slides': None, 'source': 'old_clean'
+        } for i in range(25)]
+        csv_path = tmp_path / 'master.csv'
+        pd.DataFrame(rows).to_csv(csv_path, index=False)
+
+        first = CSVDataMigrator(db_session).migrate_csv_file(str(csv_path), batch_size=10)
+        again = CSVDataMigrator(db_session).migrate_csv_file(str(csv_path), batch_size=10)
+
+        assert (first['processed'], first['imported'], first['skipped']) == (25, 25, 0)
+        assert (again['processed'], again['imported'], again['skipped']) == (25, 0, 25)
+        assert db_session.query(Post).count() == 25
+        # NaN cells become NULL, not the string 'nan'
+        assert db_session.query(Post).filter(Post.slides.isnot(None)).count() == 0
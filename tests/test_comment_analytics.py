@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for batch comment analytics (keyword matcher, response rate, reply latency, per-VA rollups)
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from comment_analytics import KeywordMatcher, analyze, comments_frame, summarize_comments
+
+URL_A = 'https://www.tiktok.com/@sofia/video/7560000000000000001'
+URL_B = 'https://www.tiktok.com/@mia/video/7560000000000000002'
+
+
+def comment(post_id, url, va, cid, author, text, at, parent=None, likes=0):
+    return {
+        'post_id': post_id, 'post_url': url, 'va': va, 'comment_id': cid,
+        'parent_comment_id': parent, 'author': author, 'text': text,
+        'like_count': likes, 'commented_at': at,
+    }
+
+
+ROWS = [
+    comment(1, URL_A, 'Anna', 'a1', 'fan1', 'Link in bio?? so CUTE', '2025-10-01 10:00', likes=4),
+    comment(1, URL_A, 'Anna', 'a2', 'fan2', 'fake', '2025-10-01 11:00'),
+    comment(1, URL_A, 'Anna', 'a3', 'Sofia', 'thank you!', '2025-10-01 10:30', parent='a1'),
+    comment(1, URL_A, 'Anna', 'a4', 'sofia', 'check my bio', '2025-10-01 12:00', parent='a1'),
+    comment(2, URL_B, 'Anna', 'b1', 'fan3', 'where is this', '2025-10-01 09:00'),
+    comment(2, URL_B, 'Anna', 'b2', 'mia', 'Bali!', '2025-10-01 11:00', parent='b1'),
+    comment(3, 'https://www.tiktok.com/@lea/video/3', None, 'c1', 'fan4', 'wow', '2025-10-01 09:00'),
+]
+
+
+class TestKeywordMatcher:
+
+    def test_longest_keyword_wins(self):
+        hits = KeywordMatcher(['link', 'link in bio', 'bio']).find(pd.Series(['LINK IN BIO pls', 'link and bio']))
+        assert hits.tolist() == ['link in bio', 'link', 'bio']
+        assert hits.index.tolist() == [0, 1, 1]
+
+    def test_whole_words_only(self):
+        matcher = KeywordMatcher(['op', 'ai'])
+        assert matcher.count(pd.Series(['shop now', 'said', 'OP: ai?', None])).tolist() == [0, 0, 2, 0]
+
+    def test_multiline_texts_keep_their_rows(self):
+        hits = KeywordMatcher(['dm']).find(pd.Series(['hi\ndm me', 'nothing', 'dm'], index=[10, 20, 30]))
+        assert hits.index.tolist() == [10, 30]
+
+
+class TestAnalyze:
+
+    @pytest.fixture
+    def reports(self):
+        return analyze(comments_frame(ROWS), keywords=['link in bio', 'bio', 'cute', 'fake', 'where'])
+
+    def test_response_rate_and_first_reply_per_post(self, reports):
+        posts = reports['posts']
+        first = posts.loc['1']
+        assert first['fan_comments'] == 2
+        assert first['responded'] == 1
+        assert first['response_rate_pct'] == 50.0
+        # Two creator replies under a1: the first one (30 min) counts
+        assert first['median_minutes_to_first_reply'] == 30.0
+        assert posts.loc['2', 'median_minutes_to_first_reply'] == 120.0
+        assert posts.loc['3', 'va'] == 'Unknown'
+
+    def test_va_rollup(self, reports):
+        anna = reports['vas'].loc['Anna']
+        assert anna['comments'] == 6
+        assert anna['top_level_comments'] == 3
+        assert anna['creator_comments'] == 3
+        assert anna['fan_comments'] == 3
+        assert anna['response_rate_pct'] == 66.67
+        assert anna['keyword_hits'] == 5
+        assert reports['vas'].loc['Unknown', 'response_rate_pct'] == 0.0
+
+    def test_keyword_and_length_tables(self, reports):
+        keywords = reports['keywords']
+        assert keywords.loc['Anna', 'link in bio'] == 1
+        assert keywords.loc['Anna', 'bio'] == 1
+        assert int(reports['lengths'].loc['Anna'].sum()) == 6
+
+    def test_scraper_dicts_and_single_post_summary(self):
+        scraped = [
+            {'comment_id': 'x1', 'text': 'so cute', 'author': 'fan', 'timestamp': '2h ago', 'likes': 3},
+            {'comment_id': 'x2', 'text': 'hi', 'author': 'fan2', 'timestamp': '1h ago', 'likes': 0},
+        ]
+        summary = summarize_comments(scraped, post_url=URL_A, va='Anna')
+        assert summary['va'] == 'Anna'
+        assert summary['comments'] == 2
+        assert summary['avg_likes'] == 1.5
+        assert summary['response_rate_pct'] == 0.0
+        assert summarize_comments([]) == {'comments': 0}
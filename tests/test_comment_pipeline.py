@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Tests for comment ingestion (upserts, high-water marks, velocity, cursor pagination)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / '02_Scraping_Systems' / '01_TikTok_Scrapers'))
+
+from database.models import Base, Post, Comment
+from database.comment_store import CommentStore, normalize_comment
+from comment_pipeline import CommentApiFetcher, CommentPipeline
+
+NOW = datetime(2025, 10, 20, 12, 0)
+
+
+@pytest.fixture
+def db_session():
+    """Create a temporary database for testing"""
+    db_fd, db_path = tempfile.mkstemp()
+
+    engine = create_engine(
+        f'sqlite:///{db_path}',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    os.close(db_fd)
+    os.unlink(db_path)
+
+
+@pytest.fixture
+def post(db_session):
+    post = Post(
+        post_url="https://www.tiktok.com/@test/video/7560000000000000001",
+        account="test",
+        created_date=NOW - timedelta(days=2),
+        comments=4,
+        source="test"
+    )
+    db_session.add(post)
+    db_session.commit()
+    return post
+
+
+def raw_comment(cid, hours_ago, likes=0, replies=0, reply_id=0, user='fan'):
+    """Comment JSON the way /api/comment/list/ returns it"""
+    created = (NOW - timedelta(hours=hours_ago)).replace(tzinfo=timezone.utc)
+    return {
+        'cid': cid,
+        'text': f'comment {cid}',
+        'create_time': int(created.timestamp()),
+        'digg_count': likes,
+        'reply_comment_total': replies,
+        'reply_id': reply_id,
+        'user': {'uid': f'uid_{user}', 'unique_id': user},
+    }
+
+
+class TestCommentStore:
+
+    def test_normalize_comment(self):
+        comment = normalize_comment(raw_comment('7001', hours_ago=1, likes=5, reply_id='6999'))
+        assert comment['comment_id'] == '7001'
+        assert comment['parent_comment_id'] == '6999'
+        assert comment['commented_at'] == NOW - timedelta(hours=1)
+        assert comment['like_count'] == 5
+        assert normalize_comment(raw_comment('7002', 1))['parent_comment_id'] is None
+        assert normalize_comment({'text': 'no id'}) is None
+
+    def test_upsert_inserts_then_updates_counters(self, db_session, post):
+        store = CommentStore(db_session)
+        first = [normalize_comment(raw_comment('1', 5)), normalize_comment(raw_comment('2', 3))]
+        assert store.upsert(post.id, first, now=NOW) == {'new': 2, 'updated': 0}
+
+        again = [normalize_comment(raw_comment('2', 3, likes=40)), normalize_comment(raw_comment('3', 1))]
+        assert store.upsert(post.id, again, now=NOW + timedelta(hours=1)) == {'new': 1, 'updated': 1}
+
+        assert db_session.query(Comment).count() == 3
+        updated = db_session.get(Comment, '2')
+        db_session.refresh(updated)
+        assert updated.like_count == 40
+        assert updated.first_seen_at == NOW
+
+    def test_high_water_mark_ignores_replies(self, db_session, post):
+        store = CommentStore(db_session)
+        comments = [
+            normalize_comment(raw_comment('1', 10)),
+            normalize_comment(raw_comment('2', 4)),
+            normalize_comment(raw_comment('3', 1, reply_id='1')),
+        ]
+        store.upsert(post.id, comments, now=NOW)
+        # Stored comments alone don't set a mark, only a complete fetch does
+        assert store.high_water_marks() == {}
+
+        store.mark_complete(post.id, comments, now=NOW)
+        assert store.high_water_marks() == {post.id: NOW - timedelta(hours=4)}
+        # An older complete fetch never moves the mark back
+        store.mark_complete(post.id, comments[:1], now=NOW)
+        assert store.high_water_marks([post.id]) == {post.id: NOW - timedelta(hours=4)}
+
+    def test_comment_stats_velocity(self, db_session, post):
+        store = CommentStore(db_session)
+        store.upsert(post.id, [
+            normalize_comment(raw_comment('1', 30)),
+            normalize_comment(raw_comment('2', 6)),
+            normalize_comment(raw_comment('3', 2)),
+            normalize_comment(raw_comment('4', 1, reply_id='3')),
+        ], now=NOW)
+
+        [stats] = store.comment_stats(window_hours=24, now=NOW)
+        assert stats['stored_comments'] == 4
+        assert stats['top_level_comments'] == 3
+        assert stats['replies'] == 1
+        assert stats['window_comments'] == 3
+        assert stats['velocity_per_hour'] == pytest.approx(3 / 24, abs=1e-3)
+        assert stats['lifetime_per_hour'] == pytest.approx(4 / 48, abs=1e-3)
+
+
+class _FakeApiFetcher(CommentApiFetcher):
+    """Serves canned pages instead of calling TikTok"""
+
+    def __init__(self, pages, replies=None, fail_pages=(), **kwargs):
+        super().__init__(page_size=2, **kwargs)
+        self.pages = pages
+        self.replies = replies or {}
+        self.fail_pages = set(fail_pages)
+        self.requests = []
+
+    async def _get_page(self, url, params):
+        self.requests.append((url, params['cursor']))
+        if params['cursor'] // 2 in self.fail_pages:
+            raise RuntimeError('HTTP 503')
+        if 'comment_id' in params:
+            return {'comments': self.replies[params['comment_id']], 'has_more': 0}
+        index = params['cursor'] // 2
+        return {'comments': self.pages[index], 'cursor': params['cursor'] + 2,
+                'has_more': int(index + 1 < len(self.pages))}
+
+
+class TestCommentApiFetcher:
+
+    PAGES = [
+        [raw_comment('10', 1, replies=1), raw_comment('9', 2)],
+        [raw_comment('8', 5), raw_comment('7', 6)],
+        [raw_comment('6', 20), raw_comment('5', 30)],
+    ]
+
+    def test_follows_cursor_to_the_end(self):
+        fetcher = _FakeApiFetcher(self.PAGES, include_replies=False)
+        result = asyncio.run(fetcher.fetch_post('123'))
+        assert [c['comment_id'] for c in result.comments] == ['10', '9', '8', '7', '6', '5']
+        assert [cursor for _, cursor in fetcher.requests] == [0, 2, 4]
+        assert result.pages == 3 and result.error is None
+
+    def test_stops_at_high_water_mark(self):
+        fetcher = _FakeApiFetcher(self.PAGES, include_replies=False)
+        result = asyncio.run(fetcher.fetch_post('123', since=NOW - timedelta(hours=5, minutes=30)))
+        # Page 2 still has a newer comment, page 3 has none
+        assert [c['comment_id'] for c in result.comments] == ['10', '9', '8']
+        assert result.reached_mark is True
+        assert result.pages == 3
+
+        fetcher = _FakeApiFetcher(self.PAGES, include_replies=False)
+        result = asyncio.run(fetcher.fetch_post('123', since=NOW - timedelta(hours=3)))
+        assert [c['comment_id'] for c in result.comments] == ['10', '9']
+        assert result.reached_mark is True
+        assert result.pages == 2
+
+    def test_fetches_reply_threads(self):
+        fetcher = _FakeApiFetcher(self.PAGES[:1], replies={'10': [raw_comment('11', 0.5, user='creator')]})
+        result = asyncio.run(fetcher.fetch_post('123'))
+        reply = result.comments[-1]
+        assert reply['comment_id'] == '11'
+        assert reply['parent_comment_id'] == '10'
+
+    def test_page_cap_marks_result_truncated(self):
+        fetcher = _FakeApiFetcher(self.PAGES, include_replies=False, max_pages=2)
+        result = asyncio.run(fetcher.fetch_post('123'))
+        assert result.pages == 2
+        assert result.truncated is True and result.complete is False
+
+
+class TestCommentPipeline:
+
+    def run(self, db_session, post, fetcher):
+        return asyncio.run(CommentPipeline(db_session, fetcher).run([post]))
+
+    def test_failed_page_is_fetched_on_the_next_run(self, db_session, post):
+        pages = TestCommentApiFetcher.PAGES
+        store = CommentStore(db_session)
+
+        # Page 2 fails: page 1 is stored, but the mark must not move past the missing comments
+        summary = self.run(db_session, post, _FakeApiFetcher(pages, include_replies=False, fail_pages={1}))
+        assert summary['errors'] == 1 and summary['new'] == 2
+        assert store.high_water_marks() == {}
+
+        fetcher = _FakeApiFetcher(pages, include_replies=False)
+        summary = self.run(db_session, post, fetcher)
+        assert summary['errors'] == 0 and summary['new'] == 4
+        assert [cursor for _, cursor in fetcher.requests] == [0, 2, 4]
+        assert db_session.query(Comment).count() == 6
+        assert store.high_water_marks() == {post.id: NOW - timedelta(hours=1)}
+
+        # Complete now: the next run stops at the first page
+        fetcher = _FakeApiFetcher(pages, include_replies=False)
+        summary = self.run(db_session, post, fetcher)
+        assert summary['incremental'] == 1 and summary['new'] == 0
+        assert [cursor for _, cursor in fetcher.requests] == [0]
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-evaluate DOM probe (payload building + result handling)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from dom_probe import FieldProbe, PROBE_SCRIPT, ProbeHits, build_payload, probe_page
+
+PROBES = (
+    FieldProbe('views', ('[data-e2e="video-views"]', 'span:has-text("Views")'), numeric=True),
+    FieldProbe('bio', ('[data-e2e="user-bio"]',), contains=('Link',)),
+    FieldProbe('verified', ('[data-e2e="verified-icon"]',), exists=True),
+)
+
+
+class _FakePage:
+    """Records evaluate calls and answers with canned hits"""
+
+    def __init__(self, result=None, error=None):
+        self.calls = []
+        self.result = result
+        self.error = error
+
+    async def evaluate(self, script, arg):
+        self.calls.append((script, arg))
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class TestBuildPayload:
+
+    def test_has_text_becomes_tag_scan(self):
+        views = build_payload(PROBES)[0]
+        assert views['candidates'] == [
+            ('[data-e2e="video-views"]', '', '[data-e2e="video-views"]'),
+            ('span', 'views', 'span:has-text("Views")'),
+        ]
+        assert views['numeric'] is True
+
+    def test_keywords_are_lowercased(self):
+        assert build_payload(PROBES)[1]['contains'] == ['link']
+
+    def test_payload_is_cached_per_probe_set(self):
+        assert build_payload(PROBES) is build_payload(PROBES)
+
+
+class TestProbePage:
+
+    def test_one_evaluate_for_all_fields(self):
+        page = _FakePage({
+            'views': ['1.2K', '[data-e2e="video-views"]'],
+            'verified': [True, '[data-e2e="verified-icon"]'],
+        })
+        hits = asyncio.run(probe_page(page, PROBES))
+
+        assert len(page.calls) == 1
+        script, payload = page.calls[0]
+        assert script == PROBE_SCRIPT
+        assert [probe['name'] for probe in payload] == ['views', 'bio', 'verified']
+
+        assert hits.count('views') == 1200
+        assert hits.value('verified') is True
+        assert hits.value('bio', '') == ''
+        assert hits.matched() == {
+            'views': '[data-e2e="video-views"]',
+            'verified': '[data-e2e="verified-icon"]',
+        }
+
+    def test_evaluate_failure_means_no_hits(self):
+        hits = asyncio.run(probe_page(_FakePage(error=RuntimeError('page closed')), PROBES))
+        assert hits == ProbeHits()
+        assert hits.count('views') == 0
+
+    def test_page_without_evaluate(self):
+        assert asyncio.run(probe_page(object(), PROBES)) == {}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide engine registry: one engine per URL, per-backend pools, pool stats
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+
+from database import config
+from database.engine_registry import EngineRegistry, TimedQueuePool
+
+
+@pytest.fixture
+def registry():
+    registry = EngineRegistry(busy_timeout_ms=1234)
+    yield registry
+    registry.dispose()
+
+
+class TestEngineRegistry:
+
+    def test_one_engine_per_url(self, registry, tmp_path):
+        url = f"sqlite:///{tmp_path / 'a.db'}"
+        assert registry.get_engine(url) is registry.get_engine(url)
+        assert registry.get_engine(url) is not registry.get_engine(f"sqlite:///{tmp_path / 'b.db'}")
+        assert registry.get_sessionmaker(url) is registry.get_sessionmaker(url)
+        assert registry.get_sessionmaker(url).kw['bind'] is registry.get_engine(url)
+
+    def test_sqlite_file_uses_wal_and_busy_timeout(self, registry, tmp_path):
+        engine = registry.get_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+        assert isinstance(engine.pool, TimedQueuePool)
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+
+    def test_sqlite_memory_shares_one_connection(self, registry):
+        engine = registry.get_engine('sqlite://')
+        assert isinstance(engine.pool, StaticPool)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        # Other threads see the same in-memory database
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(
+            engine.connect().execute(text("SELECT count(*) FROM t")).scalar()))
+        thread.start()
+        thread.join()
+        assert seen == [0]
+
+    def test_pool_stats_track_checkouts(self, registry, tmp_path):
+        url = f"sqlite:///{tmp_path / 'stats.db'}"
+        engine = registry.get_engine(url, pool_size=2, max_overflow=1)
+        first, second, third = engine.connect(), engine.connect(), engine.connect()
+
+        stats = registry.pool_stats(url)[url]
+        assert stats['pool'] == 'TimedQueuePool'
+        assert (stats['size'], stats['checked_out'], stats['overflow']) == (2, 3, 1)
+
+        for conn in (first, second, third):
+            conn.close()
+        stats = registry.pool_stats(url)[url]
+        assert stats['checked_out'] == 0
+        assert stats['checkouts'] == 3
+        assert stats['wait_ms_max'] >= stats['wait_ms_avg'] > 0
+
+    def test_pool_timeout_is_counted(self, registry, tmp_path):
+        url = f"sqlite:///{tmp_path / 'timeout.db'}"
+        engine = registry.get_engine(url, pool_size=1, max_overflow=0, pool_timeout=0.05)
+        held = engine.connect()
+        with pytest.raises(Exception):
+            engine.connect()
+        held.close()
+        assert registry.pool_stats(url)[url]['timeouts'] == 1
+
+    def test_forked_process_gets_fresh_engines(self, registry, tmp_path, monkeypatch):
+        url = f"sqlite:///{tmp_path / 'fork.db'}"
+        parent = registry.get_engine(url)
+        monkeypatch.setattr('database.engine_registry.os.getpid', lambda: -1)
+        assert registry.get_engine(url) is not parent
+
+    def test_raw_connection_row_factory_is_reset(self, registry, tmp_path):
+        import sqlite3
+        engine = registry.get_engine(f"sqlite:///{tmp_path / 'raw.db'}", pool_size=1)
+        raw = engine.raw_connection()
+        raw.driver_connection.row_factory = sqlite3.Row
+        raw.close()
+        with engine.connect() as conn:
+            assert conn.connection.driver_connection.row_factory is None
+
+    def test_async_engine_shares_registry(self, registry, tmp_path):
+        pytest.importorskip('aiosqlite')
+        pytest.importorskip('greenlet')
+        url = f"sqlite:///{tmp_path / 'async.db'}"
+        engine = registry.get_async_engine(url)
+        assert engine is registry.get_async_engine(url)
+        assert engine.url.drivername == 'sqlite+aiosqlite'
+
+
+class TestConfigUsesRegistry:
+
+    def test_create_database_engine_is_shared(self):
+        assert config.create_database_engine('sqlite') is config.create_database_engine('sqlite')
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP item fetcher: rehydration JSON parsing and the browser fallback
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / '02_Scraping_Systems' / '01_TikTok_Scrapers'))
+
+from http_item_fetcher import HttpItemFetcher, ItemFetch, item_fields, load_cookies, parse_item_detail
+
+URL = 'https://www.tiktok.com/@amy/photo/7560000000000000001'
+BLOCKED_URL = 'https://www.tiktok.com/@bob/video/7560000000000000002'
+
+ITEM = {
+    'desc': 'Sunday dump #fyp #slideshow with @bob',
+    'stats': {'playCount': 2000, 'diggCount': 150, 'commentCount': 20, 'shareCount': 10, 'collectCount': 20},
+    'author': {'uniqueId': 'amy', 'verified': True},
+    'authorStats': {'followerCount': 5100, 'followingCount': 12, 'videoCount': 88, 'heartCount': 90000},
+    'music': {'id': '42', 'title': 'original sound', 'authorName': 'amy', 'playUrl': 'https://cdn.example.com/a.mp3'},
+    'imagePost': {'images': [
+        {'imageURL': {'urlList': ['https://cdn.example.com/1a.jpeg', 'https://cdn.example.com/1b.jpeg']}},
+        {'imageURL': {'urlList': []}},
+        {'imageURL': {'urlList': ['https://cdn.example.com/3a.jpeg']}},
+    ]},
+}
+
+
+def page(scope='webapp.video-detail', item=ITEM):
+    data = {'__DEFAULT_SCOPE__': {scope: {'itemInfo': {'itemStruct': item}}}}
+    return ('<html><head><script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+            f'{json.dumps(data)}</script></head><body></body></html>')
+
+
+LOGIN_WALL = '<html><body><div class="login-modal">Log in to TikTok</div></body></html>'
+
+
+class TestParsing:
+
+    def test_item_fields(self):
+        fields = item_fields(ITEM)
+
+        assert (fields['views'], fields['likes'], fields['comments'], fields['shares'], fields['bookmarks']) == \
+            (2000, 150, 20, 10, 20)
+        assert (fields['engagement'], fields['engagement_rate']) == (200, 10.0)
+        assert (fields['account_username'], fields['account_followers'], fields['account_verified']) == \
+            ('amy', 5100, True)
+        assert (fields['hashtags'], fields['mentions']) == ('fyp, slideshow', 'bob')
+        assert (fields['sound_title'], fields['has_sound']) == ('original sound', True)
+        assert fields['slide_count'] == 2
+        assert (fields['slide_1'], fields['slide_2']) == ('https://cdn.example.com/1a.jpeg',
+                                                          'https://cdn.example.com/3a.jpeg')
+
+    def test_sparse_item_defaults(self):
+        fields = item_fields({'author': {'uniqueId': 'amy', 'stats': {'followerCount': 7}}})
+
+        assert (fields['views'], fields['account_followers'], fields['slide_count']) == (0, 7, 0)
+        assert fields['has_sound'] is False
+        assert 'engagement_rate' not in fields  # no views -> no rate
+
+    def test_parse_item_detail_scopes_and_misses(self):
+        assert parse_item_detail(page())['views'] == 2000
+        assert parse_item_detail(page('webapp.reflow.video.detail'))['account_username'] == 'amy'
+
+        assert parse_item_detail(LOGIN_WALL) is None
+        assert parse_item_detail(page(item={})) is None
+        assert parse_item_detail(page().replace('"stats"', '"stats" broken')) is None
+
+    def test_load_cookies_formats(self, tmp_path):
+        playwright_file = tmp_path / 'cookies.json'
+        playwright_file.write_text(json.dumps([{'name': 'sessionid', 'value': 'abc', 'domain': '.tiktok.com'},
+                                               {'domain': 'no-name'}]))
+        assert load_cookies(playwright_file) == {'sessionid': 'abc'}
+        assert load_cookies(tmp_path / 'missing.json') == {}
+
+
+class FakeResponse:
+
+    def __init__(self, status, html):
+        self.status = status
+        self.html = html
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def text(self):
+        return self.html
+
+
+class FakeSession:
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url):
+        outcome = self.pages[url]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(*outcome)
+
+
+class TestFetch:
+
+    def test_misses_are_marked_for_the_browser(self):
+        fetcher = HttpItemFetcher(concurrency=4)
+        fetcher.session = FakeSession({
+            URL: (200, page()),
+            BLOCKED_URL: (200, LOGIN_WALL),
+            'https://www.tiktok.com/@c/video/3': (403, page()),
+            'https://www.tiktok.com/@d/video/4': ConnectionError('reset'),
+        })
+        fetcher.semaphore = asyncio.Semaphore(4)
+
+        fetches = asyncio.run(fetcher.fetch_many(list(fetcher.session.pages)))
+
+        assert [fetch.url for fetch in fetches] == list(fetcher.session.pages)
+        assert [fetch.success for fetch in fetches] == [True, False, False, False]
+        assert fetches[0].fields['views'] == 2000
+        assert [fetch.error for fetch in fetches[1:]] == ['No item JSON in page', 'HTTP 403', 'reset']
+
+
+class TestBrowserFallback:
+
+    def test_only_http_misses_reach_playwright(self, monkeypatch, tmp_path):
+        pytest.importorskip('playwright')
+        import production_scraper_237_urls as production
+
+        class StubFetcher:
+            def __init__(self, concurrency, cookies):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                return False
+
+            async def fetch_many(self, urls):
+                return [ItemFetch(url, parse_item_detail(page()) if url == URL else None) for url in urls]
+
+        monkeypatch.setattr(production, 'HttpItemFetcher', StubFetcher)
+        scraper = production.ProductionTikTokScraper(cookie_file=str(tmp_path / 'none.json'), short_link_db=None)
+        browser_urls = []
+
+        async def scrape_video(url, index, total, target_url=None):
+            browser_urls.append(url)
+            return scraper._empty_row(url, error='stub')
+
+        scraper.scrape_video = scrape_video
+
+        df = asyncio.run(scraper.scrape_batch([URL, BLOCKED_URL], delay=0))
+
+        assert browser_urls == [BLOCKED_URL]
+        methods = df.set_index('post_url')['scraping_method']
+        assert methods[URL] == 'http_rehydration'
+        assert df.set_index('post_url').loc[URL, 'views'] == 2000
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Tests for the master timeline Parquet store and the full / incremental merge
+"""
+
+import csv
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import merge_complete_database as merge
+from master_timeline_store import MasterTimelineStore, SourceRegistry
+
+URL = 'https://www.tiktok.com/@amy/video/7560000000000000001'
+OTHER_URL = 'https://www.tiktok.com/@amy/video/7560000000000000002'
+
+
+def master_row(url=URL, account='amy', created_date='2025-10-01', views=100, scraped_at='2025-10-01T12:00:00', **extra):
+    row = {
+        'created_date': created_date, 'created_time': '10:00:00', 'account': account, 'va': 'Anna',
+        'post_url': url, 'views': views, 'likes': 10, 'comments': 1, 'shares': 0, 'engagement': 11,
+        'engagement_rate': 1.0, 'hashtags': '', 'sound': '', 'slides': '', 'source': 'test',
+        'scraped_at': scraped_at
+    }
+    row.update(extra)
+    return row
+
+
+def partition_files(store):
+    return sorted(str(path.relative_to(store.root_dir)) for path in store.root_dir.glob('month=*/creator=*/*.parquet'))
+
+
+class TestWritePosts:
+
+    def test_post_moving_partitions_is_not_duplicated(self, tmp_path):
+        store = MasterTimelineStore(tmp_path / 'store')
+        store.write_posts([master_row(), master_row(url=OTHER_URL)])
+
+        # Newer scrape files the post under a renamed account
+        summary = store.write_posts([master_row(account='amy_new', views=500, scraped_at='2025-10-05T12:00:00')])
+
+        df = store.read()
+        assert df['post_url'].tolist().count(URL) == 1
+        moved = df[df['post_url'] == URL].iloc[0]
+        assert (moved['account'], moved['views']) == ('amy_new', 500)
+        assert summary == {'partitions': 2, 'inserted': 0, 'updated': 1, 'unchanged': 0}
+        assert partition_files(store) == [
+            'month=2025-10/creator=amy/part-0.parquet', 'month=2025-10/creator=amy_new/part-0.parquet'
+        ]
+
+    def test_emptied_partition_is_removed(self, tmp_path):
+        store = MasterTimelineStore(tmp_path / 'store')
+        store.write_posts([master_row(account='')])
+        assert partition_files(store) == ['month=2025-10/creator=__unknown__/part-0.parquet']
+
+        store.write_posts([master_row(scraped_at='2025-10-05T12:00:00')])
+
+        assert partition_files(store) == ['month=2025-10/creator=amy/part-0.parquet']
+        assert len(store.read()) == 1
+
+    def test_first_seen_date_keeps_post_in_place(self, tmp_path):
+        store = MasterTimelineStore(tmp_path / 'store')
+        store.write_posts([master_row()])
+
+        store.write_posts([master_row(created_date='2025-11-02', views=900, scraped_at='2025-11-03T12:00:00')])
+
+        df = store.read()
+        assert len(df) == 1
+        assert (df.iloc[0]['created_date'], df.iloc[0]['views']) == ('2025-10-01', 900)
+        assert partition_files(store) == ['month=2025-10/creator=amy/part-0.parquet']
+
+    def test_unchanged_batch_writes_nothing(self, tmp_path):
+        store = MasterTimelineStore(tmp_path / 'store')
+        store.write_posts([master_row()])
+        assert store.write_posts([master_row()])['partitions'] == 0
+
+    def test_posts_are_located_through_the_index(self, tmp_path, monkeypatch):
+        store = MasterTimelineStore(tmp_path / 'store')
+        store.write_posts([master_row(), master_row(url=OTHER_URL, account='bob')])
+
+        def no_scan():
+            raise AssertionError('partition files scanned')
+
+        monkeypatch.setattr(store, '_dataset', no_scan)
+        summary = store.write_posts([master_row(account='amy_new', views=500, scraped_at='2025-10-05T12:00:00')])
+        monkeypatch.undo()
+
+        assert summary['partitions'] == 2
+        assert sorted(store.read()['account']) == ['amy_new', 'bob']
+        index = pd.read_parquet(store.root_dir / '_post_index.parquet').set_index('post_url')
+        assert index.loc[URL, 'creator'] == 'amy_new'
+
+    def test_store_without_index_is_indexed_on_next_write(self, tmp_path):
+        store = MasterTimelineStore(tmp_path / 'store')
+        store.write_posts([master_row()])
+        (store.root_dir / '_post_index.parquet').unlink()
+
+        store.write_posts([master_row(account='amy_new', scraped_at='2025-10-05T12:00:00')])
+
+        assert partition_files(store) == ['month=2025-10/creator=amy_new/part-0.parquet']
+        assert len(store.read()) == 1
+        assert (store.root_dir / '_post_index.parquet').exists()
+
+
+class TestRebuild:
+
+    def test_posts_no_longer_in_the_sources_are_removed(self, tmp_path):
+        store = MasterTimelineStore(tmp_path / 'store')
+        store.write_posts([master_row(), master_row(url=OTHER_URL, account='bob')])
+        kept_file = store.root_dir / 'month=2025-10' / 'creator=amy' / 'part-0.parquet'
+        kept_mtime = kept_file.stat().st_mtime_ns
+
+        summary = store.rebuild([master_row()])
+
+        assert store.read()['post_url'].tolist() == [URL]
+        assert partition_files(store) == ['month=2025-10/creator=amy/part-0.parquet']
+        assert summary == {'partitions': 1, 'inserted': 0, 'updated': 0, 'unchanged': 1, 'removed': 1}
+        # Unchanged partition keeps its file
+        assert kept_file.stat().st_mtime_ns == kept_mtime
+        # A later upsert doesn't resurrect the removed post from a stale index
+        store.write_posts([master_row(url=OTHER_URL, account='bob', views=7)])
+        assert sorted(store.read()['views']) == [7, 100]
+
+
+class TestSourceRegistry:
+
+    def test_new_recorded_touched_and_edited_files(self, tmp_path):
+        source = tmp_path / 'metrics_log.csv'
+        source.write_text('post_url\nhttps://example.com/1\n')
+        registry = SourceRegistry(tmp_path / 'store')
+        assert registry.has_changed(source)
+
+        registry.record(source, 1)
+        registry.account_to_va['amy'] = 'Anna'
+        registry.save()
+        reloaded = SourceRegistry(tmp_path / 'store')
+        assert not reloaded.has_changed(source)
+        assert reloaded.sources[str(source)]['rows'] == 1
+        assert reloaded.account_to_va == {'amy': 'Anna'}
+
+        # Same content, new mtime: re-hashed, still unchanged
+        os.utime(source, (1_700_000_000, 1_700_000_000))
+        assert not reloaded.has_changed(source)
+
+        source.write_text('post_url\nhttps://example.com/2\n')
+        assert reloaded.has_changed(source)
+
+
+def write_proof_log(path, rows, mtime):
+    fields = ['post_url', 'author', 'va', 'playCount', 'diggCount', 'commentCount', 'shareCount',
+              'createTimeISO', 'hashtags', 'sound_link']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for url, author, views, created in rows:
+            writer.writerow({'post_url': url, 'author': author, 'va': 'Anna', 'playCount': views, 'diggCount': 1,
+                             'commentCount': 0, 'shareCount': 0, 'createTimeISO': created,
+                             'hashtags': '', 'sound_link': ''})
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def merge_sources(tmp_path, monkeypatch):
+    """Older source with stale metrics listed first, newer source second"""
+    old = tmp_path / 'old_clean.csv'
+    new = tmp_path / 'metrics_log.csv'
+    write_proof_log(old, [(URL, 'amy', 100, '2025-10-01T10:00:00Z'),
+                          (OTHER_URL, 'amy', 50, '2025-10-02T10:00:00Z')], mtime=1_700_000_000)
+    write_proof_log(new, [(URL, 'amy', 900, '2025-10-01T10:00:00Z')], mtime=1_760_000_000)
+
+    monkeypatch.setattr(merge, 'SOURCES', [('old_clean', str(old), 'csv', 'old'),
+                                           ('current_metrics', str(new), 'csv', 'new')])
+    monkeypatch.setattr(merge, 'METRICS_LOG', str(new))
+    return tmp_path
+
+
+class TestMergeModes:
+
+    def test_full_and_incremental_merge_agree(self, merge_sources, monkeypatch):
+        monkeypatch.setattr(merge, 'OUTPUT_FILE', str(merge_sources / 'full' / 'MASTER.csv'))
+        (merge_sources / 'full').mkdir()
+        merge.full_merge()
+        full = MasterTimelineStore(merge_sources / 'full' / 'MASTER_parquet').read()
+
+        monkeypatch.setattr(merge, 'OUTPUT_FILE', str(merge_sources / 'incremental' / 'MASTER.csv'))
+        (merge_sources / 'incremental').mkdir()
+        merge.incremental_merge()
+        incremental = MasterTimelineStore(merge_sources / 'incremental' / 'MASTER_parquet').read()
+
+        columns = ['post_url', 'created_date', 'account', 'views', 'source']
+        full = full.sort_values('post_url')[columns].reset_index(drop=True)
+        incremental = incremental.sort_values('post_url')[columns].reset_index(drop=True)
+        assert full.equals(incremental)
+        # Newer scrape wins for metrics, first seen wins for source
+        assert full.set_index('post_url').loc[URL, 'views'] == 900
+        assert full.set_index('post_url').loc[URL, 'source'] == 'old_clean'
+
+
+class TestFullMerge:
+
+    def test_rebuild_drops_posts_removed_from_sources(self, merge_sources, monkeypatch):
+        monkeypatch.setattr(merge, 'OUTPUT_FILE', str(merge_sources / 'MASTER.csv'))
+        merge.full_merge()
+        store = MasterTimelineStore(merge_sources / 'MASTER_parquet')
+        assert sorted(store.read()['post_url']) == [URL, OTHER_URL]
+
+        write_proof_log(merge_sources / 'old_clean.csv', [(URL, 'amy', 100, '2025-10-01T10:00:00Z')],
+                        mtime=1_700_000_000)
+        merge.full_merge()
+
+        assert store.read()['post_url'].tolist() == [URL]
+
+
+class TestIncrementalMerge:
+
+    def test_only_new_or_changed_sources_are_merged(self, merge_sources, monkeypatch):
+        monkeypatch.setattr(merge, 'OUTPUT_FILE', str(merge_sources / 'MASTER.csv'))
+        store = MasterTimelineStore(merge_sources / 'MASTER_parquet')
+
+        first = merge.incremental_merge()
+        assert (first['sources'], first['inserted']) == (2, 2)
+        assert merge.incremental_merge()['sources'] == 0
+
+        # Newer metrics for one post
+        write_proof_log(merge_sources / 'metrics_log.csv', [(URL, 'amy', 1500, '2025-10-01T10:00:00Z')],
+                        mtime=1_760_100_000)
+        again = merge.incremental_merge()
+        assert (again['sources'], again['inserted'], again['updated']) == (1, 0, 1)
+        assert store.read().set_index('post_url').loc[URL, 'views'] == 1500
+
+    def test_va_is_remembered_for_later_scrapes(self, merge_sources, monkeypatch):
+        monkeypatch.setattr(merge, 'OUTPUT_FILE', str(merge_sources / 'MASTER.csv'))
+        merge.incremental_merge()
+
+        # Apify export: no VA column, account known from the earlier Proof Log merge
+        scrape = merge_sources / 'oct_scrape.json'
+        scrape.write_text(json.dumps([{
+            'webVideoUrl': 'https://www.tiktok.com/@amy/video/7560000000000000003', 'authorMeta': {'name': 'amy'},
+            'playCount': 70, 'createTimeISO': '2025-10-03T10:00:00.000Z'
+        }]))
+        summary = merge.incremental_merge(source_paths=[scrape])
+
+        assert summary['inserted'] == 1
+        df = MasterTimelineStore(merge_sources / 'MASTER_parquet').read().set_index('post_url')
+        assert df.loc['https://www.tiktok.com/@amy/video/7560000000000000003', 'va'] == 'Anna'
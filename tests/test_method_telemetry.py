@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for method telemetry: histogram buckets, percentiles, windows and routing scores
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from method_telemetry import SUB_BUCKET_COUNT, LatencyHistogram, MethodTelemetry, TelemetryRegistry
+
+MAX_RELATIVE_ERROR = 1 / SUB_BUCKET_COUNT
+
+
+class TestLatencyHistogram:
+
+    def test_small_values_have_exact_buckets(self):
+        for micros in (0, 1, 63, 127):
+            assert LatencyHistogram._index(micros) == micros
+            assert LatencyHistogram._value(micros) == micros / 1e6
+
+    def test_bucket_indexes_are_monotonic_and_contiguous(self):
+        indexes = [LatencyHistogram._index(micros) for micros in range(0, 70_000)]
+        steps = {b - a for a, b in zip(indexes, indexes[1:])}
+        assert steps <= {0, 1}
+        # Power-of-two boundaries start a new bucket
+        assert LatencyHistogram._index(256) == LatencyHistogram._index(255) + 1
+        assert LatencyHistogram._index(1 << 20) == LatencyHistogram._index((1 << 20) - 1) + 1
+
+    @pytest.mark.parametrize('seconds', [0.00013, 0.0042, 0.25, 1.0, 7.3, 95.0, 3600.0])
+    def test_bucket_midpoint_within_relative_error(self, seconds):
+        index = LatencyHistogram._index(int(seconds * 1e6))
+        assert abs(LatencyHistogram._value(index) - seconds) / seconds <= MAX_RELATIVE_ERROR
+
+    def test_percentiles_of_uniform_samples(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        for p, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+            assert histogram.percentile(p) == pytest.approx(expected, rel=MAX_RELATIVE_ERROR)
+        assert histogram.percentile(0) == pytest.approx(0.001, rel=MAX_RELATIVE_ERROR)
+        # Never above the largest recorded sample
+        assert histogram.percentile(100) <= histogram.max == 1.0
+        assert histogram.mean == pytest.approx(0.5005)
+
+    def test_skewed_samples_and_empty_histogram(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) is None and histogram.mean is None
+
+        for _ in range(98):
+            histogram.record(0.2)
+        histogram.record(5.0)
+        histogram.record(30.0)
+
+        assert histogram.percentile(50) == pytest.approx(0.2, rel=MAX_RELATIVE_ERROR)
+        assert histogram.percentile(99) == pytest.approx(5.0, rel=MAX_RELATIVE_ERROR)
+        assert histogram.percentile(99.5) == 30.0
+
+    def test_round_trip_through_json(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.05, 0.4, 0.4, 2.5, -1.0):
+            histogram.record(seconds)
+
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+
+        assert restored.counts == histogram.counts
+        assert (restored.count, restored.max) == (5, 2.5)
+        assert [restored.percentile(p) for p in (20, 50, 99)] == [histogram.percentile(p) for p in (20, 50, 99)]
+
+
+class TestMethodTelemetry:
+
+    def test_window_success_rate_and_cost_per_success(self):
+        telemetry = MethodTelemetry('api', window=3)
+        assert telemetry.window_success_rate is None and telemetry.cost_per_success is None
+
+        for success in (True, False, False, True, True):
+            telemetry.record(success, 0.1, 0.01)
+
+        # Window holds the last three attempts: False, True, True
+        assert telemetry.window_success_rate == pytest.approx(2 / 3)
+        assert telemetry.cost_per_success == pytest.approx(0.03 / 2)
+        assert (telemetry.attempts, telemetry.successes) == (5, 3)
+        assert telemetry.total_cost == pytest.approx(0.05)
+
+
+class TestTelemetryRegistry:
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / 'telemetry.json')
+        registry = TelemetryRegistry(['api', 'playwright'], path=path, window=10)
+        registry.record('api', True, 0.3, 0.00001)
+        registry.record('apify', False, 12.0, 0.0025)
+        registry.save()
+
+        restored = TelemetryRegistry(['api', 'playwright'], path=path, window=10)
+
+        assert restored.to_json() == registry.to_json()
+        assert 'tiktok_scraper_method_latency_seconds_count{method="api"} 1' in restored.to_prometheus()
+
+    def test_rank_prefers_cheap_reliable_fast_methods(self):
+        registry = TelemetryRegistry(['api', 'playwright', 'apify'])
+        for _ in range(10):
+            registry.record('api', True, 0.2, 0.00001)
+            registry.record('playwright', True, 8.0, 0.0001)
+        cost_weights = {'api': 0.00001, 'playwright': 0.0001, 'apify': 0.0025}
+
+        scores = registry.rank(['api', 'playwright', 'apify'], cost_weights)
+        assert max(scores, key=scores.get) == 'api'
+        # Untried method: configured cost, neutral success and latency
+        assert scores['apify'] == pytest.approx(0.4 * 0.00001 / 0.0025 + 0.4 + 0.2, rel=1e-3)
+
+        # Over the p95 SLO -> dropped, unless nothing else is left
+        assert set(registry.rank(['api', 'playwright'], cost_weights, max_p95_seconds=1.0)) == {'api'}
+        assert set(registry.rank(['playwright'], cost_weights, max_p95_seconds=1.0)) == {'playwright'}
+
+    def test_viable_treats_unknown_methods_as_viable(self):
+        registry = TelemetryRegistry(['api', 'selenium'])
+        for success in (True, False, False, False):
+            registry.record('api', success, 0.1, 0.0)
+
+        assert registry.viable(['api', 'selenium', 'apify'], 0.8) == ['selenium', 'apify']
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared metric/count parser (known formats + seeded fuzzing)
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from metric_parser import parse_count, cache_info
+
+
+class TestParseCount:
+    """Formats seen on TikTok pages in different locales"""
+
+    @pytest.mark.parametrize('text, expected', [
+        ('1234', 1234),
+        ('10.5K', 10500),
+        ('10.5k', 10500),
+        ('2.3K', 2300),
+        ('1.2M', 1200000),
+        ('1.5B', 1500000000),
+        ('1,234', 1234),
+        ('1,234,567', 1234567),
+        ('1.234.567', 1234567),
+        ('1 234 567', 1234567),
+        ('1 234', 1234),
+        ('1,234.5K', 1234500),
+        ('1,2K', 1200),
+        ('12,3 Mio', 12300000),
+        ('12,3 Mio.', 12300000),
+        ('1,5 Mrd.', 1500000000),
+        ('3,4 тыс.', 3400),
+        ('2.1万', 21000),
+        ('2.1万次播放', 21000),
+        ('22 comments', 22),
+        ('22 kommentare', 22),
+        ('1.2M views', 1200000),
+        ('  48  ', 48),
+    ])
+    def test_known_formats(self, text, expected):
+        assert parse_count(text) == expected
+
+    @pytest.mark.parametrize('value', [None, '', '   ', 'abc', 'K', '—'])
+    def test_no_number_returns_default(self, value):
+        assert parse_count(value) == 0
+        assert parse_count(value, default=None) is None
+
+    def test_numbers_pass_through(self):
+        assert parse_count(1500) == 1500
+        assert parse_count(1499.6) == 1500
+
+    def test_repeated_strings_hit_the_cache(self):
+        parse_count('987.6K')
+        hits = cache_info().hits
+        parse_count('987.6K')
+        assert cache_info().hits == hits + 1
+
+
+class TestParseCountFuzz:
+    """Randomly formatted counts round-trip; arbitrary text never raises"""
+
+    def test_formatted_counts_round_trip(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            n = rng.randint(0, 10 ** 10)
+            style = rng.choice(['plain', 'en', 'de', 'space', 'suffix_en', 'suffix_de'])
+            if style == 'plain':
+                text, tolerance = str(n), 0
+            elif style == 'en':
+                text, tolerance = f"{n:,}", 0
+            elif style == 'de':
+                text, tolerance = f"{n:,}".replace(',', '.'), 0
+            elif style == 'space':
+                text, tolerance = f"{n:,}".replace(',', ' '), 0
+            else:
+                for unit, scale in ((' Mrd.' if style == 'suffix_de' else 'B', 10 ** 9),
+                                    (' Mio.' if style == 'suffix_de' else 'M', 10 ** 6),
+                                    (' Tsd.' if style == 'suffix_de' else 'K', 10 ** 3)):
+                    if n >= scale:
+                        break
+                else:
+                    unit, scale = '', 1
+                number = f"{n / scale:.1f}"
+                if style == 'suffix_de':
+                    number = number.replace('.', ',')
+                text, tolerance = number + unit, scale * 0.05 + 1
+            assert abs(parse_count(text) - n) <= tolerance, text
+
+    def test_garbage_never_raises(self):
+        rng = random.Random(99)
+        alphabet = '0123456789.,KkMmBb  万Miotys-+%#@'
+        for _ in range(5000):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            assert isinstance(parse_count(text), int)
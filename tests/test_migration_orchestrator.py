@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Tests for the DAG migration orchestrator and streamed slide / OCR migration
+"""
+
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.models import Base, Post, Slide
+from database.migration_scripts.migrate_all import MigrationOrchestrator, MigrationStage
+from database.migration_scripts import migrate_ocr_data
+from database.migration_scripts.migrate_ocr_data import (
+    OCRDataMigrator, load_ocr_directory, post_url_key, post_url_variants
+)
+from database.migration_scripts.migrate_slides import SlidesMigrator, parse_slide_page
+
+CDN = 'https://p16-sign.tiktokcdn-us.com/obj/slide'
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """Create a temporary database for testing"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'migration.db'}",
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def migration_sources(tmp_path):
+    """Master CSV with 30 posts (2 slides each on even posts) and an OCR tree for 2 VAs"""
+    rows = []
+    for i in range(30):
+        rows.append({
+            'created_date': f'2025-09-{i % 28 + 1:02d}', 'created_time': '12:00',
+            'account': f'account{i % 3}', 'va': f'VA{i % 2}',
+            'post_url': f'https://www.tiktok.com/@account{i % 3}/video/{1000 + i}',
+            'views': 100 * i, 'likes': i, 'comments': 1, 'shares': 0, 'engagement': i + 1,
+            'engagement_rate': 0.5, 'hashtags': '#fyp', 'sound': 'original sound',
+            'slides': f'{CDN}{i}a.jpeg|{CDN}{i}b.jpeg|not-a-url' if i % 2 == 0 else None,
+            'source': 'old_clean'
+        })
+    csv_path = tmp_path / 'master.csv'
+    pd.DataFrame(rows).to_csv(csv_path, index=False)
+
+    ocr_dir = tmp_path / 'ocr'
+    (ocr_dir / 'by_va').mkdir(parents=True)
+    (ocr_dir / 'overall_summary.json').write_text(json.dumps({'total_vas': 2}))
+    for va in ('VA0', 'VA1'):
+        va_dir = ocr_dir / 'by_va' / va
+        va_dir.mkdir()
+        posts = [
+            {'post_url': row['post_url'], 'combined_text': f"text {row['post_url'][-4:]}"}
+            for row in rows if row['va'] == va
+        ]
+        (va_dir / 'ocr_posts.json').write_text(json.dumps(posts))
+    return csv_path, ocr_dir
+
+
+class TestSlidesMigration:
+
+    def test_parse_slide_page_splits_valid_and_invalid(self):
+        parsed = parse_slide_page([(7, 'url', f'{CDN}1.jpeg | bad |{CDN}2.jpeg')])
+        assert parsed[0]['post_id'] == 7
+        assert [url for url, _ in parsed[0]['slides']] == [f'{CDN}1.jpeg', f'{CDN}2.jpeg']
+        assert parsed[0]['invalid'] == ['bad']
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_streams_pages_and_skips_posts_with_slides(self, db_session, workers):
+        for i in range(1, 8):
+            db_session.add(Post(id=i, post_url=f'https://www.tiktok.com/@a/video/{i}', account='a',
+                                created_date=pd.Timestamp('2025-09-01').to_pydatetime(), source='test',
+                                slides=f'{CDN}{i}a.jpeg|{CDN}{i}b.jpeg'))
+        db_session.add(Slide(post_id=3, slide_url=f'{CDN}3a.jpeg', slide_index=1))
+        db_session.commit()
+
+        stats = SlidesMigrator(db_session).migrate_slides_from_posts(batch_size=2, workers=workers)
+
+        assert stats['processed'] == 6
+        assert stats['skipped'] == 1
+        assert db_session.query(Slide).count() == 13
+        assert db_session.query(Slide).filter(Slide.post_id == 7).count() == 2
+
+
+class TestMigrationOrchestrator:
+
+    def test_complete_migration_reports_stage_timings(self, db_session, migration_sources):
+        csv_path, ocr_dir = migration_sources
+        orchestrator = MigrationOrchestrator(db_session)
+        results = orchestrator.run_complete_migration(str(csv_path), str(ocr_dir), batch_size=10, workers=2)
+
+        assert 'error' not in results
+        for phase in ('csv_migration', 'ocr_files', 'slides_migration', 'ocr_migration', 'validation'):
+            assert results[phase]['status'] == 'success', phase
+
+        assert db_session.query(Post).count() == 30
+        # OCR runs after slides: text lands on the 30 parsed slides; only the 15 posts
+        # without slide URLs get a placeholder OCR slide
+        assert db_session.query(Slide).filter(Slide.slide_url != '').count() == 30
+        assert db_session.query(Slide).filter(Slide.slide_url == '').count() == 15
+        assert db_session.query(Slide).filter(Slide.ocr_text.is_(None)).count() == 0
+
+        stages = results['summary']['stages']
+        assert stages['csv_migration']['rows'] == 30
+        assert stages['csv_migration']['rows_per_second'] > 0
+        assert stages['ocr_files']['rows'] == 30
+        # Reading the OCR files overlaps the CSV import
+        assert stages['ocr_files']['started_at'] < stages['csv_migration']['started_at'] + stages['csv_migration']['seconds']
+        csv_end = stages['csv_migration']['started_at'] + stages['csv_migration']['seconds']
+        assert stages['slides_migration']['started_at'] >= csv_end - 0.005  # timings are rounded to ms
+
+    def test_failed_dependency_skips_downstream_but_still_validates(self, db_session, tmp_path):
+        orchestrator = MigrationOrchestrator(db_session)
+        results = orchestrator.run_complete_migration(
+            str(tmp_path / 'missing.csv'), str(tmp_path / 'missing_ocr'), workers=1
+        )
+
+        assert results['csv_migration']['status'] == 'failed'
+        assert results['slides_migration']['status'] == 'skipped'
+        assert results['ocr_migration']['status'] == 'skipped'
+        assert results['validation']['status'] == 'success'
+        assert results['summary']['overall_status'] == 'failed'
+
+    def test_db_stages_never_overlap(self, db_session):
+        orchestrator = MigrationOrchestrator(db_session)
+        orchestrator.start_time = time.time()
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def stage(name):
+            def run():
+                with lock:
+                    if active:
+                        overlaps.append((name, list(active)))
+                    active.append(name)
+                time.sleep(0.05)
+                with lock:
+                    active.remove(name)
+                return {'status': 'success', 'rows': 1}
+            return run
+
+        orchestrator.run_stages([
+            MigrationStage('a', stage('a')),
+            MigrationStage('b', stage('b')),
+            MigrationStage('c', stage('c'), depends_on=('a', 'b')),
+        ])
+
+        assert overlaps == []
+        assert all(orchestrator.results[name]['status'] == 'success' for name in 'abc')
+        assert orchestrator.results['c']['timing']['started_at'] >= 0.1
+
+
+class TestOCRFiles:
+
+    def test_load_ocr_directory_in_process_pool(self, migration_sources):
+        _, ocr_dir = migration_sources
+        (ocr_dir / 'by_va' / 'VA2').mkdir()
+        parsed = load_ocr_directory(ocr_dir, workers=2)
+        assert set(parsed) == {'VA0', 'VA1', 'VA2'}
+        assert len(parsed['VA0']) == 15
+        assert parsed['VA2'] is None
+
+
+class TestOCRBulkResolution:
+
+    def _add_posts(self, db_session, urls):
+        for i, url in enumerate(urls, start=1):
+            db_session.add(Post(id=i, post_url=url, account='a', source='test',
+                                created_date=pd.Timestamp('2025-09-01').to_pydatetime()))
+        db_session.commit()
+
+    def test_post_url_forms_share_a_key(self):
+        assert post_url_key('https://m.tiktok.com/@a/video/123/?lang=en') == 'id:123'
+        assert post_url_key('https://www.tiktok.com/@a/video/123') == 'id:123'
+        assert post_url_key('https://vm.tiktok.com/ZS1abc/') == 'short:ZS1abc'
+        assert post_url_key('https://www.tiktok.com/t/ZS1abc') == 'short:ZS1abc'
+        assert 'https://vt.tiktok.com/ZS1abc/' in post_url_variants('https://vm.tiktok.com/ZS1abc')
+
+    def test_resolves_all_forms_with_chunked_queries(self, db_session, monkeypatch):
+        self._add_posts(db_session, [
+            'https://www.tiktok.com/@a/video/1',
+            'https://vt.tiktok.com/ZS2/',
+        ] + [f'https://www.tiktok.com/@a/video/{i}' for i in range(3, 41)])
+        monkeypatch.setattr(migrate_ocr_data, 'POST_LOOKUP_CHUNK', 50)
+
+        statements = []
+        event.listen(db_session.bind, 'before_cursor_execute',
+                     lambda conn, cursor, sql, *args: statements.append(sql))
+        migrator = OCRDataMigrator(db_session)
+        urls = ['https://m.tiktok.com/@a/video/1?is_from_webapp=1', 'https://vm.tiktok.com/ZS2',
+                'https://www.tiktok.com/@a/video/999'] + \
+               [f'https://www.tiktok.com/@a/video/{i}/' for i in range(3, 41)]
+        resolved = migrator.resolve_post_ids(urls)
+
+        assert resolved[urls[0]] == 1
+        assert resolved[urls[1]] == 2
+        assert urls[2] not in resolved
+        assert len(resolved) == 40
+        # ~6 candidate forms per URL, 50 per IN (...) lookup; not one query per post
+        assert len(statements) == 5
+        # Cached URLs don't hit the database again
+        migrator.resolve_post_ids(urls[:2])
+        assert len(statements) == 5
+
+    def test_applies_ocr_with_bulk_updates(self, db_session):
+        self._add_posts(db_session, [f'https://www.tiktok.com/@a/video/{i}' for i in range(1, 4)])
+        db_session.add_all([
+            Slide(post_id=1, slide_url=f'{CDN}1a.jpeg', slide_index=1),
+            Slide(post_id=1, slide_url=f'{CDN}1b.jpeg', slide_index=2, ocr_text='kept'),
+            Slide(post_id=2, slide_url=f'{CDN}2a.jpeg', slide_index=1),
+        ])
+        db_session.commit()
+
+        migrator = OCRDataMigrator(db_session)
+        migrator.start_migration('test', 'ocr')
+        migrator._apply_va_ocr_posts([
+            {'post_url': 'https://www.tiktok.com/@a/video/1?lang=en', 'combined_text': 'one'},
+            {'post_url': 'https://www.tiktok.com/@a/video/2', 'combined_text': 'two'},
+            {'post_url': 'https://www.tiktok.com/@a/video/3', 'combined_text': 'three'},
+            {'post_url': 'https://www.tiktok.com/@a/video/404', 'combined_text': 'missing'},
+            {'combined_text': 'no url'},
+        ], 'VA1')
+        migrator.complete_migration(success=True)
+
+        texts = dict(db_session.query(Slide.slide_url, Slide.ocr_text))
+        assert texts == {f'{CDN}1a.jpeg': 'one', f'{CDN}1b.jpeg': 'kept', f'{CDN}2a.jpeg': 'two', '': 'three'}
+        assert migrator.stats['processed'] == 3
+        assert migrator.stats['skipped'] == 1
+        assert migrator.stats['failed'] == 1
+        # Two posts updated in place, one placeholder slide inserted
+        assert migrator.stats['imported'] == 3
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for OptimalTikTokScraper.scrape_batch (concurrency, budget reservation, shutdown)
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from optimal_metrics_scraper import OptimalTikTokScraper, ScrapingMethod, ScrapingResult
+from database.engine_registry import engine_registry
+
+URLS = [f'https://www.tiktok.com/@amy/video/75600000000000000{i:02d}' for i in range(8)]
+
+
+@pytest.fixture
+def make_scraper(tmp_path):
+    """Scraper with its database, telemetry and config in tmp_path"""
+    created = []
+
+    def make(**config):
+        config = {
+            'database_path': str(tmp_path / 'metrics.db'),
+            'short_link_db': None,
+            'monitoring': {'telemetry_path': str(tmp_path / 'telemetry.json')},
+            **config
+        }
+        config_path = tmp_path / 'scraper_config.json'
+        config_path.write_text(json.dumps(config))
+        scraper = OptimalTikTokScraper(str(config_path))
+        created.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in created:
+        scraper.db_manager.close()
+    engine_registry.dispose(f"sqlite:///{tmp_path / 'metrics.db'}")
+
+
+def stub_scrape_post(scraper, delays, events=None, fail_url=None):
+    """Replace scrape_post with a timed fake that tracks how many posts are in flight"""
+    in_flight = {'now': 0, 'max': 0}
+
+    async def scrape_post(post_url, target_url=None):
+        in_flight['now'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        try:
+            await asyncio.sleep(delays.get(post_url, 0.01))
+            if post_url == fail_url:
+                raise RuntimeError('scraper crashed')
+            return ScrapingResult(post_url=post_url, method=ScrapingMethod.API, success=True,
+                                  metrics={'views': 1}, cost=0.0, duration=0.0, scraped_at=time.time())
+        except asyncio.CancelledError:
+            if events is not None:
+                events.append(('cancelled', post_url))
+            raise
+        finally:
+            in_flight['now'] -= 1
+
+    scraper.scrape_post = scrape_post
+    return in_flight
+
+
+class TestScrapeBatch:
+
+    def test_bounded_concurrency_and_input_order(self, make_scraper):
+        scraper = make_scraper(scraping={'max_concurrent': 3})
+        # Later posts finish first
+        in_flight = stub_scrape_post(scraper, {url: 0.05 - 0.005 * i for i, url in enumerate(URLS)})
+
+        results = asyncio.run(scraper.scrape_batch(URLS))
+
+        assert [result.post_url for result in results] == URLS
+        assert in_flight['max'] == 3
+        assert scraper.throughput['rows_written'] == len(URLS)
+
+    def test_in_flight_posts_reserve_budget(self, make_scraper):
+        worst_case = 0.0025  # apify, the most expensive default method
+        scraper = make_scraper(scraping={'max_concurrent': 4, 'save_to_database': False},
+                               max_budget_per_day=worst_case * 2.5)
+        in_flight = stub_scrape_post(scraper, {})
+
+        results = asyncio.run(scraper.scrape_batch(URLS))
+
+        # Only two worst-case posts fit in the remaining budget at once
+        assert in_flight['max'] == 2
+        assert [result.post_url for result in results] == URLS[:2]
+
+    def test_failing_worker_cancels_siblings_before_cleanup(self, make_scraper):
+        scraper = make_scraper(scraping={'max_concurrent': 3})
+        events = []
+        stub_scrape_post(scraper, {URLS[0]: 0.01, URLS[1]: 5, URLS[2]: 5}, events, fail_url=URLS[0])
+        close = scraper.close
+
+        async def recording_close():
+            events.append(('closed', None))
+            await close()
+
+        scraper.close = recording_close
+
+        with pytest.raises(RuntimeError, match='scraper crashed'):
+            asyncio.run(asyncio.wait_for(scraper.scrape_batch(URLS), timeout=2))
+
+        assert sorted(events[:2]) == [('cancelled', URLS[1]), ('cancelled', URLS[2])]
+        assert events[2:] == [('closed', None)]
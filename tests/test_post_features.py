@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-post feature table (vectorized features, change-based refresh)
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from post_features import (
+    FEATURE_COLUMNS, PostFeatureTable, compute_features, feature_table_path, load_posts_with_features
+)
+
+CANONICAL = 'https://www.tiktok.com/@amy/video/7560000000000000001'
+VARIANT = 'https://www.tiktok.com/@amy/video/7560000000000000001?is_from_webapp=1'
+OTHER = 'https://www.tiktok.com/@bob/photo/7560000000000000002'
+
+
+def posts(*rows):
+    return pd.DataFrame([
+        {'post_url': url, 'views': views, 'likes': 100, 'comments': 10, 'shares': 0, 'sound': 'original sound'}
+        for url, views in rows
+    ])
+
+
+@pytest.fixture
+def table(tmp_path):
+    return PostFeatureTable(tmp_path / '_features' / 'post_features.parquet')
+
+
+class TestComputeFeatures:
+
+    def test_vectorized_values(self):
+        features = compute_features(posts((CANONICAL, 20000), (OTHER, 0))).set_index('post_id')
+
+        viral = features.loc['7560000000000000001']
+        assert viral['engagement'] == 110
+        assert viral['engagement_rate_pct'] == pytest.approx(0.55)
+        assert bool(viral['is_viral'])
+        assert viral['view_bracket'] == '10K-100K'
+        assert features.loc['7560000000000000002', 'engagement_rate_pct'] == 0
+
+
+class TestRefresh:
+
+    def test_second_refresh_only_recomputes_changed_posts(self, table):
+        assert table.refresh(posts((CANONICAL, 1000), (OTHER, 500))) == {'recomputed': 2, 'reused': 0, 'total': 2}
+
+        summary = table.refresh(posts((CANONICAL, 1000), (OTHER, 900)))
+
+        assert summary == {'recomputed': 1, 'reused': 1, 'total': 2}
+        assert table.load().set_index('post_id').loc['7560000000000000002', 'views'] == 900
+
+    def test_urls_sharing_a_video_id_keep_one_row(self, table):
+        table.refresh(posts((CANONICAL, 1000), (VARIANT, 1200)))
+        stored = table.load()
+        assert stored['post_id'].tolist() == ['7560000000000000001']
+        assert stored['views'].tolist() == [1200]
+
+        # Refreshing again (either URL form) must not fail on the index
+        assert table.refresh(posts((CANONICAL, 1500), (OTHER, 10)))['total'] == 2
+        assert table.load()['post_id'].is_unique
+
+    def test_refresh_heals_table_with_duplicate_ids(self, table):
+        duplicated = pd.concat([compute_features(posts((CANONICAL, 1000))), compute_features(posts((VARIANT, 1000)))])
+        table.path.parent.mkdir(parents=True)
+        duplicated.to_parquet(table.path, index=False)
+
+        summary = table.refresh(posts((VARIANT, 2000)))
+
+        assert summary['total'] == 1
+        assert table.load()['views'].tolist() == [2000]
+
+
+class TestLoadPostsWithFeatures:
+
+    def test_joins_by_video_id_across_url_forms(self, tmp_path):
+        database_csv = tmp_path / 'MASTER.csv'
+        master = posts((CANONICAL, 20000), (OTHER, 50))
+        master['created_date'] = '2025-10-01'
+        master.to_csv(database_csv, index=False)
+        PostFeatureTable(feature_table_path(database_csv)).refresh(posts((VARIANT, 20000)))
+
+        merged = load_posts_with_features(database_csv).set_index('post_url')
+
+        assert bool(merged.loc[CANONICAL, 'is_viral'])
+        # Not in the table yet: computed inline
+        assert merged.loc[OTHER, 'view_bracket'] == '<1K'
+        assert not merged[FEATURE_COLUMNS].isna().any().any()
+
+    def test_stored_features_are_only_used_while_inputs_match(self, tmp_path):
+        database_csv = tmp_path / 'MASTER.csv'
+        path = feature_table_path(database_csv)
+        PostFeatureTable(path).refresh(posts((CANONICAL, 20000), (OTHER, 50)))
+        # Mark the stored rows so the test can tell them from inline results
+        stored = pd.read_parquet(path)
+        stored['view_bracket'] = 'stored'
+        stored.to_parquet(path, index=False)
+
+        # CANONICAL's views changed since the refresh, OTHER's didn't
+        master = posts((CANONICAL, 500), (OTHER, 50))
+        master['created_date'] = '2025-10-01'
+        master.to_csv(database_csv, index=False)
+
+        merged = load_posts_with_features(database_csv).set_index('post_url')
+
+        assert merged.loc[OTHER, 'view_bracket'] == 'stored'
+        assert merged.loc[CANONICAL, 'view_bracket'] == '<1K'
+        assert not bool(merged.loc[CANONICAL, 'is_viral'])
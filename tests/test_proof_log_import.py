@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk Proof Log / master CSV importer
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from database.onlyfans_tracking_schema import (
+    TikTokAnalyticsDatabase, Creator, VA, ContentSet, TikTokAccount, TikTokPost
+)
+from database.proof_log_import import BulkImporter, read_proof_log
+
+PROOF_LOG = pd.DataFrame({
+    'Timestamp': ['2025-10-01T09:00:00Z', '2025-10-01T11:30:00+02:00', '2025-10-02T08:00:00Z', 'not a date'],
+    'Chat ID': ['-100', '-100', '-200', '-200'],
+    'Message ID': ['1', '2', '3', '4'],
+    'Creator': ['Tyra', 'Tyra', 'Naomi', 'Naomi'],
+    'Set ID': [5, None, 5, 6],
+    'VA': ['Felix', 'Felix', 'Ann', 'Ann'],
+    'Type': ['NEW', 'REPOST', 'NEW', 'NEW'],
+    'Platform': ['tiktok'] * 4,
+    'Post URL': ['https://www.tiktok.com/@amy/video/1', 'https://www.tiktok.com/@amy/video/2',
+                 'https://www.tiktok.com/@bob/video/3?lang=en', 'https://example.com/no-account'],
+})
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a temporary OnlyFans tracking database for testing"""
+    db = TikTokAnalyticsDatabase(f"sqlite:///{tmp_path / 'tracking.db'}")
+    db.create_tables()
+    yield db
+    db.engine.dispose()
+
+
+@pytest.fixture
+def proof_log_csv(tmp_path):
+    path = tmp_path / 'proof_log.csv'
+    PROOF_LOG.to_csv(path, index=False)
+    return str(path)
+
+
+class TestReadProofLog:
+
+    def test_vectorized_parsing(self, proof_log_csv):
+        df = read_proof_log(proof_log_csv)
+
+        assert df['timestamp'].tolist()[:3] == [
+            datetime(2025, 10, 1, 9, 0), datetime(2025, 10, 1, 9, 30), datetime(2025, 10, 2, 8, 0)
+        ]
+        assert pd.isna(df['timestamp'][3])
+        assert df['set_id'].tolist()[:2] == [5, pd.NA]
+        assert df['account_username'].tolist()[:3] == ['amy', 'amy', 'bob']
+        assert pd.isna(df['account_username'][3])
+        assert df['Chat ID'][0] == '-100'
+
+    def test_mixed_iso_forms_in_one_file(self, tmp_path):
+        path = tmp_path / 'mixed.csv'
+        PROOF_LOG.assign(Timestamp=['2025-10-01T09:00:00.123456+00:00', '2025-10-01T09:00:01+00:00',
+                                    '2025-10-01 09:00:02', '2025-10-01T09:00:03.5Z']).to_csv(path, index=False)
+
+        df = read_proof_log(str(path))
+
+        assert df['timestamp'].tolist() == [
+            datetime(2025, 10, 1, 9, 0, 0, 123456), datetime(2025, 10, 1, 9, 0, 1),
+            datetime(2025, 10, 1, 9, 0, 2), datetime(2025, 10, 1, 9, 0, 3, 500000)
+        ]
+
+
+class TestBulkImporter:
+
+    def test_resolve_reuses_existing_and_inserts_missing(self, db):
+        session = db.get_session()
+        session.add(VA(name='Felix'))
+        session.commit()
+        existing_id = session.query(VA).one().id
+        session.close()
+
+        importer = BulkImporter(db.engine, progress=None)
+        ids = importer.resolve(VA, pd.DataFrame({'name': ['Felix', 'Ann', None, 'Ann']}), ['name'])
+
+        assert ids[0] == existing_id
+        assert ids[1] == ids[3] != existing_id
+        assert pd.isna(ids[2])
+        session = db.get_session()
+        assert session.query(VA).count() == 2
+        session.close()
+
+    def test_insert_chunks_report_progress_and_skip_duplicates(self, db):
+        calls = []
+        importer = BulkImporter(db.engine, chunk_size=2, progress=lambda *args: calls.append(args[:3]))
+        creator_ids = importer.resolve(Creator, pd.DataFrame({'name': ['Tyra'] * 5}), ['name'])
+
+        sets = pd.DataFrame({'set_id': [1, 2, 3, 4, 1], 'creator_id': creator_ids})
+        stats = importer.insert(ContentSet, sets)
+
+        assert calls == [('content_sets', 2, 5), ('content_sets', 4, 5), ('content_sets', 5, 5)]
+        assert stats == {'inserted': 5, 'skipped': 0, 'invalid': 0}
+
+        stats = importer.insert(TikTokAccount, pd.DataFrame({'username': ['amy', 'bob', 'amy'], 'va_id': [1, None, 1]}))
+        assert stats == {'inserted': 1, 'skipped': 1, 'invalid': 1}
+
+
+class TestManagerImports:
+
+    def test_proof_log_import_is_idempotent(self, db, proof_log_csv):
+        stats = db.import_proof_log_data(proof_log_csv)
+
+        # The last row has no TikTok account (required on tiktok_posts)
+        assert stats == {'inserted': 3, 'skipped': 0, 'invalid': 1}
+        session = db.get_session()
+        assert session.query(Creator).count() == 2
+        assert session.query(VA).count() == 2
+        assert {s.name for s in session.query(ContentSet)} == {'Set 5 - Tyra', 'Set 5 - Naomi', 'Set 6 - Naomi'}
+        amy = session.query(TikTokAccount).filter_by(username='amy').one()
+        assert amy.va.name == 'Felix'
+
+        repost = session.query(TikTokPost).filter_by(post_type='REPOST').one()
+        assert repost.account_id == amy.id
+        assert repost.content_set_id is None
+        assert repost.created_date == datetime(2025, 10, 1, 9, 30)
+        session.close()
+
+        assert db.import_proof_log_data(proof_log_csv) == {'inserted': 0, 'skipped': 3, 'invalid': 1}
+
+    def test_master_database_import(self, db, tmp_path):
+        path = tmp_path / 'master.csv'
+        pd.DataFrame({
+            'post_url': ['https://www.tiktok.com/@amy/video/1'], 'creator': ['Tyra'], 'va': ['Felix'],
+            'created_date': ['2025-10-01'], 'created_time': ['14:05:00'],
+            'views': [1000], 'likes': [100], 'comments': [10], 'shares': [None],
+            'engagement': [110], 'engagement_rate': [11.0], 'hashtags': ['#fyp'], 'sound': [None], 'slides': [3],
+        }).to_csv(path, index=False)
+
+        assert db.import_master_database(str(path))['inserted'] == 1
+
+        session = db.get_session()
+        post = session.query(TikTokPost).one()
+        assert (post.views, post.shares, post.slides_count) == (1000, 0, 3)
+        assert post.created_date == datetime(2025, 10, 1)
+        assert post.created_time == datetime(1900, 1, 1, 14, 5)
+        assert post.account.username == 'amy'
+        session.close()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for query-plan performance validation and the anti-join integrity checks
+"""
+
+import pytest
+import tempfile
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.models import Base, VA, Post, MetricsHistory, Slide
+from database.storage_benchmark import DatasetGenerator, Scale, BenchmarkTarget, bulk_ingest
+from database.migration_scripts.query_plans import (
+    HOT_QUERIES, HotQuery, PerformanceValidator, QueryContext, explain, filter_columns
+)
+from database.migration_scripts.validate_migration import MigrationValidator
+
+
+@pytest.fixture
+def db_session():
+    """Create a temporary database for testing"""
+    db_fd, db_path = tempfile.mkstemp()
+
+    engine = create_engine(
+        f'sqlite:///{db_path}',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+    os.close(db_fd)
+    os.unlink(db_path)
+
+
+@pytest.fixture(scope='module')
+def seeded_session(tmp_path_factory):
+    """Benchmark dataset (analyzed), so the planner sees realistic row counts"""
+    target = BenchmarkTarget('plans', f"sqlite:///{tmp_path_factory.mktemp('plans')}/plans.db")
+    target.setup()
+    Base.metadata.create_all(target.engine)
+    bulk_ingest(target, DatasetGenerator(Scale(posts=2000, snapshots=3, vas=5, accounts=50), seed=3))
+    session = sessionmaker(bind=target.engine)()
+    yield session
+    session.close()
+    target.teardown()
+
+
+QUERIES = {query.name: query for query in HOT_QUERIES}
+
+
+def _unindexed_sound_query(ctx):
+    return select(Post.id, Post.views).where(Post.sound == 'original sound')
+
+
+class TestQueryPlans:
+
+    def test_hot_queries_have_no_unexpected_full_scans(self, seeded_session):
+        results = PerformanceValidator(seeded_session, repeats=2).validate()
+        assert results['issues'] == []
+        assert results['passed'] is True
+        assert set(results['queries']) == {query.name for query in HOT_QUERIES}
+        assert results['queries']['va_recent_posts']['full_scans'] == []
+
+    def test_timed_queries_report_percentiles(self, seeded_session):
+        results = PerformanceValidator(seeded_session, repeats=4).validate()
+        timed = {query.name for query in HOT_QUERIES if query.timed}
+        assert set(results['metrics']) == timed
+        for name in timed:
+            metrics = results['metrics'][name]
+            assert 0 < metrics['p50_ms'] <= metrics['p95_ms']
+        assert results['queries']['metrics_last_7d']['p50_ms'] is None
+
+    def test_unindexed_filter_is_flagged_with_index_suggestion(self, seeded_session):
+        query = HotQuery('posts_by_sound', 'dashboard', _unindexed_sound_query, 1_000)
+        results = PerformanceValidator(seeded_session, queries=[query], repeats=1).validate()
+        assert results['passed'] is False
+        result = results['queries']['posts_by_sound']
+        assert result['full_scans'] == ['posts']
+        assert result['missing_indexes'] == [{'table': 'posts', 'columns': ['sound']}]
+        assert 'no index on posts(sound)' in results['issues'][0]
+
+    def test_budget_overrun_is_an_issue(self, seeded_session):
+        query = HotQuery('post_timeseries', 'dashboard', QUERIES['post_timeseries'].build, budget_ms=0)
+        results = PerformanceValidator(seeded_session, queries=[query], repeats=1).validate()
+        assert results['passed'] is False
+        assert 'over 0ms budget' in results['issues'][0]
+
+    def test_filter_columns_include_join_and_where(self, seeded_session):
+        ctx = QueryContext.from_db(seeded_session)
+        columns = filter_columns(QUERIES['first_day_views'].build(ctx))
+        assert set(columns['posts']) == {'id', 'created_date'}
+        assert set(columns['metrics_history']) == {'post_id', 'snapshot_date'}
+
+    def test_first_day_views_uses_the_first_day_window(self, db_session):
+        created = datetime(2025, 10, 1, 9, 0, 0, 250000)
+        va = VA(name='Felix')
+        db_session.add(va)
+        db_session.flush()
+        recent = Post(post_url='https://www.tiktok.com/@amy/video/1', account='amy', va_id=va.id,
+                      created_date=created, source='test')
+        old = Post(post_url='https://www.tiktok.com/@amy/video/2', account='amy', va_id=va.id,
+                   created_date=created - timedelta(days=45), source='test')
+        db_session.add_all([recent, old])
+        db_session.flush()
+        for post, hours, views in [(recent, 6, 100), (recent, 24, 150), (recent, 24.5, 400),
+                                   (recent, 72, 900), (old, 6, 50)]:
+            db_session.add(MetricsHistory(post_id=post.id, va_id=va.id, views=views, likes=0, comments=0,
+                                          shares=0, engagement=0,
+                                          snapshot_date=post.created_date + timedelta(hours=hours)))
+        db_session.commit()
+
+        ctx = QueryContext.from_db(db_session)
+        rows = db_session.execute(QUERIES['first_day_views'].build(ctx)).all()
+
+        # The snapshot exactly one day in is the last one counted
+        assert [tuple(row) for row in rows] == [(recent.id, va.id, 150)]
+
+    def test_explain_keeps_bound_parameters(self, seeded_session):
+        ctx = QueryContext.from_db(seeded_session)
+        plan = explain(seeded_session, QUERIES['va_recent_posts'].build(ctx))
+        assert plan.index_lookups == ['posts']
+        assert 'idx_posts_va_date' in plan.steps[0]
+
+
+class TestAntiJoinIntegrity:
+
+    def test_orphans_and_invalid_references_are_counted(self, db_session):
+        va = VA(name='VA1')
+        db_session.add(va)
+        db_session.flush()
+        now = datetime(2025, 9, 1)
+        db_session.add_all([
+            Post(id=1, post_url='https://www.tiktok.com/@a/video/1', account='a', va_id=va.id,
+                 created_date=now, source='test'),
+            Post(id=2, post_url='https://www.tiktok.com/@a/video/2', account='a', va_id=999,
+                 created_date=now, source='test'),
+            Post(id=3, post_url='https://www.tiktok.com/@a/video/3', account='a', va_id=None,
+                 created_date=now, source='test'),
+        ])
+        db_session.add_all([
+            Slide(post_id=1, slide_url='s1', slide_index=1, ocr_text='hello'),
+            Slide(post_id=1, slide_url='s2', slide_index=2),
+        ])
+        db_session.commit()
+        # Orphans can only be created with foreign keys off (SQLite default)
+        db_session.execute(text(
+            "INSERT INTO slides (post_id, slide_url, slide_index, created_at, updated_at) "
+            "VALUES (42, 's3', 1, '2025-09-01', '2025-09-01')"
+        ))
+        db_session.commit()
+
+        validator = MigrationValidator(db_session)
+        integrity = validator._validate_data_integrity()
+        assert integrity['orphaned_slides'] == 1
+        assert integrity['invalid_va_posts'] == 1
+        assert integrity['orphaned_metrics'] == 0
+        assert integrity['duplicate_posts'] == 0
+        assert integrity['negative_metrics'] == 0
+        assert integrity['passed'] is False
+
+        relationships = validator._validate_relationships()
+        assert relationships['posts_without_va'] == 1
+        assert relationships['posts_with_slide_records'] == 2
+
+        quality = validator._validate_data_quality()
+        assert quality['ocr_coverage'] == pytest.approx(100 / 3)
+
+    def test_performance_check_keeps_metrics_key(self, seeded_session):
+        performance = MigrationValidator(seeded_session, performance_repeats=2)._validate_performance()
+        assert performance['passed'] is True
+        assert 'post_timeseries' in performance['metrics']
+        assert performance['plans']['va_recent_posts']['full_scans'] == []
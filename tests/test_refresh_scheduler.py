@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the refresh scheduler (age / velocity tiers, hourly budget, pausing)
+"""
+
+import pytest
+import tempfile
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.models import Base, Post, MetricsHistory, RefreshSchedule, RefreshDispatch
+from database.refresh_scheduler import RefreshPolicy, RefreshScheduler
+
+NOW = datetime(2025, 10, 20, 12, 0)
+
+
+@pytest.fixture
+def db_session():
+    """Create a temporary database for testing"""
+    db_fd, db_path = tempfile.mkstemp()
+
+    engine = create_engine(
+        f'sqlite:///{db_path}',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    os.close(db_fd)
+    os.unlink(db_path)
+
+
+def add_post(session, name, age_days, snapshots=()):
+    """Post created age_days before NOW with (hours_before_now, views) snapshots"""
+    post = Post(
+        post_url=f"https://www.tiktok.com/@test/video/{name}",
+        account="test",
+        created_date=NOW - timedelta(days=age_days),
+        source="test"
+    )
+    session.add(post)
+    session.flush()
+    for hours_ago, views in snapshots:
+        session.add(MetricsHistory(
+            post_id=post.id, views=views, likes=0, comments=0, shares=0, engagement=0,
+            snapshot_date=NOW - timedelta(hours=hours_ago)
+        ))
+    session.commit()
+    return post
+
+
+class TestRefreshPolicy:
+    """Tier selection from age and velocity"""
+
+    def test_tiers(self):
+        policy = RefreshPolicy()
+        assert policy.classify(2, None) == ('young', 1)
+        assert policy.classify(72, 2000) == ('fast', 2)
+        assert policy.classify(72, None) == ('growing', 6)
+        assert policy.classify(72, 10) == ('slow', 24)
+        assert policy.classify(30 * 24, 10) == ('stale', 72)
+        assert policy.classify(30 * 24, 0, flat_scrapes=3) == ('paused', 168)
+
+
+class TestRefreshScheduler:
+    """Scheduling, dispatch order and budget"""
+
+    def test_sync_computes_velocity_from_history(self, db_session):
+        fast = add_post(db_session, "1", age_days=3, snapshots=[(10, 1000), (2, 9000)])
+        slow = add_post(db_session, "2", age_days=3, snapshots=[(10, 1000), (2, 1100)])
+
+        scheduler = RefreshScheduler(db_session)
+        result = scheduler.sync(now=NOW)
+
+        assert result == {'scheduled': 2, 'snapshots_applied': 4}
+        assert fast.refresh_schedule.view_velocity == pytest.approx(1000)
+        assert fast.refresh_schedule.tier == 'fast'
+        assert slow.refresh_schedule.tier == 'slow'
+        assert slow.refresh_schedule.next_due_at == NOW - timedelta(hours=2) + timedelta(hours=24)
+
+    def test_next_batch_orders_by_urgency_and_respects_budget(self, db_session):
+        add_post(db_session, "1", age_days=3, snapshots=[(30, 1000), (26, 1010)])
+        fast = add_post(db_session, "2", age_days=3, snapshots=[(30, 1000), (26, 50000)])
+        add_post(db_session, "3", age_days=3, snapshots=[(30, 1000), (26, 1020)])
+
+        scheduler = RefreshScheduler(db_session, hourly_budget=2)
+        scheduler.sync(now=NOW)
+
+        batch = scheduler.next_batch(now=NOW)
+        assert len(batch) == 2
+        assert batch[0].id == fast.id
+
+        # Budget used up for this hour, dispatched posts are not handed out again
+        assert scheduler.next_batch(now=NOW + timedelta(minutes=10)) == []
+        later = scheduler.next_batch(now=NOW + timedelta(hours=1, minutes=1))
+        assert len(later) == 2
+
+    def test_finished_scrapes_do_not_free_budget(self, db_session):
+        for i in range(6):
+            add_post(db_session, str(i), age_days=3, snapshots=[(30, 1000), (26, 1010)])
+        scheduler = RefreshScheduler(db_session, hourly_budget=3)
+        scheduler.sync(now=NOW)
+
+        batch = scheduler.next_batch(now=NOW)
+        assert len(batch) == 3
+        for minutes, post in enumerate(batch, start=1):
+            scheduler.record_scrape(post.id, views=1100, scraped_at=NOW + timedelta(minutes=minutes))
+
+        assert scheduler.budget_remaining(NOW + timedelta(minutes=15)) == 0
+        assert scheduler.next_batch(now=NOW + timedelta(minutes=15)) == []
+        assert db_session.query(RefreshDispatch).count() == 3
+        assert len(scheduler.next_batch(now=NOW + timedelta(hours=1, minutes=1))) == 3
+
+    def test_flat_old_post_is_paused_and_rechecked(self, db_session):
+        post = add_post(db_session, "1", age_days=20)
+        scheduler = RefreshScheduler(db_session)
+        scheduler.sync(now=NOW)
+
+        for day in range(4):
+            scheduler.record_scrape(post.id, views=500, scraped_at=NOW + timedelta(days=day))
+
+        schedule = db_session.get(RefreshSchedule, post.id)
+        last_scrape = NOW + timedelta(days=3)
+        assert schedule.tier == 'paused'
+        assert schedule.next_due_at == last_scrape + timedelta(hours=168)
+        assert post.scraping_status == 'paused'
+        assert scheduler.next_batch(now=last_scrape + timedelta(days=6)) == []
+
+        recheck = last_scrape + timedelta(days=7, hours=1)
+        assert [p.id for p in scheduler.next_batch(now=recheck)] == [post.id]
+
+        # Revived: views moved again
+        scheduler.record_scrape(post.id, views=50000, scraped_at=recheck)
+        assert schedule.tier != 'paused'
+        assert post.scraping_status == 'active'
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for the short-link cache, the redirect resolver and video_id dedup
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / '02_Scraping_Systems' / '01_TikTok_Scrapers'))
+
+import short_link_cache
+from short_link_cache import (
+    ShortLink, ShortLinkCache, ShortLinkResolver, dedupe_urls, parse_canonical, parse_short_code,
+    resolve_short_links
+)
+
+SHORT = 'https://www.tiktok.com/t/ZTMuUscW9/'
+VM_SHORT = 'https://vm.tiktok.com/ZMabc123/'
+CANONICAL = 'https://www.tiktok.com/@amy/video/7560000000000000001'
+
+
+class FakeResponse:
+
+    def __init__(self, status, location=None):
+        self.status = status
+        self.headers = {'Location': location} if location else {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FakeSession:
+    """aiohttp-like session answering (method, url) from a routing table"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    def request(self, method, url, allow_redirects=True):
+        assert allow_redirects is False
+        self.requests.append((method, url))
+        return FakeResponse(*self.routes.get((method, url), (200,)))
+
+
+def resolver_with(routes, **kwargs):
+    resolver = ShortLinkResolver(**kwargs)
+    resolver.session = FakeSession(routes)
+    return resolver
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ShortLinkCache(str(tmp_path / 'short_links.db'))
+    yield cache
+    cache.close()
+
+
+class TestParsing:
+
+    def test_short_and_canonical_forms(self):
+        assert parse_short_code(SHORT) == 'ZTMuUscW9'
+        assert parse_short_code('https://vt.tiktok.com/ZSUGHkc9j/') == 'ZSUGHkc9j'
+        assert parse_short_code(CANONICAL) is None
+        assert parse_canonical(CANONICAL + '?is_from_webapp=1') == ('amy', 'video', '7560000000000000001')
+        assert parse_canonical(SHORT) is None
+
+
+class TestResolver:
+
+    def test_head_redirect_with_relative_location(self):
+        resolver = resolver_with({('HEAD', SHORT): (301, '/@amy/video/7560000000000000001?_r=1')})
+
+        link = asyncio.run(resolver.resolve('ZTMuUscW9', SHORT))
+
+        assert link == ShortLink('ZTMuUscW9', 'amy', '7560000000000000001', 'video')
+        assert resolver.session.requests == [('HEAD', SHORT)]
+
+    def test_get_fallback_and_multiple_hops(self):
+        hop = 'https://www.tiktok.com/t/ZMabc123/'
+        resolver = resolver_with({
+            ('HEAD', VM_SHORT): (405,),
+            ('GET', VM_SHORT): (302, hop),
+            ('HEAD', hop): (302, 'https://www.tiktok.com/@bob/photo/7560000000000000002'),
+        })
+
+        link = asyncio.run(resolver.resolve('ZMabc123', VM_SHORT))
+
+        assert (link.username, link.post_type, link.video_id) == ('bob', 'photo', '7560000000000000002')
+        assert resolver.session.requests == [('HEAD', VM_SHORT), ('GET', VM_SHORT), ('HEAD', hop)]
+
+    def test_no_redirect_is_an_error(self):
+        resolver = resolver_with({})
+
+        with pytest.raises(ValueError, match='no canonical redirect'):
+            asyncio.run(resolver.resolve('ZTMuUscW9', SHORT))
+        # Redirect without a Location header isn't followed either
+        resolver = resolver_with({('HEAD', SHORT): (301,), ('GET', SHORT): (302,)})
+        with pytest.raises(ValueError):
+            asyncio.run(resolver.resolve('ZTMuUscW9', SHORT))
+
+    def test_redirect_loop_stops_after_max_hops(self):
+        resolver = resolver_with({('HEAD', SHORT): (302, SHORT)}, max_hops=3)
+
+        with pytest.raises(ValueError):
+            asyncio.run(resolver.resolve('ZTMuUscW9', SHORT))
+        assert len(resolver.session.requests) == 3
+
+    def test_resolve_many_splits_failures(self):
+        resolver = resolver_with({('HEAD', SHORT): (301, CANONICAL)})
+
+        resolved, failures = asyncio.run(resolver.resolve_many({'ZTMuUscW9': SHORT, 'ZMabc123': VM_SHORT}))
+
+        assert [link.short_code for link in resolved] == ['ZTMuUscW9']
+        assert list(failures) == ['ZMabc123']
+
+
+class TestCache:
+
+    def test_store_get_and_failures(self, cache):
+        cache.store([ShortLink('ZTMuUscW9', 'amy', '7560000000000000001')])
+        cache.store_failures({'ZMabc123': 'no canonical redirect', 'ZTMuUscW9': 'timeout'})
+
+        assert cache.get('ZTMuUscW9').canonical_url == CANONICAL
+        assert cache.get('ZMabc123') is None
+        # A failure never overwrites a resolved code
+        assert cache.stats() == {'resolved': 1, 'failed': 1}
+        assert cache.short_code_for('7560000000000000001') == 'ZTMuUscW9'
+        assert cache.canonicalize(SHORT) == CANONICAL
+        assert cache.canonicalize(VM_SHORT) == VM_SHORT
+
+    def test_resolve_short_links_only_hits_the_network_for_misses(self, cache, monkeypatch):
+        cache.store([ShortLink('ZTMuUscW9', 'amy', '7560000000000000001')])
+        looked_up = []
+
+        class StubResolver:
+            def __init__(self, concurrency):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                return False
+
+            async def resolve_many(self, codes_to_urls):
+                looked_up.extend(codes_to_urls)
+                return [ShortLink('ZMabc123', 'bob', '7560000000000000002')], {}
+
+        monkeypatch.setattr(short_link_cache, 'ShortLinkResolver', StubResolver)
+
+        mapping = asyncio.run(resolve_short_links([SHORT, VM_SHORT, CANONICAL], cache))
+
+        assert looked_up == ['ZMabc123']
+        assert mapping == {
+            SHORT: CANONICAL,
+            VM_SHORT: 'https://www.tiktok.com/@bob/video/7560000000000000002',
+            CANONICAL: CANONICAL,
+        }
+        assert cache.get('ZMabc123').video_id == '7560000000000000002'
+
+
+class TestDedupe:
+
+    def test_short_and_canonical_forms_of_one_video_collapse(self, cache):
+        cache.store([ShortLink('ZTMuUscW9', 'amy', '7560000000000000001')])
+        urls = [SHORT, CANONICAL + '?is_from_webapp=1', CANONICAL, VM_SHORT, VM_SHORT]
+
+        assert dedupe_urls(urls, cache) == [SHORT, VM_SHORT]
+        assert cache.video_id_for(SHORT) == cache.video_id_for(CANONICAL) == '7560000000000000001'
+        # Unresolved short links are kept (keyed by URL) rather than dropped
+        assert cache.video_id_for(VM_SHORT) is None
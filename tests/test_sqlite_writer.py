@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite writer's sound / hashtag index
+"""
+
+import pytest
+
+from database.engine_registry import engine_registry
+from local_database_setup import parse_hashtags
+from sqlite_writer import SQLiteWriter
+
+URL = 'https://www.tiktok.com/@amy/video/7560000000000000001'
+OTHER_URL = 'https://www.tiktok.com/@bob/video/7560000000000000002'
+
+
+@pytest.fixture
+def writer(tmp_path):
+    path = tmp_path / 'tiktok_analytics.db'
+    writer = SQLiteWriter(str(path))
+    yield writer
+    writer.close()
+    engine_registry.dispose(f"sqlite:///{path}")
+
+
+def post(url=URL, **fields):
+    return {'post_url': url, 'account': url.split('@')[1].split('/')[0], 'views': 100, **fields}
+
+
+def tags_of(writer, post_id):
+    cursor = writer.connect().cursor()
+    cursor.execute("""
+    SELECT h.tag FROM post_hashtags ph JOIN hashtags h ON h.id = ph.hashtag_id
+    WHERE ph.post_id = ? ORDER BY h.tag
+    """, (post_id,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+class TestParseHashtags:
+
+    def test_only_hash_prefixed_tokens(self):
+        assert parse_hashtags('#fyp #Viral, #fyp') == ['fyp', 'viral']
+        assert parse_hashtags('new post #dance_challenge!') == ['dance_challenge']
+        assert parse_hashtags('fyp, viral') == []
+        assert parse_hashtags('') == parse_hashtags(None) == []
+
+
+class TestTagIndex:
+
+    def test_top_posts_by_sound_and_hashtag(self, writer):
+        writer.insert_post(post(views=500, sound_title='original sound', sound_author='amy',
+                                hashtags='#fyp #dance'))
+        writer.insert_post(post(OTHER_URL, views=900, sound_title='original sound', sound_author='amy',
+                                hashtags='#FYP'))
+
+        assert [row['views'] for row in writer.top_posts_by_sound('original sound')] == [900, 500]
+        assert [row['post_url'] for row in writer.top_posts_by_hashtag('#fyp')] == [OTHER_URL, URL]
+        assert [row['post_url'] for row in writer.top_posts_by_hashtag('dance')] == [URL]
+        top = writer.top_sounds()[0]
+        assert (top['posts'], top['accounts'], top['total_views']) == (2, 2, 1400)
+
+    def test_update_relinks_sound_and_hashtags(self, writer):
+        post_id = writer.insert_post(post(sound_title='song a', sound_author='x', hashtags='#fyp #old'))
+
+        writer.insert_post(post(views=300, sound_title='song b', sound_author='y', hashtags='#fyp #new'))
+
+        assert tags_of(writer, post_id) == ['fyp', 'new']
+        assert writer.top_posts_by_sound('song a') == []
+        assert writer.top_posts_by_sound('song b')[0]['views'] == 300
+
+    def test_update_without_tag_fields_keeps_links(self, writer):
+        post_id = writer.insert_post(post(sound_title='song a', hashtags='#fyp'))
+
+        writer.insert_post(post(views=300))
+
+        assert tags_of(writer, post_id) == ['fyp']
+        assert writer.top_posts_by_sound('song a')[0]['views'] == 300
+
+    def test_rebuild_indexes_only_unlinked_posts(self, writer):
+        cursor = writer.connect().cursor()
+        cursor.execute("INSERT INTO tiktok_posts (post_url, views, hashtags, sound_title, sound_author) "
+                       "VALUES (?, 10, '#legacy', 'old song', '')", (OTHER_URL,))
+        writer.conn.commit()
+        writer.insert_post(post(hashtags='#fyp'))
+
+        assert writer.rebuild_tag_index() == {'posts_indexed': 1}
+        assert writer.top_posts_by_hashtag('legacy')[0]['post_url'] == OTHER_URL
+        assert writer.rebuild_tag_index() == {'posts_indexed': 0}
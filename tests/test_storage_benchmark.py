@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the storage benchmark suite (dataset generation, workloads on SQLite, JSON results)
+"""
+
+import pytest
+
+from database.storage_benchmark import (
+    DatasetGenerator, Scale, latest_results, run_suite, save_results, summarize
+)
+
+TINY = Scale(posts=300, snapshots=3, vas=4, accounts=20)
+
+
+class TestDatasetGenerator:
+
+    def test_is_deterministic(self):
+        first = [row for chunk in DatasetGenerator(TINY, seed=7).post_chunks() for row in chunk]
+        again = [row for chunk in DatasetGenerator(TINY, seed=7).post_chunks() for row in chunk]
+        other = [row for chunk in DatasetGenerator(TINY, seed=8).post_chunks() for row in chunk]
+        assert first == again
+        assert first != other
+
+    def test_snapshots_end_at_current_counts(self):
+        data = DatasetGenerator(TINY)
+        posts = [row for chunk in data.post_chunks() for row in chunk]
+        snapshots = [row for chunk in data.metrics_chunks(chunk_size=100) for row in chunk]
+        assert len(snapshots) == TINY.posts * TINY.snapshots
+        latest = {row['post_id']: row['views'] for row in snapshots}
+        assert all(latest[post['id']] == post['views'] for post in posts)
+
+    def test_refresh_rows_pick_ten_percent(self):
+        rows = DatasetGenerator(TINY).refresh_rows()
+        assert len(rows) == 30
+        assert len({row['post_url'] for row in rows}) == 30
+
+
+class TestRunSuite:
+
+    @pytest.fixture(scope='class')
+    def results(self):
+        return run_suite(TINY, sqlite=['sqlite-default', 'sqlite-tuned'], repeats=1)
+
+    def test_workloads_run_against_each_variant(self, results):
+        assert set(results['targets']) == {'sqlite-default', 'sqlite-tuned'}
+        tuned = results['targets']['sqlite-tuned']
+        assert 'error' not in tuned
+        assert tuned['settings']['journal_mode'] == 'WAL'
+        assert tuned['bulk_ingest']['posts']['rows'] == 300
+        assert tuned['bulk_ingest']['metrics_history']['rows'] == 900
+        assert tuned['upsert_refresh']['posts_and_snapshots']['rows'] == 30
+        assert tuned['va_rollups']['va_leaderboard']['rows'] == 4
+        # Original snapshots plus one refresh snapshot per refreshed post
+        assert tuned['exports']['metrics_history_csv']['rows'] == 930
+
+    def test_summary_and_saved_json(self, results, tmp_path):
+        summary = summarize(results['targets']['sqlite-default'])
+        assert summary['measured'] is True
+        assert summary['inserts_per_second'] > 0
+
+        path = save_results(results, tmp_path)
+        assert path.suffix == '.json'
+        assert latest_results('sqlite-tuned', tmp_path)['seed'] == 42
+        assert latest_results('postgresql', tmp_path) is None
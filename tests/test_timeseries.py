@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for time-series storage: latest indexes, compaction, SQLite month rotation, retention
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import database.location_optimization_models  # noqa: F401  (registers location_metrics)
+from database.models import Base, MetricsHistory
+from database.migration_scripts.query_plans import explain
+from database.timeseries import (
+    TIME_SERIES_SPECS, TimeSeriesMaintenance, add_months, latest_index_ddl, latest_query,
+    partition_ddl, trend_query
+)
+
+NOW = datetime(2025, 10, 20, 12, 0)
+METRICS = TIME_SERIES_SPECS[0]
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """Create a temporary database for testing"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'timeseries.db'}",
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+def add_snapshots(db_session, post_ids, times):
+    db_session.execute(insert(MetricsHistory), [
+        dict(post_id=post_id, views=int(ts.timestamp()) % 100000, likes=1, comments=0, shares=0,
+             engagement=1, snapshot_date=ts)
+        for post_id in post_ids for ts in times
+    ])
+    db_session.commit()
+
+
+def count(db_session, table_name):
+    return db_session.execute(text(f"SELECT count(*) FROM {table_name}")).scalar()
+
+
+class TestLatestIndexes:
+
+    def test_specs_match_this_schema(self, db_session):
+        tables = {spec.table: spec for spec in TimeSeriesMaintenance(db_session, now=NOW).specs}
+        assert set(tables) == {'metrics_history', 'follower_snapshots', 'location_metrics'}
+        assert tables['follower_snapshots'].time_column == 'snapshot_date'
+
+    def test_ensure_indexes_adds_missing_latest_index(self, db_session):
+        db_session.execute(text("DROP INDEX idx_metrics_post_latest"))
+        db_session.commit()
+
+        maintenance = TimeSeriesMaintenance(db_session, now=NOW)
+        assert maintenance.ensure_indexes() == ['metrics_history']
+        assert maintenance.ensure_indexes() == []
+        names = {index['name'] for index in inspect(db_session.connection()).get_indexes('metrics_history')}
+        assert 'idx_metrics_post_latest' in names
+
+    def test_latest_and_trend_queries_use_the_index(self, db_session):
+        add_snapshots(db_session, range(1, 51), [NOW - timedelta(hours=6 * i) for i in range(40)])
+
+        latest = db_session.execute(latest_query(METRICS, [3, 7])).all()
+        assert {(row.post_id, row.snapshot_date) for row in latest} == {(3, NOW), (7, NOW)}
+        trend = db_session.execute(trend_query(METRICS, 3, NOW - timedelta(days=2))).all()
+        assert len(trend) == 9
+        assert trend[0].snapshot_date < trend[-1].snapshot_date
+
+        for statement in (latest_query(METRICS, [3, 7]), trend_query(METRICS, 3, NOW - timedelta(days=2))):
+            plan = explain(db_session, statement)
+            assert plan.full_scans == []
+            assert plan.temp_sorts == 0
+
+    def test_postgresql_ddl(self):
+        assert latest_index_ddl(METRICS, 'postgresql') == (
+            "CREATE INDEX IF NOT EXISTS idx_metrics_post_latest ON metrics_history "
+            "(post_id, snapshot_date DESC) INCLUDE (views, likes, comments, shares, engagement)"
+        )
+        assert partition_ddl(METRICS, datetime(2025, 12, 1).date()) == (
+            "CREATE TABLE IF NOT EXISTS metrics_history_y2025m12 PARTITION OF metrics_history "
+            "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+        )
+        assert add_months(datetime(2025, 11, 15).date(), 3).isoformat() == '2026-02-01'
+
+
+class TestCompactionAndRetention:
+
+    def test_compact_keeps_last_snapshot_per_day(self, db_session):
+        old_day = datetime(2025, 8, 1)
+        add_snapshots(db_session, [1, 2], [old_day + timedelta(hours=h) for h in (1, 7, 13, 19)])
+        add_snapshots(db_session, [1], [NOW - timedelta(hours=h) for h in (1, 2, 3)])
+
+        deleted = TimeSeriesMaintenance(db_session, now=NOW).compact(older_than_days=30)
+
+        assert deleted['metrics_history'] == 6
+        kept = db_session.query(MetricsHistory.post_id, MetricsHistory.snapshot_date).filter(
+            MetricsHistory.snapshot_date < NOW - timedelta(days=30)).all()
+        assert sorted(kept) == [(1, old_day + timedelta(hours=19)), (2, old_day + timedelta(hours=19))]
+        # Recent rows keep full resolution
+        assert count(db_session, 'metrics_history') == 5
+
+    def test_rotate_moves_old_months_to_shadow_tables(self, db_session):
+        months = [datetime(2025, month, 10) for month in (6, 7, 8, 9, 10)]
+        add_snapshots(db_session, [1, 2, 3], months)
+
+        maintenance = TimeSeriesMaintenance(db_session, now=NOW)
+        moved = maintenance.rotate_sqlite_months(hot_months=2)
+
+        assert moved['metrics_history'] == {
+            'metrics_history_2025_06': 3, 'metrics_history_2025_07': 3, 'metrics_history_2025_08': 3
+        }
+        assert count(db_session, 'metrics_history') == 6
+        assert count(db_session, 'metrics_history_history') == 15
+        # Latest values come from the small hot table
+        latest = db_session.execute(latest_query(METRICS, [1])).one()
+        assert latest.snapshot_date == datetime(2025, 10, 10)
+
+        # Rotating again is a no-op
+        assert maintenance.rotate_sqlite_months(hot_months=2) == {}
+
+        report = maintenance.apply_retention(retain_days=90)
+        assert report['metrics_history']['dropped_tables'] == ['metrics_history_2025_06']
+        assert count(db_session, 'metrics_history_history') == 12
+
+    def test_run_reports_each_step(self, db_session):
+        add_snapshots(db_session, [1], [datetime(2025, 1, 5), datetime(2025, 10, 1)])
+        report = TimeSeriesMaintenance(db_session, now=NOW).run(compact_after_days=30, retain_days=180)
+
+        assert report['tables'] == ['metrics_history', 'follower_snapshots', 'location_metrics']
+        assert report['partitions_created'] == {}
+        assert report['retention']['metrics_history']['deleted_rows'] == 1
+        assert count(db_session, 'metrics_history') == 1
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Tests for the unified schema: compatibility views and legacy database import
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import database.onlyfans_tracking_schema as onlyfans
+from database.engine_registry import engine_registry
+from database.models import Base, Account, MetricsHistory, Post, ProofLog
+from database.migration_scripts.migrate_legacy_schemas import LegacyLayout, LegacySchemaMigrator
+from database.unified_schema import compat_views, create_compat_views, drop_compat_views
+from local_database_setup import create_local_database
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """Create a temporary database for testing"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'unified.db'}",
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def local_db(tmp_path):
+    """Raw local_database_setup.py database with two posts"""
+    path = tmp_path / 'local.db'
+    create_local_database(str(path))
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        INSERT INTO tiktok_posts (post_url, creator, va, account, set_id, views, likes, comments, created_date, scraped_at)
+        VALUES ('https://www.tiktok.com/@amy/video/1', 'Tyra', 'Felix', 'amy', 5, 100, 10, 1,
+                '2025-10-01T10:00:00', '2025-10-02T10:00:00')
+    """)
+    conn.execute("""
+        INSERT INTO tiktok_posts (post_url, creator, va, account_username, views, scraped_at)
+        VALUES ('https://www.tiktok.com/@bob/video/2', 'Naomi', 'Ann', '@bob', 5, '2025-10-03T08:00:00Z')
+    """)
+    conn.execute("""
+        INSERT INTO tiktok_slides (post_id, slide_number, slide_url)
+        VALUES (1, 1, 'https://example.com/1.jpg'), (1, 2, 'https://example.com/2.jpg')
+    """)
+    conn.commit()
+    conn.close()
+    url = f"sqlite:///{path}"
+    yield url
+    engine_registry.dispose(url)
+
+
+@pytest.fixture
+def onlyfans_db(tmp_path):
+    """database/onlyfans_tracking_schema.py database with metric and follower history"""
+    url = f"sqlite:///{tmp_path / 'onlyfans.db'}"
+    engine = create_engine(url)
+    onlyfans.Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    creator, va = onlyfans.Creator(name='Tyra'), onlyfans.VA(name='Felix')
+    session.add_all([creator, va])
+    session.flush()
+    account = onlyfans.TikTokAccount(username='amy', va_id=va.id, followers=500)
+    content_set = onlyfans.ContentSet(set_id=7, creator_id=creator.id)
+    session.add_all([account, content_set])
+    session.flush()
+    post = onlyfans.TikTokPost(post_url='https://www.tiktok.com/@amy/video/9', creator_id=creator.id,
+                               account_id=account.id, va_id=va.id, content_set_id=content_set.id,
+                               post_type='NEW', views=300, created_date=datetime(2025, 10, 1))
+    session.add(post)
+    session.flush()
+    session.add_all([
+        onlyfans.MetricsSnapshot(tiktok_post_id=post.id, views=300 - 100 * i, likes=1, comments=0, shares=0,
+                                 bookmarks=0, engagement=1, engagement_rate=1.0, timestamp=NOW - timedelta(days=i))
+        for i in range(3)
+    ])
+    session.add_all([
+        onlyfans.FollowerSnapshot(account_id=account.id, followers=500 - 10 * i, timestamp=NOW - timedelta(days=i))
+        for i in range(10)
+    ])
+    session.commit()
+    session.close()
+    engine.dispose()
+    yield url
+    engine_registry.dispose(url)
+
+
+def count(db_session, table_name):
+    return db_session.execute(text(f"SELECT count(*) FROM {table_name}")).scalar()
+
+
+class TestCompatViews:
+
+    def test_views_cover_legacy_table_names(self, db_session):
+        created, skipped = create_compat_views(db_session.get_bind())
+
+        assert created == list(compat_views())
+        assert skipped == []
+        assert set(created) <= set(inspect(db_session.get_bind()).get_view_names())
+        assert not set(created) & set(Base.metadata.tables)
+
+        assert drop_compat_views(db_session.get_bind()) == list(reversed(created))
+
+    def test_existing_tables_are_not_replaced(self, tmp_path):
+        create_local_database(str(tmp_path / 'shared.db'))
+        engine = create_engine(f"sqlite:///{tmp_path / 'shared.db'}")
+        Base.metadata.create_all(engine)
+
+        created, skipped = create_compat_views(engine)
+
+        assert skipped == ['tiktok_posts', 'tiktok_slides']
+        assert 'tiktok_posts' in inspect(engine).get_table_names()
+        assert 'post_slides' in created
+        engine.dispose()
+
+
+class TestLegacyImport:
+
+    def test_local_layout_import_is_idempotent(self, db_session, local_db):
+        summary = LegacySchemaMigrator(db_session).migrate_database(local_db)
+
+        assert summary['layout'] == 'local'
+        assert summary['stats']['failed'] == 0
+        assert count(db_session, 'posts') == 2
+        assert count(db_session, 'slides') == 2
+        assert count(db_session, 'content_sets') == 1
+
+        amy = db_session.query(Post).filter_by(post_url='https://www.tiktok.com/@amy/video/1').one()
+        assert (amy.va.name, amy.creator.name, amy.tiktok_account.username) == ('Felix', 'Tyra', 'amy')
+        assert amy.content_set.set_id == 5
+        assert amy.created_date == datetime(2025, 10, 1, 10, 0)
+        bob = db_session.query(Post).filter_by(account='bob').one()
+        assert bob.created_date == datetime(2025, 10, 3, 8, 0)  # falls back to scraped_at, as UTC
+
+        again = LegacySchemaMigrator(db_session).migrate_database(local_db)
+        assert again['stats']['imported'] == 0
+        assert count(db_session, 'posts') == 2
+        assert count(db_session, 'slides') == 2
+
+    def test_existing_posts_only_gain_missing_links(self, db_session, local_db):
+        db_session.add(Post(post_url='https://www.tiktok.com/@amy/video/1', account='amy', views=999,
+                            created_date=datetime(2025, 10, 1), source='current_metrics'))
+        db_session.commit()
+
+        LegacySchemaMigrator(db_session).migrate_database(local_db)
+
+        post = db_session.query(Post).filter_by(post_url='https://www.tiktok.com/@amy/video/1').one()
+        assert post.views == 999
+        assert post.source == 'current_metrics'
+        assert post.tiktok_account.username == 'amy'
+        assert post.creator.name == 'Tyra'
+
+    def test_onlyfans_layout_history_and_summary_views(self, db_session, onlyfans_db):
+        summary = LegacySchemaMigrator(db_session).migrate_database(onlyfans_db)
+
+        assert summary['layout'] == 'onlyfans'
+        assert count(db_session, 'metrics_history') == 3
+        assert count(db_session, 'follower_snapshots') == 10
+        post = db_session.query(Post).one()
+        assert {m.va_id for m in db_session.query(MetricsHistory)} == {post.va_id}
+        assert db_session.query(Account).one().followers == 500
+
+        create_compat_views(db_session.get_bind())
+        row = db_session.execute(text("SELECT * FROM account_summary")).mappings().one()
+        assert row['current_followers'] == 500
+        assert row['followers_change_7d'] == 70
+        va = db_session.execute(text("SELECT * FROM va_summary")).mappings().one()
+        assert (va['va_name'], va['total_followers'], va['best_account']) == ('Felix', 500, 'amy')
+        views = db_session.execute(text("SELECT views FROM metrics_snapshots ORDER BY \"timestamp\"")).scalars().all()
+        assert views == [100, 200, 300]
+
+    def test_proof_logs_link_to_imported_posts(self, db_session, onlyfans_db, tmp_path):
+        LegacySchemaMigrator(db_session).migrate_database(onlyfans_db)
+
+        url = f"sqlite:///{tmp_path / 'proof_log.db'}"
+        engine = create_engine(url)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE vas (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("CREATE TABLE creators (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("CREATE TABLE content_sets (id INTEGER PRIMARY KEY, set_id INTEGER, creator_id INTEGER)"))
+            conn.execute(text("""
+                CREATE TABLE proof_logs (id INTEGER PRIMARY KEY, "timestamp" DATETIME, chat_id TEXT, message_id TEXT,
+                    creator_id INTEGER, content_set_id INTEGER, va_id INTEGER, account_id INTEGER,
+                    post_type TEXT, platform TEXT, post_url TEXT, dedupe_key TEXT)
+            """))
+            conn.execute(text("INSERT INTO vas VALUES (1, 'Zoe')"))
+            conn.execute(text("INSERT INTO creators VALUES (1, 'Tyra')"))
+            conn.execute(text("INSERT INTO content_sets VALUES (1, 7, 1)"))
+            conn.execute(text("""
+                INSERT INTO proof_logs VALUES
+                (1, '2025-10-05 09:00:00', '-100', '11', 1, 1, 1, NULL, 'NEW', 'tiktok',
+                 'https://www.tiktok.com/@amy/video/9', NULL),
+                (2, '2025-10-05 09:05:00', '-100', '12', 1, NULL, 1, NULL, 'REPOST', 'tiktok',
+                 'https://www.tiktok.com/@amy/video/10', NULL)
+            """))
+        engine.dispose()
+
+        assert LegacyLayout.inspect(engine).name == 'proof_log'
+        LegacySchemaMigrator(db_session).migrate_database(url)
+        engine_registry.dispose(url)
+
+        logs = {log.message_id: log for log in db_session.query(ProofLog)}
+        post = db_session.query(Post).one()
+        assert logs['11'].post_id == post.id
+        assert logs['11'].content_set_id == post.content_set_id
+        assert logs['12'].post_id is None
+        assert count(db_session, 'creators') == 1
+        assert count(db_session, 'vas') == 2